@@ -0,0 +1,380 @@
+# benchmarks/fake_webdriver_server.py
+"""
+ベンチマーク用のプロセス内 W3C WebDriver サーバー。
+
+Selenium Grid と Edge の代わりに、セッション作成・ページ移動・スクリーンショット・終了の
+各コマンドに設定した遅延をかけて応答します。webdriver.Remote からは本物の Grid と
+同じように見えるため、ProxiedEdgeBrowser や RotationRunner の実際のコードパスを
+Grid 無しで計測できます。
+"""
+import base64
+import hashlib
+import json
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass(frozen=True)
+class FakeLatencies:
+    """各コマンドの応答までの遅延 (秒)。jitter は各遅延に加える一様乱数の最大値。"""
+    session_create: float = 0.0
+    navigate: float = 0.0
+    screenshot: float = 0.0
+    quit: float = 0.0
+    context_create: float = 0.0
+    # 遮断されなかったサブリソース1件ごとにページ移動へ加わる遅延 (ディスクキャッシュにあるものは除く)
+    resource: float = 0.0
+    # 初回起動の処理を済ませていないプロファイル ("First Run" の無い --user-data-dir) でのセッション作成に加わる遅延
+    first_run: float = 0.0
+    jitter: float = 0.0
+
+
+# 偽のページが読み込むサブリソース (Network.setBlockedURLs のパターンに当てはまるものは遮断される)
+FAKE_PAGE_RESOURCES = (
+    "/static/app.js", "/static/style.css", "/static/logo.png", "/static/hero.jpg", "/static/icon.svg",
+    "/static/font.woff2", "/static/intro.mp4", "https://www.google-analytics.com/analytics.js",
+    "https://securepubads.g.doubleclick.net/tag/js/gpt.js",
+)
+
+
+def _blocked_url_regex(patterns: list[str]) -> re.Pattern | None:
+    # CDP の URL パターンは * のみがワイルドカード
+    if not patterns:
+        return None
+    return re.compile("|".join(re.escape(p).replace(r"\*", ".*") for p in patterns))
+
+
+def make_png(width: int, height: int) -> bytes:
+    """指定サイズの単色 PNG を生成します (スクリーンショットの偽データ用)。"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + b"\xff\xff\xff" * width
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+
+def fake_egress_ip(proxy_server: str | None) -> str:
+    """プロキシ設定から決まる送信元 IP (TEST-NET-3 の範囲) を返します。"""
+    digest = hashlib.sha1((proxy_server or "direct").encode("utf-8")).digest()
+    return f"203.0.113.{digest[0] % 254 + 1}"
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # 並列セッション時に接続が拒否されないよう listen キューを広げる
+    request_queue_size = 1024
+
+
+class _Window:
+    def __init__(self, proxy_server: str | None = None, context_id: str | None = None):
+        self.url = "about:blank"
+        # ブラウザコンテキスト内のタブは、コンテキストのプロキシを使う
+        self.proxy_server = proxy_server
+        self.context_id = context_id
+        # スクリプトで開始したページ移動が確定する時刻 (それまでは移動中として応答する)
+        self.ready_at = 0.0
+        # Network.setBlockedURLs で設定された遮断パターン
+        self.blocked: re.Pattern | None = None
+
+
+class _Session:
+    def __init__(self, proxy_server: str | None, performance_log: bool = False, cache: set[str] | None = None):
+        self.proxy_server = proxy_server
+        # ディスクキャッシュにあるサブリソースの URL (--disk-cache-dir が同じセッションで共有される)
+        self.cache: set[str] = cache if cache is not None else set()
+        # パフォーマンスログ (ms:loggingPrefs) が有効な場合に、遮断したリクエストのイベントを溜める
+        self.performance_log: list[dict] | None = [] if performance_log else None
+        self.windows: dict[str, _Window] = {"main": _Window()}
+        self.current = "main"
+        self.contexts: dict[str, str | None] = {}
+
+    @property
+    def window(self) -> _Window:
+        return self.windows[self.current]
+
+    @property
+    def url(self) -> str:
+        return self.window.url
+
+
+class FakeWebDriverServer:
+    """
+    最小限の W3C WebDriver エンドポイントを実装した HTTP サーバー。
+
+    対応コマンド: New Session / Delete Session / Navigate To / Get Current URL /
+    Take Screenshot / Find Element(s) / Get Element Text / Execute Script / Status / ウィンドウ (タブ) の
+    作成・切り替え・終了、および Edge の CDP 実行 (Target.createBrowserContext / createTarget /
+    disposeBrowserContext はコンテキストごとのプロキシ、Network.setBlockedURLs はタブごとの遮断パターンを保持し、
+    それ以外は空の結果を返します)、パフォーマンスログの取得。
+    ページは FAKE_PAGE_RESOURCES のサブリソースを読み込み、遮断されたものは Network.loadingFailed として
+    パフォーマンスログに記録されます (キャッシュに無いもの1件ごとに resource の遅延が加わり、キャッシュは
+    セッションごと、--disk-cache-dir を指定した場合はそのディレクトリごと)。"First Run" ファイルの無い
+    --user-data-dir (または指定なし) のセッション作成には first_run の遅延が加わります。
+    ページ本文は {"ip": "..."} で、IP はセッションの --proxy-server 引数から決まります。
+    スクリプトによるページ移動 (location.href への代入) は待たずに戻り、navigate の遅延の後に確定します。
+    """
+
+    def __init__(
+        self,
+        latencies: FakeLatencies = FakeLatencies(),
+        screenshot_size: tuple[int, int] = (1280, 720),
+        host: str = "127.0.0.1",
+        port: int = 0,
+        base_path: str = "/wd/hub"
+    ):
+        """
+        Args:
+            latencies: 各コマンドの遅延設定。
+            screenshot_size: 返すスクリーンショットの幅と高さ (ピクセル)。
+            host: 待ち受けるアドレス。
+            port: 待ち受けるポート番号 (0 の場合は空きポートを自動で割り当て)。
+            base_path: Grid の URL のパス部分 (例: /wd/hub)。
+        """
+        self.latencies = latencies
+        self._screenshot_b64 = base64.b64encode(make_png(*screenshot_size)).decode("ascii")
+        self._host = host
+        self._port = port
+        self._base_path = base_path.rstrip("/")
+        self._sessions: dict[str, _Session] = {}
+        self._lock = threading.Lock()
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+        self._disk_caches: dict[str, set[str]] = {}
+        self.sessions_created = 0
+        self.contexts_created = 0
+
+    @property
+    def url(self) -> str:
+        """webdriver.Remote の command_executor に渡す URL。"""
+        port = self._server.server_address[1] if self._server else self._port
+        return f"http://{self._host}:{port}{self._base_path}"
+
+    @property
+    def active_sessions(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def start(self) -> 'FakeWebDriverServer':
+        if self._server is None:
+            self._server = _Server((self._host, self._port), self._handler_class())
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="fake-webdriver", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> 'FakeWebDriverServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _sleep(self, seconds: float) -> None:
+        if self.latencies.jitter:
+            seconds += random.uniform(0, self.latencies.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    # --- コマンドの処理 (戻り値は (HTTP ステータス, value)) ---
+    def _new_session(self, body: dict) -> tuple[int, object]:
+        always_match = body.get("capabilities", {}).get("alwaysMatch", {})
+        args = always_match.get("ms:edgeOptions", {}).get("args", [])
+        flags = dict(a.split("=", 1) for a in args if "=" in a)
+        user_data_dir = flags.get("--user-data-dir")
+        first_run = user_data_dir is None or not (Path(user_data_dir) / "First Run").exists()
+        self._sleep(self.latencies.session_create + (self.latencies.first_run if first_run else 0.0))
+        if user_data_dir is not None and Path(user_data_dir).is_dir():
+            # Edge と同じく、起動したユーザーデータディレクトリにロックを作る (コピーごと削除される)
+            (Path(user_data_dir) / "SingletonLock").touch()
+        performance_log = "performance" in (always_match.get("ms:loggingPrefs") or {})
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            cache = self._disk_caches.setdefault(flags["--disk-cache-dir"], set()) \
+                if "--disk-cache-dir" in flags else None
+            self._sessions[session_id] = _Session(flags.get("--proxy-server"), performance_log, cache)
+            self.sessions_created += 1
+        return 200, {"sessionId": session_id, "capabilities": {
+            "browserName": always_match.get("browserName", "MicrosoftEdge"),
+            "browserVersion": "0.0-fake", "platformName": "linux", "acceptInsecureCerts": True}}
+
+    def _load_page(self, session: _Session, url: str) -> float:
+        # 現在のタブで url のサブリソースを読み込み、ページ移動にかかる秒数を返す (遮断したものはログに記録する)
+        window = session.window
+        downloaded = 0
+        for resource in FAKE_PAGE_RESOURCES:
+            resource_url = resource if "://" in resource else url.split("?", 1)[0].rstrip("/") + resource
+            if window.blocked is None or not window.blocked.fullmatch(resource_url):
+                with self._lock:
+                    if resource_url not in session.cache:
+                        session.cache.add(resource_url)
+                        downloaded += 1
+                continue
+            if session.performance_log is not None:
+                session.performance_log.append({"level": "INFO", "timestamp": int(time.time() * 1000), "message": json.dumps({
+                    "webview": session.current, "message": {"method": "Network.loadingFailed", "params": {
+                        "requestId": uuid.uuid4().hex, "errorText": "net::ERR_BLOCKED_BY_CLIENT",
+                        "blockedReason": "inspector"}}})})
+        delay = self.latencies.navigate + self.latencies.resource * downloaded
+        return delay + (random.uniform(0, self.latencies.jitter) if self.latencies.jitter else 0)
+
+    def _execute_cdp(self, session: _Session, cmd: str, params: dict) -> tuple[int, object]:
+        # ブラウザコンテキスト (Target.createBrowserContext など) と遮断パターンのみ状態を持ち、他のコマンドは空の結果を返す
+        if cmd == "Network.setBlockedURLs":
+            session.window.blocked = _blocked_url_regex(params.get("urls") or [])
+            return 200, {}
+        if cmd == "Target.createBrowserContext":
+            self._sleep(self.latencies.context_create)
+        with self._lock:
+            if cmd == "Target.createBrowserContext":
+                context_id = uuid.uuid4().hex
+                session.contexts[context_id] = params.get("proxyServer")
+                self.contexts_created += 1
+                return 200, {"browserContextId": context_id}
+            if cmd == "Target.createTarget":
+                context_id = params.get("browserContextId")
+                if context_id is not None and context_id not in session.contexts:
+                    return 500, {"error": "unknown error", "message": "Failed to find browser context", "stacktrace": ""}
+                handle = uuid.uuid4().hex
+                session.windows[handle] = _Window(session.contexts.get(context_id), context_id)
+                session.windows[handle].url = params.get("url", "about:blank")
+                return 200, {"targetId": handle}
+            if cmd == "Target.disposeBrowserContext":
+                context_id = params.get("browserContextId")
+                session.contexts.pop(context_id, None)
+                for handle in [h for h, w in session.windows.items() if w.context_id == context_id]:
+                    del session.windows[handle]
+                return 200, {}
+        return 200, {}
+
+    def _dispatch(self, method: str, path: str, body: dict) -> tuple[int, object]:
+        if method == "GET" and path == "/status":
+            return 200, {"ready": True, "message": "fake webdriver ready"}
+        if method == "POST" and path == "/session":
+            return self._new_session(body)
+
+        match = re.fullmatch(r"/session/([^/]+)(/.*)?", path)
+        if not match:
+            return 404, {"error": "unknown command", "message": path, "stacktrace": ""}
+        with self._lock:
+            session = self._sessions.get(match.group(1))
+        if session is None:
+            return 404, {"error": "invalid session id", "message": "No such session", "stacktrace": ""}
+        command = match.group(2) or ""
+
+        if method == "DELETE" and command == "":
+            self._sleep(self.latencies.quit)
+            with self._lock:
+                self._sessions.pop(match.group(1), None)
+            return 200, None
+        if command == "/url":
+            if method == "POST":
+                url = body.get("url", "about:blank")
+                delay = self._load_page(session, url)
+                if delay > 0:
+                    time.sleep(delay)
+                session.window.url = url
+                return 200, None
+            return 200, session.url
+        if command == "/window":
+            if method == "GET":
+                return 200, session.current
+            if method == "POST":
+                if body.get("handle") not in session.windows:
+                    return 404, {"error": "no such window", "message": "No such window", "stacktrace": ""}
+                session.current = body["handle"]
+                return 200, None
+            if method == "DELETE":
+                with self._lock:
+                    session.windows.pop(session.current, None)
+                    return 200, list(session.windows)
+        if method == "GET" and command == "/window/handles":
+            return 200, list(session.windows)
+        if method == "POST" and command == "/window/new":
+            handle = uuid.uuid4().hex
+            with self._lock:
+                session.windows[handle] = _Window()
+            return 200, {"handle": handle, "type": "tab"}
+        if method == "GET" and command == "/screenshot":
+            self._sleep(self.latencies.screenshot)
+            return 200, self._screenshot_b64
+        if method == "POST" and command == "/element":
+            return 200, {"element-6066-11e4-a52e-4f735466cecf": "body"}
+        if method == "POST" and command == "/elements":
+            return 200, [{"element-6066-11e4-a52e-4f735466cecf": "body"}]
+        if method == "GET" and command == "/element/body/text":
+            return 200, json.dumps({"ip": fake_egress_ip(session.window.proxy_server or session.proxy_server)})
+        if method == "POST" and command == "/execute/sync":
+            script = body.get("script", "")
+            if "location.href" in script:
+                # タブでのページ移動の開始 (完了を待たずに戻る)
+                session.window.url = (body.get("args") or ["about:blank"])[0]
+                delay = self._load_page(session, session.window.url)
+                session.window.ready_at = time.monotonic() + delay
+                return 200, None
+            loading = time.monotonic() < session.window.ready_at
+            if "__proxyrotNavigating" in script:
+                return 200, "pending" if loading else "complete"
+            if "errorCode" in script:
+                # エラーページ検出用の問い合わせには、通常のページとして応答する
+                return 200, {"url": session.url, "errorCode": "", "title": "", "text": ""}
+            return 200, "loading" if loading else "complete"  # document.readyState などの問い合わせ
+        if method == "POST" and command == "/se/log":
+            with self._lock:
+                entries, session.performance_log = session.performance_log or [], \
+                    [] if session.performance_log is not None else None
+            return 200, entries
+        if method == "POST" and command.endswith("/cdp/execute"):
+            return self._execute_cdp(session, body.get("cmd", ""), body.get("params") or {})
+        return 404, {"error": "unknown command", "message": f"{method} {path}", "stacktrace": ""}
+
+    def _handler_class(self):
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive で接続を再利用させる
+            disable_nagle_algorithm = True  # 小さな応答に Nagle + 遅延 ACK の 40ms が乗らないようにする
+
+            def _handle(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else {}
+                path = self.path.split("?", 1)[0]
+                if server._base_path and path.startswith(server._base_path):
+                    path = path[len(server._base_path):] or "/"
+                status, value = server._dispatch(method, path.rstrip("/") or "/", body)
+                payload = json.dumps({"value": value}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        return _Handler
@@ -0,0 +1,358 @@
+# benchmarks/fault_proxy.py
+"""
+負荷試験・耐障害性試験用の、障害を注入できるローカル HTTP プロキシ。
+
+シナリオファイル (JSON) に従ってポートごとに振る舞いを割り当て、遅延・帯域制限・
+接続切断・CONNECT 拒否・エラーページ応答を再現します。1つのイベントループで
+多数のポート (例: 1,000 個) を待ち受けられるため、localhost 上に現実的な障害の
+混ざったプロキシ群を用意してローテーターのスループットを確認できます。
+
+    python -m benchmarks.fault_proxy benchmarks/scenarios/mixed_failures.json --write-proxies load_proxies.txt
+
+シナリオファイルの形式:
+
+    {
+      "base_port": 20000,          # 割り当てるポートの先頭
+      "count": 1000,               # ポート数
+      "seed": 42,                  # mix の割り当てに使う乱数の種 (再現性のため)
+      "mix": [                     # 重み付きで各ポートに振る舞いを割り当てる
+        {"weight": 80, "behavior": {}},
+        {"weight": 10, "behavior": {"latency": 3.0}},
+        {"weight": 10, "behavior": {"error_status": 502}}
+      ],
+      "ports": {"20000": {"local_response": true}}   # 個別指定 (mix より優先)
+    }
+
+振る舞い (FaultBehavior) のキー: latency, bandwidth, drop_probability, drop_after_bytes,
+refuse_connect, error_status, local_response。
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+from dataclasses import dataclass, fields
+from pathlib import Path
+from urllib.parse import urlsplit
+
+_HEADER_LIMIT = 64 * 1024
+_CHUNK_SIZE = 16 * 1024
+_CONNECT_TIMEOUT_SECONDS = 10.0
+
+_REASONS = {400: "Bad Request", 403: "Forbidden", 407: "Proxy Authentication Required",
+            429: "Too Many Requests", 500: "Internal Server Error", 502: "Bad Gateway",
+            503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+@dataclass(frozen=True)
+class FaultBehavior:
+    """
+    1ポート分のプロキシの振る舞い。
+
+    Attributes:
+        latency: リクエストを受け取ってから処理を始めるまでの遅延 (秒)。
+        bandwidth: 転送速度の上限 (バイト/秒)。None の場合は無制限。
+        drop_probability: リクエストを受け取った直後に接続を切断する確率 (0〜1)。
+        drop_after_bytes: この転送量 (バイト) に達したら接続を切断する。
+        refuse_connect: CONNECT (HTTPS) を 403 で拒否するかどうか。
+        error_status: 指定時は常にこの HTTP ステータスのエラーページを返す。
+        local_response: 平文 HTTP のリクエストに上流へ転送せず自分で {"ip": ...} を返すかどうか。
+    """
+    latency: float = 0.0
+    bandwidth: int | None = None
+    drop_probability: float = 0.0
+    drop_after_bytes: int | None = None
+    refuse_connect: bool = False
+    error_status: int | None = None
+    local_response: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FaultBehavior':
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown behavior key(s): {sorted(unknown)}")
+        return cls(**data)
+
+
+def load_scenario(source: str | Path | dict) -> dict[int, FaultBehavior]:
+    """
+    シナリオファイル (またはその内容の辞書) を読み込み、ポートごとの振る舞いを返します。
+
+    Raises:
+        ValueError: シナリオの内容が不正な場合。
+    """
+    scenario = source if isinstance(source, dict) else json.loads(Path(source).read_text(encoding="utf-8"))
+    base_port = int(scenario.get("base_port", 20000))
+    count = int(scenario.get("count", 0))
+    rng = random.Random(scenario.get("seed", 0))
+    mix = scenario.get("mix") or [{"weight": 1, "behavior": {}}]
+    behaviors = [FaultBehavior.from_dict(entry.get("behavior", {})) for entry in mix]
+    weights = [float(entry.get("weight", 1)) for entry in mix]
+    if any(w < 0 for w in weights) or sum(weights) <= 0:
+        raise ValueError("mix weights must be non-negative and not all zero")
+
+    ports: dict[int, FaultBehavior] = {
+        base_port + i: rng.choices(behaviors, weights)[0] for i in range(count)}
+    for port, behavior in scenario.get("ports", {}).items():
+        ports[int(port)] = FaultBehavior.from_dict(behavior)
+    if not ports:
+        raise ValueError("Scenario defines no ports")
+    return ports
+
+
+def _error_page(status: int) -> bytes:
+    reason = _REASONS.get(status, "Error")
+    body = (f"<html><head><title>{status} {reason}</title></head><body>"
+            f"<h1>{status} {reason}</h1><p>The proxy server could not handle the request.</p>"
+            f"</body></html>").encode("utf-8")
+    return (f"HTTP/1.1 {status} {reason}\r\nContent-Type: text/html\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode("ascii") + body
+
+
+class _Budget:
+    """drop_after_bytes 用に、1接続の両方向の転送量を合算する。"""
+
+    def __init__(self, limit: int | None):
+        self.remaining = limit
+
+    def consume(self, size: int) -> bool:
+        if self.remaining is None:
+            return True
+        self.remaining -= size
+        return self.remaining >= 0
+
+
+class FaultProxyServer:
+    """
+    ポートごとに FaultBehavior を持つ HTTP/HTTPS (CONNECT) プロキシ群を1つのイベントループで動かすサーバー。
+    start_in_thread() でバックグラウンドスレッドのイベントループ上に起動できます (テスト・ベンチマーク用)。
+    """
+
+    def __init__(self, behaviors: dict[int, FaultBehavior], host: str = "127.0.0.1", seed: int | None = None):
+        """
+        Args:
+            behaviors: ポート番号と振る舞いの対応 (ポート 0 は空きポートを自動で割り当て)。
+            host: 待ち受けるアドレス。
+            seed: drop_probability の判定に使う乱数の種。
+        """
+        self._behaviors = dict(behaviors)
+        self._host = host
+        self._rng = random.Random(seed)
+        self._servers: list[asyncio.AbstractServer] = []
+        self._ports: dict[int, FaultBehavior] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def ports(self) -> dict[int, FaultBehavior]:
+        """実際に待ち受けているポート番号と振る舞いの対応。"""
+        return dict(self._ports)
+
+    async def start(self) -> None:
+        for port, behavior in self._behaviors.items():
+            server = await asyncio.start_server(
+                lambda r, w, b=behavior: self._handle(r, w, b), self._host, port, limit=_HEADER_LIMIT)
+            self._servers.append(server)
+            self._ports[server.sockets[0].getsockname()[1]] = behavior
+
+    async def stop(self) -> None:
+        for server in self._servers:
+            server.close()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+
+    def start_in_thread(self) -> 'FaultProxyServer':
+        """バックグラウンドスレッドで新しいイベントループを動かし、全ポートの待ち受けを開始します。"""
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="fault-proxy", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop_thread(self) -> None:
+        """start_in_thread() で起動したサーバーを停止します。"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                      behavior: FaultBehavior) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        try:
+            if behavior.latency > 0:
+                await asyncio.sleep(behavior.latency)
+            if behavior.drop_probability and self._rng.random() < behavior.drop_probability:
+                writer.transport.abort()
+                return
+            if behavior.error_status:
+                await self._send(writer, _error_page(behavior.error_status))
+                return
+
+            request_line, _, header_block = head.decode("latin-1").partition("\r\n")
+            parts = request_line.split()
+            if len(parts) != 3:
+                await self._send(writer, _error_page(400))
+                return
+            method, target, _version = parts
+            if method.upper() == "CONNECT":
+                await self._handle_connect(reader, writer, target, behavior)
+            else:
+                await self._handle_http(reader, writer, method, target, header_block, behavior)
+        except (ConnectionError, asyncio.TimeoutError, OSError):
+            writer.transport.abort()
+        finally:
+            if not writer.is_closing():
+                writer.close()
+
+    async def _handle_connect(self, reader, writer, target: str, behavior: FaultBehavior) -> None:
+        if behavior.refuse_connect:
+            await self._send(writer, _error_page(403))
+            return
+        host, _, port = target.rpartition(":")
+        try:
+            upstream_reader, upstream_writer = await asyncio.wait_for(
+                asyncio.open_connection(host.strip("[]"), int(port)), _CONNECT_TIMEOUT_SECONDS)
+        except (OSError, ValueError, asyncio.TimeoutError):
+            await self._send(writer, _error_page(502))
+            return
+        writer.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+        await writer.drain()
+        await self._relay(reader, writer, upstream_reader, upstream_writer, behavior)
+
+    async def _handle_http(self, reader, writer, method: str, target: str, header_block: str,
+                           behavior: FaultBehavior) -> None:
+        if behavior.local_response:
+            peer = writer.get_extra_info("sockname")[0]
+            body = json.dumps({"ip": peer}).encode("utf-8")
+            await self._send(writer, (
+                f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n").encode("ascii") + body, behavior)
+            return
+        url = urlsplit(target)
+        if not url.hostname:
+            await self._send(writer, _error_page(400))
+            return
+        try:
+            upstream_reader, upstream_writer = await asyncio.wait_for(
+                asyncio.open_connection(url.hostname, url.port or 80), _CONNECT_TIMEOUT_SECONDS)
+        except (OSError, asyncio.TimeoutError):
+            await self._send(writer, _error_page(502))
+            return
+        path = url.path or "/"
+        if url.query:
+            path += "?" + url.query
+        headers = [line for line in header_block.split("\r\n")
+                   if line and not line.lower().startswith(("proxy-", "connection:"))]
+        upstream_writer.write((f"{method} {path} HTTP/1.1\r\n" + "\r\n".join(headers)
+                               + "\r\nConnection: close\r\n\r\n").encode("latin-1"))
+        await upstream_writer.drain()
+        await self._relay(reader, writer, upstream_reader, upstream_writer, behavior)
+
+    async def _send(self, writer: asyncio.StreamWriter, data: bytes,
+                    behavior: FaultBehavior | None = None) -> None:
+        if behavior is not None and behavior.bandwidth:
+            for i in range(0, len(data), _CHUNK_SIZE):
+                chunk = data[i:i + _CHUNK_SIZE]
+                writer.write(chunk)
+                await writer.drain()
+                await asyncio.sleep(len(chunk) / behavior.bandwidth)
+        else:
+            writer.write(data)
+            await writer.drain()
+
+    async def _relay(self, client_reader, client_writer, upstream_reader, upstream_writer,
+                     behavior: FaultBehavior) -> None:
+        budget = _Budget(behavior.drop_after_bytes)
+
+        async def pipe(src: asyncio.StreamReader, dst: asyncio.StreamWriter) -> None:
+            while True:
+                chunk = await src.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if not budget.consume(len(chunk)):
+                    raise ConnectionResetError("drop_after_bytes reached")
+                dst.write(chunk)
+                await dst.drain()
+                if behavior.bandwidth:
+                    await asyncio.sleep(len(chunk) / behavior.bandwidth)
+            if dst.can_write_eof():
+                dst.write_eof()
+
+        tasks = [asyncio.ensure_future(pipe(client_reader, upstream_writer)),
+                 asyncio.ensure_future(pipe(upstream_reader, client_writer))]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in pending:
+                task.cancel()
+            for task in done:
+                task.result()  # 切断 (drop_after_bytes など) は例外として呼び出し元に伝える
+        finally:
+            upstream_writer.close()
+
+
+def write_proxy_file(path: str | Path, host: str, ports: list[int], first_proxy: str | None) -> None:
+    """
+    main.py の -f に渡せるプロキシリストファイルを書き出します。
+
+    Args:
+        path: 出力先。
+        host: プロキシのホスト名。
+        ports: ポート番号のリスト。
+        first_proxy: 1行目に書く初期化用プロキシ (例: proxy-server:8080)。None の場合は書かない。
+    """
+    lines = ([first_proxy] if first_proxy else []) + [f"{host}:{port}" for port in sorted(ports)]
+    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="障害を注入できるローカル HTTP プロキシ群を起動します。")
+    parser.add_argument('scenario', help='シナリオファイル (JSON)')
+    parser.add_argument('--host', default='127.0.0.1', help='待ち受けるアドレス (デフォルト: 127.0.0.1)')
+    parser.add_argument('--write-proxies', metavar='FILEPATH',
+                        help='起動したプロキシのリストを main.py の -f 形式で書き出します')
+    parser.add_argument('--first-proxy', default='proxy-server:8080',
+                        help="--write-proxies の1行目に書く初期化用プロキシ (空文字で省略)")
+    args = parser.parse_args()
+
+    behaviors = load_scenario(args.scenario)
+    server = FaultProxyServer(behaviors, host=args.host)
+
+    async def serve() -> None:
+        await server.start()
+        summary: dict[FaultBehavior, int] = {}
+        for behavior in server.ports.values():
+            summary[behavior] = summary.get(behavior, 0) + 1
+        print(f"Listening on {len(server.ports)} port(s) at {args.host}:")
+        for behavior, count in summary.items():
+            print(f"  {count:5d} x {behavior}")
+        if args.write_proxies:
+            write_proxy_file(args.write_proxies, args.host, list(server.ports), args.first_proxy or None)
+            print(f"Proxy list written to '{args.write_proxies}'.")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+# benchmarks/run_benchmark.py
+"""
+プロキシローテーションのスループットを、プロセス内の偽 WebDriver サーバーに対して計測するベンチマーク。
+
+実際の ProxiedEdgeBrowser / RotationRunner / webdriver.Remote を通して処理するため、
+Selenium Grid や Edge を用意せずに、アプリケーション側のオーバーヘッドと
+バージョン間の性能差を確認できます。
+
+    python -m benchmarks.run_benchmark --proxies 500 --navigate-latency 0.05
+
+benchmarks/results/baseline.json はリポジトリに含めたベースラインで、次の設定で計測しています。
+スループットが偽サーバーの遅延で決まるため、マシンの性能差よりアプリケーション側の退行が表れます。
+比較する際は同じ設定で実行してください (設定が異なる場合は警告を表示します)。
+
+    python -m benchmarks.run_benchmark --proxies 200 --session-latency 0.02 --navigate-latency 0.02 \
+        --screenshot-latency 0.01 --compare benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import logging
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import selenium
+
+from benchmarks.fake_webdriver_server import FakeLatencies, FakeWebDriverServer
+from src.adapters.edge_option_factory import EdgeOptionFactory
+from src.application.cdp_context_browser import (
+    BACKEND_CDP_CONTEXT, BACKEND_SESSION, BROWSER_BACKENDS, CdpContextBrowser, SharedEdgeSessionPool)
+from src.application.concurrency_controller import AimdConcurrencyController
+from src.application.proxied_edge_browser import ProxiedEdgeBrowser
+from src.application.proxy_provider import ListProxyProvider
+from src.application.proxy_selector import ProxySelector
+from src.application.metrics import DEFAULT_LATENCY_BUCKETS
+from src.application.rotation_runner import MODE_IP, MODE_SCREENSHOT, RotationRunner
+from src.application.resource_blocking import BlockingRule, ResourceBlocker, parse_resource_types
+from src.application.run_metrics import RunMetrics
+from src.domain.proxy_info import ProxyInfo
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_MAX_REGRESSION = 0.10
+# 偽サーバーは応答が速いため、既定のバケットにミリ秒単位のバケットを追加する
+BENCHMARK_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025) + DEFAULT_LATENCY_BUCKETS
+
+
+def generate_proxies(count: int) -> list[ProxyInfo]:
+    """Proxy #0 (proxy-server) に続けて、ダミーのプロキシを count - 1 件生成します。"""
+    proxies = [ProxyInfo("proxy-server", 8080)]
+    for i in range(1, count):
+        proxies.append(ProxyInfo(f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}", 3128))
+    return proxies
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _max_rss_mb() -> float:
+    # Linux では KiB、macOS ではバイト単位
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_benchmark(
+    proxies: int,
+    mode: str,
+    latencies: FakeLatencies,
+    screenshot_size: tuple[int, int] = (1280, 720),
+    trace_memory: bool = False,
+    concurrency: int = 1,
+    urls: int = 1,
+    tabs: int = 1,
+    backend: str = BACKEND_SESSION,
+    block_resources: tuple[str, ...] = (),
+    profile_template: bool = False,
+    disk_cache: bool = False
+) -> dict:
+    """
+    偽 WebDriver サーバーを起動し、RotationRunner で proxies 件を処理して計測結果を返します。
+
+    Args:
+        proxies: 処理するプロキシ数 (Proxy #0 を含む)。
+        mode: 検証モード (screenshot または ip)。
+        latencies: 偽サーバーの各コマンドの遅延。
+        screenshot_size: 偽スクリーンショットのサイズ。
+        trace_memory: tracemalloc で Python ヒープのピークを計測するかどうか (遅くなります)。
+        concurrency: 同時実行数の上限 (2以上で AimdConcurrencyController を使用)。
+        urls: 1セッションで処理する URL の数 (セッション起動・終了の按分効果の計測用)。
+        tabs: 同時に読み込むタブの数の上限 (urls が2以上の場合に有効)。
+        backend: ブラウザの実行方式 (session または cdp-context)。
+        block_resources: 遮断するリソースの種類 (空の場合は遮断しない)。
+        profile_template: 初回起動の処理を済ませたプロファイルのテンプレートをコピーして使うかどうか。
+        disk_cache: セッション間で再利用するディスクキャッシュを使うかどうか。
+
+    Returns:
+        dict: 設定と計測結果。
+    """
+    proxy_list = generate_proxies(proxies)
+    selector = ProxySelector(ListProxyProvider(proxy_list))
+    metrics = RunMetrics(buckets=BENCHMARK_LATENCY_BUCKETS)
+    logger = logging.getLogger("benchmark")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    blocker = ResourceBlocker(BlockingRule(block_resources)) if block_resources else None
+
+    with FakeWebDriverServer(latencies, screenshot_size=screenshot_size) as server, \
+            tempfile.TemporaryDirectory(prefix="proxyrot-bench-") as screenshot_dir, \
+            tempfile.TemporaryDirectory(prefix="proxyrot-bench-profile-") as profile_dir:
+        template = Path(profile_dir) / "template"
+        if profile_template:
+            # 初回起動を済ませたプロファイルに見立てる ("First Run" は Chromium が初回起動後に作るファイル)
+            (template / "Default").mkdir(parents=True)
+            (template / "First Run").touch()
+            (template / "Default" / "Preferences").write_text("{}", encoding="utf-8")
+        factory = EdgeOptionFactory(
+            profile_template=template if profile_template else None,
+            profile_root=Path(profile_dir) / "profiles" if profile_template else None,
+            disk_cache_dir=Path(profile_dir) / "cache" if disk_cache else None)
+        session_pool = SharedEdgeSessionPool(
+            selector, factory, command_executor=server.url, resource_blocker=blocker,
+            logger=logger) if backend == BACKEND_CDP_CONTEXT else None
+
+        def browser_factory() -> ProxiedEdgeBrowser:
+            if session_pool is not None:
+                return CdpContextBrowser(
+                    session_pool=session_pool, proxy_selector=selector, command_executor=server.url,
+                    logger=logger, metrics=metrics, resource_blocker=blocker)
+            return ProxiedEdgeBrowser(
+                proxy_selector=selector, option_factory=factory, command_executor=server.url,
+                logger=logger, metrics=metrics, resource_blocker=blocker)
+
+        controller = AimdConcurrencyController(
+            max_limit=concurrency, metrics=metrics, logger=logger) if concurrency > 1 else None
+        url_list = [f"https://api.ipify.org?format=json&n={n}" for n in range(1, urls + 1)]
+        runner = RotationRunner(
+            browser_factory=browser_factory, url=url_list[0], urls=url_list, mode=mode,
+            screenshot_dir=screenshot_dir, metrics=metrics,
+            concurrency=controller, tabs_per_session=tabs, logger=logger)
+
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        summary = runner.run(proxy_list)
+        elapsed = time.perf_counter() - started
+        if session_pool is not None:
+            session_pool.close()
+        factory.close()
+        sessions_created = server.sessions_created
+        peak_traced = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    results = {
+        "proxies": summary.total,
+        "succeeded": summary.succeeded,
+        "failed": summary.failed,
+        "elapsed_seconds": elapsed,
+        "proxies_per_second": summary.total / elapsed if elapsed > 0 else None,
+        # Proxy #0 は初期化のみのため、キャプチャ数は (プロキシ数 - 1) × URL 数
+        "captures_per_second": (summary.succeeded + summary.failed - 1) / elapsed if elapsed > 0 else None,
+        "phases": metrics.phases.summary(),
+        "max_rss_mb": _max_rss_mb(),
+        "sessions_created": sessions_created,
+        "blocked_requests": summary.blocked_requests,
+    }
+    if controller is not None:
+        results["final_concurrency_limit"] = controller.limit
+    if peak_traced is not None:
+        results["peak_traced_memory_mb"] = peak_traced
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "selenium": selenium.__version__,
+        "config": {
+            "proxies": proxies, "mode": mode, "screenshot_size": list(screenshot_size),
+            "concurrency": concurrency, "urls": urls, "tabs": tabs, "backend": backend,
+            "block_resources": list(block_resources),
+            "profile_template": profile_template, "disk_cache": disk_cache,
+            "latencies": latencies.__dict__,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> bool:
+    """
+    ベースラインと比較した結果を表示し、スループットの低下が許容範囲内なら True を返します。
+    """
+    if current.get("config") != baseline.get("config"):
+        print("WARNING: benchmark settings differ from the baseline; the comparison may not be meaningful")
+    base = baseline["results"]["proxies_per_second"]
+    now = current["results"]["proxies_per_second"]
+    change = (now - base) / base
+    print(f"Throughput: {now:.2f} proxies/s vs baseline {base:.2f} "
+          f"({change:+.1%}, baseline commit {baseline.get('git_commit')})")
+    for phase, stats in current["results"]["phases"].items():
+        base_stats = baseline["results"]["phases"].get(phase)
+        if base_stats:
+            print(f"  {phase}: p95 {stats['p95'] * 1000:.1f}ms vs {base_stats['p95'] * 1000:.1f}ms")
+    if change < -max_regression:
+        print(f"REGRESSION: throughput dropped by more than {max_regression:.0%}")
+        return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="偽 WebDriver サーバーに対するプロキシローテーションのベンチマーク")
+    parser.add_argument('--proxies', type=int, default=200, help='処理するプロキシ数 (デフォルト: 200)')
+    parser.add_argument('-m', '--mode', default=MODE_SCREENSHOT, choices=(MODE_SCREENSHOT, MODE_IP))
+    parser.add_argument('-c', '--concurrency', type=int, default=1, metavar='N',
+                        help='同時実行数の上限 (2以上で AIMD による自動調整)')
+    parser.add_argument('--urls', type=int, default=1, metavar='N',
+                        help='1セッションで処理する URL の数 (デフォルト: 1)')
+    parser.add_argument('--tabs', type=int, default=1, metavar='N',
+                        help='同時に読み込むタブの数の上限 (デフォルト: 1)')
+    parser.add_argument('--backend', default=BACKEND_SESSION, choices=BROWSER_BACKENDS,
+                        help='ブラウザの実行方式 (デフォルト: session)')
+    parser.add_argument('--block-resources', default='', metavar='TYPES',
+                        help='遮断するリソースの種類 (カンマ区切り、例: image,media,font,tracker)')
+    parser.add_argument('--profile-template', action='store_true',
+                        help='初回起動を済ませたプロファイルのテンプレートをセッションごとにコピーして使う')
+    parser.add_argument('--disk-cache', action='store_true', help='セッション間で再利用するディスクキャッシュを使う')
+    parser.add_argument('--session-latency', type=float, default=0.0, metavar='SECONDS')
+    parser.add_argument('--navigate-latency', type=float, default=0.0, metavar='SECONDS')
+    parser.add_argument('--screenshot-latency', type=float, default=0.0, metavar='SECONDS')
+    parser.add_argument('--quit-latency', type=float, default=0.0, metavar='SECONDS')
+    parser.add_argument('--resource-latency', type=float, default=0.0, metavar='SECONDS',
+                        help='遮断されなかったサブリソース1件ごとのページ移動の遅延')
+    parser.add_argument('--first-run-latency', type=float, default=0.0, metavar='SECONDS',
+                        help='初回起動の処理の模擬として、"First Run" の無いプロファイルでのセッション作成に加える遅延')
+    parser.add_argument('--context-latency', type=float, default=0.0, metavar='SECONDS',
+                        help='CDP でのブラウザコンテキスト作成の遅延')
+    parser.add_argument('--jitter', type=float, default=0.0, metavar='SECONDS',
+                        help='各遅延に加える一様乱数の最大値')
+    parser.add_argument('--screenshot-size', default='1280x720', metavar='WxH')
+    parser.add_argument('--trace-memory', action='store_true', help='tracemalloc で Python ヒープのピークを計測する')
+    parser.add_argument('-o', '--output', metavar='FILEPATH',
+                        help=f'結果の保存先 (デフォルト: {RESULTS_DIR.name}/<日時>_<コミット>.json)')
+    parser.add_argument('--compare', metavar='FILEPATH', help='比較するベースラインの結果ファイル')
+    parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION, metavar='RATIO',
+                        help=f'許容するスループット低下率 (デフォルト: {DEFAULT_MAX_REGRESSION})')
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.screenshot_size.lower().split('x', 1))
+    latencies = FakeLatencies(
+        session_create=args.session_latency, navigate=args.navigate_latency,
+        screenshot=args.screenshot_latency, quit=args.quit_latency,
+        context_create=args.context_latency, resource=args.resource_latency,
+        first_run=args.first_run_latency, jitter=args.jitter)
+    result = run_benchmark(
+        args.proxies, args.mode, latencies, (width, height), args.trace_memory, args.concurrency, args.urls, args.tabs,
+        args.backend, parse_resource_types(args.block_resources), args.profile_template, args.disk_cache)
+
+    r = result["results"]
+    print(f"Processed {r['proxies']} proxies in {r['elapsed_seconds']:.2f}s "
+          f"({r['proxies_per_second']:.2f} proxies/s, {r['captures_per_second']:.2f} captures/s, "
+          f"{r['failed']} failed, {r['sessions_created']} sessions, "
+          f"{r['blocked_requests']} requests blocked), max RSS {r['max_rss_mb']:.1f} MiB")
+    for phase, stats in r["phases"].items():
+        print(f"  {phase}: p50={stats['p50'] * 1000:.1f}ms p95={stats['p95'] * 1000:.1f}ms "
+              f"p99={stats['p99'] * 1000:.1f}ms")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{result['git_commit'] or 'nogit'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"Results written to '{output}'.")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if not compare(result, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,47 @@
 # main.py (最初のプロキシ(proxy-server)のスクショをスキップする最終版)
 
 import os
+import re
 import sys
+import json
 import argparse
 import logging
+import warnings
 from pathlib import Path
-from time import sleep
-import re
 from typing import List  # load_proxies_from_file の型ヒントで使用
 
 # --- 必要なクラス/関数を src からインポート ---
 try:
     from src.domain.proxy_info import ProxyInfo
+    from src.application.proxy_bypass import ProxyBypassRules
     from src.application.proxy_provider import ListProxyProvider, ProxyProvider
     from src.application.proxy_selector import ProxySelector
-    from src.adapters.edge_option_factory import EdgeOptionFactory
+    from src.adapters.edge_option_factory import EdgeOptionFactory, PAGE_LOAD_STRATEGIES
+    from src.application.readiness import parse_readiness, DEFAULT_READINESS_TIMEOUT_SECONDS
+    from src.application.error_page import ErrorPageDetector, BlockPageSignature, DEFAULT_BLOCK_PAGE_SIGNATURES
+    from src.adapters.proxy_host_resolver import ProxyHostResolver, DEFAULT_DNS_TTL_SECONDS
+    from src.adapters.http_ip_checker import HttpIpChecker, DEFAULT_HTTP_TIMEOUT_SECONDS
+    from urllib3.exceptions import InsecureRequestWarning
+    from src.adapters.result_sink import create_result_sink, read_results
+    from src.adapters.run_journal import RunJournal
+    from src.application.sharding import parse_shard, select_shard
+    from src.application.tiered_verifier import TieredVerifier
+    from src.application.cdp_context_browser import (
+        BACKEND_CDP_CONTEXT, BROWSER_BACKENDS, CdpContextBrowser, SharedEdgeSessionPool)
     from src.application.proxied_edge_browser import ProxiedEdgeBrowser
+    from src.application.resource_blocking import (
+        RESOURCE_TYPES, BlockingRule, ResourceBlocker, parse_resource_types)
+    from src.application.rotation_runner import RotationRunner, VERIFICATION_MODES
+    from src.application.run_metrics import RunMetrics
+    from src.application.rate_limiter import RateLimiter
+    from src.application.hedged_capture import (
+        HedgedCapturer, DEFAULT_HEDGE_BUDGET, DEFAULT_HEDGE_COMMAND_TIMEOUT_SECONDS)
+    from src.application.retry_policy import RetryPolicy, DEFAULT_RETRY_BUDGET
+    from src.application.concurrency_controller import (
+        AimdConcurrencyController, DEFAULT_INITIAL_CONCURRENCY, DEFAULT_SESSION_LATENCY_TARGET_SECONDS)
+    from src.adapters.metrics_server import MetricsServer
+    from src.adapters.span_exporter import JsonlSpanExporter
+    from src.application.tracing import Tracer, DEFAULT_TRACE_SAMPLE_RATIO, DEFAULT_SLOW_TRACE_SECONDS
     from src.config.logging_config import setup_logging, get_logger
     # webdriver と EdgeOptions は ProxiedEdgeBrowser 内で使われる
     from selenium import webdriver
@@ -36,6 +62,8 @@ DEFAULT_PROXIES_DATA = [
     {"host": REQUIRED_FIRST_PROXY_HOST, "port": 8080}  # デフォルトも合わせる
 ]
 SCREENSHOT_DIR_CONTAINER = "/app/screenshots"
+# アクセス先ホストへの1秒あたりの試行数の上限 (従来のプロキシ間1秒待機に相当)
+DEFAULT_HOST_RATE = 1.0
 
 
 def load_proxies_from_file(filepath: str | Path) -> list[ProxyInfo]:
@@ -78,6 +106,17 @@ def load_proxies_from_file(filepath: str | Path) -> list[ProxyInfo]:
     return proxies
 
 
+def load_urls_from_file(filepath: str | Path) -> list[str]:
+    """URL のリストファイルを読み込みます (空行と # で始まる行は無視し、重複は最初の1件のみ残します)。"""
+    urls: list[str] = []
+    with open(filepath, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and line not in urls:
+                urls.append(line)
+    return urls
+
+
 def main():
     """メインの処理を実行する関数"""
     # --- コマンドライン引数の設定 (変更なし) ---
@@ -91,7 +130,150 @@ def main():
                         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], help='ログレベルを指定します。')
     parser.add_argument('-u', '--url', default=DEFAULT_IP_CHECK_URL,
                         help=f'IPアドレス確認に使用するURL (デフォルト: {DEFAULT_IP_CHECK_URL})。')
+    parser.add_argument('--url-file', default=os.getenv('URL_FILE'), metavar='FILEPATH',
+                        help='確認する URL のリストファイル (1行1URL、# で始まる行は無視)。指定時は -u の代わりに、'
+                             '1プロキシ1セッションで全 URL を順に処理し、URL ごとに結果とスクショを記録します。')
+    parser.add_argument('--tabs', type=int, default=int(os.getenv('TABS_PER_SESSION', '1')), metavar='N',
+                        help='--url-file の URL を最大 N 個のタブで並行して読み込み、読み込み済みのタブから順にキャプチャします (デフォルト: 1 = 順に移動)。')
+    parser.add_argument('--backend', default=os.getenv('BROWSER_BACKEND', 'session'), choices=BROWSER_BACKENDS,
+                        help='ブラウザの実行方式。session はプロキシごとに Edge セッションを起動し、cdp-context は1つの Edge '
+                             'セッション内にプロキシごとのブラウザコンテキストを CDP で作成します (CDP が使えない場合は session で処理)。')
+    parser.add_argument('-m', '--mode', default='screenshot', choices=VERIFICATION_MODES,
+                        help='検証モード。ip はスクショを撮らずにページ本文から送信元IPを読み取ります (JSONを返す https://api.ipify.org?format=json などを推奨)。'
+                             'tiered は HTTP クライアントで先に確認し、通過したプロキシのみブラウザで確認します。')
+    parser.add_argument('--render', action='store_true',
+                        help='tiered モードで、HTTP 段階を通過したプロキシについてブラウザでスクショを取得します (レンダリングが必要な対象向け)。')
+    parser.add_argument('--http-timeout', type=float, default=DEFAULT_HTTP_TIMEOUT_SECONDS,
+                        help=f'tiered モードの HTTP 段階のタイムアウト秒数 (デフォルト: {DEFAULT_HTTP_TIMEOUT_SECONDS})。', metavar='SECONDS')
+    parser.add_argument('-r', '--results', default=os.getenv('RESULTS_FILE'),
+                        help='試行ごとの構造化レコードの出力先 (.jsonl または .sqlite)。指定しない場合は出力しません。', metavar='FILEPATH')
+    parser.add_argument('--journal', default=os.getenv('RUN_JOURNAL'),
+                        help='完了した試行を記録する実行ジャーナルのパス。--resume と組み合わせて中断した実行を再開できます。', metavar='FILEPATH')
+    parser.add_argument('--resume', action='store_true',
+                        help='--journal に記録済みの (プロキシ, URL) の試行をスキップして再開します (Proxy #0 と、Grid の障害やタイムアウトで失敗した試行は処理し直します)。')
+    parser.add_argument('--shard', default=os.getenv('SHARD'), metavar='I/N',
+                        help='プロキシを host:port のハッシュで N 個に分け、そのうち i 番目 (1 始まり) だけを処理します。Proxy #0 はすべてのシャードで処理します。')
+    parser.add_argument('--summary-file', default=os.getenv('SUMMARY_FILE'), metavar='FILEPATH',
+                        help='実行結果のサマリーを JSON で保存するパス (merge_results.py でシャードごとの結果をまとめる際に使用)。')
+    parser.add_argument('--resolve-dns', action='store_true',
+                        help='起動前に全プロキシのホスト名を並列に名前解決し、解決済みIPをEdgeに渡します。解決できないプロキシはスキップします。')
+    parser.add_argument('--dns-ttl', type=float, default=float(os.getenv('DNS_TTL', DEFAULT_DNS_TTL_SECONDS)),
+                        help=f'名前解決結果のキャッシュ秒数 (デフォルト: {DEFAULT_DNS_TTL_SECONDS})。', metavar='SECONDS')
+    parser.add_argument('--metrics-port', type=int, default=int(os.getenv('METRICS_PORT', '0')) or None,
+                        help='指定したポートで Prometheus 形式のメトリクス (/metrics) を公開します。指定しない場合は公開しません。', metavar='PORT')
+    parser.add_argument('--trace-file', default=os.getenv('TRACE_FILE'),
+                        help='WebDriver コマンドごとのスパンを OTLP/JSON 形式 (1行1トレース) で追記するファイル。指定しない場合はトレースしません。', metavar='FILEPATH')
+    parser.add_argument('--trace-sample', type=float, default=float(os.getenv('TRACE_SAMPLE', DEFAULT_TRACE_SAMPLE_RATIO)),
+                        help=f'通常のトレースを残す割合 (デフォルト: {DEFAULT_TRACE_SAMPLE_RATIO})。失敗したトレースと遅いトレースは常に残します。', metavar='RATIO')
+    parser.add_argument('--trace-slow', type=float, default=float(os.getenv('TRACE_SLOW_SECONDS', DEFAULT_SLOW_TRACE_SECONDS)),
+                        help=f'この秒数以上かかったプロキシのトレースは常に残します (デフォルト: {DEFAULT_SLOW_TRACE_SECONDS})。', metavar='SECONDS')
+    parser.add_argument('-c', '--concurrency', type=int, default=int(os.getenv('CONCURRENCY', '1')),
+                        help='同時に実行するブラウザセッション数の上限 (デフォルト: 1 = 順に処理)。2以上の場合、セッション作成の所要時間と失敗率に応じて自動で増減します。', metavar='N')
+    parser.add_argument('--initial-concurrency', type=int, default=DEFAULT_INITIAL_CONCURRENCY,
+                        help=f'並列処理開始時の同時実行数 (デフォルト: {DEFAULT_INITIAL_CONCURRENCY})。', metavar='N')
+    parser.add_argument('--session-latency-target', type=float,
+                        default=float(os.getenv('SESSION_LATENCY_TARGET', DEFAULT_SESSION_LATENCY_TARGET_SECONDS)),
+                        help=f'セッション作成の所要時間の目標秒数。超えると同時実行数を減らします (デフォルト: {DEFAULT_SESSION_LATENCY_TARGET_SECONDS})。', metavar='SECONDS')
+    parser.add_argument('--host-rate', type=float, default=float(os.getenv('HOST_RATE', DEFAULT_HOST_RATE)),
+                        help=f'アクセス先ホストごとの1秒あたりの試行数の上限 (デフォルト: {DEFAULT_HOST_RATE}、0 で無制限)。', metavar='PER_SECOND')
+    parser.add_argument('--host-burst', type=float, default=float(os.getenv('HOST_BURST', '1')),
+                        help='アクセス先ホストごとに連続して開始できる試行数 (デフォルト: 1)。', metavar='N')
+    parser.add_argument('--proxy-rate', type=float, default=float(os.getenv('PROXY_RATE', '0')),
+                        help='プロキシごとの1秒あたりの試行数の上限 (デフォルト: 0 = 無制限)。', metavar='PER_SECOND')
+    parser.add_argument('--retry-budget', type=int, default=int(os.getenv('RETRY_BUDGET', DEFAULT_RETRY_BUDGET)),
+                        help=f'実行全体での再試行回数の上限 (デフォルト: {DEFAULT_RETRY_BUDGET}、0 で再試行しない)。Grid 側のエラーとページ読み込みのタイムアウトのみ再試行します。', metavar='N')
+    parser.add_argument('--hedge', action='store_true',
+                        help='URL のスクリーンショットを1枚だけ取得します。試行が直近の所要時間の p90 を過ぎても終わらない場合は次のプロキシで並行して試行し、先に成功した方を採用します (screenshot モードのみ)。')
+    parser.add_argument('--hedge-budget', type=float, default=float(os.getenv('HEDGE_BUDGET', DEFAULT_HEDGE_BUDGET)),
+                        help=f'通常の試行の数に対する追加の試行 (ヘッジ) の数の上限の割合 (デフォルト: {DEFAULT_HEDGE_BUDGET})。', metavar='RATIO')
+    parser.add_argument('--command-timeout', type=float, default=float(os.getenv('COMMAND_TIMEOUT', '0')) or None,
+                        help='WebDriver コマンド (セッションの作成を含む) の応答を待つ最大秒数 (デフォルト: 無制限、'
+                             f'--hedge では {DEFAULT_HEDGE_COMMAND_TIMEOUT_SECONDS:.0f} 秒)。', metavar='SECONDS')
+    parser.add_argument('--page-load-strategy', default=os.getenv('PAGE_LOAD_STRATEGY'), choices=PAGE_LOAD_STRATEGIES,
+                        help='ページ読み込み戦略。eager は DOMContentLoaded まで、none は待たずに次へ進みます (デフォルト: normal = onload まで待つ)。')
+    parser.add_argument('--page-load-timeout', type=float, default=float(os.getenv('PAGE_LOAD_TIMEOUT', '0')) or None,
+                        help='ページ読み込みを待つ最大秒数 (デフォルト: ブラウザの既定値)。', metavar='SECONDS')
+    parser.add_argument('--script-timeout', type=float, default=float(os.getenv('SCRIPT_TIMEOUT', '0')) or None,
+                        help='スクリプト実行の最大秒数 (デフォルト: ブラウザの既定値)。', metavar='SECONDS')
+    parser.add_argument('--profile-template', default=os.getenv('EDGE_PROFILE_TEMPLATE'), metavar='DIR',
+                        help='初回起動の処理を済ませた Edge のユーザーデータディレクトリ。セッションごとにコピーして使い、'
+                             '起動時間を短くします (ブラウザのノードからも同じパスで見える共有ボリューム上に置きます)。')
+    parser.add_argument('--profile-root', default=os.getenv('EDGE_PROFILE_ROOT'), metavar='DIR',
+                        help='--profile-template のコピーを置くディレクトリ (デフォルト: テンプレートと同じ階層)。')
+    parser.add_argument('--disk-cache-dir', default=os.getenv('EDGE_DISK_CACHE_DIR'), metavar='DIR',
+                        help='セッション間で再利用するディスクキャッシュのディレクトリ (共有ボリューム上)。'
+                             '同時に実行するセッションごとのスロットに分け、終了したセッションのキャッシュを次のセッションで使います。')
+    parser.add_argument('--ready', default=os.getenv('READY_CONDITION'), metavar='CONDITION',
+                        help='ページ移動後、この条件を満たした時点でキャプチャします: ip (本文に IP)、interactive、complete、'
+                             'css:<セレクタ>、text:<正規表現>。--page-load-strategy eager/none と組み合わせて使います。')
+    parser.add_argument('--ready-timeout', type=float, default=DEFAULT_READINESS_TIMEOUT_SECONDS,
+                        help=f'--ready の条件を待つ最大秒数 (デフォルト: {DEFAULT_READINESS_TIMEOUT_SECONDS})。', metavar='SECONDS')
+    parser.add_argument('--no-abort-on-error-page', dest='abort_on_error_page', action='store_false',
+                        help='ネットワークエラーページ (ERR_PROXY_CONNECTION_FAILED など) やブロックページを検出しても打ち切らず、そのままキャプチャします。')
+    parser.add_argument('--block-page', action='append', default=[], metavar='REGEX',
+                        help='ブロックページとみなすタイトル/本文の正規表現を追加します (複数指定可)。')
+    parser.add_argument('--block-resources', default=os.getenv('BLOCK_RESOURCES', ''), metavar='TYPES',
+                        help=f'キャプチャ中に読み込まないリソースの種類 (カンマ区切り: {", ".join(RESOURCE_TYPES)})。'
+                             'DevTools の Network.setBlockedURLs で遮断し、遮断数を結果レコードに記録します。')
+    parser.add_argument('--block-url', action='append', default=[], metavar='PATTERN',
+                        help='読み込まない URL のパターン (* はワイルドカード、複数指定可)。')
+    parser.add_argument('--block-rules', default=os.getenv('BLOCK_RULES'), metavar='FILEPATH',
+                        help='アクセス先のホストごとの遮断規則 (JSON)。当てはまらないホストには --block-resources / --block-url を使います。')
+    parser.add_argument('--proxy-bypass', action='append',
+                        default=[e for e in os.getenv('PROXY_BYPASS', '').split(';') if e.strip()], metavar='HOST',
+                        help='プロキシを経由せずに直接接続するホストのパターン (cdn.example.net、*.cloudfront.net など、複数指定可)。'
+                             'アクセス先のページ自体は常にプロキシ経由で、アクセス先のホストに当てはまるパターンはエラーになります。')
+    parser.add_argument('--bypass-rules', default=os.getenv('PROXY_BYPASS_RULES'), metavar='FILEPATH',
+                        help='アクセス先のホストごとの直接接続ルール (JSON)。当てはまらないホストには --proxy-bypass を使います。')
     args = parser.parse_args()
+    try:
+        readiness = parse_readiness(args.ready) if args.ready else None
+        shard = parse_shard(args.shard) if args.shard else None
+        error_page_detector = ErrorPageDetector(DEFAULT_BLOCK_PAGE_SIGNATURES + tuple(
+            BlockPageSignature(f"custom_{i}", pattern) for i, pattern in enumerate(args.block_page, start=1))
+        ) if args.abort_on_error_page else None
+        default_blocking = BlockingRule(parse_resource_types(args.block_resources), tuple(args.block_url))
+        resource_blocker: ResourceBlocker | None = None
+        if args.block_rules:
+            resource_blocker = ResourceBlocker.from_file(args.block_rules, default=default_blocking)
+        elif default_blocking.blocked_urls:
+            resource_blocker = ResourceBlocker(default_blocking)
+    except OSError as e:
+        parser.error(f"遮断規則ファイル '{args.block_rules}' を読み込めません: {e}")
+    except (ValueError, KeyError, re.error) as e:
+        parser.error(str(e))
+    if args.hedge and args.mode != 'screenshot':
+        parser.error('--hedge は screenshot モードでのみ使用できます。')
+    # --hedge では打ち切った試行のスレッドが必ず戻るよう、コマンドの最大秒数を設定する
+    command_timeout = args.command_timeout or (DEFAULT_HEDGE_COMMAND_TIMEOUT_SECONDS if args.hedge else None)
+    urls: list[str] | None = None
+    if args.url_file:
+        if args.hedge or args.mode == 'tiered':
+            parser.error('--url-file は --hedge や tiered モードと同時に使用できません。')
+        try:
+            urls = load_urls_from_file(args.url_file)
+        except OSError as e:
+            parser.error(f"URL ファイル '{args.url_file}' を読み込めません: {e}")
+        if not urls:
+            parser.error(f"URL ファイル '{args.url_file}' に URL がありません。")
+        args.url = urls[0]
+    if args.tabs < 1:
+        parser.error('--tabs は1以上を指定してください。')
+    # --proxy-bypass-list はセッション単位のため、この実行のアクセス先すべてに使える直接接続の一覧を作る
+    try:
+        bypass_rules = ProxyBypassRules.from_file(args.bypass_rules, default=args.proxy_bypass) \
+            if args.bypass_rules else ProxyBypassRules(args.proxy_bypass)
+        proxy_bypass_list = bypass_rules.bypass_list(urls or [args.url])
+    except OSError as e:
+        parser.error(f"直接接続ルールファイル '{args.bypass_rules}' を読み込めません: {e}")
+    except ValueError as e:
+        parser.error(str(e))
+    if args.resume and not args.journal:
+        parser.error('--resume には --journal (RUN_JOURNAL) の指定が必要です。')
+    if args.profile_template and not Path(args.profile_template).is_dir():
+        parser.error(f"プロファイルのテンプレート '{args.profile_template}' がディレクトリではありません。")
+    if args.profile_root and not args.profile_template:
+        parser.error('--profile-root には --profile-template の指定が必要です。')
 
     # --- ロギング設定 ---
     setup_logging(log_level_override=args.level)
@@ -133,78 +315,199 @@ def main():
 
     # ★★★ 検証ここまで ★★★
 
+    if shard is not None and proxy_list:
+        # 他のプロセス/ホストと重複せずに分担できるよう、ハッシュで割り当てられた分だけを処理する
+        total_proxies = len(proxy_list)
+        proxy_list = select_shard(proxy_list, shard)
+        logger.info(
+            f"Shard {shard}: processing {len(proxy_list) - 1} of {total_proxies - 1} proxies (plus Proxy #0).")
+
     logger.info(
         f"{len(proxy_list)} 件のプロキシを処理します。Proxy #0 ({REQUIRED_FIRST_PROXY_HOST}) は初期化のみに使用します。")
 
     # --- 依存コンポーネントの準備 (変更なし) ---
     provider = ListProxyProvider(proxy_list)
     selector = ProxySelector(provider)
-    factory = EdgeOptionFactory()  # --ignore-certificate-errors 込みと想定
+    resolver: ProxyHostResolver | None = None
+    if args.resolve_dns:
+        # ブラウザ起動前にホスト名をまとめて解決し、解決できないエントリを洗い出す
+        resolver = ProxyHostResolver(ttl_seconds=args.dns_ttl)
+        resolved = resolver.resolve_all(proxy_list)
+        logger.info(f"DNS pre-resolution finished: {len(resolved)} host(s) resolved, {len(resolver.failures)} failed.")
+        for host, error in resolver.failures.items():
+            logger.warning(f"DNS resolution failed for proxy host '{host}': {error}")
+    factory = EdgeOptionFactory(  # --ignore-certificate-errors 込みと想定
+        resolver=resolver,
+        page_load_strategy=args.page_load_strategy,
+        page_load_timeout=args.page_load_timeout,
+        script_timeout=args.script_timeout,
+        proxy_bypass_list=proxy_bypass_list,
+        profile_template=args.profile_template,
+        profile_root=args.profile_root,
+        disk_cache_dir=args.disk_cache_dir
+    )
+    if proxy_bypass_list:
+        logger.info("Hosts loaded directly without the proxy: %s", ", ".join(proxy_bypass_list))
+    # 各フェーズ (セッション作成・移動・スクショ・終了) の所要時間と試行数などを集計する
+    run_metrics = RunMetrics()
+    metrics_server: MetricsServer | None = None
+    if args.metrics_port:
+        metrics_server = MetricsServer(run_metrics, port=args.metrics_port)
+        metrics_server.start()
+        logger.info(f"Serving Prometheus metrics on port {metrics_server.port} at /metrics")
+    # プロキシごとのスパンの下に WebDriver コマンドごとのスパンを記録する
+    span_exporter: JsonlSpanExporter | None = None
+    tracer: Tracer | None = None
+    if args.trace_file:
+        span_exporter = JsonlSpanExporter(args.trace_file)
+        tracer = Tracer(span_exporter, sample_ratio=args.trace_sample, slow_threshold_seconds=args.trace_slow)
 
-    # --- 全プロキシでループし、最初のプロキシのスクショはスキップ ---
-    success_count = 0  # 処理試行の成功数 (ブラウザ起動成功)
-    failure_count = 0  # 処理試行の失敗数
-    screenshots_taken = 0  # 実際に保存されたスクショ数
+    # cdp-context では、プロキシごとのブラウザコンテキストを共有セッションの中に作成する
+    session_pool: SharedEdgeSessionPool | None = None
+    if args.backend == BACKEND_CDP_CONTEXT:
+        session_pool = SharedEdgeSessionPool(
+            proxy_selector=selector, option_factory=factory, command_executor=SELENIUM_URL,
+            tracer=tracer, resource_blocker=resource_blocker, command_timeout=command_timeout, logger=logger)
 
-    for i, current_proxy in enumerate(proxy_list):
-        logger.info(
-            f"--- Processing Proxy #{i}: {current_proxy.host}:{current_proxy.port} ---")
+    def browser_factory() -> ProxiedEdgeBrowser:
+        browser_kwargs = dict(
+            proxy_selector=selector,
+            command_executor=SELENIUM_URL,
+            logger=logger,
+            metrics=run_metrics,
+            tracer=tracer,
+            readiness=readiness,
+            readiness_timeout=args.ready_timeout,
+            error_page_detector=error_page_detector,
+            resource_blocker=resource_blocker,
+            command_timeout=command_timeout
+        )
+        if session_pool is not None:
+            return CdpContextBrowser(session_pool=session_pool, **browser_kwargs)
+        return ProxiedEdgeBrowser(option_factory=factory, **browser_kwargs)
 
-        try:
-            # ProxiedEdgeBrowser を 'with' 文で使用
-            with ProxiedEdgeBrowser(
-                proxy_selector=selector,
-                option_factory=factory,
-                command_executor=SELENIUM_URL,
-                logger=logger
-            ) as browser_manager:
-
-                # 1. ブラウザ起動 (常に実行)
-                browser_manager.start_browser(proxy_index=i)
-                # ブラウザ起動が成功した時点で success_count を増やす
-                success_count += 1
-
-                # ★★★ 条件分岐: 最初のプロキシ(index 0)はスクショをスキップ ★★★
-                if i == 0:
-                    logger.info(
-                        f"Skipping screenshot for the first proxy ({current_proxy.host}). Used for initialization.")
-                    # 特に何もしない
-                else:
-                    # 2. スクリーンショット取得 (最初のプロキシ以外)
-                    safe_host = re.sub(r'[^\w\-.]', '_', current_proxy.host)
-                    screenshot_filename = f"ip_check_proxy_{i}_{safe_host}_{current_proxy.port}.png"
-                    screenshot_path_container = os.path.join(
-                        SCREENSHOT_DIR_CONTAINER, screenshot_filename)
-
-                    browser_manager.take_screenshot(
-                        url=args.url,
-                        save_path_in_container=screenshot_path_container
-                    )
-                    screenshots_taken += 1  # スクショが成功した場合のみカウント
-                # ★★★ 分岐ここまで ★★★
-
-        except Exception as e:
-            # ブラウザ起動失敗なども含め、このプロキシでの処理が失敗した場合
-            logger.error(
-                f"Failed to process proxy #{i} ({current_proxy.host}:{current_proxy.port}): {e}", exc_info=False)
-            failure_count += 1
-            # with ブロックは抜けるので close_browser は呼ばれる
-            continue  # 次のプロキシへ
+    verifier: TieredVerifier | None = None
+    if args.mode == 'tiered':
+        # HTTP 段階は証明書を検証しない (Edge の --ignore-certificate-errors に合わせる) ため、毎回の警告を抑制する
+        warnings.filterwarnings('ignore', category=InsecureRequestWarning)
+        verifier = TieredVerifier(
+            http_checker=HttpIpChecker(timeout=args.http_timeout),
+            proxy_selector=selector,
+            browser_factory=browser_factory,
+            logger=logger
+        )
 
-        # 任意: プロキシ間の待機時間
-        if i < len(proxy_list) - 1:
-            logger.debug("Waiting a bit before next proxy...")
-            sleep(1)
+    # Grid の混雑具合に応じて同時実行数を AIMD で調整する
+    concurrency: AimdConcurrencyController | None = None
+    if args.concurrency > 1:
+        concurrency = AimdConcurrencyController(
+            max_limit=args.concurrency,
+            initial_limit=args.initial_concurrency,
+            latency_target_seconds=args.session_latency_target,
+            metrics=run_metrics,
+            logger=logger
+        )
+
+    # 固定の待機の代わりに、トークンが揃っている試行から開始する
+    rate_limiter = RateLimiter(host_rate=args.host_rate, proxy_rate=args.proxy_rate, host_burst=args.host_burst)
+
+    # --- 全プロキシを処理 (最初のプロキシのスクショは RotationRunner がスキップ) ---
+    # --hedge では、追記前の結果ファイルに残る過去の試行の所要時間をヘッジまでの待機秒数の計算に使う
+    previous_results = read_results(args.results) if args.hedge and args.results and Path(args.results).exists() else []
+    result_sink = create_result_sink(args.results) if args.results else None
+    journal = RunJournal(args.journal, resume=args.resume) if args.journal else None
+    if journal is not None and journal.completed:
+        logger.info("Loaded %s completed attempt(s) from journal '%s'.", journal.completed, args.journal)
+    retry_policy = RetryPolicy(budget=args.retry_budget, metrics=run_metrics)
+    runner = RotationRunner(
+        browser_factory=browser_factory,
+        url=args.url,
+        mode=args.mode,
+        screenshot_dir=SCREENSHOT_DIR_CONTAINER,
+        result_sink=result_sink,
+        resolver=resolver,
+        verifier=verifier,
+        render=args.render,
+        metrics=run_metrics,
+        tracer=tracer,
+        rate_limiter=rate_limiter if rate_limiter.enabled else None,
+        retry_policy=retry_policy,
+        concurrency=concurrency,
+        journal=journal,
+        urls=urls,
+        tabs_per_session=args.tabs,
+        logger=logger
+    )
+    capture = None
+    try:
+        if args.hedge:
+            # Proxy #0 は初期化専用のため、キャプチャには Proxy #1 以降を使う
+            capturer = HedgedCapturer(
+                browser_factory, screenshot_dir=SCREENSHOT_DIR_CONTAINER,
+                hedge_budget=args.hedge_budget, metrics=run_metrics, result_sink=result_sink,
+                journal=journal, retry_policy=retry_policy, logger=logger)
+            seeded = capturer.seed_latencies(previous_results)
+            if seeded:
+                logger.info("Seeded hedge latencies with %s attempt(s) from '%s'; hedging after %.1fs.",
+                            seeded, args.results, capturer.hedge_delay)
+            capture = capturer.capture(args.url, proxy_list, range(1, len(proxy_list)))
+        else:
+            summary = runner.run(proxy_list)
+    finally:
+        if result_sink is not None:
+            result_sink.close()  # バッファに残ったレコードを書き出す
+        if journal is not None:
+            journal.close()  # 残りを fsync し、ジャーナルをコンパクションする
+        if session_pool is not None:
+            session_pool.close()  # 共有セッションを終了する
+        factory.close()  # 残っているプロファイルのコピーを削除する
+        if metrics_server is not None:
+            metrics_server.stop()
+        if span_exporter is not None:
+            span_exporter.close()
 
     # --- 最終結果表示 ---
     print("-" * 30)
+    if capture is not None:
+        logger.info("--- Hedged Capture Finished ---")
+        if capture.success:
+            print(f"Captured '{capture.url}' via proxy #{capture.proxy_index} in {capture.elapsed_seconds:.2f}s: "
+                  f"{capture.screenshot_path}")
+        else:
+            print(f"Could not capture '{capture.url}' with any proxy.")
+        print(f"Attempts started: {len(capture.outcomes)} ({capture.hedges_started} hedged), outcomes: {capture.outcomes}")
+        print("-" * 30)
+        sys.exit(0 if capture.success else 1)
     logger.info("--- Screenshot Process Finished ---")
     print(
-        f"Processed {len(proxy_list)} proxies (Proxy #0 was for initialization).")
-    print(f"Successful processing attempts (browser started): {success_count}")
-    print(f"Actual screenshots taken (Proxy #1 onwards): {screenshots_taken}")
-    print(f"Failed attempts: {failure_count}")
-    print(f"Check the '{SCREENSHOT_DIR_CONTAINER}' directory inside the container (mapped to './screenshots' on host) for the images (index 1 onwards recommended).")
+        f"Processed {summary.total} proxies (Proxy #0 was for initialization).")
+    if urls:
+        print(f"URLs per proxy: {len(urls)} (one record per proxy and URL)")
+    print(f"Successful processing attempts: {summary.succeeded}")
+    if args.mode in ('ip', 'tiered'):
+        print(f"Egress IPs verified: {summary.ips_verified}")
+    if args.mode != 'ip':
+        print(f"Actual screenshots taken (Proxy #1 onwards): {summary.screenshots_taken}")
+    print(f"Failed attempts: {summary.failed}")
+    if resource_blocker is not None:
+        print(f"Requests blocked (images, media, fonts, trackers, ...): {summary.blocked_requests}")
+    if args.summary_file:
+        summary_path = Path(args.summary_file)
+        summary_path.parent.mkdir(parents=True, exist_ok=True)
+        summary_path.write_text(json.dumps({
+            "shard": str(shard) if shard is not None else None, "urls": urls or [args.url], "mode": args.mode,
+            "results": args.results, "summary": summary.to_dict()}, ensure_ascii=False, indent=2), encoding='utf-8')
+    if summary.skipped:
+        print(f"Skipped (already completed according to the journal): {summary.skipped}")
+    for phase, stats in run_metrics.phases.summary().items():
+        print(f"Phase '{phase}': n={stats['count']}, mean={stats['mean']:.2f}s, "
+              f"p50={stats['p50']:.2f}s, p95={stats['p95']:.2f}s, p99={stats['p99']:.2f}s")
+    if args.trace_file:
+        print(f"Sampled, slow and failed traces written to '{args.trace_file}'.")
+    if args.results:
+        print(f"Per-attempt records written to '{args.results}'.")
+    if summary.screenshots_taken:
+        print(f"Check the '{SCREENSHOT_DIR_CONTAINER}' directory inside the container (mapped to './screenshots' on host) for the images (index 1 onwards recommended).")
     print("-" * 30)
     sys.exit(0)
 
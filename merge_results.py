@@ -0,0 +1,72 @@
+# merge_results.py
+"""
+シャードごと (main.py --shard i/N) の結果ファイルとサマリーファイルを1つの実行レポートにまとめます。
+
+使用例:
+    python merge_results.py results/shard-*.jsonl -s results/summary-*.json -o results/merged.jsonl --report results/report.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+try:
+    from src.adapters.result_sink import create_result_sink, read_results
+    from src.application.run_report import build_run_report, merge_records
+except ImportError as e:
+    print(f"ERROR: Could not import necessary modules from src: {e}")
+    print("Make sure PYTHONPATH is set correctly or run from the project root.")
+    sys.exit(1)
+
+
+def main() -> None:
+    """メインの処理を実行する関数"""
+    parser = argparse.ArgumentParser(description='シャードごとの結果ファイルとサマリーを1つの実行レポートにまとめます。')
+    parser.add_argument('results', nargs='+', metavar='RESULT_FILE',
+                        help='main.py -r で出力した結果ファイル (.jsonl または .sqlite)。')
+    parser.add_argument('-s', '--summary', action='append', default=[], metavar='SUMMARY_FILE',
+                        help='main.py --summary-file で出力したサマリーファイル (複数指定可)。')
+    parser.add_argument('-o', '--output', metavar='FILEPATH',
+                        help='まとめたレコードの出力先 (.jsonl または .sqlite)。指定しない場合は出力しません。')
+    parser.add_argument('--report', metavar='FILEPATH',
+                        help='レポートを JSON で保存するパス。指定しない場合はコンソールにのみ表示します。')
+    args = parser.parse_args()
+
+    try:
+        records = merge_records(read_results(path) for path in args.results)
+        shard_summaries: dict[str, dict] = {}
+        for path in args.summary:
+            data = json.loads(Path(path).read_text(encoding='utf-8'))
+            shard_summaries[data.get('shard') or path] = data['summary']
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        with create_result_sink(args.output) as sink:
+            for record in records:
+                sink.write(record)
+
+    report = build_run_report(records, shard_summaries)
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    summary = report['summary']
+    print("-" * 30)
+    print(f"Merged {len(args.results)} result file(s) from {len(shard_summaries) or 'unknown number of'} shard(s).")
+    print(f"Proxies: {summary['total']} (succeeded: {summary['succeeded']}, failed: {summary['failed']}, "
+          f"skipped on resume: {summary['skipped']})")
+    print(f"Screenshots taken: {summary['screenshots_taken']}, egress IPs verified: {summary['ips_verified']}")
+    for category, count in report['error_categories'].items():
+        print(f"Failures ({category}): {count}")
+    if args.output:
+        print(f"Merged records written to '{args.output}'.")
+    if args.report:
+        print(f"Report written to '{args.report}'.")
+    print("-" * 30)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@
 
 import sys
 import os
-import json
 import re # 正規表現を使う場合 (今回はfindで)
 from selenium import webdriver
 from selenium.webdriver.edge.options import Options as EdgeOptions
@@ -12,6 +11,7 @@ from selenium.common.exceptions import WebDriverException, NoSuchElementExceptio
 try:
     from src.domain.proxy_info import ProxyInfo
     from src.adapters.edge_option_factory import EdgeOptionFactory
+    from src.application.ip_extractor import extract_ip
 except ImportError as e:
     print(f"ERROR: Could not import necessary modules from src: {e}")
     sys.exit(1)
@@ -52,38 +52,16 @@ try:
     # 5. レスポンスからIPアドレス情報を取得
     detected_ip = "Could not determine IP from page content."
     body_text = ""
-    json_string = "" # 抽出後のJSON文字列用
     try:
         body_text = driver.find_element("tag name", "body").text.strip()
         print(f"DEBUG: Raw text from <body> tag:\n---\n{body_text}\n---")
 
-        if "api.ipify.org" in TARGET_URL or "httpbin.org/ip" in TARGET_URL:
-            # ★★★ JSON部分を抽出する処理を追加 ★★★
-            # 最初の '{' を探す
-            json_start_index = body_text.find('{')
-            # 最後の '}' を探す
-            json_end_index = body_text.rfind('}')
-
-            if json_start_index != -1 and json_end_index != -1 and json_start_index < json_end_index:
-                # '{' から '}' までを抽出
-                json_string = body_text[json_start_index : json_end_index + 1]
-                print(f"DEBUG: Extracted potential JSON string:\n---\n{json_string}\n---")
-
-                # 抽出した文字列でJSONパースを試みる
-                try:
-                    data = json.loads(json_string)
-                    detected_ip = data.get("origin") or data.get("ip", "Not found in JSON")
-                    print("DEBUG: JSON parsed successfully from extracted string.")
-                except json.JSONDecodeError as e:
-                    print(f"ERROR: Could not parse extracted JSON: {e}")
-                    print(f"DEBUG: Extracted string that failed to parse:\n---\n{json_string}\n---")
-            else:
-                # 有効なJSON構造が見つからなかった場合
-                print("ERROR: Could not find valid JSON structure '{...}' in the body text.")
-                print(f"DEBUG: Original body text was:\n---\n{body_text}\n---")
+        # JSON 応答 ({"ip": ...} / {"origin": ...}) と本文中の IP 表記の両方に対応した共通処理で抽出
+        extracted_ip = extract_ip(body_text)
+        if extracted_ip:
+            detected_ip = extracted_ip
         else:
-             print("DEBUG: Target URL is not JSON type, using raw body text.")
-             detected_ip = body_text
+            print("ERROR: Could not find an IP address in the body text.")
 
     except Exception as e: # NoSuchElementExceptionなども含む
         print(f"ERROR: Could not extract IP from page: {e}")
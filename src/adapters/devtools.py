@@ -0,0 +1,39 @@
+# src/adapters/devtools.py
+import json
+from typing import Any, Iterable
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+# EdgeRemoteConnection に登録されている CDP 実行コマンド (POST /session/{id}/ms/cdp/execute)
+_EXECUTE_CDP_COMMAND = "executeCdpCommand"
+# Edge のパフォーマンスログ (DevTools のイベント) を有効にする capability
+PERFORMANCE_LOGGING_CAPABILITY = "ms:loggingPrefs"
+PERFORMANCE_LOG = "performance"
+
+
+def execute_cdp(driver: RemoteWebDriver, cmd: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Remote WebDriver 経由で、現在のタブに対して DevTools プロトコルのコマンドを実行し、結果を返します。"""
+    return driver.execute(_EXECUTE_CDP_COMMAND, {"cmd": cmd, "params": params or {}})["value"] or {}
+
+
+def read_performance_log(driver: RemoteWebDriver) -> list[dict[str, Any]]:
+    """
+    パフォーマンスログに溜まったエントリを取得します (取得したエントリはドライバ側から消えます)。
+    セッションの capability で PERFORMANCE_LOGGING_CAPABILITY を有効にしておく必要があります。
+    """
+    return driver.execute(Command.GET_LOG, {"type": PERFORMANCE_LOG})["value"] or []
+
+
+def iter_devtools_events(entries: Iterable[dict[str, Any]]) -> Iterable[tuple[str | None, str, dict[str, Any]]]:
+    """
+    パフォーマンスログのエントリから (webview, メソッド名, パラメータ) を順に返します。
+    webview はイベントが発生したタブ (DevTools のターゲット ID) で、解釈できないエントリは読み飛ばします。
+    """
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])
+            event = message["message"]
+            yield message.get("webview"), event["method"], event.get("params") or {}
+        except (ValueError, KeyError, TypeError):
+            continue
@@ -1,15 +1,111 @@
 # src/adapters/edge_option_factory.py
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 from selenium.webdriver.edge.options import Options as EdgeOptions # Seleniumからインポート
 
 # 依存クラスを import
 # このimportが成功するためには src/domain/proxy_info.py が必要です。
 from src.domain.proxy_info import ProxyInfo
+from src.adapters.proxy_host_resolver import ProxyHostResolver
+from src.config.logging_config import get_logger
+
+# ページ読み込み戦略: normal は onload まで、eager は DOMContentLoaded まで待ち、none は待たない
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+# プロファイルのテンプレートからコピーしないもの (ブラウザ実行中のロックと、共有ディスクキャッシュに任せるキャッシュ)
+_PROFILE_TEMPLATE_SKIP = ("Singleton*", "lockfile", "*.lock", "Cache", "Code Cache", "GPUCache")
+_USER_DATA_DIR_ARG = "--user-data-dir="
+# 起動中の Chromium がユーザーデータディレクトリに作るロック (ノードと共有されているかの確認に使う)
+_PROFILE_LOCK_NAME = "SingletonLock"
+# セッションの開始時にコピーを待たないよう、事前に用意しておくプロファイルのコピーの数
+DEFAULT_PROFILE_SPARES = 2
+# ブラウザのノードは別のユーザー (selenium イメージの seluser) で動くため、コピーとキャッシュは誰でも書き込めるようにする
+_SHARED_DIR_MODE = 0o777
+_SHARED_FILE_MODE = 0o666
+_DISK_CACHE_DIR_ARG = "--disk-cache-dir="
 
 class EdgeOptionFactory:
     """
     ProxyInfo データを受け取り、プロキシサーバー設定を含む
     Selenium WebDriver の EdgeOptions オブジェクトを生成するファクトリクラス。
     """
+    def __init__(
+        self,
+        resolver: ProxyHostResolver | None = None,
+        page_load_strategy: str | None = None,
+        page_load_timeout: float | None = None,
+        script_timeout: float | None = None,
+        proxy_bypass_list: tuple[str, ...] = (),
+        profile_template: str | Path | None = None,
+        profile_root: str | Path | None = None,
+        disk_cache_dir: str | Path | None = None,
+        profile_spares: int = DEFAULT_PROFILE_SPARES
+    ):
+        """
+        EdgeOptionFactory を初期化します。
+
+        Args:
+            resolver: プロキシのホスト名を事前解決する ProxyHostResolver (任意)。
+                      指定した場合、--proxy-server には解決済みの IP アドレスが使われます。
+            page_load_strategy: ページ読み込み戦略 (PAGE_LOAD_STRATEGIES のいずれか)。
+                                省略時はブラウザの既定 (normal)。
+            page_load_timeout: driver.get がページ読み込みを待つ最大秒数 (任意)。
+            script_timeout: スクリプト実行の最大秒数 (任意)。
+            proxy_bypass_list: プロキシを経由せずに直接接続するホストのパターン (--proxy-bypass-list、任意)。
+                               ProxyBypassRules.bypass_list で、アクセス先のホストを含まないことを確認したもの。
+            profile_template: 初回起動の処理を済ませたユーザーデータディレクトリ (読み取り専用で使用、任意)。
+                              セッションごとに profile_root へコピーして --user-data-dir に指定します。
+            profile_root: コピーしたプロファイルを置くディレクトリ (省略時は profile_template と同じ階層)。
+            profile_spares: バックグラウンドで事前にコピーしておくプロファイルの数 (0 で毎回その場でコピー)。
+                            コピーはディレクトリツリー全体を複製するため、create_options (セッション開始前) で待たないようにします。
+            disk_cache_dir: セッション間で再利用するディスクキャッシュのディレクトリ (任意)。
+                            Chromium のキャッシュは複数のブラウザで同時に使えないため、この下のスロットを
+                            セッションごとに1つ貸し出し、終了後に次のセッションで再利用します。
+            (profile_template / profile_root / disk_cache_dir は、ブラウザ (Grid のノード) からも
+            同じパスで見える共有ボリューム上にある必要があります。check_session_started で最初のセッションについて確認します。)
+
+        Raises:
+            ValueError: page_load_strategy が不正な場合、または profile_template がディレクトリでない場合。
+        """
+        if page_load_strategy is not None and page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"page_load_strategy must be one of {PAGE_LOAD_STRATEGIES}")
+        self._resolver: ProxyHostResolver | None = resolver
+        self._page_load_strategy: str | None = page_load_strategy
+        # W3C の timeouts capability はミリ秒単位
+        self._timeouts: dict[str, int] = {}
+        if page_load_timeout is not None:
+            self._timeouts["pageLoad"] = int(page_load_timeout * 1000)
+        if script_timeout is not None:
+            self._timeouts["script"] = int(script_timeout * 1000)
+        self._proxy_bypass_list: tuple[str, ...] = tuple(proxy_bypass_list)
+        if profile_template is not None and not Path(profile_template).is_dir():
+            raise ValueError(f"profile_template '{profile_template}' is not a directory")
+        self._profile_template: Path | None = Path(profile_template) if profile_template is not None else None
+        self._profile_root: Path | None = Path(profile_root) if profile_root is not None else \
+            self._profile_template.parent if self._profile_template is not None else None
+        self._disk_cache_dir: Path | None = Path(disk_cache_dir) if disk_cache_dir is not None else None
+        self._lock = threading.Lock()
+        # コピーしたプロファイル (事前に用意した分を含む) と、貸し出し中/空きのキャッシュスロット
+        self._profiles: set[str] = set()
+        self._profile_spares: int = max(0, profile_spares)
+        self._spare_profiles: list[str] = []
+        self._preparing: int = 0
+        self._copier: ThreadPoolExecutor | None = None
+        self._closed = False
+        self._profile_checked = False
+        self._leased_slots: set[str] = set()
+        self._free_slots: list[str] = []
+        self._slot_count = 0
+
+    @property
+    def proxy_bypass_list(self) -> tuple[str, ...]:
+        """直接接続するホストのパターン (CDP の proxyBypassList にも使います)。"""
+        return self._proxy_bypass_list
+
     def create_options(self, proxy_info: ProxyInfo) -> EdgeOptions:
         """
         指定されたプロキシ情報に基づいて EdgeOptions インスタンスを生成し、
@@ -32,13 +128,29 @@ class EdgeOptionFactory:
         options = EdgeOptions()
 
         # プロキシ設定用の引数文字列を作成
-        proxy_argument = f"--proxy-server={proxy_info.host}:{proxy_info.port}"
+        proxy_argument = f"--proxy-server={self.proxy_server(proxy_info)}"
 
         # 作成した引数を EdgeOptions に追加
         options.add_argument(proxy_argument)
+        if self._proxy_bypass_list:
+            options.add_argument(f"--proxy-bypass-list={';'.join(self._proxy_bypass_list)}")
         # ★★★ 証明書エラーを無視するオプションを追加 ★★★
         options.add_argument("--ignore-certificate-errors")
 
+        # 初回起動の処理を済ませたプロファイルと、前のセッションで温まったディスクキャッシュを使う
+        if self._profile_template is not None:
+            options.add_argument(f"{_USER_DATA_DIR_ARG}{self._take_profile_copy()}")
+            options.add_argument("--no-first-run")
+            options.add_argument("--no-default-browser-check")
+        if self._disk_cache_dir is not None:
+            options.add_argument(f"{_DISK_CACHE_DIR_ARG}{self._lease_cache_slot()}")
+
+        # 遅いプロキシ経由で全リソースの読み込みを待たないよう、読み込み戦略とタイムアウトを設定する
+        if self._page_load_strategy is not None:
+            options.page_load_strategy = self._page_load_strategy
+        if self._timeouts:
+            options.timeouts = dict(self._timeouts)
+
         # 必要に応じて、他のデフォルトオプションをここに追加できます
         # 例: ヘッドレスモード
         # options.add_argument("--headless")
@@ -47,4 +159,127 @@ class EdgeOptionFactory:
         # 設定済みの options オブジェクトを返す
         return options
 
+    def proxy_server(self, proxy_info: ProxyInfo) -> str:
+        """
+        --proxy-server (または CDP の proxyServer) に渡す 'host:port' 文字列を返します。
+        リゾルバがあれば解決済みの IP アドレスを使い、Edge 側での名前解決を省きます。
+        """
+        if self._resolver is not None:
+            proxy_info = self._resolver.lookup(proxy_info)
+        return f"{proxy_info.host}:{proxy_info.port}"
+
+    def release_options(self, options: EdgeOptions) -> None:
+        """
+        options のセッションが終了した後に呼び出し、コピーしたプロファイルを削除して
+        ディスクキャッシュのスロットを次のセッションのために返却します。
+        """
+        for argument in getattr(options, 'arguments', None) or []:
+            if argument.startswith(_USER_DATA_DIR_ARG):
+                path = argument[len(_USER_DATA_DIR_ARG):]
+                with self._lock:
+                    if path not in self._profiles:
+                        continue
+                    self._profiles.discard(path)
+                shutil.rmtree(path, ignore_errors=True)
+            elif argument.startswith(_DISK_CACHE_DIR_ARG):
+                path = argument[len(_DISK_CACHE_DIR_ARG):]
+                with self._lock:
+                    if path in self._leased_slots:
+                        self._leased_slots.discard(path)
+                        self._free_slots.append(path)
+
+    def check_session_started(self, options: EdgeOptions) -> None:
+        """
+        options で最初のセッションが起動した後に呼び出し、コピーしたプロファイルを Edge が使っているか確認します。
+
+        Edge は起動中のユーザーデータディレクトリにロック (SingletonLock) を作るため、コピーにロックが無い場合は
+        プロファイルのディレクトリがブラウザのノードと同じパスで共有されておらず、Edge が空のプロファイルで
+        起動している (テンプレートの効果が無い) として警告します。確認は最初の1回だけ行います。
+        """
+        paths = [argument[len(_USER_DATA_DIR_ARG):] for argument in getattr(options, 'arguments', None) or []
+                 if argument.startswith(_USER_DATA_DIR_ARG)]
+        with self._lock:
+            if self._profile_checked or not paths or paths[0] not in self._profiles:
+                return
+            self._profile_checked = True
+        path = paths[0]
+        if not os.path.lexists(Path(path) / _PROFILE_LOCK_NAME):
+            get_logger().warning(
+                "Edge did not lock the profile copy '%s'; --profile-template/--profile-root (and --disk-cache-dir) "
+                "must be on a volume that the browser node mounts at the same path.", path)
+
+    def close(self) -> None:
+        """削除されずに残っているプロファイルのコピーを削除します (キャッシュは次回の実行のために残します)。"""
+        with self._lock:
+            self._closed = True
+            copier, self._copier = self._copier, None
+        if copier is not None:
+            copier.shutdown(wait=True)  # コピー中の分も含めて削除する
+        with self._lock:
+            profiles, self._profiles = self._profiles, set()
+            self._spare_profiles = []
+        for path in profiles:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _take_profile_copy(self) -> str:
+        # 事前に用意したコピーがあれば使い、使った分をバックグラウンドで補充する
+        with self._lock:
+            path = self._spare_profiles.pop() if self._spare_profiles else None
+            missing = 0 if self._closed else self._profile_spares - len(self._spare_profiles) - self._preparing
+            if missing > 0:
+                self._preparing += missing
+                if self._copier is None:
+                    self._copier = ThreadPoolExecutor(max_workers=1, thread_name_prefix="proxyrot-profile")
+                for _ in range(missing):
+                    self._copier.submit(self._prepare_spare_profile)
+        return path if path is not None else self._copy_profile_template()
+
+    def _prepare_spare_profile(self) -> None:
+        try:
+            path: str | None = self._copy_profile_template()
+        except OSError as e:
+            # 補充に失敗しても、次のセッションはその場でコピーする (そこで失敗すればセッションの失敗になる)
+            get_logger().warning("Failed to prepare a profile copy in the background: %s", e)
+            path = None
+        with self._lock:
+            self._preparing -= 1
+            if path is not None and not self._closed:
+                self._spare_profiles.append(path)
+
+    def _copy_profile_template(self) -> str:
+        # テンプレート (読み取り専用でもよい) の内容を、書き込み可能なセッション専用のディレクトリにコピーする
+        destination = self._profile_root / f"profile-{uuid.uuid4().hex}"
+        skip = shutil.ignore_patterns(*_PROFILE_TEMPLATE_SKIP)
+        try:
+            for directory, subdirs, files in os.walk(self._profile_template):
+                relative = Path(directory).relative_to(self._profile_template)
+                ignored = skip(directory, subdirs + files)
+                subdirs[:] = [d for d in subdirs if d not in ignored]
+                (destination / relative).mkdir(parents=True, exist_ok=True)
+                os.chmod(destination / relative, _SHARED_DIR_MODE)
+                for name in files:
+                    if name not in ignored:
+                        shutil.copyfile(Path(directory) / name, destination / relative / name)
+                        os.chmod(destination / relative / name, _SHARED_FILE_MODE)
+        except OSError:
+            shutil.rmtree(destination, ignore_errors=True)
+            raise
+        with self._lock:
+            self._profiles.add(str(destination))
+        return str(destination)
+
+    def _lease_cache_slot(self) -> str:
+        # 直前に返却されたスロット (キャッシュが最も新しい) から再利用する
+        with self._lock:
+            if self._free_slots:
+                path = self._free_slots.pop()
+            else:
+                self._slot_count += 1
+                path = str(self._disk_cache_dir / f"slot-{self._slot_count}")
+            self._leased_slots.add(path)
+        if not os.path.isdir(path):
+            Path(path).mkdir(parents=True, exist_ok=True)
+            os.chmod(path, _SHARED_DIR_MODE)
+        return path
+
 # 必要に応じて src/adapters/__init__.py (空ファイル) を作成してください。
\ No newline at end of file
@@ -0,0 +1,80 @@
+# src/adapters/http_ip_checker.py
+import time
+from typing import Callable
+
+import requests
+
+from src.application.ip_extractor import extract_ip
+from src.domain.ip_check_result import IpCheckResult, NO_EGRESS_IP, TIER_HTTP
+from src.domain.proxy_info import ProxyInfo
+
+DEFAULT_HTTP_TIMEOUT_SECONDS = 10.0
+
+
+class HttpIpChecker:
+    """
+    ブラウザを使わず、HTTP クライアントでプロキシ経由の IP 確認 URL にアクセスする軽量チェッカー。
+    結果は ProxiedEdgeBrowser.verify_ip と同じ IpCheckResult (tier=TIER_HTTP) で返します。
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_HTTP_TIMEOUT_SECONDS,
+        verify_tls: bool = False,
+        session_factory: Callable[[], requests.Session] = requests.Session
+    ):
+        """
+        HttpIpChecker を初期化します。
+
+        Args:
+            timeout: 接続・読み込みのタイムアウト秒数。
+            verify_tls: TLS 証明書を検証するかどうか。EdgeOptionFactory の
+                        --ignore-certificate-errors に合わせ、既定では検証しません。
+                        その際の InsecureRequestWarning はプロセス全体の設定のため、ここでは抑制せず
+                        アプリケーションの起動時 (main.py) に抑制します。
+            session_factory: requests.Session を生成する関数 (テスト用に差し替え可能)。
+
+        Raises:
+            ValueError: timeout が0以下の場合。
+        """
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self._timeout: float = timeout
+        self._verify_tls: bool = verify_tls
+        self._session_factory = session_factory
+
+    def check(self, proxy_info: ProxyInfo, url: str) -> IpCheckResult:
+        """
+        指定したプロキシ経由で URL にアクセスし、応答本文から送信元 IP を読み取ります。
+        通信エラーは例外として送出せず、error を設定した結果として返します。
+
+        Args:
+            proxy_info: 経由するプロキシの情報。
+            url: IP 確認 URL。
+
+        Returns:
+            IpCheckResult: tier=TIER_HTTP の確認結果。
+        """
+        proxy_url = f"http://{proxy_info.host}:{proxy_info.port}"
+        proxies = {"http": proxy_url, "https": proxy_url}
+        started = time.perf_counter()
+        try:
+            with self._session_factory() as session:
+                response = session.get(
+                    url, proxies=proxies, timeout=self._timeout, verify=self._verify_tls)
+                response.raise_for_status()
+                body_text = response.text
+        except requests.RequestException as e:
+            return IpCheckResult(
+                proxy=proxy_info, url=url, egress_ip=None,
+                elapsed_seconds=time.perf_counter() - started,
+                error=f"{e.__class__.__name__}: {e}", error_class=e.__class__.__name__,
+                tier=TIER_HTTP)
+
+        egress_ip = extract_ip(body_text)
+        return IpCheckResult(
+            proxy=proxy_info, url=url, egress_ip=egress_ip,
+            elapsed_seconds=time.perf_counter() - started,
+            error=None if egress_ip else "No IP address found in response body",
+            error_class=None if egress_ip else NO_EGRESS_IP,
+            tier=TIER_HTTP)
@@ -0,0 +1,74 @@
+# src/adapters/metrics_server.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.application.run_metrics import RunMetrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """
+    RunMetrics を Prometheus のテキスト形式で /metrics に公開する組み込み HTTP サーバー。
+    応答はスクレイプ時にのみ生成されるため、ワーカースレッドの処理には影響しません。
+    """
+
+    def __init__(self, metrics: RunMetrics, host: str = "0.0.0.0", port: int = 9100):
+        """
+        Args:
+            metrics: 公開する RunMetrics。
+            host: 待ち受けるアドレス。
+            port: 待ち受けるポート番号 (0 の場合は空きポートを自動で割り当て)。
+
+        Raises:
+            TypeError: metrics が RunMetrics のインスタンスでない場合。
+        """
+        if not isinstance(metrics, RunMetrics):
+            raise TypeError("metrics must be an instance of RunMetrics")
+        self._metrics = metrics
+        self._host = host
+        self._port = port
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        """実際に待ち受けているポート番号 (起動前は指定値)。"""
+        return self._server.server_address[1] if self._server else self._port
+
+    def start(self) -> None:
+        """デーモンスレッドでサーバーを起動します。既に起動済みの場合は何もしません。"""
+        if self._server is not None:
+            return
+        metrics = self._metrics
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # スクレイプごとのアクセスログは出力しない
+
+        self._server = ThreadingHTTPServer((self._host, self._port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """サーバーを停止します。"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
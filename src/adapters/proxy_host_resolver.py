@@ -0,0 +1,181 @@
+# src/adapters/proxy_host_resolver.py
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable
+
+from src.domain.proxy_info import ProxyInfo
+
+DEFAULT_DNS_TTL_SECONDS = 300.0
+DEFAULT_RESOLVER_WORKERS = 32
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    """名前解決結果のキャッシュエントリ (address か error のどちらか一方を持つ)。"""
+    address: str | None
+    error: str | None
+    expires_at: float
+
+
+def _default_resolve(host: str, port: int) -> str:
+    """
+    socket.getaddrinfo でホスト名を解決し、IPv4 を優先してアドレスを1つ返す。
+    IPv6 アドレスは --proxy-server で使えるよう角括弧で囲んで返す。
+    """
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    if not infos:
+        raise OSError(f"No address found for host '{host}'")
+    ipv4 = [info for info in infos if info[0] == socket.AF_INET]
+    family, _, _, _, sockaddr = (ipv4 or infos)[0]
+    address = sockaddr[0]
+    return f"[{address}]" if family == socket.AF_INET6 else address
+
+
+class ProxyHostResolver:
+    """
+    ProxyInfo のホスト名を事前に名前解決し、結果を TTL 付きでキャッシュするクラス。
+
+    ブラウザセッションごとに Edge 側で名前解決が行われるのを避けるため、
+    ロード時に全プロキシのホスト名を並列に解決しておき、EdgeOptionFactory に
+    解決済みの IP アドレスを渡せるようにします。解決に失敗したホストも
+    (同じ TTL で) 記録されるため、ブラウザ起動前に無効なエントリを判別できます。
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_DNS_TTL_SECONDS,
+        max_workers: int = DEFAULT_RESOLVER_WORKERS,
+        resolve_func: Callable[[str, int], str] | None = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        ProxyHostResolver を初期化します。
+
+        Args:
+            ttl_seconds: 解決結果 (成功・失敗とも) をキャッシュする秒数。
+            max_workers: resolve_all で並列に名前解決を行う最大スレッド数。
+            resolve_func: (host, port) を受け取りアドレス文字列を返す解決関数。
+                          省略時は socket.getaddrinfo を使用します。
+            clock: 単調増加する時刻を返す関数 (テスト用に差し替え可能)。
+
+        Raises:
+            ValueError: ttl_seconds が負、または max_workers が1未満の場合。
+        """
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds must be zero or positive")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self._ttl: float = ttl_seconds
+        self._max_workers: int = max_workers
+        self._resolve_func: Callable[[str, int], str] = resolve_func or _default_resolve
+        self._clock: Callable[[], float] = clock
+        self._cache: dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def resolve_all(self, proxies: list[ProxyInfo]) -> dict[str, str]:
+        """
+        プロキシリスト内のホスト名を並列に解決し、キャッシュに格納します。
+
+        Args:
+            proxies: 名前解決対象のプロキシ情報のリスト。
+
+        Returns:
+            dict[str, str]: 解決に成功したホスト名と IP アドレスの対応。
+        """
+        hosts = {(p.host, p.port) for p in proxies if not self._is_ip_literal(p.host)}
+        # 同一ホストは1回だけ解決すればよい
+        unique_hosts = {host: port for host, port in sorted(hosts)}
+        if unique_hosts:
+            workers = min(self._max_workers, len(unique_hosts))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda item: self._resolve_and_cache(*item), unique_hosts.items()))
+
+        resolved: dict[str, str] = {}
+        with self._lock:
+            for host in unique_hosts:
+                entry = self._cache.get(host)
+                if entry is not None and entry.address is not None:
+                    resolved[host] = entry.address
+        return resolved
+
+    def lookup(self, proxy_info: ProxyInfo) -> ProxyInfo:
+        """
+        ホスト名を解決済み IP アドレスに置き換えた ProxyInfo を返します。
+
+        キャッシュが有効期限切れ、または未登録の場合はその場で解決を試みます。
+        解決に失敗した場合は、ブラウザ側での解決に委ねるため元の ProxyInfo を返します。
+
+        Args:
+            proxy_info: 対象のプロキシ情報。
+
+        Returns:
+            ProxyInfo: host が IP アドレスに置き換えられた (または元の) ProxyInfo。
+        """
+        if self._is_ip_literal(proxy_info.host):
+            return proxy_info
+        entry = self._get_fresh_entry(proxy_info.host)
+        if entry is None:
+            entry = self._resolve_and_cache(proxy_info.host, proxy_info.port)
+        if entry.address is None:
+            return proxy_info
+        return replace(proxy_info, host=entry.address)
+
+    def is_unresolvable(self, proxy_info: ProxyInfo) -> bool:
+        """
+        ホスト名の解決に失敗するかを返します。
+
+        キャッシュが有効期限切れ、または未登録の場合は lookup と同じくその場で解決し直すため、
+        TTL の経過後 (TTL が 0 の場合は常に) も解決できないホストを判別できます。
+
+        Args:
+            proxy_info: 対象のプロキシ情報。
+
+        Returns:
+            bool: 有効期限内の失敗記録がある場合、または解決し直して失敗した場合 True。
+        """
+        if self._is_ip_literal(proxy_info.host):
+            return False
+        entry = self._get_fresh_entry(proxy_info.host)
+        if entry is None:
+            entry = self._resolve_and_cache(proxy_info.host, proxy_info.port)
+        return entry.error is not None
+
+    @property
+    def failures(self) -> dict[str, str]:
+        """最後の名前解決に失敗したホスト (ホスト名 -> エラーメッセージ) を返します (有効期限切れの記録を含む)。"""
+        with self._lock:
+            return {host: entry.error for host, entry in self._cache.items() if entry.error is not None}
+
+    def _get_fresh_entry(self, host: str) -> _CacheEntry | None:
+        with self._lock:
+            entry = self._cache.get(host)
+        if entry is None or entry.expires_at <= self._clock():
+            return None
+        return entry
+
+    def _resolve_and_cache(self, host: str, port: int) -> _CacheEntry:
+        try:
+            entry = _CacheEntry(
+                address=self._resolve_func(host, port), error=None,
+                expires_at=self._clock() + self._ttl)
+        except OSError as e:
+            # socket.gaierror は OSError のサブクラス
+            entry = _CacheEntry(
+                address=None, error=str(e) or e.__class__.__name__,
+                expires_at=self._clock() + self._ttl)
+        with self._lock:
+            self._cache[host] = entry
+        return entry
+
+    @staticmethod
+    def _is_ip_literal(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host.strip("[]"))
+            return True
+        except ValueError:
+            return False
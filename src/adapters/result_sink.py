@@ -0,0 +1,299 @@
+# src/adapters/result_sink.py
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from types import TracebackType
+
+from src.config.logging_config import get_logger
+from src.domain.attempt_record import AttemptRecord
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_FLUSH_BATCH_SIZE = 500
+
+
+class ResultSink(ABC):
+    """
+    AttemptRecord を書き出す結果シンクのインターフェース (Abstract Base Class)。
+    """
+
+    @abstractmethod
+    def write(self, record: AttemptRecord) -> None:
+        """
+        1試行分のレコードを書き出す (またはバッファに積む)。
+
+        Args:
+            record: 書き出す試行レコード。
+        """
+        pass  # 実装はサブクラスに委ねる
+
+    @abstractmethod
+    def close(self) -> None:
+        """未書き出しのレコードをすべて書き出し、シンクを閉じる。"""
+        pass  # 実装はサブクラスに委ねる
+
+    def __enter__(self) -> 'ResultSink':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None
+    ) -> None:
+        self.close()
+
+
+class BufferedResultSink(ResultSink):
+    """
+    レコードをメモリ上のバッファに積み、バックグラウンドスレッドでまとめて追記する結果シンク。
+
+    write() はロックを取ってリストに追加するだけなので、ワーカーがファイル I/O で
+    待たされることはありません。バッファは flush_interval 秒ごと、または
+    flush_batch_size 件に達した時点で書き出されます。サブクラスは _write_batch と
+    _close_storage を実装します (どちらもフラッシュ用スレッドからのみ呼ばれます)。
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        flush_batch_size: int = DEFAULT_FLUSH_BATCH_SIZE
+    ):
+        """
+        BufferedResultSink を初期化し、フラッシュ用スレッドを開始します。
+
+        Args:
+            flush_interval: 定期フラッシュの間隔 (秒)。
+            flush_batch_size: この件数に達したら間隔を待たずにフラッシュする。
+
+        Raises:
+            ValueError: flush_interval が0以下、または flush_batch_size が1未満の場合。
+        """
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        if flush_batch_size < 1:
+            raise ValueError("flush_batch_size must be at least 1")
+
+        self._flush_interval: float = flush_interval
+        self._flush_batch_size: int = flush_batch_size
+        self._buffer: list[AttemptRecord] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.__class__.__name__}-flusher", daemon=True)
+        self._thread.start()
+
+    def write(self, record: AttemptRecord) -> None:
+        if not isinstance(record, AttemptRecord):
+            raise TypeError("record must be an instance of AttemptRecord")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Result sink is already closed")
+            self._buffer.append(record)
+            should_wake = len(self._buffer) >= self._flush_batch_size
+        if should_wake:
+            self._wakeup.set()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                self._wakeup.wait(self._flush_interval)
+                self._wakeup.clear()
+                with self._lock:
+                    batch, self._buffer = self._buffer, []
+                    closing = self._closed
+                if batch:
+                    try:
+                        self._write_batch(batch)
+                    except Exception as e:
+                        # 結果の書き出し失敗でワーカーを止めないよう、ログに記録して継続する
+                        get_logger().error("Failed to write %s result record(s): %s", len(batch), e, exc_info=True)
+                if closing:
+                    return
+        finally:
+            self._close_storage()
+
+    @abstractmethod
+    def _write_batch(self, records: list[AttemptRecord]) -> None:
+        """レコードのまとまりをストレージに追記する。"""
+        pass
+
+    @abstractmethod
+    def _close_storage(self) -> None:
+        """ストレージを閉じる。"""
+        pass
+
+
+class JsonlResultSink(BufferedResultSink):
+    """AttemptRecord を1行1レコードの JSON Lines 形式でファイルに追記する結果シンク。"""
+
+    def __init__(self, path: str | Path, **kwargs):
+        """
+        Args:
+            path: 追記先の .jsonl ファイルパス。親ディレクトリが無ければ作成します。
+            **kwargs: BufferedResultSink に渡すフラッシュ設定。
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._path, 'a', encoding='utf-8')
+        super().__init__(**kwargs)
+
+    def _write_batch(self, records: list[AttemptRecord]) -> None:
+        self._file.writelines(
+            json.dumps(record.to_dict(), ensure_ascii=False) + "\n" for record in records)
+        self._file.flush()
+
+    def _close_storage(self) -> None:
+        self._file.close()
+
+
+class SqliteResultSink(BufferedResultSink):
+    """AttemptRecord を SQLite データベースの attempts テーブルに追記する結果シンク。"""
+
+    _CREATE_TABLE = """
+        CREATE TABLE IF NOT EXISTS attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            proxy_index INTEGER NOT NULL,
+            proxy_host TEXT NOT NULL,
+            proxy_port INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            success INTEGER NOT NULL,
+            started_at REAL NOT NULL,
+            timings TEXT NOT NULL,
+            egress_ip TEXT,
+            screenshot_path TEXT,
+            error_class TEXT,
+            error_message TEXT,
+            tier TEXT,
+            error_category TEXT,
+            attempts INTEGER NOT NULL DEFAULT 1,
+            blocked_requests INTEGER
+        )
+    """
+    # 後から追加した列 (既存のデータベースには ALTER TABLE で追加する)
+    _ADDED_COLUMNS = {
+        "error_category": "TEXT",
+        "attempts": "INTEGER NOT NULL DEFAULT 1",
+        "blocked_requests": "INTEGER",
+    }
+    _INSERT = """
+        INSERT INTO attempts (
+            proxy_index, proxy_host, proxy_port, url, mode, success, started_at,
+            timings, egress_ip, screenshot_path, error_class, error_message, tier,
+            error_category, attempts, blocked_requests
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, path: str | Path, **kwargs):
+        """
+        Args:
+            path: 追記先の SQLite データベースファイルパス。親ディレクトリが無ければ作成します。
+            **kwargs: BufferedResultSink に渡すフラッシュ設定。
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # sqlite3 の接続は作成したスレッドでしか使えないため、フラッシュ用スレッドで遅延作成する
+        self._conn: sqlite3.Connection | None = None
+        super().__init__(**kwargs)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self._CREATE_TABLE)
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(attempts)")}
+            for column, definition in self._ADDED_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE attempts ADD COLUMN {column} {definition}")
+        return self._conn
+
+    def _write_batch(self, records: list[AttemptRecord]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.executemany(self._INSERT, [
+                (r.proxy_index, r.proxy_host, r.proxy_port, r.url, r.mode, int(r.success),
+                 r.started_at, json.dumps(r.timings), r.egress_ip, r.screenshot_path,
+                 r.error_class, r.error_message, r.tier, r.error_category, r.attempts,
+                 r.blocked_requests)
+                for r in records
+            ])
+
+    def _close_storage(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def create_result_sink(path: str | Path, **kwargs) -> ResultSink:
+    """
+    ファイルの拡張子に応じた結果シンクを生成します。
+
+    Args:
+        path: 出力先パス。.jsonl / .json は JSON Lines、.db / .sqlite / .sqlite3 は SQLite。
+        **kwargs: BufferedResultSink に渡すフラッシュ設定。
+
+    Returns:
+        ResultSink: 生成した結果シンク。
+
+    Raises:
+        ValueError: 対応していない拡張子の場合。
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.jsonl', '.json'):
+        return JsonlResultSink(path, **kwargs)
+    if suffix in ('.db', '.sqlite', '.sqlite3'):
+        return SqliteResultSink(path, **kwargs)
+    raise ValueError(f"Unsupported result file extension: '{suffix}' (use .jsonl or .sqlite)")
+
+
+def read_results(path: str | Path) -> list[AttemptRecord]:
+    """
+    create_result_sink で書き出した結果ファイル (JSON Lines または SQLite) から AttemptRecord を読み込みます。
+    JSON Lines の壊れた行 (書き込み途中の最終行など) は読み飛ばします。
+
+    Args:
+        path: 結果ファイルのパス。
+
+    Returns:
+        list[AttemptRecord]: ファイルに記録された順の試行レコード。
+
+    Raises:
+        ValueError: 対応していない拡張子の場合。
+        FileNotFoundError: ファイルが存在しない場合。
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if not path.exists():
+        raise FileNotFoundError(f"Result file not found: '{path}'")
+    if suffix in ('.jsonl', '.json'):
+        records: list[AttemptRecord] = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(AttemptRecord(**json.loads(line)))
+                except (ValueError, TypeError):
+                    continue
+        return records
+    if suffix in ('.db', '.sqlite', '.sqlite3'):
+        conn = sqlite3.connect(path)
+        try:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM attempts ORDER BY id").fetchall()
+        finally:
+            conn.close()
+        fields = set(AttemptRecord.__dataclass_fields__)
+        return [AttemptRecord(**{
+            **{key: row[key] for key in row.keys() if key in fields},
+            "success": bool(row["success"]), "timings": json.loads(row["timings"])}) for row in rows]
+    raise ValueError(f"Unsupported result file extension: '{suffix}' (use .jsonl or .sqlite)")
@@ -0,0 +1,120 @@
+# src/adapters/run_journal.py
+import json
+import os
+from pathlib import Path
+
+from src.adapters.result_sink import BufferedResultSink
+from src.application.retry_policy import ERROR_GRID, ERROR_NAVIGATION_TIMEOUT
+from src.domain.attempt_record import AttemptRecord
+from src.domain.proxy_info import ProxyInfo
+
+DEFAULT_JOURNAL_FSYNC_INTERVAL_SECONDS = 1.0
+DEFAULT_JOURNAL_FSYNC_BATCH_SIZE = 200
+# 再開時にやり直す失敗の分類 (Grid の障害やタイムアウトなど、プロキシ自体の結果ではない失敗)
+DEFAULT_RERUN_CATEGORIES = (ERROR_GRID, ERROR_NAVIGATION_TIMEOUT)
+
+
+def _journal_key(host: str, port: int, url: str) -> tuple[str, int, str]:
+    return host, int(port), url
+
+
+class RunJournal(BufferedResultSink):
+    """
+    完了した (プロキシ, URL) の試行を1行1件で追記する実行ジャーナル。
+
+    中断された実行を resume=True で再開すると、ジャーナルに記録済みの試行をスキップできます。
+    ただし、rerun_categories に分類された失敗 (Grid の障害など) は完了とみなさず、再開時にやり直します。
+    書き込みは BufferedResultSink のバッファにまとめ、バッチごとに fsync するため、
+    クラッシュ時に失われるのは最後のフラッシュ以降の試行 (再開時にやり直すだけ) に限られます。
+    close() の際は重複行や途中で切れた行を取り除いたファイルに置き換えます (コンパクション)。
+    プロキシはリスト内の位置ではなくホスト/ポートで識別するため、プロキシリストの順序が変わっても再開できます。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        resume: bool = False,
+        compact_on_close: bool = True,
+        rerun_categories: tuple[str, ...] = DEFAULT_RERUN_CATEGORIES,
+        flush_interval: float = DEFAULT_JOURNAL_FSYNC_INTERVAL_SECONDS,
+        flush_batch_size: int = DEFAULT_JOURNAL_FSYNC_BATCH_SIZE
+    ):
+        """
+        Args:
+            path: ジャーナルファイルのパス。親ディレクトリが無ければ作成します。
+            resume: True の場合は既存のジャーナルを読み込んで追記し、False の場合は空にして始めます。
+            compact_on_close: close() 時にジャーナルをコンパクションするかどうか。
+            rerun_categories: 再開時に完了とみなさず、やり直す失敗のエラー分類。
+            flush_interval: fsync の間隔 (秒)。
+            flush_batch_size: この件数に達したら間隔を待たずに fsync する。
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._compact_on_close: bool = compact_on_close
+        self._rerun_categories: tuple[str, ...] = tuple(rerun_categories)
+        self._done: set[tuple[str, int, str]] = set()
+        truncated = False
+        if resume and self._path.exists():
+            truncated = self._load()
+        self._file = open(self._path, 'a' if resume else 'w', encoding='utf-8')
+        if truncated:
+            self._file.write("\n")  # 途中で切れた最後の行に続けて追記しないよう改行で終わらせる
+        super().__init__(flush_interval=flush_interval, flush_batch_size=flush_batch_size)
+
+    @property
+    def completed(self) -> int:
+        """再開時にジャーナルから読み込んだ完了済みの試行数。"""
+        return len(self._done)
+
+    def is_done(self, proxy: ProxyInfo, url: str) -> bool:
+        """proxy で url にアクセスする試行が、再開前の実行で完了済みかどうかを返します。"""
+        return _journal_key(proxy.host, proxy.port, url) in self._done
+
+    def _load(self) -> bool:
+        # 最後の行が改行で終わっていない (書き込み途中でクラッシュした) 場合は True を返す
+        line = "\n"
+        with open(self._path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key = _journal_key(entry["host"], entry["port"], entry["url"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # クラッシュ時に途中まで書かれた行は無視する
+                # 同じキーは後の行の結果で判定する (やり直した試行の結果で上書きされる)
+                if entry.get("success") or entry.get("error_category") not in self._rerun_categories:
+                    self._done.add(key)
+                else:
+                    self._done.discard(key)
+        return not line.endswith("\n")
+
+    def _write_batch(self, records: list[AttemptRecord]) -> None:
+        self._file.writelines(
+            json.dumps({"host": r.proxy_host, "port": r.proxy_port, "url": r.url, "success": r.success,
+                        "error_category": r.error_category}, ensure_ascii=False) + "\n"
+            for r in records)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close_storage(self) -> None:
+        self._file.close()
+        if self._compact_on_close:
+            self._compact()
+
+    def _compact(self) -> None:
+        # 重複と壊れた行を取り除いた内容を一時ファイルに書き、rename で置き換える (同じキーは後の行を残す)
+        entries: dict[tuple[str, int, str], str] = {}
+        with open(self._path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key = _journal_key(entry["host"], entry["port"], entry["url"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                entries.pop(key, None)
+                entries[key] = line if line.endswith("\n") else line + "\n"
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(entries.values())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
@@ -0,0 +1,112 @@
+# src/adapters/span_exporter.py
+import json
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.application.tracing import Span
+
+SERVICE_NAME = "py-proxy-rotator"
+SCOPE_NAME = "src.application.tracing"
+
+# OTLP の Status.code / Span.kind の値
+_OTLP_STATUS_CODES = {"UNSET": 0, "OK": 1, "ERROR": 2}
+_OTLP_SPAN_KIND_INTERNAL = 1
+
+
+class SpanExporter(ABC):
+    """
+    終了したトレースのスパンを書き出すエクスポーターのインターフェース (Abstract Base Class)。
+    """
+
+    @abstractmethod
+    def export(self, spans: list['Span']) -> None:
+        """
+        1トレース分のスパンを書き出す。
+
+        Args:
+            spans: 同じトレースに属する終了済みのスパン。
+        """
+        pass  # 実装はサブクラスに委ねる
+
+    def close(self) -> None:
+        """書き出し先を閉じる (必要な場合のみサブクラスで実装)。"""
+        pass
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def to_otlp_json(spans: list['Span']) -> dict[str, Any]:
+    """
+    スパンを OTLP/JSON の ExportTraceServiceRequest 形式の辞書に変換します。
+
+    Args:
+        spans: 変換するスパン。
+
+    Returns:
+        dict: resourceSpans を持つ辞書。
+    """
+    otlp_spans = []
+    for span in spans:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": _OTLP_SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(span.start_time_ns),
+            "endTimeUnixNano": str(span.end_time_ns),
+            "attributes": _otlp_attributes(span.attributes),
+            "status": {"code": _OTLP_STATUS_CODES.get(span.status, 0)},
+        }
+        if span.parent_span_id:
+            otlp_span["parentSpanId"] = span.parent_span_id
+        if span.status_message:
+            otlp_span["status"]["message"] = span.status_message
+        otlp_spans.append(otlp_span)
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+        "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": otlp_spans}],
+    }]}
+
+
+class JsonlSpanExporter(SpanExporter):
+    """
+    1トレースを1行の OTLP/JSON (OpenTelemetry Collector の file exporter と同じ形式) として
+    ファイルに追記するエクスポーター。
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: 追記先のファイルパス。親ディレクトリが無ければ作成します。
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def export(self, spans: list['Span']) -> None:
+        line = json.dumps(to_otlp_json(spans), ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,69 @@
+# src/adapters/tracing_remote_connection.py
+from typing import TYPE_CHECKING
+
+from selenium.webdriver.edge.remote_connection import EdgeRemoteConnection
+from selenium.webdriver.remote.client_config import ClientConfig
+
+if TYPE_CHECKING:
+    from src.application.tracing import Tracer
+
+
+class TracingRemoteConnection(EdgeRemoteConnection):
+    """
+    W3C WebDriver コマンドごとにスパンを記録する Edge 用の RemoteConnection。
+
+    webdriver.Remote の command_executor として渡すと、newSession / get / screenshot /
+    quit などの各コマンドの HTTP 往復が、その時点で開いているスパン (例: プロキシごとの
+    スパン) の子として記録されます。
+    """
+
+    def __init__(self, remote_server_addr: str, tracer: 'Tracer', keep_alive: bool = True,
+                 client_config: ClientConfig | None = None):
+        """
+        Args:
+            remote_server_addr: Selenium Grid / Hub の URL。
+            tracer: スパンを記録する Tracer。
+            keep_alive: HTTP 接続を再利用するかどうか。
+            client_config: HTTP クライアントの設定 (タイムアウトなど、任意)。
+        """
+        super().__init__(remote_server_addr, keep_alive=keep_alive, client_config=client_config)
+        self._tracer = tracer
+
+    def execute(self, command, params):
+        method, path = self._commands.get(command) or self.extra_commands.get(command) or (None, None)
+        attributes = {"webdriver.command": command}
+        if method:
+            attributes["http.method"] = method
+            attributes["http.route"] = path
+        with self._tracer.span(f"webdriver {command}", attributes) as span:
+            response = super().execute(command, params)
+            status = response.get("status") if isinstance(response, dict) else None
+            if isinstance(status, int) and status >= 100:
+                span.set_attribute("http.status_code", status)
+                if status >= 400:
+                    span.set_error(f"HTTP {status}")
+            return response
+
+
+def create_command_executor(
+    remote_server_addr: str,
+    tracer: 'Tracer | None' = None,
+    timeout: float | None = None
+) -> str | EdgeRemoteConnection:
+    """
+    webdriver.Remote の command_executor に渡す値を返します。
+
+    tracer を指定した場合は TracingRemoteConnection を、timeout を指定した場合は
+    WebDriver コマンドの HTTP 往復をその秒数で打ち切る接続を返します。どちらも無ければ URL をそのまま返します。
+
+    Args:
+        remote_server_addr: Selenium Grid / Hub の URL。
+        tracer: コマンドごとのスパンを記録する Tracer (任意)。
+        timeout: コマンドごとの HTTP 往復の最大秒数 (任意)。Grid が応答しない場合も試行のスレッドが戻れるようにします。
+    """
+    if tracer is None and timeout is None:
+        return remote_server_addr
+    client_config = ClientConfig(remote_server_addr, timeout=timeout) if timeout is not None else None
+    if tracer is None:
+        return EdgeRemoteConnection(remote_server_addr, client_config=client_config)
+    return TracingRemoteConnection(remote_server_addr, tracer, client_config=client_config)
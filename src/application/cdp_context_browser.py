@@ -0,0 +1,300 @@
+# src/application/cdp_context_browser.py
+import logging
+import threading
+from dataclasses import dataclass
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from ..adapters.devtools import execute_cdp, read_performance_log
+from ..adapters.edge_option_factory import EdgeOptionFactory
+from ..adapters.tracing_remote_connection import create_command_executor
+from ..application.metrics import PhaseTimings
+from ..application.proxied_edge_browser import ProxiedEdgeBrowser
+from ..application.proxy_selector import ProxySelector
+from ..application.resource_blocking import ResourceBlocker
+from ..application.tracing import Tracer
+from ..config.logging_config import get_logger
+from ..domain.proxy_info import ProxyInfo
+
+# ブラウザの実行方式: プロキシごとの Edge セッション / 共有セッション内のブラウザコンテキスト
+BACKEND_SESSION = "session"
+BACKEND_CDP_CONTEXT = "cdp-context"
+BROWSER_BACKENDS = (BACKEND_SESSION, BACKEND_CDP_CONTEXT)
+# 共有セッションを作り直すまでに作成するブラウザコンテキストの数 (ブラウザプロセスのリソース蓄積を避ける)
+DEFAULT_MAX_CONTEXTS_PER_SESSION = 100
+
+
+@dataclass
+class _SharedSession:
+    driver: RemoteWebDriver
+    main_handle: str
+    options: EdgeOptions | None = None
+    contexts_created: int = 0
+
+
+class SharedEdgeSessionPool:
+    """
+    ブラウザコンテキストを作成するための Edge セッション (共有セッション) を貸し出すプール。
+
+    WebDriver のセッションはウィンドウの切り替えなどの状態を持つため、1つの共有セッションを
+    同時に使う試行は1つだけです。並列に処理する場合は同時実行数の分だけ共有セッションが作られます。
+    共有セッションは Proxy #0 (初期化用) の設定で作成し、max_contexts_per_session 回使うと作り直します。
+    最初のブラウザコンテキストの作成に失敗した場合は CDP が使えないものとして記録し (available が False)、
+    以降の試行は通常のセッションで処理されます。
+    """
+
+    def __init__(
+        self,
+        proxy_selector: ProxySelector,
+        option_factory: EdgeOptionFactory,
+        command_executor: str = 'http://selenium:4444/wd/hub',
+        max_contexts_per_session: int = DEFAULT_MAX_CONTEXTS_PER_SESSION,
+        tracer: Tracer | None = None,
+        resource_blocker: ResourceBlocker | None = None,
+        command_timeout: float | None = None,
+        logger: logging.Logger | None = None
+    ):
+        """
+        Args:
+            proxy_selector: 共有セッションの作成に使う Proxy #0 を選択する ProxySelector。
+            option_factory: EdgeOptions を生成するファクトリ。
+            command_executor: Selenium Grid / Hub の URL。
+            max_contexts_per_session: 共有セッションを作り直すまでに作成するブラウザコンテキストの数。
+            tracer: 指定時は共有セッションの WebDriver コマンドをスパンとして記録します (任意)。
+            resource_blocker: 指定時は遮断したリクエストを数えられるよう共有セッションのログを有効にします (任意)。
+            command_timeout: 共有セッションの WebDriver コマンドの HTTP 往復の最大秒数 (任意)。
+            logger: 使用するロガー。省略時はアプリケーションロガー。
+
+        Raises:
+            ValueError: max_contexts_per_session が1未満の場合。
+        """
+        if max_contexts_per_session < 1:
+            raise ValueError("max_contexts_per_session must be at least 1")
+        self._selector: ProxySelector = proxy_selector
+        self._option_factory: EdgeOptionFactory = option_factory
+        self._command_executor: str = command_executor
+        self._max_contexts: int = max_contexts_per_session
+        self._tracer: Tracer | None = tracer
+        self._resource_blocker: ResourceBlocker | None = resource_blocker
+        self._command_timeout: float | None = command_timeout
+        self._logger: logging.Logger = logger or get_logger()
+        self._idle: list[_SharedSession] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        # None は未確認、True は CDP でコンテキストを作成できた、False は使えない
+        self._available: bool | None = None
+        self.sessions_created = 0
+
+    @property
+    def available(self) -> bool | None:
+        """CDP でブラウザコンテキストを作成できるかどうか (未確認の場合は None)。"""
+        return self._available
+
+    @property
+    def option_factory(self) -> EdgeOptionFactory:
+        return self._option_factory
+
+    def mark_available(self) -> None:
+        self._available = True
+
+    def mark_unavailable(self, reason: BaseException) -> None:
+        """CDP が使えないことを記録します。以降の試行は通常のセッションで処理されます。"""
+        with self._lock:
+            if self._available is False:
+                return
+            self._available = False
+        self._logger.warning(
+            "Browser contexts via CDP are unavailable (%s); falling back to one session per proxy.", reason)
+
+    def acquire(self, timings: PhaseTimings | None = None) -> _SharedSession:
+        """
+        空いている共有セッションを返します。無ければ新しく作成します。
+
+        Raises:
+            RuntimeError: プールが閉じられている場合。
+            WebDriverException: 共有セッションの作成に失敗した場合。
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Shared session pool is already closed")
+            if self._idle:
+                return self._idle.pop()
+        timings = timings or PhaseTimings()
+        with timings.measure("create_options"):
+            options = self._option_factory.create_options(self._selector.select_proxy(0))
+            if self._resource_blocker is not None:
+                self._resource_blocker.configure_options(options)
+        command_executor = create_command_executor(self._command_executor, self._tracer, self._command_timeout)
+        try:
+            with timings.measure("session_create"):
+                driver = webdriver.Remote(command_executor=command_executor, options=options)
+        except Exception:
+            self._option_factory.release_options(options)
+            raise
+        with self._lock:
+            self.sessions_created += 1
+        self._logger.info("Started shared browser session %s for browser contexts.",
+                          getattr(driver, 'session_id', 'N/A'))
+        return _SharedSession(driver=driver, main_handle=driver.current_window_handle, options=options)
+
+    def release(self, session: _SharedSession, healthy: bool = True) -> None:
+        """
+        共有セッションをプールに返します。異常がある場合、使用回数が上限に達した場合、
+        またはプールが閉じられている場合はセッションを終了します。
+        """
+        with self._lock:
+            keep = healthy and not self._closed and session.contexts_created < self._max_contexts
+            if keep:
+                self._idle.append(session)
+        if not keep:
+            self._quit(session)
+
+    def close(self) -> None:
+        """空いている共有セッションをすべて終了します (使用中のものは返却時に終了します)。"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._quit(session)
+
+    def _quit(self, session: _SharedSession) -> None:
+        try:
+            session.driver.quit()
+        except Exception as e:
+            self._logger.warning("Failed to quit shared browser session: %s", e)
+        if session.options is not None:
+            self._option_factory.release_options(session.options)
+
+
+class CdpContextBrowser(ProxiedEdgeBrowser):
+    """
+    1つの Edge セッションの中に、プロキシごとのブラウザコンテキスト (Target.createBrowserContext) を
+    作成して処理する ProxiedEdgeBrowser。
+
+    コンテキストは Cookie やキャッシュが他のコンテキストと分離され、プロキシを個別に指定できるため、
+    プロキシごとに新しいブラウザプロセス (Grid のセッション) を起動するより大幅に軽量です。
+    ページ移動・スクリーンショット・IP 確認・タブの処理は ProxiedEdgeBrowser と同じです。
+    CDP が使えない環境 (SharedEdgeSessionPool.available が False) では通常のセッションで処理します。
+    """
+
+    def __init__(
+        self,
+        session_pool: SharedEdgeSessionPool,
+        proxy_selector: ProxySelector,
+        command_executor: str = 'http://selenium:4444/wd/hub',
+        **kwargs
+    ):
+        """
+        Args:
+            session_pool: 共有セッションのプール。
+            proxy_selector: プロキシを選択する ProxySelector。
+            command_executor: CDP が使えない場合に通常のセッションを作成する Selenium Grid / Hub の URL。
+            **kwargs: ProxiedEdgeBrowser に渡すその他の引数 (logger・metrics・readiness など)。
+        """
+        super().__init__(proxy_selector, session_pool.option_factory, command_executor, **kwargs)
+        self._pool: SharedEdgeSessionPool = session_pool
+        self._shared: _SharedSession | None = None
+        self._context_id: str | None = None
+
+    def start_browser(self, proxy_index: int) -> None:
+        """
+        共有セッションにプロキシ用のブラウザコンテキストを作成し、そのタブに切り替えます。
+        CDP が使えない場合は通常のセッションを起動します。
+        """
+        if self._pool.available is False:
+            super().start_browser(proxy_index)
+            return
+        self._logger.info(
+            "Attempting to open a browser context using proxy index %s...", proxy_index)
+        if self._driver is not None:
+            self.close_browser()
+        self._timings = PhaseTimings(self._metrics)
+        self._reset_tabs()
+        self._blocked_requests = {}
+
+        proxy_info: ProxyInfo = self._selector.select_proxy(proxy_index)
+        shared = self._pool.acquire(self._timings)
+        context_id: str | None = None
+        try:
+            with self._timings.measure("context_create"):
+                params = {"proxyServer": self._option_factory.proxy_server(proxy_info), "disposeOnDetach": False}
+                if self._option_factory.proxy_bypass_list:
+                    params["proxyBypassList"] = ";".join(self._option_factory.proxy_bypass_list)
+                context_id = execute_cdp(shared.driver, "Target.createBrowserContext", params)["browserContextId"]
+                shared.contexts_created += 1
+                target_id = execute_cdp(shared.driver, "Target.createTarget", {
+                    "url": "about:blank", "browserContextId": context_id})["targetId"]
+                shared.driver.switch_to.window(target_id)
+        except (WebDriverException, KeyError) as e:
+            if context_id is None and self._pool.available is None:
+                # CDP 自体が使えない: 共有セッションは返却し、通常のセッションで処理する
+                self._pool.release(shared)
+                self._pool.mark_unavailable(e)
+                super().start_browser(proxy_index)
+                return
+            self._logger.error("Failed to open a browser context: %s", e, exc_info=True)
+            self._dispose(shared, context_id)
+            raise
+        self._pool.mark_available()
+        if self._resource_blocker is not None:
+            self._discard_performance_log(shared)
+        self._shared = shared
+        self._context_id = context_id
+        self._driver = shared.driver
+        self._proxy_info = proxy_info
+        self._logger.info("Browser context %s opened via proxy %s:%s.", context_id, proxy_info.host, proxy_info.port)
+
+    def close_browser(self) -> None:
+        """ブラウザコンテキストを破棄し、共有セッションをプールに返します。"""
+        if self._shared is None:
+            super().close_browser()
+            return
+        shared, context_id = self._shared, self._context_id
+        # 別スレッドから打ち切られた場合も、以降のコマンドが共有セッションを使わないよう先に参照を外す
+        self._shared = None
+        self._context_id = None
+        self._driver = None
+        self._proxy_info = None
+        self._reset_tabs()
+        self._logger.info("Closing browser context %s...", context_id)
+        with self._timings.measure("quit"):
+            self._dispose(shared, context_id)
+
+    def abort(self) -> None:
+        """
+        CDP が使えず通常のセッションで処理している場合はセッションを終了します。共有セッションは
+        他の試行も使うため終了せず、実行中のコマンドは共有セッションの command_timeout で戻ります。
+        """
+        if self._pool.available is False:
+            super().abort()
+
+    def _discard_performance_log(self, shared: _SharedSession) -> None:
+        # 共有セッションのログには前のコンテキストのイベントが残っているため、数え始める前に読み捨てる
+        try:
+            read_performance_log(shared.driver)
+        except WebDriverException as e:
+            self._logger.debug("Could not clear the performance log of the shared session: %s", e)
+
+    def _dispose(self, shared: _SharedSession, context_id: str | None) -> None:
+        healthy = True
+        try:
+            if context_id is not None:
+                execute_cdp(shared.driver, "Target.disposeBrowserContext", {"browserContextId": context_id})
+            shared.driver.switch_to.window(shared.main_handle)
+        except Exception as e:
+            # 共有セッションの状態が分からないため、プールには戻さず終了する
+            self._logger.error("Failed to dispose browser context %s: %s", context_id, e)
+            healthy = False
+        self._pool.release(shared, healthy)
+
+    def _new_tab(self) -> str:
+        if self._context_id is None:
+            return super()._new_tab()
+        # 新しいタブも同じコンテキスト (同じプロキシ) に作成する
+        target_id = execute_cdp(self._driver, "Target.createTarget", {
+            "url": "about:blank", "browserContextId": self._context_id})["targetId"]
+        self._driver.switch_to.window(target_id)
+        return target_id
@@ -0,0 +1,176 @@
+# src/application/concurrency_controller.py
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+from ..application.run_metrics import RunMetrics
+from ..config.logging_config import get_logger
+
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_INITIAL_CONCURRENCY = 2
+# セッション作成がこの秒数を超えたら Grid が混雑しているとみなす
+DEFAULT_SESSION_LATENCY_TARGET_SECONDS = 15.0
+# 直近のセッション作成のうち、この割合を超えて失敗したら Grid が混雑しているとみなす
+DEFAULT_MAX_SESSION_ERROR_RATE = 0.2
+DEFAULT_WINDOW_SIZE = 20
+# 判定に必要な最小サンプル数 (起動直後の1件の失敗で絞り込まないため)
+MIN_SAMPLES = 5
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class AimdConcurrencyController:
+    """
+    同時に実行するブラウザセッション数を AIMD (加算増加・乗算減少) で調整するクラス。
+
+    セッション作成の所要時間 (指数移動平均) と、直近のセッション作成の失敗率を監視します。
+    どちらも目標内であれば、成功1件ごとに上限を 1/上限 ずつ増やします (上限分の成功で +1)。
+    目標を超えたら上限を decrease_factor 倍に減らし、その後は上限と同じ件数の結果が
+    集まるまで次の減少を行いません (実行中のセッションが一斉に失敗しても一気に潰れないため)。
+    決定した上限と監視値は RunMetrics のゲージとして公開します。
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = DEFAULT_MIN_CONCURRENCY,
+        initial_limit: int = DEFAULT_INITIAL_CONCURRENCY,
+        latency_target_seconds: float = DEFAULT_SESSION_LATENCY_TARGET_SECONDS,
+        max_error_rate: float = DEFAULT_MAX_SESSION_ERROR_RATE,
+        decrease_factor: float = 0.5,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        metrics: RunMetrics | None = None,
+        logger: logging.Logger | None = None
+    ):
+        """
+        Args:
+            max_limit: 同時実行数の上限の最大値 (ワーカースレッド数)。
+            min_limit: 同時実行数の上限の最小値。
+            initial_limit: 開始時の上限 (min_limit..max_limit に丸めます)。
+            latency_target_seconds: セッション作成の所要時間の目標 (秒)。
+            max_error_rate: 許容するセッション作成の失敗率 (0〜1)。
+            decrease_factor: 混雑時に上限に掛ける係数 (0〜1)。
+            window_size: 失敗率の計算に使う直近のセッション数。
+            metrics: 上限などをゲージとして公開する RunMetrics (任意)。
+            logger: 使用するロガー。省略時はアプリケーションロガー。
+
+        Raises:
+            ValueError: 上下限や係数が不正な場合。
+        """
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        if latency_target_seconds <= 0:
+            raise ValueError("latency_target_seconds must be positive")
+
+        self._min: int = min_limit
+        self._max: int = max_limit
+        self._latency_target: float = latency_target_seconds
+        self._max_error_rate: float = max_error_rate
+        self._decrease_factor: float = decrease_factor
+        self._metrics: RunMetrics | None = metrics
+        self._logger: logging.Logger = logger or get_logger()
+
+        # 上限は小数で持ち、整数部分を実際の上限とする
+        self._window: float = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight: int = 0
+        self._recent_errors: deque[bool] = deque(maxlen=window_size)
+        self._latency_ewma: float | None = None
+        self._cooldown: int = 0
+        self._condition = threading.Condition()
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        """現在の同時実行数の上限。"""
+        return int(self._window)
+
+    @property
+    def max_limit(self) -> int:
+        """上限の最大値 (必要なワーカースレッド数)。"""
+        return self._max
+
+    @property
+    def in_flight(self) -> int:
+        """現在実行中のセッション数。"""
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """実行中のセッション数が上限未満になるまで待ち、枠を1つ確保します。"""
+        with self._condition:
+            while self._in_flight >= int(self._window):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """acquire で確保した枠を返却します。"""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """with ブロックの間、枠を1つ確保します。"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_session(self, create_seconds: float | None, failed: bool) -> None:
+        """
+        1回分のセッション作成の結果を反映し、必要に応じて上限を増減します。
+
+        Args:
+            create_seconds: セッション作成の所要秒数 (不明な場合は None)。
+            failed: セッション作成が失敗したかどうか (WebDriverException に限らず、urllib3 のタイムアウトなども含む)。
+        """
+        with self._condition:
+            self._recent_errors.append(failed)
+            if create_seconds is not None:
+                self._latency_ewma = create_seconds if self._latency_ewma is None else \
+                    LATENCY_EWMA_ALPHA * create_seconds + (1 - LATENCY_EWMA_ALPHA) * self._latency_ewma
+            if self._cooldown > 0:
+                self._cooldown -= 1
+
+            previous = int(self._window)
+            reason = self._congestion_reason()
+            if reason is not None:
+                if self._cooldown == 0:
+                    self._window = max(float(self._min), self._window * self._decrease_factor)
+                    # 減少前に開始したセッションの結果が揃うまで、次の減少は行わない
+                    self._cooldown = previous
+                    self._recent_errors.clear()
+            elif not failed:
+                self._window = min(float(self._max), self._window + 1.0 / self._window)
+
+            current = int(self._window)
+            if current > previous:
+                # 上限が増えた分だけ待機中のワーカーを起こす
+                self._condition.notify(current - previous)
+            self._publish()
+        if current != previous:
+            self._logger.info(
+                "Concurrency limit changed %s -> %s (%s)", previous, current, reason or "healthy")
+
+    def _congestion_reason(self) -> str | None:
+        if self._latency_ewma is not None and self._latency_ewma > self._latency_target:
+            return f"session create {self._latency_ewma:.1f}s > {self._latency_target:g}s"
+        if len(self._recent_errors) >= MIN_SAMPLES and self._error_rate() > self._max_error_rate:
+            return f"session error rate {self._error_rate():.0%}"
+        return None
+
+    def _error_rate(self) -> float:
+        if not self._recent_errors:
+            return 0.0
+        return sum(self._recent_errors) / len(self._recent_errors)
+
+    def _publish(self) -> None:
+        if self._metrics is None:
+            return
+        self._metrics.set_gauge("concurrency_limit", int(self._window))
+        self._metrics.set_gauge("concurrency_session_error_rate", self._error_rate())
+        if self._latency_ewma is not None:
+            self._metrics.set_gauge("concurrency_session_create_seconds", self._latency_ewma)
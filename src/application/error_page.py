@@ -0,0 +1,132 @@
+# src/application/error_page.py
+import re
+from dataclasses import dataclass, field
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from ..application.retry_policy import ERROR_NAVIGATION_TIMEOUT, ERROR_PROXY
+
+# 1回のスクリプト実行で、エラーページの判定に必要な情報をまとめて取得する
+# (Chromium のネットワークエラーページはエラーコードを .error-code 要素に表示する)
+_PROBE_SCRIPT = """
+var code = document.querySelector('.error-code');
+return {url: document.URL, errorCode: code ? code.textContent : '', title: document.title,
+        text: document.body ? document.body.innerText.slice(0, arguments[0]) : ''};
+"""
+_CHROMIUM_ERROR_URL_PREFIX = "chrome-error://"
+_NET_ERROR_PATTERN = re.compile(r"\b(?:net::)?(ERR_[A-Z0-9_]+)")
+# タイムアウト系のネットワークエラーは navigation_timeout、それ以外はプロキシの問題として扱う
+_TIMEOUT_NET_ERRORS = ("ERR_TIMED_OUT", "ERR_CONNECTION_TIMED_OUT")
+DEFAULT_TEXT_LIMIT = 2000
+
+
+@dataclass(frozen=True)
+class BlockPageSignature:
+    """
+    プロキシの送信元 IP がブロックされたことを示すページを、タイトルまたは本文の正規表現で識別するシグネチャ。
+
+    Attributes:
+        name (str): ログや結果レコードに出すシグネチャ名。
+        pattern (str): タイトルまたは本文の先頭部分に対して検索する正規表現。
+    """
+    name: str
+    pattern: str
+    _compiled: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_compiled", re.compile(self.pattern, re.DOTALL))
+
+    def matches(self, title: str, text: str) -> bool:
+        return self._compiled.search(title) is not None or self._compiled.search(text) is not None
+
+
+DEFAULT_BLOCK_PAGE_SIGNATURES: tuple[BlockPageSignature, ...] = (
+    BlockPageSignature("cloudflare_block", r"Attention Required! \| Cloudflare|Sorry, you have been blocked"),
+    BlockPageSignature("akamai_access_denied", r"Access Denied.*You don't have permission to access"),
+    BlockPageSignature("squid_error", r"ERROR: The requested URL could not be retrieved"),
+    BlockPageSignature("proxy_auth_required", r"407 Proxy Authentication Required"),
+)
+
+
+class NavigationAbortedError(WebDriverException):
+    """
+    ページ移動の結果がネットワークエラーページまたはブロックページだったため、
+    キャプチャを行わずに打ち切ったことを示す例外。
+
+    Attributes:
+        url (str): 移動しようとした URL。
+        reason (str): 打ち切りの理由 (ERR_PROXY_CONNECTION_FAILED などのエラーコード、またはシグネチャ名)。
+        error_category (str): エラーの分類 (classify_error はこの値を優先します)。
+    """
+
+    def __init__(self, url: str, reason: str, error_category: str = ERROR_PROXY):
+        super().__init__(f"Navigation to '{url}' aborted: {reason}")
+        self.url: str = url
+        self.reason: str = reason
+        self.error_category: str = error_category
+
+
+def _net_error_category(code: str) -> str:
+    return ERROR_NAVIGATION_TIMEOUT if code in _TIMEOUT_NET_ERRORS else ERROR_PROXY
+
+
+class ErrorPageDetector:
+    """
+    ページ移動の直後 (または準備完了を待つ間) に、表示中のページが Chromium のネットワークエラーページや
+    既知のブロックページでないかを調べるクラス。見つかった場合は NavigationAbortedError を送出し、
+    エラーページのスクリーンショット取得や準備完了待ちに時間を使わずに済むようにします。
+    """
+
+    def __init__(
+        self,
+        signatures: tuple[BlockPageSignature, ...] = DEFAULT_BLOCK_PAGE_SIGNATURES,
+        text_limit: int = DEFAULT_TEXT_LIMIT
+    ):
+        """
+        Args:
+            signatures: ブロックページのシグネチャ。
+            text_limit: シグネチャの検索対象とする本文の先頭の文字数。
+        """
+        self._signatures: tuple[BlockPageSignature, ...] = tuple(signatures)
+        self._text_limit: int = text_limit
+
+    def check(self, driver: RemoteWebDriver, url: str) -> None:
+        """
+        表示中のページを調べ、エラーページまたはブロックページなら NavigationAbortedError を送出します。
+
+        Args:
+            driver: 調べる WebDriver。
+            url: 移動しようとした URL (エラーメッセージ用)。
+
+        Raises:
+            NavigationAbortedError: エラーページまたはブロックページの場合。
+        """
+        page = driver.execute_script(_PROBE_SCRIPT, self._text_limit)
+        if not isinstance(page, dict):
+            return
+        title = page.get("title") or ""
+        text = page.get("text") or ""
+        match = _NET_ERROR_PATTERN.search(page.get("errorCode") or "")
+        if match is None and str(page.get("url") or "").startswith(_CHROMIUM_ERROR_URL_PREFIX):
+            match = _NET_ERROR_PATTERN.search(text)
+            if match is None:
+                raise NavigationAbortedError(url, "browser error page")
+        if match is not None:
+            code = match.group(1)
+            raise NavigationAbortedError(url, f"net::{code}", _net_error_category(code))
+        for signature in self._signatures:
+            if signature.matches(title, text):
+                raise NavigationAbortedError(url, f"block page ({signature.name})")
+
+    @staticmethod
+    def from_navigation_error(error: WebDriverException, url: str) -> NavigationAbortedError | None:
+        """
+        driver.get が送出した例外のメッセージに Chromium のネットワークエラーコードが含まれていれば、
+        対応する NavigationAbortedError を返します (含まれていなければ None)。
+        """
+        match = _NET_ERROR_PATTERN.search(error.msg or "")
+        if match is None:
+            return None
+        code = match.group(1)
+        return NavigationAbortedError(url, f"net::{code}", _net_error_category(code))
@@ -0,0 +1,302 @@
+# src/application/hedged_capture.py
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from ..adapters.result_sink import ResultSink
+from ..adapters.run_journal import RunJournal
+from ..application.proxied_edge_browser import ProxiedEdgeBrowser
+from ..application.retry_policy import RetryPolicy, classify_error
+from ..application.rotation_runner import DEFAULT_SCREENSHOT_DIR, MODE_SCREENSHOT, build_screenshot_path
+from ..application.run_metrics import RunMetrics
+from ..config.logging_config import get_logger
+from ..domain.attempt_record import AttemptRecord
+from ..domain.capture_result import OUTCOME_CANCELLED, OUTCOME_FAILED, OUTCOME_WON, CaptureResult
+from ..domain.proxy_info import ProxyInfo
+
+# 追加で開始する試行 (ヘッジ) の数の上限を、通常の試行の数に対する割合で指定する
+DEFAULT_HEDGE_BUDGET = 0.1
+DEFAULT_HEDGE_QUANTILE = 0.9
+# 所要時間のサンプルが揃うまでに使うヘッジまでの待機秒数
+DEFAULT_INITIAL_HEDGE_DELAY_SECONDS = 10.0
+MIN_LATENCY_SAMPLES = 10
+LATENCY_WINDOW_SIZE = 200
+# 打ち切った試行のスレッドが必ず戻れるよう、ヘッジする実行で WebDriver コマンドに設定する最大秒数
+DEFAULT_HEDGE_COMMAND_TIMEOUT_SECONDS = 120.0
+# ページ移動が完了するまでのフェーズ
+_PHASES_UNTIL_NAVIGATED = ("create_options", "session_create", "navigate")
+
+
+def navigation_latency(timings: dict[str, float]) -> float | None:
+    """
+    試行のフェーズごとの所要時間から、ページ移動が完了するまでの秒数を返します。
+    ページ移動まで進まなかった試行 (navigate が無い) の場合は None。
+    """
+    if "navigate" not in timings:
+        return None
+    return sum(timings.get(phase, 0.0) for phase in _PHASES_UNTIL_NAVIGATED)
+
+
+class LatencyWindow:
+    """直近の所要時間を保持し、分位数を返すスライディングウィンドウ。"""
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE, min_samples: int = MIN_LATENCY_SAMPLES):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._min_samples: int = min_samples
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def quantile(self, q: float) -> float | None:
+        """q 分位数を返します。サンプルが min_samples 未満の場合は None。"""
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+@dataclass
+class _Attempt:
+    index: int
+    browser: ProxiedEdgeBrowser
+    screenshot_path: str
+    started: float
+    started_at: float
+    number: int = 1
+    delay: float = 0.0
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+
+class HedgedCapturer:
+    """
+    1つの URL のスクリーンショットを1枚取得するために、遅いプロキシを別のプロキシで追い越すクラス。
+
+    試行が直近のページ移動完了までの所要時間の p90 を過ぎても終わらない場合、
+    次のプロキシで同じ URL の試行を並行して開始し、先に成功した方を採用します。
+    負けた方の試行はセッションを終了 (ProxiedEdgeBrowser.abort) して実行中のコマンドを打ち切り、
+    その試行のスレッドが戻ってから結果を返します (呼び出し元が共有のリソースを片付けても安全です)。
+    セッションの作成中で終了できない試行は、ブラウザの command_timeout で戻ります。
+    ヘッジの数は通常の試行の数の hedge_budget 倍までに制限されます。
+    試行が失敗した場合は、再試行ポリシーで再試行できるエラー (Grid 側の障害など) なら同じプロキシで、
+    それ以外は次のプロキシで通常の試行を開始します。
+    直近の所要時間は seed_latencies で過去の実行の結果レコードから補えるため、1回の実行で
+    1枚だけキャプチャする場合もサンプルの分位数でヘッジを開始できます。
+    """
+
+    def __init__(
+        self,
+        browser_factory: Callable[[], ProxiedEdgeBrowser],
+        screenshot_dir: str = DEFAULT_SCREENSHOT_DIR,
+        hedge_budget: float = DEFAULT_HEDGE_BUDGET,
+        quantile: float = DEFAULT_HEDGE_QUANTILE,
+        initial_hedge_delay: float = DEFAULT_INITIAL_HEDGE_DELAY_SECONDS,
+        metrics: RunMetrics | None = None,
+        result_sink: ResultSink | None = None,
+        journal: RunJournal | None = None,
+        retry_policy: RetryPolicy | None = None,
+        logger: logging.Logger | None = None
+    ):
+        """
+        Args:
+            browser_factory: 試行ごとに ProxiedEdgeBrowser を生成する関数。
+            screenshot_dir: スクリーンショットの保存先ディレクトリ (コンテナ内のパス)。
+            hedge_budget: 通常の試行の数に対するヘッジの数の上限の割合 (0 でヘッジしない)。
+            quantile: ヘッジを開始する所要時間の分位数。
+            initial_hedge_delay: 所要時間のサンプルが揃うまでのヘッジまでの待機秒数。
+            metrics: ヘッジの数と待機秒数をゲージとして公開する RunMetrics (任意)。
+            result_sink: 完了した試行 (採用・失敗) のレコードの書き出し先 (任意)。打ち切った試行は書き出しません。
+            journal: 完了した試行を記録し、再開前の実行で完了済みのプロキシを使わないための実行ジャーナル (任意)。
+            retry_policy: 指定時は失敗した試行をエラー分類ごとの設定に従って同じプロキシで再試行します (任意)。
+            logger: 使用するロガー。省略時はアプリケーションロガー。
+        """
+        self._browser_factory = browser_factory
+        self._screenshot_dir: str = screenshot_dir
+        self._budget: float = hedge_budget
+        self._quantile: float = quantile
+        self._initial_delay: float = initial_hedge_delay
+        self._metrics: RunMetrics | None = metrics
+        self._sink: ResultSink | None = result_sink
+        self._journal: RunJournal | None = journal
+        self._retry_policy: RetryPolicy | None = retry_policy
+        self._logger: logging.Logger = logger or get_logger()
+        self._latencies = LatencyWindow()
+        self._primaries: int = 0
+        self._hedges: int = 0
+
+    @property
+    def hedge_delay(self) -> float:
+        """試行の開始からヘッジを開始するまでの秒数 (直近の所要時間の分位数)。"""
+        observed = self._latencies.quantile(self._quantile)
+        return self._initial_delay if observed is None else observed
+
+    def seed_latencies(self, records: Iterable[AttemptRecord]) -> int:
+        """
+        過去の実行の結果レコードのうち、ページ移動まで完了した試行の所要時間を直近の所要時間として取り込みます。
+
+        Returns:
+            int: 取り込んだサンプルの数。
+        """
+        added = 0
+        for record in records:
+            seconds = navigation_latency(record.timings) if record.success else None
+            if seconds is not None:
+                self._latencies.add(seconds)
+                added += 1
+        return added
+
+    def capture(self, url: str, proxies: list[ProxyInfo], indices: Iterable[int]) -> CaptureResult:
+        """
+        indices の順にプロキシを使い、url のスクリーンショットを1枚取得します。
+
+        Args:
+            url: キャプチャ対象の URL。
+            proxies: プロキシのリスト (ProxySelector に渡したものと同じ順序)。
+            indices: 使用するプロキシのインデックス (先頭から順に使います)。
+
+        Returns:
+            CaptureResult: 採用されたキャプチャと、開始した試行ごとの結末。
+        """
+        started = time.perf_counter()
+        candidates = (index for index in indices
+                      if self._journal is None or not self._journal.is_done(proxies[index], url))
+        running: dict[Future, _Attempt] = {}
+        outcomes: dict[int, str] = {}
+        hedges = 0
+        winner: _Attempt | None = None
+        exhausted = False
+        # 負けた試行を打ち切ってからスレッドの終了を待つため、with 文は使わない
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="proxyrot-hedge")
+
+        def launch(index: int | None = None, number: int = 1, delay: float = 0.0) -> bool:
+            if index is None:
+                index = next(candidates, None)
+                if index is None:
+                    return False
+            attempt = _Attempt(index, self._browser_factory(),
+                               build_screenshot_path(index, proxies[index], self._screenshot_dir),
+                               time.perf_counter(), time.time(), number, delay)
+            running[executor.submit(self._run_attempt, url, proxies[index], attempt)] = attempt
+            return True
+
+        try:
+            if launch():
+                self._primaries += 1
+            while running and winner is None:
+                timeout = None
+                if len(running) == 1 and not exhausted and self._hedge_allowed():
+                    (attempt,) = running.values()
+                    timeout = max(0.0, attempt.started + self.hedge_delay - time.perf_counter())
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # 先行する試行が遅いため、次のプロキシで同じ URL を並行して開始する
+                    (slow,) = running.values()
+                    if launch():
+                        hedges += 1
+                        self._hedges += 1
+                        self._logger.info(
+                            "Proxy #%s has not finished after %.1fs; hedging with another proxy.",
+                            slow.index, time.perf_counter() - slow.started)
+                    else:
+                        exhausted = True
+                    continue
+                retry: tuple[int, int, float] | None = None
+                for future in done:
+                    attempt = running.pop(future)
+                    record: AttemptRecord = future.result()
+                    if record.success and winner is None:
+                        winner = attempt
+                        outcomes[attempt.index] = OUTCOME_WON
+                    elif not record.success and winner is None and retry is None and self._retry_policy is not None \
+                            and self._retry_policy.should_retry(record.error_category, attempt.number):
+                        # Grid 側の障害など、プロキシ自体の失敗ではない場合は同じプロキシで再試行する
+                        delay = self._retry_policy.backoff(record.error_category, attempt.number)
+                        self._logger.warning(
+                            "Capture via proxy #%s failed with %s error; retrying in %.1fs.",
+                            attempt.index, record.error_category, delay)
+                        retry = (attempt.index, attempt.number + 1, delay)
+                        continue
+                    else:
+                        outcomes[attempt.index] = OUTCOME_FAILED
+                    self._record(record)
+                if winner is None and retry is not None:
+                    launch(*retry)
+                elif winner is None and not running and launch():
+                    self._primaries += 1
+        finally:
+            elapsed = time.perf_counter() - started
+            for attempt in running.values():
+                self._cancel(attempt)
+                outcomes[attempt.index] = OUTCOME_CANCELLED
+            executor.shutdown(wait=True)
+            self._publish()
+
+        return CaptureResult(
+            url=url, success=winner is not None,
+            proxy_index=winner.index if winner else None,
+            screenshot_path=winner.screenshot_path if winner else None,
+            elapsed_seconds=elapsed,
+            outcomes=outcomes, hedges_started=hedges)
+
+    def _hedge_allowed(self) -> bool:
+        # このヘッジを加えても上限 (通常の試行の数の hedge_budget 倍) を超えない場合だけ許可する
+        return self._hedges + 1 <= self._budget * self._primaries
+
+    def _record(self, record: AttemptRecord) -> None:
+        if self._sink is not None:
+            self._sink.write(record)
+        if self._journal is not None:
+            self._journal.write(record)
+
+    def _run_attempt(self, url: str, proxy: ProxyInfo, attempt: _Attempt) -> AttemptRecord:
+        # ブラウザはこのスレッドだけが操作する。打ち切りは cancelled で通知され (セッションは abort で終了済み)、
+        # 実行中のコマンドが戻った時点で with ブロックを抜けて参照とプロファイルのコピーを片付ける。
+        browser = attempt.browser
+        fields = dict(proxy_index=attempt.index, proxy_host=proxy.host, proxy_port=proxy.port, url=url,
+                      mode=MODE_SCREENSHOT, started_at=attempt.started_at, attempts=attempt.number)
+        session_started = False
+        try:
+            if attempt.delay and attempt.cancelled.wait(attempt.delay):
+                return AttemptRecord(**fields, success=False, timings={})
+            with browser:
+                browser.start_browser(proxy_index=attempt.index)
+                session_started = True
+                if not attempt.cancelled.is_set():
+                    browser.take_screenshot(url=url, save_path_in_container=attempt.screenshot_path)
+                timings = {**browser.timings.as_dict(), "total": time.perf_counter() - attempt.started}
+                if attempt.cancelled.is_set():
+                    return AttemptRecord(**fields, success=False, timings=timings)
+            seconds = navigation_latency(timings)
+            if seconds is not None:
+                self._latencies.add(seconds)
+            return AttemptRecord(**fields, success=True, timings=timings, screenshot_path=attempt.screenshot_path)
+        except Exception as e:
+            if not attempt.cancelled.is_set():
+                self._logger.error(
+                    "Capture of '%s' via proxy #%s failed: %s", url, attempt.index, e)
+            return AttemptRecord(
+                **fields, success=False, timings={**browser.timings.as_dict(),
+                                                  "total": time.perf_counter() - attempt.started},
+                error_class=e.__class__.__name__, error_message=str(e), error_category=classify_error(e, session_create=not session_started))
+
+    def _cancel(self, attempt: _Attempt) -> None:
+        # 試行のスレッドに打ち切りを通知し、ブロックしているコマンドが戻るようセッションを終了する
+        attempt.cancelled.set()
+        self._logger.info("Cancelling slower capture via proxy #%s.", attempt.index)
+        attempt.browser.abort()
+
+    def _publish(self) -> None:
+        if self._metrics is not None:
+            self._metrics.set_gauge("hedge_sessions_started", self._hedges)
+            self._metrics.set_gauge("hedge_delay_seconds", self.hedge_delay)
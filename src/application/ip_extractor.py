@@ -0,0 +1,66 @@
+# src/application/ip_extractor.py
+import ipaddress
+import json
+import re
+
+# JSON 応答で送信元 IP を表すキー (api.ipify.org: ip / httpbin.org/ip: origin / ip-api.com: query)
+IP_JSON_KEYS = ("ip", "origin", "query")
+
+# 本文中の IP アドレス候補 (最終的な妥当性は ipaddress で検証する)
+_IP_CANDIDATE_PATTERN = re.compile(
+    r"(?<![\w.:])(?:\d{1,3}(?:\.\d{1,3}){3}|[0-9A-Fa-f]{0,4}(?::[0-9A-Fa-f]{0,4}){2,7})(?![\w.:])")
+
+
+def _normalize_ip(value: str) -> str | None:
+    """文字列が IP アドレスとして妥当なら正規化した表記を返し、そうでなければ None を返す。"""
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except ValueError:
+        return None
+
+
+def _extract_from_json(text: str) -> str | None:
+    """本文中の最初の '{' から最後の '}' までを JSON として解釈し、IP アドレスを取り出す。"""
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end == -1 or start >= end:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    for key in IP_JSON_KEYS:
+        value = data.get(key)
+        if isinstance(value, str):
+            # httpbin の origin は "1.2.3.4, 5.6.7.8" のように複数並ぶことがある
+            ip = _normalize_ip(value.split(',')[0])
+            if ip:
+                return ip
+    return None
+
+
+def extract_ip(text: str) -> str | None:
+    """
+    IP 確認ページの本文テキストから送信元 IP アドレスを取り出します。
+
+    まず JSON 応答 (api.ipify.org?format=json や httpbin.org/ip など) として解釈を試み、
+    失敗した場合は本文中に最初に現れる妥当な IPv4/IPv6 アドレスを返します。
+
+    Args:
+        text: ページの <body> テキスト、または HTTP 応答本文。
+
+    Returns:
+        str | None: 抽出した IP アドレス。見つからない場合は None。
+    """
+    if not text:
+        return None
+    ip = _extract_from_json(text)
+    if ip:
+        return ip
+    for match in _IP_CANDIDATE_PATTERN.finditer(text):
+        ip = _normalize_ip(match.group(0))
+        if ip:
+            return ip
+    return None
@@ -0,0 +1,220 @@
+# src/application/metrics.py
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
+
+# フェーズ所要時間のヒストグラムのバケット上限 (秒)。最後は +Inf。
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, math.inf)
+REPORTED_PERCENTILES: tuple[float, ...] = (0.50, 0.95, 0.99)
+
+
+class MetricsCollector(ABC):
+    """
+    フェーズごとの所要時間を受け取るメトリクス収集器のインターフェース (Abstract Base Class)。
+    """
+
+    @abstractmethod
+    def observe(self, phase: str, seconds: float) -> None:
+        """
+        1回分のフェーズ所要時間を記録する。
+
+        Args:
+            phase: フェーズ名 (例: 'session_create', 'navigate')。
+            seconds: 所要秒数。
+        """
+        pass  # 実装はサブクラスに委ねる
+
+
+class NullMetricsCollector(MetricsCollector):
+    """何も記録しないメトリクス収集器 (メトリクス不要時の既定値)。"""
+
+    def observe(self, phase: str, seconds: float) -> None:
+        pass
+
+
+class PhaseTimings:
+    """
+    1セッション分のフェーズごとの所要時間 (単調時計で計測) を保持するクラス。
+    同じフェーズが複数回計測された場合は合計されます。
+    """
+
+    def __init__(self, collector: MetricsCollector | None = None):
+        """
+        Args:
+            collector: 計測したフェーズ時間の送信先 (任意)。
+        """
+        self._collector: MetricsCollector = collector or NullMetricsCollector()
+        self._durations: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """
+        with ブロックの所要時間をフェーズとして計測します。例外で抜けた場合も記録されます。
+
+        Args:
+            phase: フェーズ名。
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - started)
+
+    def record(self, phase: str, seconds: float) -> None:
+        """計測済みのフェーズ時間を記録し、メトリクス収集器に送信します。"""
+        self._durations[phase] = self._durations.get(phase, 0.0) + seconds
+        self._collector.observe(phase, seconds)
+
+    def get(self, phase: str) -> float | None:
+        """フェーズの所要秒数を返します。未計測の場合は None。"""
+        return self._durations.get(phase)
+
+    def as_dict(self) -> dict[str, float]:
+        """フェーズ名と所要秒数の辞書 (コピー) を返します。"""
+        return dict(self._durations)
+
+
+class Histogram:
+    """固定バケットのヒストグラム (件数・合計・バケットごとの件数)。"""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q: float) -> float | None:
+        """バケット内を線形補間してパーセンタイル値を推定する。"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i]
+                if math.isinf(upper):
+                    # +Inf バケットは上限が無いため、下限値を返す
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-2]
+
+
+class ThreadShards:
+    """
+    スレッドごとに独立したシャード (集計用オブジェクト) を払い出すヘルパー。
+
+    各スレッドは自分のシャードだけを更新するため、ホットパスでロックを取る必要がありません。
+    ロックはスレッドが初めてシャードを取得する際の登録時と、集計時のシャード一覧の取得時にのみ使います。
+    """
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory: 新しいシャードを生成する引数なしの関数。
+        """
+        self._factory = factory
+        self._local = threading.local()
+        self._shards: list = []
+        self._lock = threading.Lock()
+
+    def local(self):
+        """呼び出したスレッド専用のシャードを返します。"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = self._factory()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def all(self) -> list:
+        """登録済みの全シャードのリスト (コピー) を返します。"""
+        with self._lock:
+            return list(self._shards)
+
+
+class HistogramMetricsCollector(MetricsCollector):
+    """
+    フェーズごとに固定バケットのヒストグラムを保持し、p50/p95/p99 を推定できるメトリクス収集器。
+    サンプルを保持しないため、長時間の実行でもメモリ使用量は一定です。
+    observe はスレッドごとのシャードを更新するだけなので、ワーカースレッドがロックで待たされません。
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: 昇順のバケット上限 (秒)。最後の要素は math.inf である必要があります。
+
+        Raises:
+            ValueError: buckets が昇順でない、または最後が math.inf でない場合。
+        """
+        if list(buckets) != sorted(buckets) or not buckets or not math.isinf(buckets[-1]):
+            raise ValueError("buckets must be ascending and end with math.inf")
+        self._buckets: tuple[float, ...] = tuple(buckets)
+        # シャード: フェーズ名 -> Histogram
+        self._shards = ThreadShards(dict)
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        """バケット上限 (秒) のタプル。"""
+        return self._buckets
+
+    def observe(self, phase: str, seconds: float) -> None:
+        shard: dict[str, Histogram] = self._shards.local()
+        histogram = shard.get(phase)
+        if histogram is None:
+            histogram = shard[phase] = Histogram(self._buckets)
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict[str, Histogram]:
+        """全シャードを合算したフェーズごとのヒストグラム (コピー) を返します。"""
+        merged: dict[str, Histogram] = {}
+        for shard in self._shards.all():
+            for phase, histogram in list(shard.items()):
+                target = merged.get(phase)
+                if target is None:
+                    target = merged[phase] = Histogram(self._buckets)
+                counts = list(histogram.counts)
+                target.counts = [a + b for a, b in zip(target.counts, counts)]
+                target.count += sum(counts)
+                target.total += histogram.total
+        return merged
+
+    def percentile(self, phase: str, q: float) -> float | None:
+        """
+        フェーズ所要時間のパーセンタイル値 (推定) を返します。
+
+        Args:
+            phase: フェーズ名。
+            q: 0 から 1 の分位点 (例: 0.95)。
+
+        Returns:
+            float | None: 推定値 (秒)。観測が無い場合は None。
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        histogram = self.snapshot().get(phase)
+        return histogram.percentile(q) if histogram else None
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """フェーズごとの件数・平均・p50/p95/p99 を返します。"""
+        result: dict[str, dict[str, float]] = {}
+        for phase, histogram in sorted(self.snapshot().items()):
+            if histogram.count == 0:
+                continue
+            stats = {"count": histogram.count, "mean": histogram.total / histogram.count}
+            for q in REPORTED_PERCENTILES:
+                stats[f"p{int(q * 100)}"] = histogram.percentile(q)
+            result[phase] = stats
+        return result
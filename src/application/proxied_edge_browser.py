@@ -1,20 +1,38 @@
 # src/application/proxied_edge_browser.py
 
 import logging
+import time
+from collections import Counter
 from typing import Optional, Type
 from types import TracebackType
 from pathlib import Path  # ★ 追加: ディレクトリ操作のため
 from selenium import webdriver
 from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
 from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, WebDriverException)
+from selenium.webdriver.support.ui import WebDriverWait
 
 # 相対インポート
+from ..adapters.devtools import read_performance_log
 from ..adapters.edge_option_factory import EdgeOptionFactory
+from ..adapters.tracing_remote_connection import create_command_executor
+from ..application.error_page import ErrorPageDetector, NavigationAbortedError
 from ..application.proxy_selector import ProxySelector
+from ..application.ip_extractor import extract_ip
+from ..application.metrics import MetricsCollector, PhaseTimings
+from ..application.readiness import DEFAULT_READINESS_TIMEOUT_SECONDS, ReadinessCondition
+from ..application.resource_blocking import ResourceBlocker, count_blocked_requests
+from ..application.tracing import Tracer
 from ..config.logging_config import get_logger
+from ..domain.ip_check_result import IpCheckResult, NO_EGRESS_IP
 from ..domain.proxy_info import ProxyInfo
 
+# タブでのページ移動を完了を待たずに開始する。移動が確定する (新しいドキュメントになる) と目印の変数は消える。
+_START_NAVIGATION_SCRIPT = "window.__proxyrotNavigating = true; window.location.href = arguments[0];"
+_TAB_STATE_SCRIPT = "return window.__proxyrotNavigating ? 'pending' : document.readyState;"
+
 
 class ProxiedEdgeBrowser:
     """
@@ -28,10 +46,30 @@ class ProxiedEdgeBrowser:
         proxy_selector: ProxySelector,
         option_factory: EdgeOptionFactory,
         command_executor: str = 'http://selenium:4444/wd/hub',
-        logger: logging.Logger | None = None
+        logger: logging.Logger | None = None,
+        metrics: MetricsCollector | None = None,
+        tracer: Tracer | None = None,
+        readiness: ReadinessCondition | None = None,
+        readiness_timeout: float = DEFAULT_READINESS_TIMEOUT_SECONDS,
+        error_page_detector: ErrorPageDetector | None = None,
+        resource_blocker: ResourceBlocker | None = None,
+        command_timeout: float | None = None
     ):
         """
         (コンストラクタDocstringと実装は変更なし)
+
+        readiness を指定した場合、ページ移動の後この条件を満たした時点でキャプチャ/本文の読み取りに進みます
+        (readiness_timeout 秒以内に満たさなければ TimeoutException)。ページ読み込み戦略
+        eager/none (EdgeOptionFactory) と組み合わせると、全リソースの読み込みを待たずに済みます。
+
+        error_page_detector を指定した場合、ページ移動の直後 (readiness 指定時は条件を待つ間も) に
+        ネットワークエラーページやブロックページを検出し、キャプチャせずに NavigationAbortedError を送出します。
+
+        resource_blocker を指定した場合、ページ移動の前にアクセス先の規則で画像や広告などのリクエストを遮断し、
+        キャプチャの後に遮断したリクエストの数を blocked_requests に記録します。
+
+        command_timeout を指定した場合、WebDriver コマンド (セッションの作成を含む) の HTTP 往復をその秒数で打ち切ります。
+        Grid やページが応答しなくても、ブラウザを操作するスレッドが必ず戻れるようにします。
         """
         if not isinstance(proxy_selector, ProxySelector):
             raise TypeError(
@@ -46,72 +84,112 @@ class ProxiedEdgeBrowser:
         self._selector: ProxySelector = proxy_selector
         self._option_factory: EdgeOptionFactory = option_factory
         self._command_executor: str = command_executor
+        self._command_timeout: float | None = command_timeout
         self._logger: logging.Logger = logger or get_logger()
         self._driver: RemoteWebDriver | None = None
+        # abort で別スレッドからセッションを終了済みの場合は、close_browser で quit を送らない
+        self._aborted: bool = False
+        self._proxy_info: ProxyInfo | None = None
+        # セッションの終了後に EdgeOptionFactory へ返却する (プロファイルのコピーやキャッシュスロット)
+        self._options: EdgeOptions | None = None
+        # 各フェーズ (セッション作成・移動・スクショ・終了) の所要時間を単調時計で計測する
+        self._metrics: MetricsCollector | None = metrics
+        self._timings: PhaseTimings = PhaseTimings(metrics)
+        # 指定時は WebDriver コマンドごとの HTTP 往復をスパンとして記録する
+        self._tracer: Tracer | None = tracer
+        self._readiness: ReadinessCondition | None = readiness
+        self._readiness_timeout: float = readiness_timeout
+        self._error_page_detector: ErrorPageDetector | None = error_page_detector
+        # open_tabs で読み込みを開始したタブ (URL -> ウィンドウハンドル) と、セッションで開いているウィンドウ
+        self._tabs: dict[str, str] = {}
+        self._windows: list[str] = []
+        self._active_tab: str | None = None
+        # タブごとに設定済みの遮断パターン (最初のタブは None キー) と、URL ごとの遮断したリクエスト数
+        self._resource_blocker: ResourceBlocker | None = resource_blocker
+        self._blocking: dict[str | None, tuple[str, ...] | None] = {}
+        self._pending_blocked: Counter = Counter()
+        self._blocked_requests: dict[str, int] = {}
 
         self._logger.debug(
-            f"ProxiedEdgeBrowser initialized. Executor: {self._command_executor}")
+            "ProxiedEdgeBrowser initialized. Executor: %s", self._command_executor)
 
     def start_browser(self, proxy_index: int) -> None:
         """
         (start_browser のDocstringと実装は変更なし - 英語ログ版)
         """
         self._logger.info(
-            f"Attempting to start browser using proxy index {proxy_index}...")
+            "Attempting to start browser using proxy index %s...", proxy_index)
         if self._driver is not None:
             self._logger.warning(
                 "An active browser session exists. Closing it before starting a new one.")
             self.close_browser()
+        # 新しいセッションごとに計測結果とタブの状態をリセットする
+        self._timings = PhaseTimings(self._metrics)
+        self._reset_tabs()
+        self._blocked_requests = {}
+        self._aborted = False
 
         try:
             proxy_info: ProxyInfo = self._selector.select_proxy(proxy_index)
             self._logger.debug(
-                f"Selected proxy: {proxy_info.host}:{proxy_info.port}")
-            options: EdgeOptions = self._option_factory.create_options(
-                proxy_info)
+                "Selected proxy: %s:%s", proxy_info.host, proxy_info.port)
+            with self._timings.measure("create_options"):
+                options: EdgeOptions = self._option_factory.create_options(
+                    proxy_info)
+                self._options = options
+                if self._resource_blocker is not None:
+                    self._resource_blocker.configure_options(options)
             try:
                 args_str = " ".join(options.arguments) if hasattr(
                     options, 'arguments') and options.arguments else "N/A or Arguments not accessible"
                 self._logger.debug(
-                    f"Generated EdgeOptions with arguments: {args_str}")
+                    "Generated EdgeOptions with arguments: %s", args_str)
             except Exception:
                 self._logger.debug(
                     "Could not retrieve arguments from EdgeOptions (potentially changed in Selenium version).")
 
             self._logger.debug(
-                f"Connecting to Remote WebDriver at {self._command_executor}...")
-            self._driver = webdriver.Remote(
-                command_executor=self._command_executor,
-                options=options
-            )
+                "Connecting to Remote WebDriver at %s...", self._command_executor)
+            command_executor = create_command_executor(self._command_executor, self._tracer, self._command_timeout)
+            with self._timings.measure("session_create"):
+                self._driver = webdriver.Remote(
+                    command_executor=command_executor,
+                    options=options
+                )
+            self._proxy_info = proxy_info
+            # コピーしたプロファイルがブラウザのノードから見えているか (最初のセッションのみ) 確認する
+            self._option_factory.check_session_started(options)
             session_id = getattr(self._driver, 'session_id', 'N/A')
             self._logger.info(
-                f"Browser session started successfully. Session ID: {session_id}")
+                "Browser session started successfully. Session ID: %s", session_id)
 
         except (IndexError, TypeError) as e:
             self._logger.error(
-                f"Failed to prepare for browser start: {e}", exc_info=True)
+                "Failed to prepare for browser start: %s", e, exc_info=True)
             self._driver = None
+            self._release_options()
             raise
         except WebDriverException as e:
             self._logger.error(
-                f"Failed to start WebDriver session: {e}", exc_info=True)
+                "Failed to start WebDriver session: %s", e, exc_info=True)
             if self._driver:
                 try:
                     self._driver.quit()
                 except Exception:
                     pass
             self._driver = None
+            self._release_options()
             raise
         except Exception as e:
             self._logger.error(
-                f"An unexpected error occurred during browser startup: {e}", exc_info=True)
+                "An unexpected error occurred during browser startup: %s", e, exc_info=True)
             if self._driver:
                 try:
                     self._driver.quit()
                 except Exception:
                     pass
             self._driver = None
+            self._release_options()
             raise
 
     # --- ↓↓↓ take_screenshot メソッドの修正 ↓↓↓ ---
@@ -137,70 +215,332 @@ class ProxiedEdgeBrowser:
                 "Browser not started. Call start_browser() first.")
 
         self._logger.info(
-            f"Navigating to '{url}' and saving screenshot to '{save_path_in_container}'.")
+            "Navigating to '%s' and saving screenshot to '%s'.", url, save_path_in_container)
         try:
             # 1. 保存先ディレクトリの確認と作成
             save_dir = Path(save_path_in_container).parent
             if not save_dir.exists():
                 self._logger.debug(
-                    f"Creating screenshot directory: {save_dir}")
+                    "Creating screenshot directory: %s", save_dir)
                 # ★ mkdirのエラーはここで捕捉せず、外側のOSErrorで処理する方針に変更
                 # (あるいは、ここでログを出力せずに raise する)
                 save_dir.mkdir(parents=True, exist_ok=True)
-                self._logger.debug(f"Directory {save_dir} ensured.")
+                self._logger.debug("Directory %s ensured.", save_dir)
 
-            # 2. URLへ移動
-            self._logger.debug(f"Navigating to URL: {url}")
-            self._driver.get(url)
-            self._logger.debug(f"Navigation to {url} completed.")
+            # 2. URLへ移動 (エラーページの場合はここで打ち切り、スクショは撮らない)
+            self._logger.debug("Navigating to URL: %s", url)
+            self._navigate(url)
+            self._logger.debug("Navigation to %s completed.", url)
 
             # 3. スクリーンショットを保存
             self._logger.debug(
-                f"Saving screenshot to: {save_path_in_container}")
-            if not self._driver.save_screenshot(save_path_in_container):
+                "Saving screenshot to: %s", save_path_in_container)
+            with self._timings.measure("save_screenshot"):
+                saved = self._driver.save_screenshot(save_path_in_container)
+            if not saved:
                 self._logger.warning(
-                    f"save_screenshot returned False for path: {save_path_in_container}")
+                    "save_screenshot returned False for path: %s", save_path_in_container)
                 # 必要ならここでエラーにする: raise IOError(...)
             self._logger.info(
-                f"Screenshot saved successfully to '{save_path_in_container}'.")
+                "Screenshot saved successfully to '%s'.", save_path_in_container)
 
         # ★★★ エラーハンドリングの修正: 具体的な例外を先に捕捉 ★★★
+        except NavigationAbortedError as e:
+            # エラーページ/ブロックページは想定内の失敗のため、スタックトレースは出さない
+            self._logger.warning("Screenshot skipped: %s", e.msg)
+            raise
         except WebDriverException as e:
             # URL移動失敗やスクリーンショット保存失敗（WebDriver由来）
             self._logger.error(
-                f"WebDriverException during screenshot process: {e}", exc_info=True)
+                "WebDriverException during screenshot process: %s", e, exc_info=True)
             raise  # WebDriver関連のエラーは再送出
         except OSError as e:
             # ディレクトリ作成失敗 (mkdir が送出)
             self._logger.error(
-                f"OSError during screenshot process (likely directory creation): {e}", exc_info=True)
+                "OSError during screenshot process (likely directory creation): %s", e, exc_info=True)
             raise  # OSError も再送出
         except Exception as e:
             # その他の予期せぬエラー
             self._logger.error(
-                f"An unexpected error occurred during screenshot process: {e}", exc_info=True)
+                "An unexpected error occurred during screenshot process: %s", e, exc_info=True)
             raise
+        finally:
+            self._collect_blocked_requests(url)
+            self._release_tab()
+
+    def verify_ip(self, url: str) -> IpCheckResult:
+        """
+        現在のブラウザセッションで IP 確認 URL に移動し、ページ本文から送信元 IP を読み取ります。
+        スクリーンショットは取得しないため、PNG のエンコードと転送のコストがかかりません。
+
+        Args:
+            url: 移動先の IP 確認 URL (例: https://api.ipify.org?format=json)。
+
+        Returns:
+            IpCheckResult: 送信元 IP の確認結果。本文から IP を読み取れなかった場合は
+                           egress_ip が None で error が設定された結果を返します。
+
+        Raises:
+            RuntimeError: ブラウザが起動していない場合。
+            WebDriverException: URLへの移動または本文の取得に失敗した場合。
+        """
+        if self._driver is None or self._proxy_info is None:
+            self._logger.error(
+                "Browser not started when attempting to verify IP.")
+            raise RuntimeError(
+                "Browser not started. Call start_browser() first.")
+
+        self._logger.info("Navigating to '%s' to verify egress IP.", url)
+        started = time.perf_counter()
+        try:
+            self._navigate(url)
+            with self._timings.measure("read_body"):
+                body_text = self._driver.find_element(By.TAG_NAME, "body").text.strip()
+        except NavigationAbortedError as e:
+            self._logger.warning("IP verification aborted: %s", e.msg)
+            raise
+        except WebDriverException as e:
+            self._logger.error(
+                "WebDriverException during IP verification: %s", e, exc_info=True)
+            raise
+        finally:
+            self._collect_blocked_requests(url)
+            self._release_tab()
+
+        egress_ip = extract_ip(body_text)
+        elapsed = time.perf_counter() - started
+        if egress_ip is None:
+            self._logger.warning(
+                "Could not determine egress IP from page text of '%s'.", url)
+            return IpCheckResult(
+                proxy=self._proxy_info, url=url, egress_ip=None,
+                elapsed_seconds=elapsed, error="No IP address found in page text",
+                error_class=NO_EGRESS_IP)
+
+        self._logger.info("Egress IP via %s:%s: %s", self._proxy_info.host, self._proxy_info.port, egress_ip)
+        return IpCheckResult(
+            proxy=self._proxy_info, url=url, egress_ip=egress_ip, elapsed_seconds=elapsed)
+
+    def open_tabs(self, urls: list[str]) -> None:
+        """
+        urls をそれぞれ別のタブで、読み込みの完了を待たずに開き始めます。
+
+        以降 take_screenshot / verify_ip にこれらの URL を渡すと、ページ移動の代わりに
+        そのタブへ切り替えて読み込み (と準備完了条件) を待ち、キャプチャした後にタブを閉じます。
+        複数の URL のネットワーク待ちが重なるため、1セッションで複数の URL を処理する時間が短くなります。
+        読み込み待ちの最大秒数は readiness_timeout です。
+
+        Args:
+            urls: 開く URL のリスト (開いたまま処理していないタブが無ければ、先頭は現在のタブを使います)。
+
+        Raises:
+            RuntimeError: ブラウザが起動していない場合。
+            WebDriverException: タブの作成やページ移動の開始に失敗した場合。
+        """
+        if self._driver is None:
+            raise RuntimeError("Browser not started. Call start_browser() first.")
+        with self._timings.measure("open_tabs"):
+            if not self._windows:
+                self._windows = [self._driver.current_window_handle]
+                if None in self._blocking:
+                    self._blocking[self._windows[0]] = self._blocking.pop(None)
+            free = [handle for handle in self._windows if handle not in self._tabs.values()]
+            for url in urls:
+                if free:
+                    handle = free.pop(0)
+                    self._driver.switch_to.window(handle)
+                else:
+                    handle = self._new_tab()
+                    self._windows.append(handle)
+                self._apply_blocking(handle, url)
+                self._driver.execute_script(_START_NAVIGATION_SCRIPT, url)
+                self._tabs[url] = handle
+        self._logger.debug("Started loading %s URL(s) in %s tab(s).", len(urls), len(self._windows))
+
+    def _navigate(self, url: str) -> None:
+        """url へ移動し、エラーページの検出と準備完了条件の待機を行います。"""
+        if url in self._tabs:
+            self._switch_to_tab(url)
+            return
+        detector = self._error_page_detector
+        self._apply_blocking(self._windows[0] if self._windows else None, url)
+        with self._timings.measure("navigate"):
+            try:
+                self._driver.get(url)
+            except WebDriverException as e:
+                # ドライバによってはネットワークエラーを get の失敗として返す (unknown error: net::ERR_...)
+                aborted = detector.from_navigation_error(e, url) if detector is not None else None
+                if aborted is None:
+                    raise
+                raise aborted from e
+            if detector is not None and self._readiness is None:
+                detector.check(self._driver, url)
+        self._wait_until_ready(url)
+
+    def _apply_blocking(self, handle: str | None, url: str) -> None:
+        # 現在のタブ (handle) に url 用の遮断パターンを設定する
+        if self._resource_blocker is None:
+            return
+        with self._timings.measure("block_resources"):
+            self._blocking[handle] = self._resource_blocker.apply(self._driver, url, self._blocking.get(handle))
+
+    def _collect_blocked_requests(self, url: str) -> None:
+        # パフォーマンスログから遮断したリクエストを数え、キャプチャしたタブの分を url の数として記録する
+        if self._resource_blocker is None or self._driver is None:
+            return
+        try:
+            self._pending_blocked.update(count_blocked_requests(read_performance_log(self._driver)))
+        except WebDriverException as e:
+            self._logger.debug("Could not read the performance log for blocked requests: %s", e)
+            return
+        handle = self._active_tab
+        if handle is None or len(self._windows) <= 1:
+            count = sum(self._pending_blocked.values())
+            self._pending_blocked.clear()
+        else:
+            # 他のタブで読み込み中のページの分は、そのタブのキャプチャまで残す
+            # (webview は DevTools のターゲット ID で、ウィンドウハンドルはその前に接頭辞が付く場合がある)
+            webviews = [w for w in self._pending_blocked if w and handle.endswith(w)]
+            count = sum(self._pending_blocked.pop(w) for w in webviews)
+        self._blocked_requests[url] = self._blocked_requests.get(url, 0) + count
+
+    def _new_tab(self) -> str:
+        """新しいタブを開いてそのタブに切り替え、ウィンドウハンドルを返します。"""
+        self._driver.switch_to.new_window('tab')
+        return self._driver.current_window_handle
+
+    def _switch_to_tab(self, url: str) -> None:
+        # open_tabs で開いたタブに切り替え、移動の確定と読み込み (または準備完了条件) を待つ
+        handle = self._tabs.pop(url)
+        self._active_tab = handle
+        readiness = self._readiness
+        detector = self._error_page_detector
+
+        def condition(driver: RemoteWebDriver) -> bool:
+            state = driver.execute_script(_TAB_STATE_SCRIPT)
+            if state == 'pending':
+                return False
+            if detector is not None:
+                detector.check(driver, url)
+            return readiness(driver) if readiness is not None else state == 'complete'
+
+        description = readiness.description if readiness is not None else "document complete"
+        with self._timings.measure("navigate"):
+            self._driver.switch_to.window(handle)
+            WebDriverWait(
+                self._driver, self._readiness_timeout, poll_frequency=0.1,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+            ).until(condition, message=(
+                f"Page '{url}' was not ready ({description}) in its tab within {self._readiness_timeout}s"))
+
+    def _release_tab(self) -> None:
+        # キャプチャが終わったタブを閉じる (最後の1つはセッションを保つため残す)
+        handle, self._active_tab = self._active_tab, None
+        if handle is None or self._driver is None or len(self._windows) <= 1:
+            return
+        try:
+            self._driver.close()
+            self._windows.remove(handle)
+            self._blocking.pop(handle, None)
+            self._driver.switch_to.window(self._windows[0])
+        except WebDriverException as e:
+            self._logger.warning("Failed to close tab %s: %s", handle, e)
+
+    def _release_options(self) -> None:
+        # コピーしたプロファイルの削除とキャッシュスロットの返却 (セッションの終了後に行う)
+        options, self._options = self._options, None
+        if options is not None:
+            self._option_factory.release_options(options)
+
+    def _reset_tabs(self) -> None:
+        self._tabs = {}
+        self._windows = []
+        self._active_tab = None
+        self._blocking = {}
+        self._pending_blocked = Counter()
+
+    def _wait_until_ready(self, url: str) -> None:
+        """準備完了条件が指定されていれば、満たすまで (最大 readiness_timeout 秒) 待ちます。
+        エラーページの検出も有効な場合は、待機中にエラーページが表示された時点で打ち切ります。"""
+        if self._readiness is None:
+            return
+        readiness = self._readiness
+        detector = self._error_page_detector
+
+        def condition(driver: RemoteWebDriver) -> bool:
+            if detector is not None:
+                detector.check(driver, url)
+            return readiness(driver)
+
+        with self._timings.measure("wait_ready"):
+            WebDriverWait(
+                self._driver, self._readiness_timeout, poll_frequency=0.1,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+            ).until(condition, message=(
+                f"Page '{url}' was not ready ({self._readiness.description}) "
+                f"within {self._readiness_timeout}s"))
+        self._logger.debug("Page is ready (%s).", self._readiness.description)
 
     def close_browser(self) -> None:
         """
         現在アクティブなブラウザセッションを閉じ、WebDriverを終了します。
         """
-        if self._driver is not None:
+        if self._driver is not None and self._aborted:
+            # abort で終了済みのセッションには quit を送らず、参照とプロファイルのコピーだけを片付ける
+            self._driver = None
+            self._proxy_info = None
+            self._reset_tabs()
+            self._release_options()
+            self._logger.info("Browser session was already aborted.")
+        elif self._driver is not None:
             self._logger.info("Closing browser session...")
             try:
-                self._driver.quit()  # WebDriver セッションを終了し、ブラウザを閉じる
+                with self._timings.measure("quit"):
+                    self._driver.quit()  # WebDriver セッションを終了し、ブラウザを閉じる
                 self._logger.info("Browser session closed successfully.")
             except Exception as e:
                 # quit() が失敗してもエラーログは出すが、例外は送出せず、後続処理を行う
                 self._logger.error(
-                    f"Error occurred during browser quit: {e}", exc_info=True)
+                    "Error occurred during browser quit: %s", e, exc_info=True)
             finally:
                 # 成功・失敗に関わらず WebDriver インスタンスへの参照を解除
                 self._driver = None
+                self._proxy_info = None
+                self._reset_tabs()
+                self._release_options()
         else:
             self._logger.debug("No active browser session to close.")
         # pass # ← 不要なので削除
 
+    def abort(self) -> None:
+        """
+        別のスレッドが使用中のセッションを終了 (quit) し、実行中のコマンド (ページ移動など) を失敗させて戻らせます。
+
+        セッションの参照やプロファイルのコピーは操作しないため、使用中のスレッドが close_browser
+        (with ブロックの終了) で片付けます。セッションの作成中で driver が無い場合は何もしません。
+        """
+        driver = self._driver
+        if driver is None:
+            return
+        self._aborted = True
+        self._logger.info("Aborting browser session %s.", getattr(driver, 'session_id', 'N/A'))
+        try:
+            driver.quit()
+        except Exception as e:
+            self._logger.warning("Error occurred while aborting browser session: %s", e)
+
+    @property
+    def blocked_requests(self) -> dict[str, int]:
+        """直近のセッションで URL ごとに遮断したリクエストの数 (resource_blocker 指定時のみ記録)。
+        start_browser のたびにリセットされます。"""
+        return self._blocked_requests
+
+    @property
+    def timings(self) -> PhaseTimings:
+        """直近のセッションのフェーズごとの所要時間 (create_options / session_create / context_create / open_tabs / block_resources / navigate /
+        wait_ready / save_screenshot / read_body / quit)。start_browser のたびにリセットされます。"""
+        return self._timings
+
     def __enter__(self) -> 'ProxiedEdgeBrowser':
         """'with' ステートメントで使用可能にします。self を返します。"""
         self._logger.debug("Entering ProxiedEdgeBrowser context.")
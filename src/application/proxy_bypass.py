@@ -0,0 +1,120 @@
+# src/application/proxy_bypass.py
+import fnmatch
+import ipaddress
+import json
+import re
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import urlsplit
+
+# Chromium の --proxy-bypass-list の1エントリ: [スキーム://]ホストのパターン[:ポート]、IP/プレフィックス長、<local>
+_ENTRY_PATTERN = re.compile(r"^(?:[a-z][a-z0-9+.-]*://)?(?:\[[0-9a-f:.]+\]|[^\s;/:\[\]]+)(?::\d+)?(?:/\d{1,3})?$",
+                            re.IGNORECASE)
+_SPECIAL_ENTRIES = ("<local>", "<-loopback>")
+
+
+def validate_bypass_entry(entry: str) -> str:
+    """
+    --proxy-bypass-list のエントリとして使える形式かを確認し、前後の空白を除いて返します。
+
+    Raises:
+        ValueError: 空、区切り文字 (;) や空白を含むなど、形式が不正な場合。
+    """
+    entry = entry.strip()
+    if entry.lower() in _SPECIAL_ENTRIES or _ENTRY_PATTERN.match(entry):
+        return entry
+    raise ValueError(f"Invalid proxy bypass entry '{entry}' (use host, *.host, .host, IP/prefix or <local>)")
+
+
+def bypass_entry_matches(entry: str, host: str) -> bool:
+    """
+    エントリがホスト名 host への接続をプロキシ経由にしない (直接接続させる) かどうかを返します。
+    スキームとポートの指定は無視し、ホストが当てはまれば True とします (安全側の判定)。
+    """
+    host = host.lower().strip("[]")
+    entry = entry.lower()
+    if entry == "<local>":
+        return "." not in host and ":" not in host
+    if entry == "<-loopback>":
+        return False
+    pattern = entry.split("://", 1)[-1]
+    if "/" in pattern:
+        try:
+            return ipaddress.ip_address(host) in ipaddress.ip_network(pattern.strip("[]"), strict=False)
+        except ValueError:
+            return False
+    if pattern.startswith("["):
+        pattern = pattern[1:pattern.index("]")]
+    elif pattern.count(":") == 1:
+        pattern = pattern.rsplit(":", 1)[0]
+    if pattern.startswith("."):
+        return host.endswith(pattern) or host == pattern[1:]
+    return fnmatch.fnmatchcase(host, pattern)
+
+
+class ProxyBypassRules:
+    """
+    アクセス先 (ターゲット) ごとに、プロキシを経由せずに直接接続するホストのパターンを決める規則。
+
+    CDN の静的ファイルなど、プロキシの送信元 IP で取得する必要のないリクエストを直接接続にすると、
+    プロキシの転送量と読み込み時間を減らせます。アクセス先のページ自体は必ずプロキシ経由にする必要があるため、
+    アクセス先のホストに当てはまるエントリは受け付けません。
+    """
+
+    def __init__(self, default: Iterable[str] = (), targets: dict[str, Iterable[str]] | None = None):
+        """
+        Args:
+            default: targets のどれにも当てはまらないアクセス先で直接接続にするホストのパターン。
+            targets: アクセス先のホスト名のパターン (example.com、*.example.com など) ごとの、
+                     直接接続にするホストのパターン。定義順に照合し、最初に当てはまったものを使います。
+
+        Raises:
+            ValueError: エントリの形式が不正な場合。
+        """
+        self._default: tuple[str, ...] = tuple(validate_bypass_entry(e) for e in default)
+        self._targets: dict[str, tuple[str, ...]] = {
+            host: tuple(validate_bypass_entry(e) for e in entries) for host, entries in (targets or {}).items()}
+
+    @classmethod
+    def from_file(cls, path: str | Path, default: Iterable[str] = ()) -> 'ProxyBypassRules':
+        """
+        JSON の規則ファイルから生成します。
+
+        形式: {"default": ["<ホストのパターン>", ...], "targets": {"<アクセス先のパターン>": ["<ホストのパターン>", ...]}}
+        ファイルに "default" が無い場合は引数の default を使います。
+
+        Raises:
+            OSError: ファイルを読み込めない場合。
+            ValueError: JSON またはエントリの内容が不正な場合。
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError("Proxy bypass rules must be a JSON object")
+        return cls(data.get("default", default), data.get("targets"))
+
+    def entries_for(self, url: str) -> tuple[str, ...]:
+        """url のホスト名に当てはまる規則のエントリを返します。"""
+        host = (urlsplit(url).hostname or "").lower()
+        for pattern, entries in self._targets.items():
+            if fnmatch.fnmatchcase(host, pattern.lower()):
+                return entries
+        return self._default
+
+    def bypass_list(self, urls: Iterable[str]) -> tuple[str, ...]:
+        """
+        1つのセッションで処理する urls すべてに使う、直接接続にするホストのパターンを返します
+        (--proxy-bypass-list はセッション単位のため、各 URL の規則をまとめます)。
+
+        Raises:
+            ValueError: いずれかのエントリがアクセス先のホストを直接接続にしてしまう場合。
+        """
+        urls = list(urls)
+        entries = dict.fromkeys(entry for url in urls for entry in self.entries_for(url))
+        hosts = {(urlsplit(url).hostname or "").lower() for url in urls}
+        for entry in entries:
+            conflicts = sorted(host for host in hosts if host and bypass_entry_matches(entry, host))
+            if conflicts:
+                raise ValueError(
+                    f"Proxy bypass entry '{entry}' would send the target host {', '.join(conflicts)} "
+                    f"direct instead of through the proxy")
+        return tuple(entries)
@@ -0,0 +1,110 @@
+# src/application/rate_limiter.py
+import threading
+import time
+from typing import Callable
+
+from ..domain.proxy_info import ProxyInfo
+
+
+class TokenBucket:
+    """
+    一定の速度でトークンが補充されるバケット。
+    1回の処理に1トークンを使い、burst 個までは連続して処理できます。
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: 1秒あたりに補充するトークン数 (正の数)。
+            burst: バケットの容量 (1以上)。
+            clock: 単調時計 (テスト用に差し替え可能)。
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate: float = rate
+        self._capacity: float = max(burst, 1.0)
+        self._clock = clock
+        self._tokens: float = self._capacity
+        self._updated: float = clock()
+
+    def wait_time(self) -> float:
+        """トークンを1つ使えるようになるまでの秒数 (今すぐ使える場合は 0.0) を返します。"""
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        return 0.0 if self._tokens >= 1.0 else (1.0 - self._tokens) / self._rate
+
+    def take(self) -> None:
+        """トークンを1つ使います (事前に wait_time() が 0.0 であることを確認してください)。"""
+        self._tokens -= 1.0
+
+
+class RateLimiter:
+    """
+    アクセス先ホストごと・プロキシごとのトークンバケットで試行の開始を制限するクラス。
+
+    スケジューラは try_acquire で両方のバケットにトークンがあるかを確認し、
+    無ければ待たずに他の処理待ちの試行を選べます。rate が 0 以下の種類は制限しません。
+    """
+
+    def __init__(
+        self,
+        host_rate: float = 0.0,
+        proxy_rate: float = 0.0,
+        host_burst: float = 1.0,
+        proxy_burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            host_rate: アクセス先ホストごとの1秒あたりの試行数の上限 (0 以下で無制限)。
+            proxy_rate: プロキシごとの1秒あたりの試行数の上限 (0 以下で無制限)。
+            host_burst: アクセス先ホストごとに連続して開始できる試行数。
+            proxy_burst: プロキシごとに連続して開始できる試行数。
+            clock: 単調時計 (テスト用に差し替え可能)。
+        """
+        self._host_rate: float = host_rate
+        self._proxy_rate: float = proxy_rate
+        self._host_burst: float = host_burst
+        self._proxy_burst: float = proxy_burst
+        self._clock = clock
+        self._host_buckets: dict[str, TokenBucket] = {}
+        self._proxy_buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """いずれかの制限が有効かどうか。"""
+        return self._host_rate > 0 or self._proxy_rate > 0
+
+    def try_acquire(self, host: str, proxy: ProxyInfo | None = None) -> float:
+        """
+        アクセス先ホストとプロキシの両方のトークンが揃っていれば両方を消費して 0.0 を返します。
+        揃っていない場合は何も消費せず、開始できるようになるまでの秒数を返します。
+
+        Args:
+            host: アクセス先 URL のホスト名。
+            proxy: 使用するプロキシ。None の場合はアクセス先ホストのトークンのみを確認します
+                   (同じセッションで2つ目以降の URL に移動する場合など)。
+
+        Returns:
+            float: 待ち秒数 (すぐに開始できる場合は 0.0)。
+        """
+        with self._lock:
+            buckets: list[TokenBucket] = []
+            if self._host_rate > 0:
+                buckets.append(self._bucket(self._host_buckets, host, self._host_rate, self._host_burst))
+            if self._proxy_rate > 0 and proxy is not None:
+                buckets.append(self._bucket(
+                    self._proxy_buckets, f"{proxy.host}:{proxy.port}", self._proxy_rate, self._proxy_burst))
+            wait = max((bucket.wait_time() for bucket in buckets), default=0.0)
+            if wait == 0.0:
+                for bucket in buckets:
+                    bucket.take()
+            return wait
+
+    def _bucket(self, buckets: dict[str, TokenBucket], key: str, rate: float, burst: float) -> TokenBucket:
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = TokenBucket(rate, burst, self._clock)
+        return bucket
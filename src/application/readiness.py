@@ -0,0 +1,110 @@
+# src/application/readiness.py
+import re
+from abc import ABC, abstractmethod
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from ..application.ip_extractor import extract_ip
+
+DEFAULT_READINESS_TIMEOUT_SECONDS = 30.0
+
+
+class ReadinessCondition(ABC):
+    """
+    ページ移動後、キャプチャを開始してよい状態になったかを判定する条件のインターフェース。
+    WebDriverWait.until にそのまま渡せるよう、driver を受け取って真偽値を返す呼び出し可能オブジェクトです。
+    """
+
+    @abstractmethod
+    def __call__(self, driver: RemoteWebDriver) -> bool:
+        """条件を満たしていれば True を返す。要素がまだ無い場合は NoSuchElementException を送出してよい。"""
+        pass  # 実装はサブクラスに委ねる
+
+    @property
+    @abstractmethod
+    def description(self) -> str:
+        """ログやエラーメッセージ用の条件の説明。"""
+        pass
+
+
+class DocumentReadyState(ReadinessCondition):
+    """document.readyState が指定した状態 (interactive なら complete も含む) になったら準備完了とする条件。"""
+
+    def __init__(self, state: str = "interactive"):
+        if state not in ("interactive", "complete"):
+            raise ValueError("state must be 'interactive' or 'complete'")
+        self._accepted = ("interactive", "complete") if state == "interactive" else ("complete",)
+        self._state = state
+
+    def __call__(self, driver: RemoteWebDriver) -> bool:
+        return driver.execute_script("return document.readyState") in self._accepted
+
+    @property
+    def description(self) -> str:
+        return f"document {self._state}"
+
+
+class CssSelectorPresent(ReadinessCondition):
+    """CSS セレクタに一致する要素が DOM に現れたら準備完了とする条件。"""
+
+    def __init__(self, selector: str):
+        self._selector = selector
+
+    def __call__(self, driver: RemoteWebDriver) -> bool:
+        return bool(driver.find_elements(By.CSS_SELECTOR, self._selector))
+
+    @property
+    def description(self) -> str:
+        return f"css {self._selector!r}"
+
+
+class BodyTextMatches(ReadinessCondition):
+    """<body> のテキストが正規表現に一致したら準備完了とする条件。"""
+
+    def __init__(self, pattern: str):
+        self._pattern = re.compile(pattern)
+
+    def __call__(self, driver: RemoteWebDriver) -> bool:
+        return self._pattern.search(driver.find_element(By.TAG_NAME, "body").text) is not None
+
+    @property
+    def description(self) -> str:
+        return f"body text /{self._pattern.pattern}/"
+
+
+class BodyTextHasIp(ReadinessCondition):
+    """<body> のテキストから IP アドレスを読み取れたら準備完了とする条件 (IP 確認ページ向け)。"""
+
+    def __call__(self, driver: RemoteWebDriver) -> bool:
+        return extract_ip(driver.find_element(By.TAG_NAME, "body").text) is not None
+
+    @property
+    def description(self) -> str:
+        return "body text has IP"
+
+
+def parse_readiness(spec: str) -> ReadinessCondition:
+    """
+    コマンドライン引数などの文字列から準備完了条件を生成します。
+
+    Args:
+        spec: 'ip' / 'interactive' / 'complete' / 'css:<セレクタ>' / 'text:<正規表現>' のいずれか。
+
+    Returns:
+        ReadinessCondition: 生成した条件。
+
+    Raises:
+        ValueError: 形式が不正な場合。
+    """
+    kind, _, argument = spec.partition(":")
+    if kind == "ip" and not argument:
+        return BodyTextHasIp()
+    if kind in ("interactive", "complete") and not argument:
+        return DocumentReadyState(kind)
+    if kind == "css" and argument:
+        return CssSelectorPresent(argument)
+    if kind == "text" and argument:
+        return BodyTextMatches(argument)
+    raise ValueError(
+        f"Invalid readiness condition '{spec}': use ip, interactive, complete, css:<selector> or text:<regex>")
@@ -0,0 +1,159 @@
+# src/application/resource_blocking.py
+import fnmatch
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+from urllib.parse import urlsplit
+
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from ..adapters.devtools import PERFORMANCE_LOGGING_CAPABILITY, PERFORMANCE_LOG, execute_cdp, iter_devtools_events
+
+# Network.setBlockedURLs はリソースの種類を指定できないため、種類ごとに URL パターン (* はワイルドカード) で表す
+RESOURCE_TYPE_PATTERNS: dict[str, tuple[str, ...]] = {
+    "image": ("*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+              "*.webp", "*.webp?*", "*.avif", "*.avif?*", "*.svg", "*.svg?*", "*.ico", "*.ico?*"),
+    "media": ("*.mp4", "*.mp4?*", "*.webm", "*.webm?*", "*.m3u8", "*.m3u8?*", "*.ts?*",
+              "*.mp3", "*.mp3?*", "*.ogg", "*.ogg?*"),
+    "font": ("*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*"),
+    "stylesheet": ("*.css", "*.css?*"),
+    # 広告・アクセス解析のスクリプトとビーコン
+    "tracker": ("*://*.google-analytics.com/*", "*://*.googletagmanager.com/*", "*://*.doubleclick.net/*",
+                "*://*.googlesyndication.com/*", "*://*.adservice.google.com/*", "*://connect.facebook.net/*",
+                "*://*.hotjar.com/*", "*://*.scorecardresearch.com/*", "*://*.criteo.com/*",
+                "*://*.taboola.com/*", "*://*.outbrain.com/*"),
+}
+RESOURCE_TYPES = tuple(RESOURCE_TYPE_PATTERNS)
+# Network.setBlockedURLs で遮断されたリクエストの Network.loadingFailed に付く理由
+_BLOCKED_REASON = "inspector"
+
+
+@dataclass(frozen=True)
+class BlockingRule:
+    """
+    ページの読み込み中に遮断するリクエストの規則。
+
+    Attributes:
+        resource_types (tuple[str, ...]): 遮断するリソースの種類 (RESOURCE_TYPES のいずれか)。
+        url_patterns (tuple[str, ...]): 遮断する URL のパターン (* はワイルドカード)。
+    """
+    resource_types: tuple[str, ...] = ()
+    url_patterns: tuple[str, ...] = ()
+    _blocked_urls: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        unknown = [t for t in self.resource_types if t not in RESOURCE_TYPE_PATTERNS]
+        if unknown:
+            raise ValueError(
+                f"Unknown resource type(s) {', '.join(unknown)}: use {', '.join(RESOURCE_TYPES)}")
+        patterns = [p for t in self.resource_types for p in RESOURCE_TYPE_PATTERNS[t]] + list(self.url_patterns)
+        object.__setattr__(self, "_blocked_urls", tuple(dict.fromkeys(patterns)))
+
+    @property
+    def blocked_urls(self) -> tuple[str, ...]:
+        """Network.setBlockedURLs に渡す URL パターン (重複なし)。"""
+        return self._blocked_urls
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'BlockingRule':
+        """{"resource_types": [...], "url_patterns": [...]} 形式の辞書から生成します。"""
+        return cls(tuple(data.get("resource_types") or ()), tuple(data.get("url_patterns") or ()))
+
+
+def parse_resource_types(spec: str) -> tuple[str, ...]:
+    """
+    'image,font,tracker' のようなカンマ区切りの文字列からリソースの種類を取り出します。
+
+    Raises:
+        ValueError: 未知の種類が含まれる場合。
+    """
+    types = tuple(t.strip() for t in spec.split(",") if t.strip())
+    BlockingRule(resource_types=types)  # 種類の検証
+    return types
+
+
+def count_blocked_requests(entries: Iterable[dict[str, Any]]) -> Counter:
+    """パフォーマンスログのエントリから、遮断されたリクエストの数をタブ (webview) ごとに数えます。"""
+    counts: Counter = Counter()
+    for webview, method, params in iter_devtools_events(entries):
+        if method == "Network.loadingFailed" and params.get("blockedReason") == _BLOCKED_REASON:
+            counts[webview] += 1
+    return counts
+
+
+class ResourceBlocker:
+    """
+    アクセス先 (ターゲット) ごとの BlockingRule を選び、DevTools の Network ドメイン
+    (Network.setBlockedURLs) でページ移動の前にタブへ設定するクラス。
+
+    IP 確認のスクリーンショットに不要な画像・動画・フォント・広告/解析スクリプトを読み込まないため、
+    従量課金や低速なプロキシでの転送量と読み込み時間を減らせます。遮断した数は Edge の
+    パフォーマンスログ (Network.loadingFailed) から数えるため、セッションの作成時に
+    configure_options でログを有効にしておく必要があります。
+    """
+
+    def __init__(self, default: BlockingRule, targets: dict[str, BlockingRule] | None = None):
+        """
+        Args:
+            default: targets のどれにも当てはまらないアクセス先に使う規則。
+            targets: ホスト名のパターン (example.com、*.example.com など) ごとの規則。
+                     定義順に照合し、最初に当てはまった規則を default の代わりに使います。
+        """
+        self._default: BlockingRule = default
+        self._targets: dict[str, BlockingRule] = dict(targets or {})
+
+    @classmethod
+    def from_file(cls, path: str | Path, default: BlockingRule | None = None) -> 'ResourceBlocker':
+        """
+        JSON の規則ファイルから生成します。
+
+        形式: {"default": {"resource_types": [...], "url_patterns": [...]},
+               "targets": {"<ホスト名のパターン>": {"resource_types": [...], "url_patterns": [...]}, ...}}
+        ファイルに "default" が無い場合は引数の default (省略時は何も遮断しない規則) を使います。
+
+        Raises:
+            OSError: ファイルを読み込めない場合。
+            ValueError: JSON または規則の内容が不正な場合。
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError("Blocking rules must be a JSON object")
+        rules_default = BlockingRule.from_dict(data["default"]) if "default" in data else default or BlockingRule()
+        targets = {host: BlockingRule.from_dict(rule) for host, rule in (data.get("targets") or {}).items()}
+        return cls(rules_default, targets)
+
+    def rule_for(self, url: str) -> BlockingRule:
+        """url のホスト名に当てはまる規則を返します。"""
+        host = (urlsplit(url).hostname or "").lower()
+        for pattern, rule in self._targets.items():
+            if fnmatch.fnmatchcase(host, pattern.lower()):
+                return rule
+        return self._default
+
+    def configure_options(self, options: EdgeOptions) -> None:
+        """遮断したリクエストを数えるため、セッションの Network イベントをパフォーマンスログに記録させます。"""
+        options.set_capability(PERFORMANCE_LOGGING_CAPABILITY, {PERFORMANCE_LOG: "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    def apply(
+        self, driver: RemoteWebDriver, url: str, current: tuple[str, ...] | None = None
+    ) -> tuple[str, ...] | None:
+        """
+        現在のタブに url 用の遮断パターンを設定し、タブに設定済みのパターンを返します。
+
+        Args:
+            driver: 対象のタブを選択している WebDriver。
+            url: これから移動する URL。
+            current: そのタブに設定済みのパターン (まだ Network ドメインを有効にしていない場合は None)。
+                     同じパターンの場合は何もしません。
+        """
+        patterns = self.rule_for(url).blocked_urls
+        if patterns == (current or ()):
+            return current
+        if current is None:
+            execute_cdp(driver, "Network.enable")
+        execute_cdp(driver, "Network.setBlockedURLs", {"urls": list(patterns)})
+        return patterns
@@ -0,0 +1,178 @@
+# src/application/retry_policy.py
+import random
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+from ..application.run_metrics import RunMetrics
+
+# エラーの分類
+ERROR_GRID = 'grid'                              # Grid/ノード側の問題 (別ノードで再試行する価値がある)
+ERROR_PROXY = 'proxy'                            # プロキシ自体の接続失敗 (再試行しても無駄)
+ERROR_NAVIGATION_TIMEOUT = 'navigation_timeout'  # ページ読み込みのタイムアウト
+ERROR_OTHER = 'other'
+ERROR_CATEGORIES = (ERROR_GRID, ERROR_PROXY, ERROR_NAVIGATION_TIMEOUT, ERROR_OTHER)
+
+# 例外クラス名またはメッセージにこれらの文字列を含む場合に分類する (上から順に判定)
+_PROXY_MARKERS = (
+    "ERR_PROXY_CONNECTION_FAILED", "ERR_TUNNEL_CONNECTION_FAILED", "ERR_PROXY_CERTIFICATE_INVALID",
+    "ERR_SOCKS_CONNECTION_FAILED", "ERR_PROXY_AUTH", "ERR_NO_SUPPORTED_PROXIES",
+    "ERR_CONNECTION_REFUSED", "ERR_CONNECTION_RESET", "ERR_CONNECTION_CLOSED", "ERR_EMPTY_RESPONSE",
+)
+_NAVIGATION_TIMEOUT_MARKERS = (
+    "TimeoutException", "ERR_TIMED_OUT", "ERR_CONNECTION_TIMED_OUT",
+    "Timed out receiving message from renderer",
+)
+_GRID_MARKERS = (
+    "SessionNotCreatedException", "InvalidSessionIdException", "session not created",
+    "Could not start a new session", "invalid session id", "No nodes support",
+    "Timed out waiting for", "not reachable", "disconnected: not connected to DevTools",
+    "MaxRetryError", "NewConnectionError", "ConnectionRefusedError", "RemoteDisconnected",
+    "ProtocolError",
+)
+# WebDriver コマンドの応答を待つ間のクライアント側のタイムアウト。セッションの作成中なら過負荷の Grid、
+# それ以外 (遅いプロキシ経由の driver.get など) ならページ読み込みのタイムアウトとして扱う
+_READ_TIMEOUT_MARKERS = ("ReadTimeoutError", "Read timed out")
+
+
+def classify_error(error: BaseException, session_create: bool = False) -> str:
+    """
+    例外 (原因の例外を含む) のクラス名とメッセージから、エラーの分類を返します。
+    分類 (error_category 属性) を持つ例外 (NavigationAbortedError など) はその値を優先します。
+
+    Args:
+        error: 試行中に発生した例外。
+        session_create: セッションの作成中 (start_browser) に発生した例外かどうか。
+                        応答待ちのタイムアウトは、True なら Grid 側のエラー、False ならページ読み込みのタイムアウトに分類します。
+
+    Returns:
+        str: ERROR_CATEGORIES のいずれか。
+    """
+    texts: list[str] = []
+    seen: set[int] = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if getattr(current, "error_category", None) in ERROR_CATEGORIES:
+            return current.error_category
+        texts.append(f"{type(current).__name__}: {current}")
+        current = current.__cause__ or current.__context__
+    text = "\n".join(texts)
+    read_timeout = ERROR_GRID if session_create else ERROR_NAVIGATION_TIMEOUT
+    for category, markers in ((ERROR_PROXY, _PROXY_MARKERS),
+                              (ERROR_NAVIGATION_TIMEOUT, _NAVIGATION_TIMEOUT_MARKERS),
+                              (read_timeout, _READ_TIMEOUT_MARKERS),
+                              (ERROR_GRID, _GRID_MARKERS)):
+        if any(marker in text for marker in markers):
+            return category
+    return ERROR_OTHER
+
+
+@dataclass(frozen=True)
+class RetryRule:
+    """
+    1つのエラー分類に対する再試行の設定。
+
+    Attributes:
+        max_attempts (int): 1プロキシあたりの最大試行回数 (1 の場合は再試行しない)。
+        base_delay (float): 1回目の再試行前の待機秒数の上限。以降は2倍ずつ増える。
+        max_delay (float): 待機秒数の上限の最大値。
+    """
+    max_attempts: int = 1
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+
+DEFAULT_RETRY_RULES: dict[str, RetryRule] = {
+    ERROR_GRID: RetryRule(max_attempts=3, base_delay=2.0, max_delay=30.0),
+    ERROR_NAVIGATION_TIMEOUT: RetryRule(max_attempts=2, base_delay=1.0, max_delay=10.0),
+    ERROR_PROXY: RetryRule(max_attempts=1),
+    ERROR_OTHER: RetryRule(max_attempts=1),
+}
+DEFAULT_RETRY_BUDGET = 100
+
+
+class RetryPolicy:
+    """
+    エラー分類ごとの再試行回数と、指数バックオフ (フルジッター) の待機秒数を決めるクラス。
+
+    実行全体での再試行回数の上限 (予算) を持ち、Grid 全体の障害時に
+    全プロキシが再試行を繰り返して実行時間が膨らむことを防ぎます。
+    """
+
+    def __init__(
+        self,
+        rules: dict[str, RetryRule] | None = None,
+        budget: int = DEFAULT_RETRY_BUDGET,
+        metrics: RunMetrics | None = None,
+        random_func: Callable[[float, float], float] = random.uniform
+    ):
+        """
+        Args:
+            rules: エラー分類ごとの再試行設定 (省略した分類は DEFAULT_RETRY_RULES)。
+            budget: 実行全体で許可する再試行回数の合計。
+            metrics: 残りの再試行予算をゲージとして公開する RunMetrics (任意)。
+            random_func: ジッター用の乱数関数 (テスト用に差し替え可能)。
+
+        Raises:
+            ValueError: budget が負の場合。
+        """
+        if budget < 0:
+            raise ValueError("budget must not be negative")
+        self._rules: dict[str, RetryRule] = {**DEFAULT_RETRY_RULES, **(rules or {})}
+        self._remaining: int = budget
+        self._metrics: RunMetrics | None = metrics
+        self._random = random_func
+        self._lock = threading.Lock()
+        self._publish()
+
+    @property
+    def remaining_budget(self) -> int:
+        """残りの再試行回数。"""
+        return self._remaining
+
+    def should_retry(self, category: str, attempt: int) -> bool:
+        """
+        attempt 回目の試行が category のエラーで失敗したときに再試行するかどうかを返します。
+        再試行する場合は予算を1消費します。
+
+        Args:
+            category: エラーの分類。
+            attempt: 失敗した試行の回数 (1 始まり)。
+        """
+        if not self.allows_retry(category, attempt):
+            return False
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+        self._publish()
+        return True
+
+    def allows_retry(self, category: str, attempt: int) -> bool:
+        """
+        should_retry と同じ判定を、予算を消費せずに行います
+        (セッションを破棄して再試行に回すかどうかを、再試行を決める前に判断するために使います)。
+
+        Args:
+            category: エラーの分類。
+            attempt: 失敗した試行の回数 (1 始まり)。
+        """
+        rule = self._rules.get(category, self._rules[ERROR_OTHER])
+        return attempt < rule.max_attempts and self._remaining > 0
+
+    def backoff(self, category: str, attempt: int) -> float:
+        """
+        attempt 回目の失敗の後、再試行までに待つ秒数を返します (0 から上限までの一様乱数)。
+
+        Args:
+            category: エラーの分類。
+            attempt: 失敗した試行の回数 (1 始まり)。
+        """
+        rule = self._rules.get(category, self._rules[ERROR_OTHER])
+        cap = min(rule.max_delay, rule.base_delay * 2 ** (attempt - 1))
+        return self._random(0.0, cap)
+
+    def _publish(self) -> None:
+        if self._metrics is not None:
+            self._metrics.set_gauge("retry_budget_remaining", self._remaining)
@@ -0,0 +1,498 @@
+# src/application/rotation_runner.py
+import itertools
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Callable, Iterator
+from urllib.parse import urlparse
+
+from ..adapters.proxy_host_resolver import ProxyHostResolver
+from ..adapters.result_sink import ResultSink
+from ..adapters.run_journal import RunJournal
+from ..application.concurrency_controller import AimdConcurrencyController
+from ..application.proxied_edge_browser import ProxiedEdgeBrowser
+from ..application.rate_limiter import RateLimiter
+from ..application.retry_policy import ERROR_GRID, ERROR_PROXY, RetryPolicy, classify_error
+from ..application.run_metrics import RunMetrics
+from ..application.tiered_verifier import TieredVerifier
+from ..application.tracing import Tracer
+from ..config.logging_config import get_logger
+from ..domain.attempt_record import AttemptRecord
+from ..domain.ip_check_result import TIER_BROWSER
+from ..domain.proxy_info import ProxyInfo
+from ..domain.run_summary import RunSummary
+
+# 検証モード: screenshot はスクショ保存、ip はページ本文から送信元IPのみを読み取る、
+# tiered は HTTP クライアントで先に確認し、通過したプロキシのみブラウザを使う
+MODE_SCREENSHOT = 'screenshot'
+MODE_IP = 'ip'
+MODE_TIERED = 'tiered'
+VERIFICATION_MODES = (MODE_SCREENSHOT, MODE_IP, MODE_TIERED)
+
+DEFAULT_SCREENSHOT_DIR = "/app/screenshots"
+# レート制限中に、処理待ちの先頭から何件先まで開始できる試行を探すか
+SCHEDULER_LOOKAHEAD = 64
+
+
+def build_screenshot_path(
+    index: int, proxy: ProxyInfo, screenshot_dir: str = DEFAULT_SCREENSHOT_DIR, url_number: int | None = None
+) -> str:
+    """プロキシのインデックスとホスト/ポート (複数 URL の場合は URL の番号) からコンテナ内のスクショ保存パスを生成します。"""
+    safe_host = re.sub(r'[^\w\-.]', '_', proxy.host)
+    url_suffix = f"_url{url_number}" if url_number is not None else ""
+    screenshot_filename = f"ip_check_proxy_{index}_{safe_host}_{proxy.port}{url_suffix}.png"
+    return os.path.join(screenshot_dir, screenshot_filename)
+
+
+class RotationRunner:
+    """
+    プロキシリストを順に処理し、1プロキシ1試行の AttemptRecord を生成するクラス。
+
+    urls に複数の URL を指定した場合は、1つのプロキシにつき1セッションで全 URL を順に処理し、
+    URL ごとに AttemptRecord (とスクリーンショット) を生成します。セッションの起動・終了の
+    コストは URL の数で按分されます。tabs_per_session を2以上にすると、その数までの URL を
+    別々のタブで並行して読み込み始め、読み込み済みのタブから順にキャプチャします。
+    Proxy #0 はブラウザ初期化専用としてスクリーンショットを取得しません。
+    concurrency を指定した場合、Proxy #0 を処理した後の残りのプロキシは
+    AimdConcurrencyController が決める上限までワーカースレッドで並列に処理します。
+    rate_limiter を指定した場合は、トークンが揃っている試行から順に開始し、
+    制限中の試行の後ろに開始できる試行があれば待たずにそちらを先に処理します。
+    アクセス先ホストの制限は URL ごとに、その URL のホストで数えます。
+    各試行の結果は結果シンク (任意) に書き出され、集計値は RunSummary として返されます。
+    journal を指定した場合は完了した試行を記録し、再開前の実行で完了済みの試行はスキップします
+    (Proxy #0 は初期化用のため常に処理します)。
+    """
+
+    def __init__(
+        self,
+        browser_factory: Callable[[], ProxiedEdgeBrowser],
+        url: str,
+        mode: str = MODE_SCREENSHOT,
+        screenshot_dir: str = DEFAULT_SCREENSHOT_DIR,
+        result_sink: ResultSink | None = None,
+        resolver: ProxyHostResolver | None = None,
+        verifier: TieredVerifier | None = None,
+        render: bool = False,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: RunMetrics | None = None,
+        tracer: Tracer | None = None,
+        concurrency: AimdConcurrencyController | None = None,
+        journal: RunJournal | None = None,
+        urls: list[str] | None = None,
+        tabs_per_session: int = 1,
+        logger: logging.Logger | None = None
+    ):
+        """
+        RotationRunner を初期化します。
+
+        Args:
+            browser_factory: 試行ごとに ProxiedEdgeBrowser を生成する関数。
+            url: アクセス対象の URL。
+            mode: 検証モード (VERIFICATION_MODES のいずれか)。
+            screenshot_dir: スクリーンショットの保存先ディレクトリ (コンテナ内のパス)。
+            result_sink: 試行レコードの書き出し先 (任意)。
+            resolver: 事前名前解決済みの ProxyHostResolver (任意)。解決に失敗した
+                      プロキシはブラウザを起動せずに失敗として記録します。
+            verifier: tiered モードで使用する TieredVerifier。
+            render: tiered モードで、HTTP 段階を通過したプロキシのスクショを取得するかどうか。
+            rate_limiter: アクセス先ホストごと・プロキシごとの試行の開始を制限する RateLimiter (任意)。
+            retry_policy: 指定時はブラウザでの処理の失敗をエラー分類ごとの設定に従って
+                          新しいセッションで再試行します (任意)。
+            metrics: 試行数・実行中セッション数・キュー長などを集計する RunMetrics (任意)。
+            tracer: 指定時は試行ごとに proxy_attempt スパンを開き、WebDriver コマンドの
+                    スパンをその子として記録します (任意)。
+            concurrency: 指定時は同時実行数をこのコントローラで調整しながら並列に処理し、
+                         セッション作成の所要時間と失敗をコントローラに通知します (任意)。
+            journal: 完了した試行を記録し、完了済みの試行をスキップするための実行ジャーナル (任意)。
+            urls: 指定時は url の代わりにこれらの URL を1セッションで順に処理します (任意)。
+                  2つ目以降の URL も、移動する前にその URL のホストのトークンを待ちます。
+            tabs_per_session: 複数の URL を処理する際に、同時に読み込むタブの数の上限 (1 の場合は順に移動)。
+            logger: 使用するロガー。省略時はアプリケーションロガー。
+
+        Raises:
+            ValueError: mode が不正な場合、tiered モードで verifier が無い場合、
+                        tiered モードで複数の URL を指定した場合、または tabs_per_session が1未満の場合。
+        """
+        if mode not in VERIFICATION_MODES:
+            raise ValueError(f"mode must be one of {VERIFICATION_MODES}")
+        if mode == MODE_TIERED and verifier is None:
+            raise ValueError("verifier is required for tiered mode")
+        urls = list(urls) if urls else [url]
+        if mode == MODE_TIERED and len(urls) > 1:
+            raise ValueError("tiered mode supports a single URL only")
+        if tabs_per_session < 1:
+            raise ValueError("tabs_per_session must be at least 1")
+        url = urls[0]
+
+        self._browser_factory = browser_factory
+        self._url: str = url
+        self._urls: list[str] = urls
+        self._tabs_per_session: int = tabs_per_session
+        self._mode: str = mode
+        self._screenshot_dir: str = screenshot_dir
+        self._sink: ResultSink | None = result_sink
+        self._resolver: ProxyHostResolver | None = resolver
+        self._verifier: TieredVerifier | None = verifier
+        self._render: bool = render
+        self._rate_limiter: RateLimiter | None = rate_limiter
+        self._retry_policy: RetryPolicy | None = retry_policy
+        self._metrics: RunMetrics | None = metrics
+        self._tracer: Tracer | None = tracer
+        self._concurrency: AimdConcurrencyController | None = concurrency
+        self._journal: RunJournal | None = journal
+        # 並列実行時に処理待ちの取り出し・集計値・結果シンクへの書き込みを直列化する
+        self._lock = threading.Lock()
+        # 同時実行数の枠を確保しているワーカースレッド (再試行までの待機中に枠を返すため)
+        self._slot_holder = threading.local()
+        self._logger: logging.Logger = logger or get_logger()
+
+    def run(self, proxies: list[ProxyInfo]) -> RunSummary:
+        """
+        全プロキシを処理します。concurrency 未指定時は1件ずつ処理します。
+
+        Args:
+            proxies: 処理するプロキシのリスト (ProxySelector に渡したものと同じ順序)。
+
+        Returns:
+            RunSummary: 実行結果の集計値。
+        """
+        summary = RunSummary(total=len(proxies))
+        if proxies:
+            # Proxy #0 は初期化用のため、他のプロキシより先に単独で処理する (レート制限の対象外)
+            self._finish(summary, self._attempt(0, proxies[0], remaining=len(proxies)))
+            pending = deque(index for index in range(1, len(proxies)) if self._remaining_urls(proxies[index]))
+            summary.skipped = sum(len(self._urls) - len(self._remaining_urls(proxy)) for proxy in proxies[1:])
+            if summary.skipped:
+                self._logger.info(
+                    "Resuming run: skipping %s attempts already completed according to the journal.",
+                    summary.skipped)
+            if self._concurrency is None:
+                self._drain(proxies, pending, summary)
+            else:
+                self._run_concurrent(proxies, pending, summary)
+        if self._metrics is not None:
+            self._metrics.set_queue_depth(0)
+        return summary
+
+    def _run_concurrent(self, proxies: list[ProxyInfo], pending: deque[int], summary: RunSummary) -> None:
+        workers = min(self._concurrency.max_limit, len(pending))
+        if workers < 1:
+            return
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="proxyrot-worker") as executor:
+            futures = [executor.submit(self._drain, proxies, pending, summary) for _ in range(workers)]
+            for future in futures:
+                future.result()  # ワーカー内の予期せぬ例外 (結果シンクの書き込み失敗など) を送出する
+
+    def _drain(self, proxies: list[ProxyInfo], pending: deque[int], summary: RunSummary) -> None:
+        # 枠を確保してから次のプロキシを取り出すため、実行中の試行数は常に上限以下になる。
+        # レート制限で待つ間は枠を返し、他のワーカー (と同時実行数の調整) を止めない。
+        while True:
+            with self._slot():
+                index, wait = self._next_ready(proxies, pending)
+                if index is None and wait == 0.0:
+                    return
+                if index is not None:
+                    records = self._attempt(index, proxies[index], remaining=len(pending) + 1)
+                    with self._lock:
+                        self._finish(summary, records)
+                    continue
+            self._logger.debug("Rate limited; next attempt can start in %.2fs", wait)
+            time.sleep(wait)
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        # 同時実行数の枠を確保し、このスレッドが枠を持っていることを記録する
+        if self._concurrency is None:
+            yield
+            return
+        with self._concurrency.slot():
+            self._slot_holder.held = True
+            try:
+                yield
+            finally:
+                self._slot_holder.held = False
+
+    def _sleep_without_slot(self, seconds: float) -> None:
+        # 再試行までの待機中は枠を返し、他のプロキシの試行 (と同時実行数の調整) を止めない
+        if self._concurrency is None or not getattr(self._slot_holder, "held", False):
+            time.sleep(seconds)
+            return
+        self._concurrency.release()
+        try:
+            time.sleep(seconds)
+        finally:
+            self._concurrency.acquire()
+
+    def _next_ready(self, proxies: list[ProxyInfo], pending: deque[int]) -> tuple[int | None, float]:
+        # レート制限で今すぐ開始できる最初の試行を取り出し、(インデックス, 0.0) を返す。
+        # どれも開始できない場合は (None, 最も早く開始できるようになるまでの秒数)、
+        # 処理待ちが無い場合は (None, 0.0) を返す。
+        with self._lock:
+            if not pending:
+                return None, 0.0
+            if self._rate_limiter is None:
+                return pending.popleft(), 0.0
+            wait = math.inf
+            for position, index in enumerate(itertools.islice(pending, SCHEDULER_LOOKAHEAD)):
+                # 試行の開始はそのプロキシで最初に処理する URL のホストで数える
+                host = self._host(self._remaining_urls(proxies[index])[0])
+                wait = min(wait, self._rate_limiter.try_acquire(host, proxies[index]))
+                if wait == 0.0:
+                    del pending[position]
+                    return index, 0.0
+            return None, wait
+
+    def _wait_for_host(self, url: str) -> None:
+        # 同じセッションで次の URL に移動する前に、その URL のホストのトークンを待つ (プロキシのトークンは使わない)
+        if self._rate_limiter is None:
+            return
+        host = self._host(url)
+        while (wait := self._rate_limiter.try_acquire(host)) > 0.0:
+            self._logger.debug("Rate limited for host %s; waiting %.2fs", host, wait)
+            time.sleep(wait)
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).hostname or url
+
+    def _attempt(self, index: int, proxy: ProxyInfo, remaining: int) -> list[AttemptRecord]:
+        if self._metrics is None:
+            return self.process(index, proxy)
+        self._metrics.set_queue_depth(remaining)
+        with self._metrics.track_session():
+            records = self.process(index, proxy)
+        for record in records:
+            self._metrics.record_attempt(record)
+        return records
+
+    def _remaining_urls(self, proxy: ProxyInfo) -> list[str]:
+        # ジャーナルで完了済みの URL を除いた、このプロキシで処理する URL
+        if self._journal is None:
+            return self._urls
+        return [url for url in self._urls if not self._journal.is_done(proxy, url)]
+
+    def _finish(self, summary: RunSummary, records: list[AttemptRecord]) -> None:
+        for record in records:
+            summary.add(record)
+            if self._sink is not None:
+                self._sink.write(record)
+            if self._journal is not None and record.proxy_index != 0:
+                self._journal.write(record)
+
+    def process(self, index: int, proxy: ProxyInfo) -> list[AttemptRecord]:
+        """
+        1つのプロキシを処理し、URL ごとの AttemptRecord を返します。
+        処理中の例外は送出せず、失敗レコードとして返します。
+        Proxy #0 は初期化のみのため、先頭の URL のレコードを1件だけ返します。
+
+        Args:
+            index: プロキシリスト内のインデックス。
+            proxy: 処理するプロキシ。
+
+        Returns:
+            list[AttemptRecord]: URL ごとの試行結果 (ジャーナルで完了済みの URL は含みません)。
+        """
+        self._logger.info(
+            "--- Processing Proxy #%s: %s:%s ---", index, proxy.host, proxy.port)
+        if self._tracer is None:
+            return self._process(index, proxy)
+        attributes = {"proxy.index": index, "proxy.host": proxy.host, "proxy.port": proxy.port,
+                      "url": self._url, "mode": self._mode}
+        if len(self._urls) > 1:
+            attributes["url.count"] = len(self._urls)
+        with self._tracer.span("proxy_attempt", attributes) as span:
+            records = self._process(index, proxy)
+            failures = [record for record in records if not record.success]
+            span.set_attribute("success", not failures)
+            if failures:
+                span.set_error(f"{failures[0].error_class}: {failures[0].error_message}")
+            return records
+
+    def _process(self, index: int, proxy: ProxyInfo) -> list[AttemptRecord]:
+        started_at = time.time()
+        started = time.perf_counter()
+        urls = [self._url] if index == 0 else self._remaining_urls(proxy)
+        fields = dict(proxy_index=index, proxy_host=proxy.host, proxy_port=proxy.port,
+                      mode=self._mode, started_at=started_at)
+
+        if self._resolver is not None and self._resolver.is_unresolvable(proxy):
+            # 名前解決できないプロキシはブラウザを起動せずに失敗扱いとする
+            self._logger.error(
+                "Skipping proxy #%s (%s:%s): host could not be resolved.", index, proxy.host, proxy.port)
+            return [AttemptRecord(
+                **fields, url=url, success=False, timings={"total": time.perf_counter() - started},
+                error_class="DnsResolutionError", error_category=ERROR_PROXY,
+                error_message=self._resolver.failures.get(proxy.host)) for url in urls]
+
+        if self._mode == MODE_TIERED:
+            return self._process_tiered(index, proxy, fields, started)
+        return self._process_browser(index, proxy, urls, fields, started)
+
+    def _process_tiered(self, index: int, proxy: ProxyInfo, fields: dict, started: float) -> list[AttemptRecord]:
+        # HTTP 段階で落ちたプロキシにはブラウザを起動しない。ブラウザ段階 (--render) は他のモードと同じ
+        # _process_browser で行い、再試行ポリシーと同時実行数の調整 (セッション作成の通知) の対象にする。
+        # --render 時の Proxy #0 はスクショを撮らずブラウザ段階 (初期化) のみ行う。
+        result = self._verifier.verify_http(index, self._url)
+        if not result.success or not self._render:
+            if result.success:
+                self._logger.info("Proxy #%s verified via %s tier: egress IP %s", index, result.tier, result.egress_ip)
+            else:
+                self._logger.error(
+                    "Failed to verify proxy #%s (%s:%s) via %s tier: %s",
+                    index, proxy.host, proxy.port, result.tier, result.error)
+            return [AttemptRecord(
+                **fields, url=self._url, success=result.success,
+                timings={result.tier: result.elapsed_seconds, "total": time.perf_counter() - started},
+                egress_ip=result.egress_ip, error_class=result.error_class, error_message=result.error,
+                tier=result.tier)]
+        # スクショ保存時は HTTP 段階で確認した送信元 IP を引き継ぐ
+        return [replace(record, egress_ip=record.egress_ip or result.egress_ip,
+                        timings={result.tier: result.elapsed_seconds, **record.timings})
+                for record in self._process_browser(
+                    index, proxy, [self._url], dict(fields, tier=TIER_BROWSER), started)]
+
+    def _process_browser(
+        self, index: int, proxy: ProxyInfo, urls: list[str], fields: dict, started: float
+    ) -> list[AttemptRecord]:
+        # 1セッションで urls を順に処理する。フェーズごとの所要時間は ProxiedEdgeBrowser.timings から取得し、
+        # セッションの起動は最初の URL、終了は最後の URL のレコードに含める。
+        records: dict[str, AttemptRecord] = {}
+        for attempt in itertools.count(1):
+            browser_manager = self._browser_factory()
+            todo = [url for url in urls if url not in records]
+            session_started = False
+            try:
+                # ProxiedEdgeBrowser を 'with' 文で使用
+                with browser_manager:
+                    # 1. ブラウザ起動 (常に実行)
+                    try:
+                        browser_manager.start_browser(proxy_index=index)
+                    except Exception:
+                        # 過負荷の Grid からは WebDriverException ではなく urllib3 の ReadTimeoutError などでも届くため、
+                        # 例外の種類によらずセッション作成の失敗として所要時間とともに通知する
+                        self._record_session(browser_manager, failed=True)
+                        raise
+                    session_started = True
+                    self._record_session(browser_manager, failed=False)
+
+                    url_started = started
+                    before: dict[str, float] = {}
+                    # 最初の試行の先頭の URL はスケジューラがトークンを確保済み (Proxy #0 は制限の対象外)
+                    gated = {0} if attempt == 1 or index == 0 else set()
+                    for position, url in enumerate(todo):
+                        if index != 0 and self._tabs_per_session > 1 and position % self._tabs_per_session == 0:
+                            # 次のまとまりの URL をタブで並行して読み込み始める
+                            batch = todo[position:position + self._tabs_per_session]
+                            for offset, batch_url in enumerate(batch, start=position):
+                                if offset not in gated:
+                                    self._wait_for_host(batch_url)
+                                    gated.add(offset)
+                            browser_manager.open_tabs(batch)
+                        elif position not in gated:
+                            self._wait_for_host(url)
+                        records[url] = self._visit(browser_manager, index, proxy, url, fields, attempt,
+                                                   before, url_started)
+                        url_started = time.perf_counter()
+                        before = browser_manager.timings.as_dict()
+                    # with ブロックを抜ける前に明示的に閉じ、終了処理の所要時間も記録に含める
+                    browser_manager.close_browser()
+                    closing = self._timings_since(browser_manager, before, url_started)
+                    last = records[todo[-1]]
+                    records[todo[-1]] = replace(last, timings={
+                        **last.timings, **closing, "total": last.timings["total"] + closing["total"]})
+            except Exception as e:
+                # ブラウザ起動失敗なども含め、このプロキシでの処理が失敗した場合。
+                # Grid 側の問題など再試行する価値のあるエラーは、新しいセッションで残りの URL を再試行する。
+                category = classify_error(e, session_create=not session_started)
+                if self._retry_policy is not None and self._retry_policy.should_retry(category, attempt):
+                    delay = self._retry_policy.backoff(category, attempt)
+                    self._logger.warning(
+                        "Attempt %s for proxy #%s (%s:%s) failed with %s error: %s. Retrying in %.1fs.",
+                        attempt, index, proxy.host, proxy.port, category, e, delay)
+                    self._sleep_without_slot(delay)
+                    continue
+                self._logger.error(
+                    "Failed to process proxy #%s (%s:%s): %s", index, proxy.host, proxy.port, e, exc_info=False)
+                timings = self._timings(browser_manager, started)
+                for url in urls:
+                    records.setdefault(url, AttemptRecord(
+                        **fields, url=url, success=False, timings=timings,
+                        error_class=e.__class__.__name__, error_message=str(e),
+                        error_category=category, attempts=attempt))
+            return [records[url] for url in urls]
+
+    def _visit(
+        self, browser_manager: ProxiedEdgeBrowser, index: int, proxy: ProxyInfo, url: str, fields: dict,
+        attempt: int, before: dict[str, float], url_started: float
+    ) -> AttemptRecord:
+        # 起動済みのセッションで1つの URL を処理する。セッションが使えなくなったとみなせる Grid 側のエラーと、
+        # 再試行ポリシーで再試行できるエラー (ページ読み込みのタイムアウトなど) は送出して新しいセッションで
+        # やり直し、それ以外はこの URL の失敗として記録して残りの URL の処理を続ける。
+        egress_ip: str | None = None
+        screenshot_path: str | None = None
+        try:
+            # ★★★ 条件分岐: 最初のプロキシ(index 0)はスクショをスキップ ★★★
+            if index == 0:
+                self._logger.info(
+                    "Skipping screenshot for the first proxy (%s). Used for initialization.", proxy.host)
+            elif self._mode == MODE_IP:
+                # 2'. 送信元IPの読み取り (スクショなし)
+                result = browser_manager.verify_ip(url)
+                if not result.success:
+                    return AttemptRecord(
+                        **fields, url=url, success=False,
+                        timings=self._timings_since(browser_manager, before, url_started),
+                        error_class=result.error_class, error_message=result.error, attempts=attempt,
+                        blocked_requests=browser_manager.blocked_requests.get(url))
+                egress_ip = result.egress_ip
+            else:
+                # 2. スクリーンショット取得 (最初のプロキシ以外)
+                url_number = self._urls.index(url) + 1 if len(self._urls) > 1 else None
+                screenshot_path = build_screenshot_path(index, proxy, self._screenshot_dir, url_number)
+                browser_manager.take_screenshot(
+                    url=url,
+                    save_path_in_container=screenshot_path
+                )
+        except Exception as e:
+            category = classify_error(e)
+            if category == ERROR_GRID or (
+                    self._retry_policy is not None and self._retry_policy.allows_retry(category, attempt)):
+                raise
+            self._logger.error(
+                "Failed to process '%s' via proxy #%s (%s:%s): %s", url, index, proxy.host, proxy.port, e)
+            return AttemptRecord(
+                **fields, url=url, success=False, timings=self._timings_since(browser_manager, before, url_started),
+                error_class=e.__class__.__name__, error_message=str(e), error_category=category, attempts=attempt,
+                blocked_requests=browser_manager.blocked_requests.get(url))
+        return AttemptRecord(
+            **fields, url=url, success=True, timings=self._timings_since(browser_manager, before, url_started),
+            egress_ip=egress_ip, screenshot_path=screenshot_path, attempts=attempt,
+            blocked_requests=browser_manager.blocked_requests.get(url))
+
+    def _record_session(self, browser_manager: ProxiedEdgeBrowser, failed: bool) -> None:
+        # セッション作成の所要時間と失敗を同時実行数の調整に使う
+        if self._concurrency is not None:
+            self._concurrency.record_session(browser_manager.timings.get("session_create"), failed)
+
+    @staticmethod
+    def _timings(browser_manager: ProxiedEdgeBrowser, started: float) -> dict[str, float]:
+        timings = browser_manager.timings.as_dict()
+        timings["total"] = time.perf_counter() - started
+        return timings
+
+    @staticmethod
+    def _timings_since(browser_manager: ProxiedEdgeBrowser, before: dict[str, float], started: float) -> dict[str, float]:
+        # before の時点からの各フェーズの増分 (同じセッションで処理した前の URL の分を除く)
+        timings = {phase: seconds - before.get(phase, 0.0)
+                   for phase, seconds in browser_manager.timings.as_dict().items()
+                   if seconds != before.get(phase, 0.0)}
+        timings["total"] = time.perf_counter() - started
+        return timings
@@ -0,0 +1,186 @@
+# src/application/run_metrics.py
+import math
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+from ..application.metrics import (
+    DEFAULT_LATENCY_BUCKETS, HistogramMetricsCollector, MetricsCollector, ThreadShards)
+from ..domain.attempt_record import AttemptRecord
+
+METRIC_PREFIX = "proxyrot"
+
+
+class _CounterShard:
+    """1スレッド分のカウンタ (スレッド自身だけが更新する)。"""
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.failures: Counter = Counter()
+        self.active_sessions = 0
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RunMetrics(MetricsCollector):
+    """
+    長時間のローテーション実行中の状態を集計し、Prometheus のテキスト形式で出力するクラス。
+
+    試行数・成功数・エラー種別ごとの失敗数・実行中セッション数・キュー長・
+    フェーズごとの所要時間ヒストグラム・プロキシごとの健全性を保持します。
+    カウンタとヒストグラムはスレッドごとのシャードを更新するだけなので、
+    ワーカースレッドのホットパスでロックを取りません (出力時にシャードを合算します)。
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: フェーズ所要時間ヒストグラムのバケット上限 (秒)。
+        """
+        self._phases = HistogramMetricsCollector(buckets)
+        self._counters = ThreadShards(_CounterShard)
+        # ゲージは最後に書いた値が有効 (辞書への代入は GIL 下で原子的)
+        self._gauges: dict[str, float] = {}
+        self._proxy_up: dict[str, int] = {}
+        self._proxy_consecutive_failures: dict[str, int] = {}
+
+    # --- MetricsCollector ---
+    def observe(self, phase: str, seconds: float) -> None:
+        self._phases.observe(phase, seconds)
+
+    @property
+    def phases(self) -> HistogramMetricsCollector:
+        """フェーズ所要時間のヒストグラム。"""
+        return self._phases
+
+    # --- 更新用 API (ワーカースレッドから呼ばれる) ---
+    def record_attempt(self, record: AttemptRecord) -> None:
+        """
+        1試行分の結果をカウンタとプロキシごとの健全性ゲージに反映します。
+
+        Args:
+            record: 試行結果のレコード。
+        """
+        shard: _CounterShard = self._counters.local()
+        shard.attempts += 1
+        proxy_key = f"{record.proxy_host}:{record.proxy_port}"
+        if record.success:
+            shard.successes += 1
+            self._proxy_up[proxy_key] = 1
+            self._proxy_consecutive_failures[proxy_key] = 0
+        else:
+            shard.failures[record.error_class or "Unknown"] += 1
+            self._proxy_up[proxy_key] = 0
+            self._proxy_consecutive_failures[proxy_key] = \
+                self._proxy_consecutive_failures.get(proxy_key, 0) + 1
+
+    @contextmanager
+    def track_session(self) -> Iterator[None]:
+        """with ブロックの間、実行中セッション数を1増やします。"""
+        shard: _CounterShard = self._counters.local()
+        shard.active_sessions += 1
+        try:
+            yield
+        finally:
+            shard.active_sessions -= 1
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        任意のゲージ (例: queue_depth, concurrency_limit) を設定します。
+
+        Args:
+            name: メトリクス名 (接頭辞 proxyrot_ は自動で付与)。
+            value: 値。
+        """
+        self._gauges[name] = value
+
+    def set_queue_depth(self, depth: int) -> None:
+        """処理待ちの試行数を設定します。"""
+        self.set_gauge("queue_depth", depth)
+
+    # --- 参照用 API ---
+    def totals(self) -> dict[str, int]:
+        """全シャードを合算した試行数・成功数・失敗数・実行中セッション数を返します。"""
+        attempts = successes = active = 0
+        failures: Counter = Counter()
+        for shard in self._counters.all():
+            attempts += shard.attempts
+            successes += shard.successes
+            active += shard.active_sessions
+            failures.update(dict(shard.failures))
+        return {"attempts": attempts, "successes": successes,
+                "failures": sum(failures.values()), "active_sessions": active}
+
+    def failures_by_class(self) -> dict[str, int]:
+        """エラー種別ごとの失敗数を返します。"""
+        failures: Counter = Counter()
+        for shard in self._counters.all():
+            failures.update(dict(shard.failures))
+        return dict(failures)
+
+    def render_prometheus(self) -> str:
+        """
+        現在の値を Prometheus のテキスト形式 (version 0.0.4) で返します。
+
+        Returns:
+            str: /metrics エンドポイントの応答本文。
+        """
+        p = METRIC_PREFIX
+        totals = self.totals()
+        lines: list[str] = [
+            f"# HELP {p}_attempts_total Proxy attempts finished.",
+            f"# TYPE {p}_attempts_total counter",
+            f"{p}_attempts_total {totals['attempts']}",
+            f"# HELP {p}_attempt_successes_total Proxy attempts that succeeded.",
+            f"# TYPE {p}_attempt_successes_total counter",
+            f"{p}_attempt_successes_total {totals['successes']}",
+            f"# HELP {p}_attempt_failures_total Proxy attempts that failed, by error class.",
+            f"# TYPE {p}_attempt_failures_total counter",
+        ]
+        for error_class, count in sorted(self.failures_by_class().items()):
+            lines.append(f'{p}_attempt_failures_total{{error_class="{_escape_label(error_class)}"}} {count}')
+
+        lines += [
+            f"# HELP {p}_active_sessions Browser sessions currently in flight.",
+            f"# TYPE {p}_active_sessions gauge",
+            f"{p}_active_sessions {totals['active_sessions']}",
+        ]
+        for name, value in sorted(dict(self._gauges).items()):
+            lines += [f"# TYPE {p}_{name} gauge", f"{p}_{name} {_format_value(value)}"]
+
+        lines += [
+            f"# HELP {p}_phase_duration_seconds Duration of each browser phase.",
+            f"# TYPE {p}_phase_duration_seconds histogram",
+        ]
+        for phase, histogram in sorted(self._phases.snapshot().items()):
+            label = _escape_label(phase)
+            cumulative = 0
+            for upper, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'{p}_phase_duration_seconds_bucket{{phase="{label}",le="{_format_value(upper)}"}} {cumulative}')
+            lines.append(f'{p}_phase_duration_seconds_sum{{phase="{label}"}} {_format_value(histogram.total)}')
+            lines.append(f'{p}_phase_duration_seconds_count{{phase="{label}"}} {histogram.count}')
+
+        lines += [
+            f"# HELP {p}_proxy_up Whether the last attempt through the proxy succeeded.",
+            f"# TYPE {p}_proxy_up gauge",
+        ]
+        for proxy, up in sorted(dict(self._proxy_up).items()):
+            lines.append(f'{p}_proxy_up{{proxy="{_escape_label(proxy)}"}} {up}')
+        lines += [
+            f"# HELP {p}_proxy_consecutive_failures Consecutive failed attempts through the proxy.",
+            f"# TYPE {p}_proxy_consecutive_failures gauge",
+        ]
+        for proxy, failures in sorted(dict(self._proxy_consecutive_failures).items()):
+            lines.append(f'{p}_proxy_consecutive_failures{{proxy="{_escape_label(proxy)}"}} {failures}')
+        return "\n".join(lines) + "\n"
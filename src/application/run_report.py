@@ -0,0 +1,52 @@
+# src/application/run_report.py
+from collections import Counter
+from typing import Any, Iterable
+
+from ..domain.attempt_record import AttemptRecord
+from ..domain.run_summary import RunSummary
+
+
+def merge_records(record_sets: Iterable[Iterable[AttemptRecord]]) -> list[AttemptRecord]:
+    """
+    複数の結果ファイル (シャードごと・再開前後など) のレコードを1つにまとめます。
+
+    同じ (ホスト, ポート, URL) のレコードが複数ある場合は、開始時刻が最も新しいものだけを残します
+    (全シャードで処理される Proxy #0 や、再開時にやり直した試行が重複しないようにするため)。
+    結果は開始時刻順に並べて返します。
+    """
+    latest: dict[tuple[str, int, str], AttemptRecord] = {}
+    for records in record_sets:
+        for record in records:
+            key = (record.proxy_host, record.proxy_port, record.url)
+            current = latest.get(key)
+            if current is None or record.started_at >= current.started_at:
+                latest[key] = record
+    return sorted(latest.values(), key=lambda r: r.started_at)
+
+
+def build_run_report(
+    records: list[AttemptRecord],
+    shard_summaries: dict[str, dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    """
+    まとめたレコードとシャードごとのサマリーから、実行全体のレポートを作成します。
+
+    Args:
+        records: merge_records でまとめたレコード。
+        shard_summaries: シャード名 ('1/4' など) ごとの RunSummary.to_dict() (任意)。
+
+    Returns:
+        dict[str, Any]: 全体の集計値 (summary)・エラー分類ごとの失敗数 (error_categories)・
+                        シャードごとのサマリー (shards) を含む辞書。
+    """
+    summary = RunSummary(total=len(records))
+    for record in records:
+        summary.add(record)
+    shard_summaries = shard_summaries or {}
+    summary.skipped = sum(int(s.get("skipped", 0)) for s in shard_summaries.values())
+    categories = Counter(r.error_category or r.error_class or "unknown" for r in records if not r.success)
+    return {
+        "summary": summary.to_dict(),
+        "error_categories": dict(categories.most_common()),
+        "shards": shard_summaries,
+    }
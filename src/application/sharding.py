@@ -0,0 +1,63 @@
+# src/application/sharding.py
+import hashlib
+from dataclasses import dataclass
+
+from ..domain.proxy_info import ProxyInfo
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """
+    プロキシリストを N 個のシャードに分けたうちの i 番目 (1 始まり) を表す値オブジェクト。
+
+    Attributes:
+        index (int): シャード番号 (1 以上 count 以下)。
+        count (int): シャードの総数。
+    """
+    index: int
+    count: int
+
+    def __post_init__(self):
+        if self.count < 1:
+            raise ValueError("shard count must be at least 1")
+        if not 1 <= self.index <= self.count:
+            raise ValueError(f"shard index must be between 1 and {self.count}")
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard(spec: str) -> ShardSpec:
+    """
+    'i/N' 形式の文字列から ShardSpec を生成します。
+
+    Raises:
+        ValueError: 形式または値が不正な場合。
+    """
+    index, sep, count = spec.partition("/")
+    try:
+        if not sep:
+            raise ValueError
+        return ShardSpec(int(index), int(count))
+    except ValueError as e:
+        detail = f": {e}" if str(e) else ""
+        raise ValueError(f"Invalid shard '{spec}' (use i/N, e.g. 1/4){detail}") from None
+
+
+def shard_of(proxy: ProxyInfo, count: int) -> int:
+    """
+    host:port の SHA-1 ハッシュから、プロキシが属するシャード番号 (1 始まり) を返します。
+    リスト内の位置に依存しないため、プロキシの追加・削除で他のプロキシの割り当ては変わりません。
+    """
+    digest = hashlib.sha1(f"{proxy.host}:{proxy.port}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(proxies: list[ProxyInfo], shard: ShardSpec) -> list[ProxyInfo]:
+    """
+    shard に割り当てられたプロキシのみを元の順序のまま返します。
+    先頭のプロキシ (Proxy #0) は初期化用のため、すべてのシャードの先頭に残します。
+    """
+    if not proxies:
+        return []
+    return [proxies[0]] + [proxy for proxy in proxies[1:] if shard_of(proxy, shard.count) == shard.index]
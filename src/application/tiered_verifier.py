@@ -0,0 +1,127 @@
+# src/application/tiered_verifier.py
+import logging
+import time
+from dataclasses import replace
+from typing import Callable
+
+from ..adapters.http_ip_checker import HttpIpChecker
+from ..application.proxied_edge_browser import ProxiedEdgeBrowser
+from ..application.proxy_selector import ProxySelector
+from ..config.logging_config import get_logger
+from ..domain.ip_check_result import IpCheckResult, TIER_BROWSER
+
+
+class TieredVerifier:
+    """
+    プロキシの確認を2段階で行うクラス。
+
+    まず HttpIpChecker による軽量な HTTP リクエストでプロキシの疎通と送信元 IP を確認し、
+    それに通過したプロキシで、かつレンダリングが必要な対象についてのみ
+    ProxiedEdgeBrowser (Edge ブラウザ) による確認を行います。
+    どちらの段階の結果も IpCheckResult として同じ形で返します。
+    RotationRunner は HTTP 段階だけを verify_http で行い、ブラウザ段階は再試行と同時実行数の制御を
+    受けるよう自身のブラウザの処理で行います。
+    """
+
+    def __init__(
+        self,
+        http_checker: HttpIpChecker,
+        proxy_selector: ProxySelector,
+        browser_factory: Callable[[], ProxiedEdgeBrowser],
+        logger: logging.Logger | None = None
+    ):
+        """
+        TieredVerifier を初期化します。
+
+        Args:
+            http_checker: HTTP 段階の確認に使用する HttpIpChecker。
+            proxy_selector: インデックスからプロキシを選択する ProxySelector。
+            browser_factory: ブラウザ段階で使用する ProxiedEdgeBrowser を生成する関数。
+            logger: 使用するロガー。省略時はアプリケーションロガー。
+
+        Raises:
+            TypeError: http_checker または proxy_selector の型が不正な場合。
+        """
+        if not isinstance(http_checker, HttpIpChecker):
+            raise TypeError("http_checker must be an instance of HttpIpChecker")
+        if not isinstance(proxy_selector, ProxySelector):
+            raise TypeError("proxy_selector must be an instance of ProxySelector")
+
+        self._http_checker: HttpIpChecker = http_checker
+        self._selector: ProxySelector = proxy_selector
+        self._browser_factory: Callable[[], ProxiedEdgeBrowser] = browser_factory
+        self._logger: logging.Logger = logger or get_logger()
+
+    def verify_http(self, proxy_index: int, url: str) -> IpCheckResult:
+        """
+        指定したインデックスのプロキシを HTTP 段階だけで確認します。
+
+        Args:
+            proxy_index: 確認するプロキシのインデックス。
+            url: IP 確認 URL。
+
+        Returns:
+            IpCheckResult: tier=TIER_HTTP の確認結果。
+
+        Raises:
+            TypeError, IndexError: proxy_index が不正な場合 (ProxySelector が送出)。
+        """
+        proxy_info = self._selector.select_proxy(proxy_index)
+        http_result = self._http_checker.check(proxy_info, url)
+        if not http_result.success:
+            self._logger.info(
+                "Proxy #%s (%s:%s) failed HTTP tier: %s", proxy_index, proxy_info.host, proxy_info.port, http_result.error)
+        else:
+            self._logger.debug(
+                "Proxy #%s passed HTTP tier in %.2fs (egress IP: %s)", proxy_index, http_result.elapsed_seconds, http_result.egress_ip)
+        return http_result
+
+    def verify(
+        self,
+        proxy_index: int,
+        url: str,
+        render_url: str | None = None,
+        screenshot_path: str | None = None
+    ) -> IpCheckResult:
+        """
+        指定したインデックスのプロキシを段階的に確認します。
+
+        Args:
+            proxy_index: 確認するプロキシのインデックス。
+            url: HTTP 段階でアクセスする IP 確認 URL。
+            render_url: レンダリングが必要な対象の URL。None の場合はブラウザ段階を行いません。
+            screenshot_path: ブラウザ段階で render_url のスクリーンショットを保存するパス。
+                             None の場合はブラウザ段階でも本文から送信元 IP を読み取ります。
+
+        Returns:
+            IpCheckResult: HTTP 段階で失敗した場合やブラウザ段階が不要な場合は HTTP 段階の結果、
+                           それ以外はブラウザ段階の結果。
+
+        Raises:
+            TypeError, IndexError: proxy_index が不正な場合 (ProxySelector が送出)。
+        """
+        http_result = self.verify_http(proxy_index, url)
+        if not http_result.success or render_url is None:
+            return http_result
+        proxy_info = http_result.proxy
+
+        started = time.perf_counter()
+        try:
+            with self._browser_factory() as browser:
+                browser.start_browser(proxy_index)
+                if screenshot_path is None:
+                    return browser.verify_ip(render_url)
+                browser.take_screenshot(render_url, screenshot_path)
+        except Exception as e:
+            self._logger.error(
+                "Proxy #%s failed browser tier: %s", proxy_index, e, exc_info=False)
+            return IpCheckResult(
+                proxy=proxy_info, url=render_url, egress_ip=None,
+                elapsed_seconds=time.perf_counter() - started,
+                error=f"{e.__class__.__name__}: {e}", error_class=e.__class__.__name__,
+                tier=TIER_BROWSER)
+
+        # スクショ保存時は HTTP 段階で確認した送信元 IP を引き継ぐ
+        return replace(
+            http_result, url=render_url, tier=TIER_BROWSER, screenshot_path=screenshot_path,
+            elapsed_seconds=time.perf_counter() - started)
@@ -0,0 +1,154 @@
+# src/application/tracing.py
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from ..adapters.span_exporter import SpanExporter
+
+STATUS_UNSET = "UNSET"
+STATUS_OK = "OK"
+STATUS_ERROR = "ERROR"
+
+DEFAULT_TRACE_SAMPLE_RATIO = 0.01
+DEFAULT_SLOW_TRACE_SECONDS = 20.0
+
+
+class Span:
+    """
+    トレース内の1区間 (例: 1プロキシの試行、1回の WebDriver コマンド)。
+    ID は OpenTelemetry と同じく 16 バイトのトレース ID と 8 バイトのスパン ID (16進文字列) です。
+    """
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: str | None,
+                 attributes: dict[str, Any] | None = None):
+        self.name: str = name
+        self.trace_id: str = trace_id
+        self.span_id: str = os.urandom(8).hex()
+        self.parent_span_id: str | None = parent_span_id
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.start_time_ns: int = time.time_ns()
+        self.end_time_ns: int | None = None
+        self.status: str = STATUS_UNSET
+        self.status_message: str | None = None
+        self._started = time.perf_counter()
+        self._duration: float | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def end(self) -> None:
+        if self._duration is None:
+            self._duration = time.perf_counter() - self._started
+            self.end_time_ns = self.start_time_ns + int(self._duration * 1e9)
+
+    @property
+    def duration_seconds(self) -> float | None:
+        """スパンの所要秒数 (単調時計)。終了前は None。"""
+        return self._duration
+
+
+class _Trace:
+    """1トレース分のスパンの入れ物 (ルートスパンの終了時に書き出しを判定する)。"""
+
+    def __init__(self, sampled: bool):
+        self.sampled = sampled
+        self.spans: list[Span] = []
+        self.has_error = False
+
+
+class Tracer:
+    """
+    スパンを生成し、トレース単位で SpanExporter に書き出すトレーサー。
+
+    スパンはスレッドごとのスタックで親子関係を管理するため、ワーカースレッドごとに
+    独立したトレースが作られます。書き出すかどうかはルートスパンの終了時に判定し
+    (テールサンプリング)、sample_ratio の確率で選ばれたトレースに加えて、
+    エラーを含むトレースと slow_threshold_seconds 以上かかったトレースは必ず残します。
+    これにより、大量のプロキシを処理する実行でも遅いプロキシ1件を後から調査できます。
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        sample_ratio: float = DEFAULT_TRACE_SAMPLE_RATIO,
+        slow_threshold_seconds: float | None = DEFAULT_SLOW_TRACE_SECONDS,
+        random_func: Callable[[], float] = random.random
+    ):
+        """
+        Args:
+            exporter: 書き出し先。
+            sample_ratio: 通常のトレースを残す確率 (0〜1)。
+            slow_threshold_seconds: この秒数以上かかったトレースは常に残す (None で無効)。
+            random_func: 0〜1 の乱数を返す関数 (テスト用に差し替え可能)。
+
+        Raises:
+            TypeError: exporter が SpanExporter のインスタンスでない場合。
+            ValueError: sample_ratio が 0〜1 の範囲外の場合。
+        """
+        if not isinstance(exporter, SpanExporter):
+            raise TypeError("exporter must be an instance of SpanExporter")
+        if not 0 <= sample_ratio <= 1:
+            raise ValueError("sample_ratio must be between 0 and 1")
+        self._exporter = exporter
+        self._sample_ratio = sample_ratio
+        self._slow_threshold = slow_threshold_seconds
+        self._random = random_func
+        self._local = threading.local()
+
+    def _stack(self) -> list[tuple[Span, _Trace]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_span(self) -> Span | None:
+        """呼び出したスレッドで現在開いているスパンを返します。無ければ None。"""
+        stack = self._stack()
+        return stack[-1][0] if stack else None
+
+    @contextmanager
+    def span(self, name: str, attributes: dict[str, Any] | None = None) -> Iterator[Span]:
+        """
+        with ブロックの区間をスパンとして記録します。開いているスパンがあればその子になり、
+        無ければ新しいトレースのルートになります。例外で抜けた場合はエラーとして記録します。
+
+        Args:
+            name: スパン名。
+            attributes: スパンの属性。
+
+        Yields:
+            Span: 開始したスパン (属性を追加できます)。
+        """
+        stack = self._stack()
+        if stack:
+            parent, trace = stack[-1]
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+        else:
+            trace = _Trace(sampled=self._random() < self._sample_ratio)
+            span = Span(name, os.urandom(16).hex(), None, attributes)
+        stack.append((span, trace))
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{e.__class__.__name__}: {e}")
+            raise
+        finally:
+            span.end()
+            stack.pop()
+            trace.spans.append(span)
+            if span.status == STATUS_ERROR:
+                trace.has_error = True
+            if not stack:
+                self._finish_trace(span, trace)
+
+    def _finish_trace(self, root: Span, trace: _Trace) -> None:
+        slow = self._slow_threshold is not None and root.duration_seconds >= self._slow_threshold
+        if trace.sampled or trace.has_error or slow:
+            self._exporter.export(trace.spans)
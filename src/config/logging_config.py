@@ -1,7 +1,16 @@
 # src/config/logging_config.py
+import atexit
+import copy
+import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 import sys # 標準エラー出力用にインポート
@@ -12,23 +21,182 @@ DEFAULT_LOG_FILE_NAME = "app.log"
 DEFAULT_LOG_LEVEL = "INFO"
 DEFAULT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
 DEFAULT_APP_LOGGER_NAME = 'my_cool_app' # ★ デフォルトのロガー名
+# ログファイルのローテーション (LOG_ROTATE_WHEN 指定時は時刻ベース、それ以外はサイズベース)
+DEFAULT_LOG_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 5
+# 同じエラーは最初の N 件のみ出力し、以降は LOG_SAMPLE_INTERVAL 秒ごとに抑制件数をまとめて出力する
+DEFAULT_LOG_SAMPLE_FIRST_N = 5
+DEFAULT_LOG_SAMPLE_INTERVAL = 60.0
+
+_TRUE_VALUES = ('1', 'true', 'yes', 'on')
+# LogRecord が標準で持つ属性 (JSON 出力で extra の項目と区別するため)
+_STANDARD_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
 
 _is_configured = False
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    1レコードを1行の JSON として出力するフォーマッタ。
+    logger.info(..., extra={...}) で渡した項目もそのままキーとして出力されます。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "file": record.filename,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ErrorSamplingFilter(logging.Filter):
+    """
+    同じ種類の WARNING 以上のログを間引くフィルタ。
+
+    ログの種類 (シグネチャ) はロガー名・レベル・書式化前のメッセージ・例外クラスで判定します。
+    各シグネチャについて最初の first_n 件はそのまま通し、以降は件数だけを数えて、
+    interval 秒ごとに「直近で抑制した件数」を付けた1件 (トレースバック無し) を通します。
+    大量のプロキシが同じ理由で失敗しても、ログの量とディスク I/O が一定に抑えられます。
+    最後のまとめ以降に抑制した件数は、summary() で取り出して終了時に出力します (shutdown_logging が呼び出します)。
+    """
+
+    def __init__(
+        self,
+        first_n: int = DEFAULT_LOG_SAMPLE_FIRST_N,
+        interval: float = DEFAULT_LOG_SAMPLE_INTERVAL,
+        max_signatures: int = 10000,
+        clock=time.monotonic
+    ):
+        """
+        Args:
+            first_n: シグネチャごとにそのまま出力する件数。
+            interval: 抑制件数をまとめて出力する間隔 (秒)。
+            max_signatures: 記憶するシグネチャ数の上限 (古いものから忘れる)。
+            clock: 単調時計 (テスト用に差し替え可能)。
+        """
+        super().__init__()
+        self._first_n = first_n
+        self._interval = interval
+        self._max_signatures = max_signatures
+        self._clock = clock
+        # シグネチャ -> [出現件数, 抑制中の件数, 最後にまとめて出力した時刻, 最後に抑制したレコード]
+        self._seen: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or getattr(record, "sampling_summary", False):
+            return True
+        exc_class = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        signature = (record.name, record.levelno, str(record.msg), exc_class)
+        now = self._clock()
+        with self._lock:
+            state = self._seen.get(signature)
+            if state is None:
+                state = self._seen[signature] = [0, 0, now, None]
+                if len(self._seen) > self._max_signatures:
+                    self._seen.popitem(last=False)
+            else:
+                self._seen.move_to_end(signature)
+            state[0] += 1
+            if state[0] <= self._first_n:
+                state[2] = now
+                return True
+            state[1] += 1
+            if now - state[2] < self._interval:
+                state[3] = record
+                return False
+            suppressed, state[1], state[2], state[3] = state[1], 0, now, None
+            total = state[0]
+        # まとめの1件はトレースバックを付けずに、抑制件数と累計を添えて出力する
+        record.msg = f"[{suppressed} similar message(s) in the last {self._interval:g}s, {total} total] {record.msg}"
+        record.exc_info = None
+        record.exc_text = None
+        return True
+
+    def summary(self) -> list[logging.LogRecord]:
+        """
+        最後のまとめ以降に抑制したログを、シグネチャごとに抑制件数を付けた1件のレコードとして返し、件数をリセットします。
+        返したレコードはこのフィルタを素通りするため、そのままロガーの handle() に渡せます。
+        """
+        records: list[logging.LogRecord] = []
+        now = self._clock()
+        with self._lock:
+            for state in self._seen.values():
+                if not state[1]:
+                    continue
+                record = copy.copy(state[3])
+                record.msg = (f"[{state[1]} similar message(s) suppressed in the last {now - state[2]:.0f}s, "
+                              f"{state[0]} total] {record.msg}")
+                record.exc_info = None
+                record.exc_text = None
+                record.sampling_summary = True
+                records.append(record)
+                state[1], state[2], state[3] = 0, now, None
+        return records
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    呼び出し元スレッドではメッセージの展開と例外の文字列化だけを行い、キューに積むハンドラ。
+    書式化とファイル/コンソールへの書き込みは QueueListener のスレッドで行われます。
+    """
 
-def setup_logging(log_level_override: Optional[str] = None):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 引数や例外オブジェクトは後から変化し得るため、キューに積む前に文字列にしておく
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, '').strip().lower() in _TRUE_VALUES
+
+
+def setup_logging(
+    log_level_override: Optional[str] = None,
+    async_logging: Optional[bool] = None,
+    json_format: Optional[bool] = None
+):
     """
     アプリケーションの基本的なファイルロギングを設定する。
-    環境変数 LOG_LEVEL、LOG_DIR、LOG_FILE_NAME、LOG_FORMAT を参照する。
+    環境変数 LOG_LEVEL、LOG_DIR、LOG_FILE_NAME、LOG_FORMAT、LOG_ASYNC、LOG_JSON を参照する。
     複数回呼び出されても設定が重複しないようにする。
-    ハンドラチェックの条件式を修正。デバッグプリント付き。
+
+    ログファイルは LOG_MAX_BYTES (0 で無効) と LOG_BACKUP_COUNT でサイズベースに、
+    LOG_ROTATE_WHEN (例: 'midnight', 'H') を指定した場合は時刻ベースにローテーションされます。
+    WARNING 以上の同じログは LOG_SAMPLE_FIRST_N 件 (0 で無効) まで出力し、以降は
+    LOG_SAMPLE_INTERVAL 秒ごとに抑制件数をまとめて出力します (ErrorSamplingFilter)。
+
+    非同期モードでは、ロガーにはキューへ積むだけの QueueHandler のみを付け、
+    ファイル/コンソールへの書き込みは QueueListener のスレッドが行います。
+    多数のワーカースレッドがハンドラのロックで待たされることがありません。
 
     Args:
         log_level_override: 環境変数の代わりに指定するログレベル (例: 'DEBUG')。
+        async_logging: QueueHandler/QueueListener を使うかどうか (省略時は LOG_ASYNC)。
+        json_format: 1行1レコードの JSON で出力するかどうか (省略時は LOG_JSON)。
     """
-    global _is_configured
-    print("\nDEBUG: --- setup_logging called ---") # ★ 関数呼び出し確認
+    global _is_configured, _queue_listener
     if _is_configured:
-        print("DEBUG: Logging already configured, skipping.") # ★ スキップ確認
         return
 
     # --- 環境変数の読み込み ---
@@ -38,7 +206,13 @@ def setup_logging(log_level_override: Optional[str] = None):
     level_str = (log_level_override or level_str_env).upper()
     log_format = os.getenv('LOG_FORMAT', DEFAULT_LOG_FORMAT)
     app_logger_name = os.getenv('APP_LOGGER_NAME', DEFAULT_APP_LOGGER_NAME)
-    print(f"DEBUG: Read config - log_dir='{log_dir_str}', file='{log_file_name}', level='{level_str}', logger='{app_logger_name}'") # ★ 読み込み値確認
+    use_async = _env_flag('LOG_ASYNC') if async_logging is None else async_logging
+    use_json = _env_flag('LOG_JSON') if json_format is None else json_format
+    max_bytes = int(os.getenv('LOG_MAX_BYTES', DEFAULT_LOG_MAX_BYTES))
+    backup_count = int(os.getenv('LOG_BACKUP_COUNT', DEFAULT_LOG_BACKUP_COUNT))
+    rotate_when = os.getenv('LOG_ROTATE_WHEN', '').strip()
+    sample_first_n = int(os.getenv('LOG_SAMPLE_FIRST_N', DEFAULT_LOG_SAMPLE_FIRST_N))
+    sample_interval = float(os.getenv('LOG_SAMPLE_INTERVAL', DEFAULT_LOG_SAMPLE_INTERVAL))
 
     log_dir = Path(log_dir_str)
     log_file_path = log_dir / log_file_name
@@ -46,59 +220,95 @@ def setup_logging(log_level_override: Optional[str] = None):
 
     # --- ディレクトリ作成処理 ---
     try:
-        print(f"DEBUG: Attempting to create directory {log_dir}") # ★ ディレクトリ作成試行確認
         log_dir.mkdir(parents=True, exist_ok=True)
-        print(f"DEBUG: Directory {log_dir} ensured.") # ★ ディレクトリ作成/存在確認
     except OSError as e:
         print(f"ERROR: Failed to create log directory {log_dir}: {e}", file=sys.stderr)
-        print("DEBUG: Exiting setup_logging due to directory creation error.") # ★ 早期リターン確認
         return # ディレクトリ作成失敗時は設定中断
 
     logger = logging.getLogger(app_logger_name)
     logger.setLevel(log_level)
-    print(f"DEBUG: Logger '{logger.name}' level set to {log_level} ({logging.getLevelName(log_level)})") # ★ ロガーレベル設定確認
 
-    # --- ★★★ ハンドラ重複チェックの条件式を変更 ★★★ ---
-    print(f"DEBUG: Checking handlers for logger '{logger.name}'. Current count: {len(logger.handlers)}") # ★ ハンドラ数確認
-    if not logger.handlers:      # ★ 修正: リストが空かどうかで直接チェック
-        print("DEBUG: No handlers found, proceeding to add new ones.") # ★ ハンドラ追加ブロック実行確認
-        formatter = logging.Formatter(log_format)
+    if not logger.handlers:
+        formatter = JsonFormatter() if use_json else logging.Formatter(log_format)
+        handlers: list[logging.Handler] = []
         file_handler_added = False
         try:
-            print(f"DEBUG: Attempting to create FileHandler for {log_file_path}") # ★ ファイルハンドラ作成試行確認
-            file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
+            file_handler = _create_file_handler(log_file_path, max_bytes, backup_count, rotate_when)
             file_handler.setLevel(log_level) # ハンドラレベルも設定
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
             file_handler_added = True
-            print("DEBUG: FileHandler added successfully.") # ★ ファイルハンドラ追加成功確認
         except OSError as e:
-             # エラーは標準エラーに出力する
-             print(f"ERROR: Failed to create file handler for {log_file_path}: {e}", file=sys.stderr)
-             print("DEBUG: FileHandler creation failed, continuing to add ConsoleHandler.") # ★ ファイルハンドラ失敗確認
+            # エラーは標準エラーに出力し、コンソールのみで継続する
+            print(f"ERROR: Failed to create file handler for {log_file_path}: {e}", file=sys.stderr)
 
         # コンソールハンドラも追加
-        print("DEBUG: Attempting to create StreamHandler (Console)") # ★ コンソールハンドラ作成試行確認
         console_handler = logging.StreamHandler(sys.stdout) # 標準出力へ
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-        print("DEBUG: StreamHandler added successfully.") # ★ コンソールハンドラ追加成功確認
+        handlers.append(console_handler)
+
+        # 再設定時に以前のフィルタ (と抑制件数) を引き継がないよう付け直す
+        for old_filter in [f for f in logger.filters if isinstance(f, ErrorSamplingFilter)]:
+            logger.removeFilter(old_filter)
+        if sample_first_n > 0:
+            # ロガー側で間引くため、抑制されたレコードはキューにもハンドラにも渡らない
+            logger.addFilter(ErrorSamplingFilter(sample_first_n, sample_interval))
+
+        if use_async:
+            # ワーカーはキューに積むだけにし、書き込みはリスナースレッドに任せる
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            logger.addHandler(_QueueHandler(log_queue))
+            _queue_listener = logging.handlers.QueueListener(
+                log_queue, *handlers, respect_handler_level=True)
+            _queue_listener.start()
+        else:
+            for handler in handlers:
+                logger.addHandler(handler)
 
         # 設定完了メッセージ
         log_destination = f"file={log_file_path}" if file_handler_added else "console only"
-        # logger.info を使用
-        logger.info(f"Logging configured: level={level_str}, {log_destination}")
-        print(f"DEBUG: Configuration log message sent via logger.") # ★ logger.info を呼んだことを確認
-
-    else:
-        # この else ブロックは、初回呼び出しでは実行されないはず
-        print(f"DEBUG: Logger '{logger.name}' already has handlers ({len(logger.handlers)} found), not adding duplicates.") # ★ ハンドラ重複防止確認
+        logger.info("Logging configured: level=%s, %s, async=%s, json=%s",
+                    level_str, log_destination, use_async, use_json)
 
     _is_configured = True
-    print("DEBUG: --- setup_logging finished ---") # ★ 関数終了確認
+
+
+def _create_file_handler(
+    path: Path, max_bytes: int, backup_count: int, rotate_when: str
+) -> logging.FileHandler:
+    if rotate_when:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=rotate_when, backupCount=backup_count, encoding='utf-8')
+    if max_bytes > 0:
+        return logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    return logging.FileHandler(path, encoding='utf-8')
+
+
+def shutdown_logging() -> None:
+    """
+    ErrorSamplingFilter が最後のまとめ以降に抑制した件数を出力し、非同期モードの QueueListener を停止して
+    キューに残ったレコードをすべて書き出します。プロセス終了時にも自動で呼ばれます。
+    """
+    global _queue_listener
+    logger = get_logger()
+    for sampling in [f for f in logger.filters if isinstance(f, ErrorSamplingFilter)]:
+        for record in sampling.summary():
+            logger.handle(record)
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.flush()
+            if isinstance(handler, logging.FileHandler):
+                handler.close()
+        _queue_listener = None
+
+
+atexit.register(shutdown_logging)
+
 
 # get_logger 関数は変更なし
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     logger_name = name or os.getenv('APP_LOGGER_NAME', DEFAULT_APP_LOGGER_NAME)
-    return logging.getLogger(logger_name)
\ No newline at end of file
+    return logging.getLogger(logger_name)
@@ -0,0 +1,49 @@
+# src/domain/attempt_record.py
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class AttemptRecord:
+    """
+    1つのプロキシに対する1回の処理試行の結果を保持する不変の値オブジェクト。
+    結果シンクに1試行1レコードとして書き出され、ログを grep せずに実行結果を分析できるようにします。
+
+    Attributes:
+        proxy_index (int): プロキシリスト内のインデックス。
+        proxy_host (str): プロキシのホスト名または IP アドレス。
+        proxy_port (int): プロキシのポート番号。
+        url (str): アクセス対象の URL。
+        mode (str): 検証モード (screenshot / ip / tiered)。
+        success (bool): 試行が成功したかどうか。
+        started_at (float): 試行開始時刻 (UNIX エポック秒)。
+        timings (dict[str, float]): フェーズ名ごとの所要秒数。
+        egress_ip (str | None): 確認できた送信元 IP アドレス。
+        screenshot_path (str | None): 保存したスクリーンショットのパス。
+        error_class (str | None): 失敗時の例外クラス名などの分類。
+        error_message (str | None): 失敗時のエラーメッセージ。
+        tier (str | None): tiered モードで結果を出した段階 (http / browser)。
+        error_category (str | None): 失敗時のエラー分類 (grid / proxy / navigation_timeout / other)。
+        attempts (int): 再試行を含めた試行回数。
+        blocked_requests (int | None): 遮断した画像・広告などのリクエスト数 (リソースの遮断を有効にした場合のみ)。
+    """
+    proxy_index: int
+    proxy_host: str
+    proxy_port: int
+    url: str
+    mode: str
+    success: bool
+    started_at: float
+    timings: dict[str, float] = field(default_factory=dict)
+    egress_ip: str | None = None
+    screenshot_path: str | None = None
+    error_class: str | None = None
+    error_message: str | None = None
+    tier: str | None = None
+    error_category: str | None = None
+    attempts: int = 1
+    blocked_requests: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON などに書き出せる辞書表現を返します。"""
+        return asdict(self)
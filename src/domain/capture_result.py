@@ -0,0 +1,30 @@
+# src/domain/capture_result.py
+from dataclasses import dataclass, field
+
+# 1つの試行の結末
+OUTCOME_WON = "won"              # 最初に成功し、キャプチャとして採用された
+OUTCOME_FAILED = "failed"        # エラーで失敗した
+OUTCOME_CANCELLED = "cancelled"  # 他の試行が先に成功したため打ち切られた
+
+
+@dataclass(frozen=True)
+class CaptureResult:
+    """
+    1つの URL を (必要に応じて複数のプロキシで並行して) キャプチャした結果を保持する不変の値オブジェクト。
+
+    Attributes:
+        url (str): キャプチャ対象の URL。
+        success (bool): いずれかのプロキシでキャプチャできたかどうか。
+        proxy_index (int | None): 採用されたキャプチャのプロキシのインデックス。
+        screenshot_path (str | None): 採用されたスクリーンショットのパス。
+        elapsed_seconds (float): 開始から結果が確定するまでの秒数。
+        outcomes (dict[int, str]): 開始した試行のプロキシインデックスごとの結末 (OUTCOME_*)。
+        hedges_started (int): 先行する試行が遅いために追加で開始した試行の数。
+    """
+    url: str
+    success: bool
+    proxy_index: int | None
+    screenshot_path: str | None
+    elapsed_seconds: float
+    outcomes: dict[int, str] = field(default_factory=dict)
+    hedges_started: int = 0
@@ -0,0 +1,40 @@
+# src/domain/ip_check_result.py
+from dataclasses import dataclass
+
+from src.domain.proxy_info import ProxyInfo
+
+# 確認を行った段階 (HTTP クライアントによる高速確認 / Edge ブラウザによる確認)
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+# ページ本文・応答本文から送信元 IP を読み取れなかった場合の error_class
+NO_EGRESS_IP = "NoEgressIp"
+
+
+@dataclass(frozen=True)
+class IpCheckResult:
+    """
+    プロキシ経由で IP 確認 URL にアクセスした結果を保持する不変の値オブジェクト。
+
+    Attributes:
+        proxy (ProxyInfo): 確認に使用したプロキシ。
+        url (str): アクセスした IP 確認 URL。
+        egress_ip (str | None): 接続先から見えた送信元 IP アドレス。取得できなかった場合は None。
+        elapsed_seconds (float): 確認に要した秒数。
+        error (str | None): 失敗時のエラー内容。成功時は None。
+        error_class (str | None): 失敗の種類 (例外クラス名など)。成功時は None。
+        tier (str): 確認を行った段階 (TIER_HTTP または TIER_BROWSER)。
+        screenshot_path (str | None): ブラウザ段階で保存したスクリーンショットのパス。
+    """
+    proxy: ProxyInfo
+    url: str
+    egress_ip: str | None
+    elapsed_seconds: float
+    error: str | None = None
+    error_class: str | None = None
+    tier: str = TIER_BROWSER
+    screenshot_path: str | None = None
+
+    @property
+    def success(self) -> bool:
+        """送信元 IP アドレスが取得でき、エラーがない場合に True を返します。"""
+        return self.egress_ip is not None and self.error is None
@@ -0,0 +1,45 @@
+# src/domain/run_summary.py
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from src.domain.attempt_record import AttemptRecord
+
+
+@dataclass
+class RunSummary:
+    """
+    プロキシローテーション1回分の実行結果の集計値。
+    複数の URL を処理する場合、試行数は (プロキシ, URL) ごとに数えます。
+
+    Attributes:
+        total (int): 処理対象のプロキシ数。
+        succeeded (int): 成功した試行数 (screenshot / ip モードではブラウザ起動成功数)。
+        failed (int): 失敗した試行数。
+        screenshots_taken (int): 実際に保存されたスクリーンショット数。
+        ips_verified (int): 送信元 IP を確認できた数。
+        skipped (int): 実行ジャーナルにより完了済みとしてスキップした数。
+        blocked_requests (int): 遮断した画像・広告などのリクエスト数の合計。
+    """
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    screenshots_taken: int = 0
+    ips_verified: int = 0
+    skipped: int = 0
+    blocked_requests: int = 0
+
+    def add(self, record: AttemptRecord) -> None:
+        """1試行分のレコードを集計値に加えます (total は変更しません)。"""
+        if record.success:
+            self.succeeded += 1
+            if record.screenshot_path:
+                self.screenshots_taken += 1
+            if record.egress_ip:
+                self.ips_verified += 1
+        else:
+            self.failed += 1
+        self.blocked_requests += record.blocked_requests or 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON などに書き出せる辞書表現を返します。"""
+        return asdict(self)
@@ -82,4 +82,197 @@ def test_create_options_input_validation():
         valid_proxy = ProxyInfo(host="valid", port=80)
         factory.create_options(valid_proxy)
     except TypeError:
-        pytest.fail("TypeError raised unexpectedly for valid ProxyInfo")
\ No newline at end of file
+        pytest.fail("TypeError raised unexpectedly for valid ProxyInfo")
+
+def test_create_options_uses_resolved_address_when_resolver_given(mocker):
+    """リゾルバを渡した場合、--proxy-server に解決済みの IP アドレスが使われることを確認"""
+    # Arrange
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    from src.adapters.proxy_host_resolver import ProxyHostResolver
+    proxy_info = ProxyInfo(host="proxy-server", port=8080)
+    mock_resolver = mocker.Mock(spec=ProxyHostResolver)
+    mock_resolver.lookup.return_value = ProxyInfo(host="172.18.0.2", port=8080)
+    factory = EdgeOptionFactory(resolver=mock_resolver)
+
+    # Act
+    options = factory.create_options(proxy_info)
+
+    # Assert
+    mock_resolver.lookup.assert_called_once_with(proxy_info)
+    assert "--proxy-server=172.18.0.2:8080" in options.arguments
+    assert "--proxy-server=proxy-server:8080" not in options.arguments
+
+
+def test_create_options_sets_page_load_strategy_and_timeouts():
+    """読み込み戦略とタイムアウトが capability に反映されることを確認"""
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    factory = EdgeOptionFactory(page_load_strategy="eager", page_load_timeout=20, script_timeout=5.5)
+
+    capabilities = factory.create_options(ProxyInfo(host="proxy.test.com", port=8888)).to_capabilities()
+
+    assert capabilities["pageLoadStrategy"] == "eager"
+    assert capabilities["timeouts"] == {"pageLoad": 20000, "script": 5500}
+
+
+def test_create_options_rejects_unknown_page_load_strategy():
+    """不正な読み込み戦略で ValueError が発生することを確認"""
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    with pytest.raises(ValueError, match="page_load_strategy must be one of"):
+        EdgeOptionFactory(page_load_strategy="fast")
+
+
+def test_proxy_server_returns_resolved_host_and_port(mocker):
+    """proxy_server が resolver を適用した host:port を返すことを確認"""
+    # Arrange
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    from src.adapters.proxy_host_resolver import ProxyHostResolver
+    resolver = mocker.Mock(spec=ProxyHostResolver)
+    resolver.lookup.return_value = ProxyInfo(host="192.0.2.10", port=3128)
+    factory = EdgeOptionFactory(resolver=resolver)
+
+    # Act / Assert
+    assert factory.proxy_server(ProxyInfo("proxy.example.com", 3128)) == "192.0.2.10:3128"
+
+
+def test_create_options_adds_proxy_bypass_list():
+    """直接接続するホストを指定した場合のみ --proxy-bypass-list が追加されることを確認"""
+    # Arrange
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    proxy_info = ProxyInfo(host="proxy-server", port=8080)
+
+    # Act
+    with_bypass = EdgeOptionFactory(proxy_bypass_list=("*.cloudfront.net", "fonts.gstatic.com")).create_options(proxy_info)
+    without_bypass = EdgeOptionFactory().create_options(proxy_info)
+
+    # Assert
+    assert "--proxy-bypass-list=*.cloudfront.net;fonts.gstatic.com" in with_bypass.arguments
+    assert not any(a.startswith("--proxy-bypass-list") for a in without_bypass.arguments)
+
+
+def test_profile_template_is_copied_per_session_and_removed_on_release(tmp_path):
+    """テンプレートがセッションごとに書き込み可能なディレクトリへコピーされ、返却時に削除されることを確認"""
+    # Arrange
+    import os
+    import stat
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    template = tmp_path / "template"
+    (template / "Default" / "Cache").mkdir(parents=True)
+    (template / "First Run").touch()
+    (template / "SingletonLock").touch()
+    (template / "Default" / "Preferences").write_text("{}", encoding="utf-8")
+    (template / "Default" / "Cache" / "data_0").touch()
+    for path in [template / "Default", template]:
+        os.chmod(path, stat.S_IRUSR | stat.S_IXUSR)  # 読み取り専用のテンプレート
+    factory = EdgeOptionFactory(profile_template=template, profile_root=tmp_path / "profiles")
+
+    try:
+        # Act
+        first = factory.create_options(ProxyInfo(host="proxy-server", port=8080))
+        second = factory.create_options(ProxyInfo(host="proxy-server", port=8080))
+        profiles = [next(a.split("=", 1)[1] for a in o.arguments if a.startswith("--user-data-dir="))
+                    for o in (first, second)]
+
+        # Assert
+        from pathlib import Path
+        assert profiles[0] != profiles[1]
+        copied = Path(profiles[0])
+        assert (copied / "First Run").exists() and (copied / "Default" / "Preferences").exists()
+        assert not (copied / "SingletonLock").exists() and not (copied / "Default" / "Cache").exists()
+        assert os.access(copied / "Default", os.W_OK)
+        assert "--no-first-run" in first.arguments
+        factory.release_options(first)
+        assert not copied.exists()
+        factory.close()
+        assert not Path(profiles[1]).exists()
+    finally:
+        for path in [template, template / "Default"]:
+            os.chmod(path, stat.S_IRWXU)
+
+
+def test_disk_cache_slots_are_leased_one_per_session_and_reused(tmp_path):
+    """同時のセッションには別々のキャッシュスロットを貸し出し、返却したスロットを次のセッションで再利用することを確認"""
+    # Arrange
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    factory = EdgeOptionFactory(disk_cache_dir=tmp_path / "cache")
+    proxy_info = ProxyInfo(host="proxy-server", port=8080)
+
+    def cache_dir(options):
+        return next(a.split("=", 1)[1] for a in options.arguments if a.startswith("--disk-cache-dir="))
+
+    # Act
+    first = factory.create_options(proxy_info)
+    second = factory.create_options(proxy_info)
+    factory.release_options(first)
+    third = factory.create_options(proxy_info)
+
+    # Assert
+    assert cache_dir(first) != cache_dir(second)
+    assert cache_dir(third) == cache_dir(first)
+    assert not any(a.startswith("--user-data-dir=") for a in third.arguments)
+
+
+def test_profile_template_must_be_a_directory(tmp_path):
+    """存在しないテンプレートは ValueError になることを確認"""
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    with pytest.raises(ValueError, match="not a directory"):
+        EdgeOptionFactory(profile_template=tmp_path / "missing")
+
+
+def test_profile_copies_are_prepared_in_the_background(tmp_path):
+    """使ったコピーの分をバックグラウンドで補充し、次のセッションは用意済みのコピーを使うことを確認"""
+    # Arrange
+    import time
+    from pathlib import Path
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "First Run").touch()
+    factory = EdgeOptionFactory(profile_template=template, profile_root=tmp_path / "profiles", profile_spares=1)
+    proxy_info = ProxyInfo(host="proxy-server", port=8080)
+
+    # Act
+    first = factory.create_options(proxy_info)
+    deadline = time.monotonic() + 5.0
+    while not factory._spare_profiles and time.monotonic() < deadline:
+        time.sleep(0.01)
+    (spare,) = factory._spare_profiles
+    second = factory.create_options(proxy_info)
+
+    # Assert
+    assert f"--user-data-dir={spare}" in second.arguments
+    assert (Path(spare) / "First Run").exists()
+    factory.close()
+    assert not any((tmp_path / "profiles").iterdir())
+
+
+def test_check_session_started_warns_when_profile_is_not_shared_with_node(tmp_path, mocker):
+    """最初のセッションのプロファイルのコピーにロックが無い (ノードと共有されていない) 場合に警告することを確認"""
+    # Arrange
+    from pathlib import Path
+    from src.adapters.edge_option_factory import EdgeOptionFactory
+    get_logger = mocker.patch("src.adapters.edge_option_factory.get_logger")
+    template = tmp_path / "template"
+    template.mkdir()
+    factory = EdgeOptionFactory(profile_template=template, profile_spares=0)
+    proxy_info = ProxyInfo(host="proxy-server", port=8080)
+    unshared = factory.create_options(proxy_info)
+
+    # Act
+    factory.check_session_started(unshared)
+    factory.check_session_started(unshared)
+
+    # Assert: 確認は最初の1回だけ
+    get_logger.return_value.warning.assert_called_once()
+
+    # Arrange / Act: ロックがあれば警告しない
+    get_logger.reset_mock()
+    shared_factory = EdgeOptionFactory(profile_template=template, profile_spares=0)
+    shared = shared_factory.create_options(proxy_info)
+    path = next(a.split("=", 1)[1] for a in shared.arguments if a.startswith("--user-data-dir="))
+    (Path(path) / "SingletonLock").symlink_to("node-host-1234")
+    shared_factory.check_session_started(shared)
+
+    # Assert
+    get_logger.return_value.warning.assert_not_called()
+    factory.close()
+    shared_factory.close()
@@ -0,0 +1,86 @@
+# tests/adapters/test_http_ip_checker.py
+import pytest
+import requests
+
+from src.domain.proxy_info import ProxyInfo
+from src.domain.ip_check_result import TIER_HTTP
+from src.adapters.http_ip_checker import HttpIpChecker
+
+
+@pytest.fixture
+def mock_session(mocker):
+    """requests.Session のモック (with 文で自身を返す)"""
+    session = mocker.MagicMock(spec=requests.Session)
+    session.__enter__.return_value = session
+    return session
+
+
+def test_check_returns_egress_ip_via_proxy(mock_session, mocker):
+    """プロキシ経由で取得した応答本文から送信元 IP を読み取ることを確認"""
+    # Arrange
+    response = mocker.Mock(spec=requests.Response)
+    response.text = '{"ip":"203.0.113.7"}'
+    mock_session.get.return_value = response
+    checker = HttpIpChecker(timeout=5.0, session_factory=lambda: mock_session)
+    proxy = ProxyInfo("proxy.test", 8080)
+
+    # Act
+    result = checker.check(proxy, "https://api.ipify.org?format=json")
+
+    # Assert
+    assert result.success
+    assert result.egress_ip == "203.0.113.7"
+    assert result.tier == TIER_HTTP
+    assert result.proxy == proxy
+    mock_session.get.assert_called_once_with(
+        "https://api.ipify.org?format=json",
+        proxies={"http": "http://proxy.test:8080", "https": "http://proxy.test:8080"},
+        timeout=5.0, verify=False)
+
+
+def test_check_returns_failed_result_on_request_exception(mock_session):
+    """通信エラーを例外ではなく失敗結果として返すことを確認"""
+    # Arrange
+    mock_session.get.side_effect = requests.exceptions.ProxyError("Cannot connect to proxy")
+    checker = HttpIpChecker(session_factory=lambda: mock_session)
+
+    # Act
+    result = checker.check(ProxyInfo("dead.proxy", 3128), "https://api.ipify.org")
+
+    # Assert
+    assert not result.success
+    assert result.egress_ip is None
+    assert result.error.startswith("ProxyError:")
+    assert result.tier == TIER_HTTP
+
+
+def test_check_returns_failed_result_when_body_has_no_ip(mock_session, mocker):
+    """応答本文に IP が含まれない場合に失敗結果を返すことを確認"""
+    # Arrange
+    response = mocker.Mock(spec=requests.Response)
+    response.text = "<html>Access denied</html>"
+    mock_session.get.return_value = response
+    checker = HttpIpChecker(session_factory=lambda: mock_session)
+
+    # Act
+    result = checker.check(ProxyInfo("proxy.test", 8080), "https://api.ipify.org")
+
+    # Assert
+    assert not result.success
+    assert result.error == "No IP address found in response body"
+
+
+def test_http_ip_checker_rejects_non_positive_timeout():
+    """タイムアウトが0以下の場合に ValueError が発生することを確認"""
+    with pytest.raises(ValueError, match="timeout must be positive"):
+        HttpIpChecker(timeout=0)
+
+
+def test_http_ip_checker_does_not_change_process_wide_warning_filters():
+    """TLS を検証しない設定でも、チェッカーの生成がプロセス全体の警告の設定を変えないことを確認"""
+    import warnings
+    before = list(warnings.filters)
+
+    HttpIpChecker(verify_tls=False)
+
+    assert warnings.filters == before
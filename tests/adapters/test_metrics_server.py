@@ -0,0 +1,42 @@
+# tests/adapters/test_metrics_server.py
+import pytest
+import urllib.error
+import urllib.request
+
+from src.adapters.metrics_server import MetricsServer, PROMETHEUS_CONTENT_TYPE
+from src.application.run_metrics import RunMetrics
+
+
+@pytest.fixture
+def server():
+    metrics = RunMetrics()
+    metrics.set_queue_depth(3)
+    server = MetricsServer(metrics, host="127.0.0.1", port=0)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_serves_prometheus_text_on_metrics_path(server):
+    """GET /metrics で Prometheus のテキスト形式が返ることを確認"""
+    # Act
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+        body = response.read().decode("utf-8")
+        content_type = response.headers["Content-Type"]
+
+    # Assert
+    assert content_type == PROMETHEUS_CONTENT_TYPE
+    assert "proxyrot_queue_depth 3" in body
+
+
+def test_other_paths_return_404(server):
+    """/metrics 以外のパスは 404 になることを確認"""
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        urllib.request.urlopen(f"http://127.0.0.1:{server.port}/", timeout=5)
+    assert exc_info.value.code == 404
+
+
+def test_init_rejects_non_run_metrics():
+    """RunMetrics 以外を渡すと TypeError になることを確認"""
+    with pytest.raises(TypeError):
+        MetricsServer(object())
@@ -0,0 +1,136 @@
+# tests/adapters/test_proxy_host_resolver.py
+import socket
+import pytest
+
+from src.domain.proxy_info import ProxyInfo
+from src.adapters.proxy_host_resolver import ProxyHostResolver
+
+
+class FakeClock:
+    """テスト用に時刻を手動で進められる時計"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_resolver(table: dict[str, str], clock=None, calls=None, ttl=60.0):
+    """table に従って名前解決するフェイク関数を持つリゾルバを生成する"""
+    def fake_resolve(host: str, port: int) -> str:
+        if calls is not None:
+            calls.append(host)
+        if host not in table:
+            raise socket.gaierror(f"Name or service not known: {host}")
+        return table[host]
+    return ProxyHostResolver(ttl_seconds=ttl, resolve_func=fake_resolve, clock=clock or FakeClock())
+
+
+def test_resolve_all_returns_resolved_hosts_and_records_failures():
+    """resolve_all が成功したホストを返し、失敗したホストを failures に記録することを確認"""
+    # Arrange
+    resolver = make_resolver({"proxy-server": "172.18.0.2"})
+    proxies = [ProxyInfo("proxy-server", 8080), ProxyInfo("dead.proxy", 3128)]
+
+    # Act
+    resolved = resolver.resolve_all(proxies)
+
+    # Assert
+    assert resolved == {"proxy-server": "172.18.0.2"}
+    assert "dead.proxy" in resolver.failures
+    assert resolver.is_unresolvable(ProxyInfo("dead.proxy", 3128))
+    assert not resolver.is_unresolvable(ProxyInfo("proxy-server", 8080))
+
+
+def test_resolve_all_resolves_each_host_once_and_skips_ip_literals():
+    """同一ホストは1回だけ解決され、IPアドレスは解決対象にならないことを確認"""
+    # Arrange
+    calls: list[str] = []
+    resolver = make_resolver({"proxy-server": "172.18.0.2"}, calls=calls)
+    proxies = [ProxyInfo("proxy-server", 8080), ProxyInfo("proxy-server", 8081),
+               ProxyInfo("10.0.0.1", 8080)]
+
+    # Act
+    resolver.resolve_all(proxies)
+
+    # Assert
+    assert calls == ["proxy-server"]
+
+
+def test_lookup_uses_cache_within_ttl_and_refreshes_after_expiry():
+    """TTL 内はキャッシュを使い、期限切れ後は再解決することを確認"""
+    # Arrange
+    clock = FakeClock()
+    calls: list[str] = []
+    table = {"proxy-server": "172.18.0.2"}
+    resolver = make_resolver(table, clock=clock, calls=calls, ttl=60.0)
+    proxy = ProxyInfo("proxy-server", 8080)
+
+    # Act
+    first = resolver.lookup(proxy)
+    second = resolver.lookup(proxy)
+    table["proxy-server"] = "172.18.0.9"
+    clock.now += 61.0
+    third = resolver.lookup(proxy)
+
+    # Assert
+    assert first == ProxyInfo("172.18.0.2", 8080)
+    assert second == first
+    assert third == ProxyInfo("172.18.0.9", 8080)
+    assert calls == ["proxy-server", "proxy-server"]
+
+
+def test_lookup_returns_original_proxy_when_resolution_fails():
+    """解決できない場合は元の ProxyInfo をそのまま返すことを確認"""
+    # Arrange
+    resolver = make_resolver({})
+    proxy = ProxyInfo("dead.proxy", 3128)
+
+    # Act
+    result = resolver.lookup(proxy)
+
+    # Assert
+    assert result is proxy
+    assert resolver.failures["dead.proxy"]
+
+
+def test_expired_failure_is_resolved_again():
+    """TTL の経過後は解決し直し、まだ解決できないホストは解決不能と判定されることを確認"""
+    # Arrange
+    clock = FakeClock()
+    calls: list[str] = []
+    table: dict[str, str] = {}
+    resolver = make_resolver(table, clock=clock, calls=calls, ttl=10.0)
+    resolver.resolve_all([ProxyInfo("dead.proxy", 3128), ProxyInfo("flaky.proxy", 3128)])
+    table["flaky.proxy"] = "10.0.0.9"
+
+    # Act
+    clock.now += 11.0
+
+    # Assert
+    assert resolver.is_unresolvable(ProxyInfo("dead.proxy", 3128))
+    assert not resolver.is_unresolvable(ProxyInfo("flaky.proxy", 3128))
+    assert calls.count("dead.proxy") == 2
+    assert list(resolver.failures) == ["dead.proxy"]
+
+
+def test_failures_are_detected_with_zero_ttl():
+    """TTL が 0 でも解決できないホストは解決不能と判定され、失敗が failures に残ることを確認"""
+    # Arrange
+    resolver = make_resolver({"proxy-server": "172.18.0.2"}, ttl=0.0)
+    resolver.resolve_all([ProxyInfo("dead.proxy", 3128)])
+
+    # Act / Assert
+    assert "dead.proxy" in resolver.failures
+    assert resolver.is_unresolvable(ProxyInfo("dead.proxy", 3128))
+    assert not resolver.is_unresolvable(ProxyInfo("proxy-server", 8080))
+    assert not resolver.is_unresolvable(ProxyInfo("10.0.0.1", 3128))
+
+
+def test_resolver_rejects_invalid_arguments():
+    """不正な TTL やワーカー数で ValueError が発生することを確認"""
+    with pytest.raises(ValueError, match="ttl_seconds must be zero or positive"):
+        ProxyHostResolver(ttl_seconds=-1)
+    with pytest.raises(ValueError, match="max_workers must be at least 1"):
+        ProxyHostResolver(max_workers=0)
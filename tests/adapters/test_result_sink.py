@@ -0,0 +1,190 @@
+# tests/adapters/test_result_sink.py
+import json
+import sqlite3
+import time
+from dataclasses import replace
+import pytest
+
+from src.domain.attempt_record import AttemptRecord
+from src.adapters.result_sink import (
+    JsonlResultSink, SqliteResultSink, create_result_sink)
+
+
+def make_record(index: int, success: bool = True) -> AttemptRecord:
+    return AttemptRecord(
+        proxy_index=index, proxy_host="proxy.test", proxy_port=8080,
+        url="https://api.ipify.org", mode="ip", success=success, started_at=1700000000.0 + index,
+        timings={"start_browser": 1.5, "verify_ip": 0.4}, egress_ip="203.0.113.7" if success else None,
+        error_class=None if success else "WebDriverException",
+        error_message=None if success else "session not created")
+
+
+def test_jsonl_sink_writes_one_line_per_record(tmp_path):
+    """JsonlResultSink が1レコード1行で追記し、close 時に全件書き出すことを確認"""
+    # Arrange
+    path = tmp_path / "results" / "run.jsonl"
+
+    # Act
+    with JsonlResultSink(path, flush_interval=60.0) as sink:
+        sink.write(make_record(0))
+        sink.write(make_record(1, success=False))
+
+    # Assert
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    first, second = (json.loads(line) for line in lines)
+    assert first["proxy_index"] == 0 and first["egress_ip"] == "203.0.113.7"
+    assert first["timings"] == {"start_browser": 1.5, "verify_ip": 0.4}
+    assert second["success"] is False and second["error_class"] == "WebDriverException"
+
+
+def test_jsonl_sink_flushes_when_batch_size_reached(tmp_path):
+    """バッチサイズに達した時点で、定期フラッシュを待たずに書き出されることを確認"""
+    # Arrange
+    path = tmp_path / "run.jsonl"
+    sink = JsonlResultSink(path, flush_interval=60.0, flush_batch_size=2)
+
+    # Act
+    sink.write(make_record(0))
+    sink.write(make_record(1))
+    # フラッシュ用スレッドが書き出すまで最大2秒待つ
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline and len(path.read_text(encoding="utf-8").splitlines()) < 2:
+        time.sleep(0.01)
+
+    # Assert
+    try:
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    finally:
+        sink.close()
+
+
+def test_jsonl_sink_appends_to_existing_file(tmp_path):
+    """既存ファイルに追記されることを確認"""
+    path = tmp_path / "run.jsonl"
+    with JsonlResultSink(path) as sink:
+        sink.write(make_record(0))
+    with JsonlResultSink(path) as sink:
+        sink.write(make_record(1))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_sqlite_sink_inserts_records(tmp_path):
+    """SqliteResultSink が attempts テーブルにレコードを追加することを確認"""
+    # Arrange
+    path = tmp_path / "run.sqlite"
+
+    # Act
+    with SqliteResultSink(path) as sink:
+        sink.write(make_record(0))
+        sink.write(make_record(1, success=False))
+
+    # Assert
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute(
+            "SELECT proxy_index, success, timings, error_class FROM attempts ORDER BY proxy_index").fetchall()
+    assert rows[0][:2] == (0, 1)
+    assert json.loads(rows[0][2]) == {"start_browser": 1.5, "verify_ip": 0.4}
+    assert rows[1][1] == 0 and rows[1][3] == "WebDriverException"
+
+
+def test_sqlite_sink_adds_new_columns_to_existing_database(tmp_path):
+    """以前の形式の attempts テーブルに、後から追加した列が追加されることを確認"""
+    # Arrange: error_category / attempts / blocked_requests 列の無い以前のテーブル
+    path = tmp_path / "old.sqlite"
+    old_table = SqliteResultSink._CREATE_TABLE.replace(
+        "tier TEXT,\n            error_category TEXT,\n            attempts INTEGER NOT NULL DEFAULT 1,\n"
+        "            blocked_requests INTEGER", "tier TEXT")
+    assert "blocked_requests" not in old_table
+    with sqlite3.connect(path) as conn:
+        conn.execute(old_table)
+
+    # Act
+    with SqliteResultSink(path) as sink:
+        sink.write(make_record(0))
+        sink.write(replace(make_record(1), blocked_requests=7))
+
+    # Assert
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT attempts, error_category, blocked_requests FROM attempts").fetchall() == [
+            (1, None, None), (1, None, 7)]
+
+
+def test_write_after_close_raises(tmp_path):
+    """close 後の write で RuntimeError が発生することを確認"""
+    sink = JsonlResultSink(tmp_path / "run.jsonl")
+    sink.close()
+    with pytest.raises(RuntimeError, match="already closed"):
+        sink.write(make_record(0))
+
+
+def test_write_rejects_non_record(tmp_path):
+    """AttemptRecord 以外を渡すと TypeError が発生することを確認"""
+    with JsonlResultSink(tmp_path / "run.jsonl") as sink:
+        with pytest.raises(TypeError, match="record must be an instance of AttemptRecord"):
+            sink.write({"proxy_index": 0})  # type: ignore
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("run.jsonl", JsonlResultSink), ("run.json", JsonlResultSink),
+    ("run.sqlite", SqliteResultSink), ("run.db", SqliteResultSink),
+])
+def test_create_result_sink_selects_by_extension(tmp_path, name, expected):
+    """拡張子に応じた結果シンクが生成されることを確認"""
+    sink = create_result_sink(tmp_path / name)
+    try:
+        assert isinstance(sink, expected)
+    finally:
+        sink.close()
+
+
+def test_create_result_sink_rejects_unknown_extension(tmp_path):
+    """対応していない拡張子で ValueError が発生することを確認"""
+    with pytest.raises(ValueError, match="Unsupported result file extension"):
+        create_result_sink(tmp_path / "run.csv")
+
+
+@pytest.mark.parametrize("name", ["run.jsonl", "run.sqlite"])
+def test_read_results_round_trips_records(tmp_path, name):
+    """書き出したレコードを read_results で同じ内容として読み戻せることを確認"""
+    from src.adapters.result_sink import read_results
+    path = tmp_path / name
+    records = [make_record(0), make_record(1, success=False)]
+    with create_result_sink(path) as sink:
+        for record in records:
+            sink.write(record)
+
+    assert read_results(path) == records
+
+
+def test_write_failure_is_logged_and_flusher_keeps_running(tmp_path, mocker):
+    """書き出しの失敗がアプリケーションロガーに記録され、以降のレコードの書き出しが続くことを確認"""
+    # Arrange
+    import threading
+    logged = threading.Event()
+    logger = mocker.Mock()
+    logger.error.side_effect = lambda *args, **kwargs: logged.set()
+    mocker.patch("src.adapters.result_sink.get_logger", return_value=logger)
+    path = tmp_path / "results.jsonl"
+    sink = JsonlResultSink(path, flush_batch_size=1)
+    write_batch = sink._write_batch
+    failures = [OSError("disk full")]
+
+    def fail_once(records):
+        if failures:
+            raise failures.pop()
+        write_batch(records)
+
+    mocker.patch.object(sink, "_write_batch", side_effect=fail_once)
+
+    # Act
+    sink.write(make_record(1))
+    assert logged.wait(2.0)
+    sink.write(make_record(2))
+    sink.close()
+
+    # Assert
+    message, count, error = logger.error.call_args.args
+    assert (count, str(error)) == (1, "disk full")
+    assert logger.error.call_args.kwargs == {"exc_info": True}
+    assert [json.loads(line)["proxy_index"] for line in path.read_text(encoding="utf-8").splitlines()] == [2]
@@ -0,0 +1,86 @@
+# tests/adapters/test_run_journal.py
+import json
+
+from src.adapters.run_journal import RunJournal
+from src.domain.attempt_record import AttemptRecord
+from src.domain.proxy_info import ProxyInfo
+
+URL = "https://api.ipify.org?format=json"
+
+
+def make_record(
+    index: int, host: str = "10.0.0.1", success: bool = True, error_category: str | None = None
+) -> AttemptRecord:
+    return AttemptRecord(
+        proxy_index=index, proxy_host=host, proxy_port=3128, url=URL,
+        mode="ip", success=success, started_at=1700000000.0, error_category=error_category)
+
+
+def test_resume_loads_completed_attempts_by_host_port_and_url(tmp_path):
+    """再開時に、前回の実行で記録した (プロキシ, URL) が完了済みとして読み込まれることを確認"""
+    # Arrange
+    path = tmp_path / "run.journal"
+    with RunJournal(path) as journal:
+        journal.write(make_record(1, "10.0.0.1"))
+        journal.write(make_record(2, "10.0.0.2", success=False))
+
+    # Act
+    journal = RunJournal(path, resume=True)
+    journal.close()
+
+    # Assert
+    assert journal.completed == 2
+    assert journal.is_done(ProxyInfo("10.0.0.2", 3128), URL)
+    assert not journal.is_done(ProxyInfo("10.0.0.2", 3128), "https://example.com/")
+    assert not journal.is_done(ProxyInfo("10.0.0.3", 3128), URL)
+
+
+def test_without_resume_journal_starts_empty(tmp_path):
+    """resume=False の場合は既存のジャーナルを空にして始めることを確認"""
+    path = tmp_path / "run.journal"
+    with RunJournal(path) as journal:
+        journal.write(make_record(1))
+
+    with RunJournal(path) as journal:
+        assert journal.completed == 0
+
+    assert path.read_text(encoding="utf-8") == ""
+
+
+def test_close_compacts_duplicates_and_truncated_lines(tmp_path):
+    """クラッシュで途中まで書かれた行と重複行が、終了時のコンパクションで取り除かれることを確認"""
+    # Arrange
+    path = tmp_path / "run.journal"
+    entry = json.dumps({"host": "10.0.0.1", "port": 3128, "url": URL, "success": False})
+    path.write_text(entry + "\n" + '{"host": "10.0.0.2", "po', encoding="utf-8")
+
+    # Act
+    with RunJournal(path, resume=True) as journal:
+        journal.write(make_record(1, "10.0.0.1", success=True))
+
+    # Assert
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert lines == [{"host": "10.0.0.1", "port": 3128, "url": URL, "success": True, "error_category": None}]
+    assert not (tmp_path / "run.journal.tmp").exists()
+
+
+def test_grid_and_timeout_failures_are_rerun_on_resume(tmp_path):
+    """Grid の障害やタイムアウトで失敗した試行は完了とみなさず、再開時にやり直すことを確認"""
+    # Arrange
+    path = tmp_path / "run.journal"
+    with RunJournal(path) as journal:
+        journal.write(make_record(1, "10.0.0.1", success=False, error_category="grid"))
+        journal.write(make_record(2, "10.0.0.2", success=False, error_category="navigation_timeout"))
+        journal.write(make_record(3, "10.0.0.3", success=False, error_category="proxy"))
+
+    # Act
+    with RunJournal(path, resume=True) as journal:
+        rerun = [not journal.is_done(ProxyInfo(f"10.0.0.{i}", 3128), URL) for i in (1, 2, 3)]
+        # 再開後にやり直して成功した試行は、次の再開では完了済みになる
+        journal.write(make_record(1, "10.0.0.1", success=True))
+
+    # Assert
+    assert rerun == [True, True, False]
+    with RunJournal(path, resume=True) as journal:
+        assert journal.is_done(ProxyInfo("10.0.0.1", 3128), URL)
+        assert not journal.is_done(ProxyInfo("10.0.0.2", 3128), URL)
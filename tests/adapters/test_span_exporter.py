@@ -0,0 +1,32 @@
+# tests/adapters/test_span_exporter.py
+import json
+
+from src.adapters.span_exporter import JsonlSpanExporter
+from src.application.tracing import Tracer
+
+
+def test_jsonl_exporter_writes_one_otlp_trace_per_line(tmp_path):
+    """1トレースが1行の OTLP/JSON として追記されることを確認"""
+    # Arrange
+    path = tmp_path / "traces" / "traces.jsonl"
+    exporter = JsonlSpanExporter(path)
+    tracer = Tracer(exporter, sample_ratio=1.0)
+
+    # Act
+    with tracer.span("proxy_attempt", {"proxy.port": 3128, "proxy.host": "10.0.0.1"}):
+        with tracer.span("webdriver get"):
+            pass
+    with tracer.span("proxy_attempt"):
+        pass
+    exporter.close()
+
+    # Assert
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    child, root = spans
+    assert child["parentSpanId"] == root["spanId"]
+    assert child["traceId"] == root["traceId"] and len(root["traceId"]) == 32
+    assert "parentSpanId" not in root
+    assert {"key": "proxy.port", "value": {"intValue": "3128"}} in root["attributes"]
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
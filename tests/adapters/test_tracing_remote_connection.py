@@ -0,0 +1,30 @@
+# tests/adapters/test_tracing_remote_connection.py
+from src.adapters.span_exporter import SpanExporter
+from src.adapters.tracing_remote_connection import TracingRemoteConnection
+from src.application.tracing import Tracer, STATUS_ERROR
+
+
+def test_execute_records_a_span_per_command_under_current_span(mocker):
+    """各コマンドが現在のスパンの子スパンとして記録されることを確認"""
+    # Arrange
+    exporter = mocker.Mock(spec=SpanExporter)
+    tracer = Tracer(exporter, sample_ratio=1.0)
+    connection = TracingRemoteConnection("http://fake-selenium-hub:4444/wd/hub", tracer)
+    mocker.patch.object(connection, "_request", side_effect=[
+        {"value": None},
+        {"status": 500, "value": "unknown error"},
+    ])
+
+    # Act
+    with tracer.span("proxy_attempt") as root:
+        connection.execute("get", {"sessionId": "abc", "url": "https://example.com"})
+        connection.execute("screenshot", {"sessionId": "abc"})
+
+    # Assert
+    get_span, screenshot_span, _ = exporter.export.call_args.args[0]
+    assert get_span.name == "webdriver get"
+    assert get_span.parent_span_id == root.span_id
+    assert get_span.attributes["http.method"] == "POST"
+    assert get_span.attributes["http.route"] == "/session/$sessionId/url"
+    assert screenshot_span.status == STATUS_ERROR
+    assert screenshot_span.attributes["http.status_code"] == 500
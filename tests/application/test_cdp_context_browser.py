@@ -0,0 +1,181 @@
+# tests/application/test_cdp_context_browser.py
+import logging
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from src.adapters.edge_option_factory import EdgeOptionFactory
+from src.application.cdp_context_browser import CdpContextBrowser, SharedEdgeSessionPool
+from src.application.proxy_selector import ProxySelector
+from src.domain.proxy_info import ProxyInfo
+
+
+def _cdp_driver(mocker, fail_with: Exception | None = None):
+    """executeCdpCommand に応答するモックの WebDriver を返します。"""
+    driver = mocker.MagicMock()
+    driver.current_window_handle = "main"
+    driver.session_id = "shared"
+
+    def execute(command, params):
+        if fail_with is not None:
+            raise fail_with
+        results = {
+            "Target.createBrowserContext": {"browserContextId": "ctx-1"},
+            "Target.createTarget": {"targetId": "target-1"},
+        }
+        return {"value": results.get(params["cmd"], {})}
+
+    driver.execute.side_effect = execute
+    return driver
+
+
+@pytest.fixture
+def selector(mocker):
+    selector = mocker.Mock(spec=ProxySelector)
+    selector.select_proxy.side_effect = lambda index: ProxyInfo("proxy-server", 8080) if index == 0 \
+        else ProxyInfo("10.0.0.1", 3128)
+    return selector
+
+
+def _pool(selector, **kwargs):
+    return SharedEdgeSessionPool(selector, EdgeOptionFactory(), command_executor="http://hub",
+                                 logger=logging.getLogger("test"), **kwargs)
+
+
+def test_start_browser_creates_context_with_proxy_in_shared_session(mocker, selector):
+    """共有セッション内にプロキシ指定のコンテキストを作成し、そのタブに切り替えることを確認"""
+    # Arrange
+    driver = _cdp_driver(mocker)
+    mock_remote = mocker.patch('src.application.cdp_context_browser.webdriver.Remote', return_value=driver)
+    pool = _pool(selector)
+    browser = CdpContextBrowser(pool, selector, command_executor="http://hub")
+
+    # Act
+    browser.start_browser(1)
+
+    # Assert
+    mock_remote.assert_called_once()
+    assert "--proxy-server=proxy-server:8080" in mock_remote.call_args.kwargs["options"].arguments
+    driver.execute.assert_any_call("executeCdpCommand", {
+        "cmd": "Target.createBrowserContext", "params": {"proxyServer": "10.0.0.1:3128", "disposeOnDetach": False}})
+    driver.switch_to.window.assert_called_with("target-1")
+    assert browser._driver is driver
+    assert pool.available is True
+    assert browser.timings.get("context_create") is not None
+
+
+def test_close_browser_disposes_context_and_reuses_shared_session(mocker, selector):
+    """閉じるとコンテキストを破棄し、次の試行では同じ共有セッションを使うことを確認"""
+    # Arrange
+    driver = _cdp_driver(mocker)
+    mock_remote = mocker.patch('src.application.cdp_context_browser.webdriver.Remote', return_value=driver)
+    pool = _pool(selector)
+
+    # Act
+    for _ in range(2):
+        with CdpContextBrowser(pool, selector, command_executor="http://hub") as browser:
+            browser.start_browser(1)
+
+    # Assert
+    assert mock_remote.call_count == 1
+    driver.execute.assert_any_call("executeCdpCommand", {
+        "cmd": "Target.disposeBrowserContext", "params": {"browserContextId": "ctx-1"}})
+    driver.switch_to.window.assert_called_with("main")
+    driver.quit.assert_not_called()
+    pool.close()
+    driver.quit.assert_called_once()
+
+
+def test_abort_does_not_quit_shared_session(mocker, selector):
+    """abort は他の試行も使う共有セッションを終了せず、共有セッションには command_timeout を設定することを確認"""
+    # Arrange
+    driver = _cdp_driver(mocker)
+    mock_remote = mocker.patch('src.application.cdp_context_browser.webdriver.Remote', return_value=driver)
+    pool = _pool(selector, command_timeout=30.0)
+    browser = CdpContextBrowser(pool, selector, command_executor="http://hub")
+    browser.start_browser(1)
+
+    # Act
+    browser.abort()
+
+    # Assert
+    driver.quit.assert_not_called()
+    assert mock_remote.call_args.kwargs["command_executor"].client_config.timeout == 30.0
+
+
+def test_shared_session_is_recreated_after_max_contexts(mocker, selector):
+    """max_contexts_per_session 回使った共有セッションは終了され、作り直されることを確認"""
+    # Arrange
+    drivers = [_cdp_driver(mocker), _cdp_driver(mocker)]
+    mock_remote = mocker.patch('src.application.cdp_context_browser.webdriver.Remote', side_effect=drivers)
+    pool = _pool(selector, max_contexts_per_session=1)
+
+    # Act
+    for _ in range(2):
+        with CdpContextBrowser(pool, selector, command_executor="http://hub") as browser:
+            browser.start_browser(1)
+
+    # Assert
+    assert mock_remote.call_count == 2
+    drivers[0].quit.assert_called_once()
+    drivers[1].quit.assert_called_once()
+
+
+def test_falls_back_to_normal_session_when_cdp_is_unavailable(mocker, selector):
+    """最初のコンテキスト作成に失敗した場合は CDP を無効として記録し、通常のセッションで処理することを確認"""
+    # Arrange
+    shared = _cdp_driver(mocker, fail_with=WebDriverException("unknown command"))
+    own = mocker.MagicMock()
+    # 共有セッション → 1回目の通常セッション → 2回目の通常セッションの順に作成される
+    mock_remote = mocker.patch('src.application.cdp_context_browser.webdriver.Remote', side_effect=[shared, own, own])
+    pool = _pool(selector)
+
+    # Act
+    with CdpContextBrowser(pool, selector, command_executor="http://hub") as browser:
+        browser.start_browser(1)
+        driver_in_use = browser._driver
+    with CdpContextBrowser(pool, selector, command_executor="http://hub") as browser:
+        browser.start_browser(1)
+
+    # Assert
+    assert pool.available is False
+    assert driver_in_use is own
+    assert mock_remote.call_count == 3
+    shared.quit.assert_not_called()
+    pool.close()
+    shared.quit.assert_called_once()
+    assert own.quit.call_count == 2
+
+
+def test_failed_dispose_quits_shared_session(mocker, selector):
+    """コンテキストの破棄に失敗した共有セッションはプールに戻さず終了することを確認"""
+    # Arrange
+    driver = _cdp_driver(mocker)
+    mocker.patch('src.application.cdp_context_browser.webdriver.Remote', return_value=driver)
+    pool = _pool(selector)
+    browser = CdpContextBrowser(pool, selector, command_executor="http://hub")
+    browser.start_browser(1)
+    driver.execute.side_effect = WebDriverException("session deleted")
+
+    # Act
+    browser.close_browser()
+
+    # Assert
+    driver.quit.assert_called_once()
+    assert browser._driver is None
+
+
+def test_context_uses_proxy_bypass_list_of_option_factory(mocker, selector):
+    """EdgeOptionFactory の直接接続ホストがコンテキストの proxyBypassList に渡されることを確認"""
+    # Arrange
+    driver = _cdp_driver(mocker)
+    mocker.patch('src.application.cdp_context_browser.webdriver.Remote', return_value=driver)
+    pool = SharedEdgeSessionPool(selector, EdgeOptionFactory(proxy_bypass_list=("*.cloudfront.net",)),
+                                 command_executor="http://hub", logger=logging.getLogger("test"))
+
+    # Act
+    CdpContextBrowser(pool, selector, command_executor="http://hub").start_browser(1)
+
+    # Assert
+    driver.execute.assert_any_call("executeCdpCommand", {"cmd": "Target.createBrowserContext", "params": {
+        "proxyServer": "10.0.0.1:3128", "disposeOnDetach": False, "proxyBypassList": "*.cloudfront.net"}})
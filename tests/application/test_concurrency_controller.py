@@ -0,0 +1,108 @@
+# tests/application/test_concurrency_controller.py
+import logging
+import threading
+
+import pytest
+
+from src.application.concurrency_controller import AimdConcurrencyController
+from src.application.run_metrics import RunMetrics
+
+
+def make_controller(mocker, **kwargs) -> AimdConcurrencyController:
+    kwargs.setdefault("max_limit", 8)
+    kwargs.setdefault("initial_limit", 2)
+    kwargs.setdefault("latency_target_seconds", 10.0)
+    return AimdConcurrencyController(logger=mocker.Mock(spec=logging.Logger), **kwargs)
+
+
+def test_limit_grows_additively_while_sessions_are_healthy(mocker):
+    """セッション作成が速く成功し続ける間、上限分の成功ごとに上限が1ずつ増えることを確認"""
+    controller = make_controller(mocker)
+
+    # Act / Assert
+    controller.record_session(1.0, failed=False)
+    controller.record_session(1.0, failed=False)
+    assert controller.limit == 2  # 2 + 1/2 + 1/2.5
+    controller.record_session(1.0, failed=False)
+    assert controller.limit == 3
+    for _ in range(100):
+        controller.record_session(1.0, failed=False)
+    assert controller.limit == 8  # max_limit で頭打ち
+
+
+def test_limit_halves_on_slow_session_create_with_cooldown(mocker):
+    """セッション作成が目標より遅いと上限が半減し、上限分の結果が集まるまで再減少しないことを確認"""
+    controller = make_controller(mocker, initial_limit=8)
+
+    # Act
+    controller.record_session(50.0, failed=False)
+
+    # Assert
+    assert controller.limit == 4
+    for _ in range(7):
+        controller.record_session(50.0, failed=False)
+    assert controller.limit == 4
+    controller.record_session(50.0, failed=False)
+    assert controller.limit == 2
+
+
+def test_limit_shrinks_on_session_error_rate_and_respects_minimum(mocker):
+    """セッション作成の失敗率が閾値を超えると上限が減り、min_limit を下回らないことを確認"""
+    controller = make_controller(mocker, initial_limit=4, min_limit=2)
+
+    # Act
+    for _ in range(4):
+        controller.record_session(1.0, failed=False)
+    assert controller.limit == 4
+    controller.record_session(None, failed=True)
+    controller.record_session(None, failed=True)
+
+    # Assert
+    assert controller.limit == 2
+    for _ in range(50):
+        controller.record_session(None, failed=True)
+    assert controller.limit == 2
+
+
+def test_acquire_blocks_at_limit_until_release(mocker):
+    """実行中のセッション数が上限に達すると、枠が返却されるまで acquire が待つことを確認"""
+    controller = make_controller(mocker, initial_limit=1)
+    controller.acquire()
+    acquired = threading.Event()
+
+    def second():
+        controller.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=second)
+    thread.start()
+
+    # Act / Assert
+    assert not acquired.wait(0.1)
+    controller.release()
+    assert acquired.wait(1.0)
+    thread.join()
+    assert controller.in_flight == 1
+
+
+def test_decisions_are_exposed_as_gauges(mocker):
+    """上限・失敗率・セッション作成時間が RunMetrics のゲージとして公開されることを確認"""
+    metrics = RunMetrics()
+    controller = make_controller(mocker, metrics=metrics)
+
+    # Act
+    controller.record_session(2.5, failed=False)
+
+    # Assert
+    text = metrics.render_prometheus()
+    assert "proxyrot_concurrency_limit 2" in text
+    assert "proxyrot_concurrency_session_error_rate 0.0" in text
+    assert "proxyrot_concurrency_session_create_seconds 2.5" in text
+
+
+def test_invalid_limits_are_rejected(mocker):
+    """上下限や係数が不正な場合に ValueError が発生することを確認"""
+    with pytest.raises(ValueError, match="min_limit <= max_limit"):
+        make_controller(mocker, max_limit=1, min_limit=2)
+    with pytest.raises(ValueError, match="decrease_factor"):
+        make_controller(mocker, decrease_factor=1.0)
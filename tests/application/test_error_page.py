@@ -0,0 +1,70 @@
+# tests/application/test_error_page.py
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from src.application.error_page import BlockPageSignature, ErrorPageDetector, NavigationAbortedError
+from src.application.retry_policy import ERROR_NAVIGATION_TIMEOUT, ERROR_PROXY, classify_error
+
+
+def make_driver(url: str = "https://example.com/", error_code: str = "", title: str = "", text: str = "") -> MagicMock:
+    driver = MagicMock()
+    driver.execute_script.return_value = {"url": url, "errorCode": error_code, "title": title, "text": text}
+    return driver
+
+
+def test_normal_page_passes():
+    """通常のページでは例外が送出されないことを確認"""
+    ErrorPageDetector().check(make_driver(text="Your IP is 203.0.113.5"), "https://example.com/")
+
+
+@pytest.mark.parametrize("error_code, expected_category", [
+    ("ERR_PROXY_CONNECTION_FAILED", ERROR_PROXY),
+    ("ERR_TUNNEL_CONNECTION_FAILED", ERROR_PROXY),
+    ("ERR_TIMED_OUT", ERROR_NAVIGATION_TIMEOUT),
+])
+def test_chromium_error_page_aborts_with_category(error_code, expected_category):
+    """Chromium のネットワークエラーページはエラーコードと分類付きで打ち切られることを確認"""
+    driver = make_driver(url="chrome-error://chromewebdata/", error_code=error_code)
+
+    with pytest.raises(NavigationAbortedError) as exc_info:
+        ErrorPageDetector().check(driver, "https://example.com/")
+
+    assert exc_info.value.reason == f"net::{error_code}"
+    assert classify_error(exc_info.value) == expected_category
+
+
+def test_error_url_without_code_still_aborts():
+    """エラーコードを読み取れなくても chrome-error:// のページは打ち切られることを確認"""
+    with pytest.raises(NavigationAbortedError, match="browser error page"):
+        ErrorPageDetector().check(make_driver(url="chrome-error://chromewebdata/"), "https://example.com/")
+
+
+def test_block_page_signature_matches_title_or_body():
+    """既定・追加のシグネチャがタイトルまたは本文に一致した場合に打ち切られることを確認"""
+    detector = ErrorPageDetector((BlockPageSignature("captcha", r"unusual traffic"),))
+
+    with pytest.raises(NavigationAbortedError, match=r"block page \(captcha\)"):
+        detector.check(make_driver(text="Our systems have detected unusual traffic"), "https://example.com/")
+    with pytest.raises(NavigationAbortedError, match="cloudflare_block"):
+        ErrorPageDetector().check(make_driver(title="Attention Required! | Cloudflare"), "https://example.com/")
+
+
+def test_non_dict_script_result_is_ignored():
+    """スクリプトの戻り値が想定外の型の場合は判定しないことを確認"""
+    driver = MagicMock()
+    driver.execute_script.return_value = None
+
+    ErrorPageDetector().check(driver, "https://example.com/")
+
+
+def test_from_navigation_error_extracts_net_error_code():
+    """driver.get の例外メッセージから net::ERR_* を読み取って変換することを確認"""
+    error = WebDriverException("unknown error: net::ERR_PROXY_CONNECTION_FAILED\n  (Session info: MicrosoftEdge=120)")
+
+    aborted = ErrorPageDetector.from_navigation_error(error, "https://example.com/")
+
+    assert aborted.reason == "net::ERR_PROXY_CONNECTION_FAILED"
+    assert aborted.error_category == ERROR_PROXY
+    assert ErrorPageDetector.from_navigation_error(WebDriverException("chrome not reachable"), "u") is None
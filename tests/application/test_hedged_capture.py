@@ -0,0 +1,184 @@
+# tests/application/test_hedged_capture.py
+import logging
+import threading
+from dataclasses import replace
+from unittest.mock import MagicMock
+
+from selenium.common.exceptions import WebDriverException
+
+from src.domain.capture_result import OUTCOME_CANCELLED, OUTCOME_FAILED, OUTCOME_WON
+from src.domain.proxy_info import ProxyInfo
+from src.application.hedged_capture import HedgedCapturer, LatencyWindow
+from src.application.metrics import PhaseTimings
+from src.application.proxied_edge_browser import ProxiedEdgeBrowser
+
+PROXIES = [ProxyInfo("proxy-server", 8080)] + [ProxyInfo(f"10.0.0.{i}", 3128) for i in range(1, 5)]
+URL = "https://example.com/"
+
+
+def make_browser(screenshot_seconds: float = 0.0, error: Exception | None = None) -> MagicMock:
+    """
+    take_screenshot に時間がかかる ProxiedEdgeBrowser のモック。
+    browser.release を set すると実行中の take_screenshot が戻り、with ブロックを抜けたスレッドが browser.exited_in に入る。
+    abort はセッションの終了を模して release を set し、実行中の take_screenshot を失敗させる。
+    """
+    browser = MagicMock(spec=ProxiedEdgeBrowser)
+    browser.__enter__.return_value = browser
+    browser.timings = PhaseTimings()
+    browser.release = threading.Event()
+    browser.exited = threading.Event()
+
+    def take_screenshot(url, save_path_in_container):
+        if error is not None:
+            raise error
+        browser.release.wait(screenshot_seconds)
+        if browser.abort.called:
+            raise WebDriverException("invalid session id")
+        browser.timings.record("navigate", screenshot_seconds)
+
+    def exit_(*args):
+        browser.exited_in = threading.current_thread()
+        browser.exited.set()
+
+    browser.take_screenshot.side_effect = take_screenshot
+    browser.__exit__.side_effect = exit_
+    browser.abort.side_effect = browser.release.set
+    return browser
+
+
+def make_capturer(browsers, mocker, **kwargs) -> HedgedCapturer:
+    kwargs.setdefault("initial_hedge_delay", 0.05)
+    queue = iter(browsers)
+    return HedgedCapturer(browser_factory=lambda: next(queue), screenshot_dir="/tmp/shots",
+                          logger=mocker.Mock(spec=logging.Logger), **kwargs)
+
+
+def test_slow_attempt_is_hedged_and_loser_is_cancelled(mocker):
+    """遅い試行がヘッジに追い越されると、ヘッジが採用され遅い試行のセッションが終了されることを確認"""
+    slow, fast = make_browser(screenshot_seconds=5.0), make_browser()
+    capturer = make_capturer([slow, fast], mocker, hedge_budget=1.0)
+
+    # Act
+    result = capturer.capture(URL, PROXIES, range(1, len(PROXIES)))
+
+    # Assert
+    assert result.success and result.proxy_index == 2
+    assert result.screenshot_path == "/tmp/shots/ip_check_proxy_2_10.0.0.2_3128.png"
+    assert result.outcomes == {2: OUTCOME_WON, 1: OUTCOME_CANCELLED}
+    assert result.hedges_started == 1
+    assert result.elapsed_seconds < 5.0
+    # 打ち切った試行はセッションの終了 (abort) で戻り、そのスレッドが with ブロックを抜けてから結果が返る
+    slow.abort.assert_called_once()
+    slow.close_browser.assert_not_called()
+    assert slow.exited.is_set()
+    assert slow.exited_in is not threading.main_thread()
+    capturer._logger.error.assert_not_called()
+
+
+def test_failed_attempt_moves_to_next_proxy_without_hedging(mocker):
+    """試行が失敗した場合は、ヘッジではなく次のプロキシで通常の試行を開始することを確認"""
+    broken, good = make_browser(error=WebDriverException("net::ERR_PROXY_CONNECTION_FAILED")), make_browser()
+    capturer = make_capturer([broken, good], mocker, initial_hedge_delay=10.0)
+
+    # Act
+    result = capturer.capture(URL, PROXIES, range(1, len(PROXIES)))
+
+    # Assert
+    assert result.proxy_index == 2
+    assert result.outcomes == {1: OUTCOME_FAILED, 2: OUTCOME_WON}
+    assert result.hedges_started == 0
+
+
+def test_hedging_is_disabled_with_zero_budget(mocker):
+    """ヘッジの予算が 0 の場合は遅い試行の完了を待つことを確認"""
+    slow = make_browser(screenshot_seconds=0.3)
+    capturer = make_capturer([slow], mocker, hedge_budget=0)
+
+    # Act
+    result = capturer.capture(URL, PROXIES, range(1, len(PROXIES)))
+
+    # Assert
+    assert result.proxy_index == 1
+    assert result.hedges_started == 0
+
+
+def test_single_capture_is_not_hedged_with_fractional_budget(mocker):
+    """予算 0.1 で URL を1つだけキャプチャする場合は、1回目のキャプチャでヘッジしないことを確認"""
+    slow = make_browser(screenshot_seconds=0.3)
+    capturer = make_capturer([slow], mocker, hedge_budget=0.1)
+
+    # Act
+    result = capturer.capture(URL, PROXIES, range(1, len(PROXIES)))
+
+    # Assert
+    assert result.proxy_index == 1
+    assert result.outcomes == {1: OUTCOME_WON}
+    assert result.hedges_started == 0
+
+
+def test_latency_window_quantile_requires_min_samples():
+    """サンプルが揃うまでは None、その後は分位数を返すことを確認"""
+    window = LatencyWindow(size=100, min_samples=10)
+    for seconds in range(1, 10):
+        window.add(float(seconds))
+    assert window.quantile(0.9) is None
+
+    window.add(10.0)
+    assert window.quantile(0.9) == 9.0
+
+
+def test_hedge_delay_uses_latencies_seeded_from_previous_results(mocker):
+    """過去の実行の結果レコードから所要時間を取り込み、最初のキャプチャから分位数でヘッジすることを確認"""
+    # Arrange
+    from src.domain.attempt_record import AttemptRecord
+    capturer = make_capturer([], mocker, initial_hedge_delay=10.0)
+    records = [AttemptRecord(proxy_index=1, proxy_host="10.0.0.1", proxy_port=3128, url=URL, mode="screenshot",
+                             success=True, started_at=0.0, timings={"session_create": 1.0, "navigate": n / 10})
+               for n in range(1, 11)]
+    records.append(replace(records[0], success=False, timings={"session_create": 30.0}))
+
+    # Act
+    added = capturer.seed_latencies(records)
+
+    # Assert
+    assert added == 10
+    assert capturer.hedge_delay == 1.9
+
+
+def test_attempts_are_written_to_sink_and_grid_failures_are_retried(mocker):
+    """完了した試行が結果シンクに書き出され、Grid 側の障害は同じプロキシで再試行されることを確認"""
+    # Arrange
+    from src.adapters.result_sink import ResultSink
+    from src.application.retry_policy import RetryPolicy
+    sink = mocker.Mock(spec=ResultSink)
+    broken = make_browser(error=WebDriverException("net::ERR_PROXY_CONNECTION_FAILED"))
+    grid_down, good = make_browser(), make_browser()
+    grid_down.start_browser.side_effect = WebDriverException("session not created")
+    capturer = make_capturer([broken, grid_down, good], mocker, initial_hedge_delay=10.0, result_sink=sink,
+                             retry_policy=RetryPolicy(random_func=lambda a, b: 0.0))
+
+    # Act
+    result = capturer.capture(URL, PROXIES, range(1, len(PROXIES)))
+
+    # Assert
+    assert result.proxy_index == 2
+    records = [c.args[0] for c in sink.write.call_args_list]
+    assert [(r.proxy_index, r.success, r.error_category, r.attempts) for r in records] == [
+        (1, False, "proxy", 1), (2, True, None, 2)]
+    assert records[1].screenshot_path == result.screenshot_path
+
+
+def test_proxies_completed_in_journal_are_not_used_again(mocker):
+    """ジャーナルで完了済みのプロキシは使わず、新しい試行をジャーナルに記録することを確認"""
+    # Arrange
+    from src.adapters.run_journal import RunJournal
+    journal = mocker.Mock(spec=RunJournal)
+    journal.is_done.side_effect = lambda proxy, url: proxy.host == "10.0.0.1"
+    capturer = make_capturer([make_browser()], mocker, journal=journal)
+
+    # Act
+    result = capturer.capture(URL, PROXIES, range(1, len(PROXIES)))
+
+    # Assert
+    assert result.proxy_index == 2
+    assert [c.args[0].proxy_index for c in journal.write.call_args_list] == [2]
@@ -0,0 +1,36 @@
+# tests/application/test_ip_extractor.py
+import pytest
+
+from src.application.ip_extractor import extract_ip
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"ip":"203.0.113.7"}', "203.0.113.7"),                       # api.ipify.org?format=json
+    ('{\n  "origin": "198.51.100.4, 10.0.0.1"\n}', "198.51.100.4"),  # httpbin.org/ip
+    ('{"status":"success","query":"192.0.2.10"}', "192.0.2.10"),     # ip-api.com
+    ('pretty print\n{"ip": "2001:db8::1"}', "2001:db8::1"),          # 前後に余計なテキストがある JSON
+])
+def test_extract_ip_from_json_responses(text, expected):
+    """JSON 応答から送信元 IP を抽出できることを確認"""
+    assert extract_ip(text) == expected
+
+
+def test_extract_ip_falls_back_to_plain_text():
+    """JSON でない本文からも最初の妥当な IP アドレスを抽出することを確認"""
+    # Arrange
+    text = "What Is My IP?\nYour IP address is 203.0.113.99\nVersion 1.2.3"
+
+    # Act & Assert
+    assert extract_ip(text) == "203.0.113.99"
+
+
+def test_extract_ip_ignores_invalid_addresses():
+    """IP アドレスとして不正な候補は無視されることを確認"""
+    assert extract_ip("build 999.1.2.3 released") is None
+    assert extract_ip('{"ip": "not-an-ip"}') is None
+
+
+@pytest.mark.parametrize("text", ["", "ERR_PROXY_CONNECTION_FAILED", "{broken json"])
+def test_extract_ip_returns_none_when_not_found(text):
+    """IP アドレスが含まれない場合は None を返すことを確認"""
+    assert extract_ip(text) is None
@@ -0,0 +1,81 @@
+# tests/application/test_metrics.py
+import math
+import pytest
+
+from src.application.metrics import (
+    HistogramMetricsCollector, MetricsCollector, PhaseTimings)
+
+
+def test_phase_timings_measure_records_and_forwards(mocker):
+    """measure がフェーズ時間を記録し、メトリクス収集器に送信することを確認"""
+    # Arrange
+    collector = mocker.Mock(spec=MetricsCollector)
+    timings = PhaseTimings(collector)
+
+    # Act
+    with timings.measure("navigate"):
+        pass
+
+    # Assert
+    assert timings.get("navigate") is not None
+    collector.observe.assert_called_once()
+    assert collector.observe.call_args.args[0] == "navigate"
+
+
+def test_phase_timings_measure_records_on_exception():
+    """with ブロックが例外で抜けた場合も計測されることを確認"""
+    timings = PhaseTimings()
+    with pytest.raises(RuntimeError):
+        with timings.measure("session_create"):
+            raise RuntimeError("boom")
+    assert timings.get("session_create") is not None
+
+
+def test_phase_timings_accumulates_repeated_phase():
+    """同じフェーズの計測値が合計されることを確認"""
+    timings = PhaseTimings()
+    timings.record("navigate", 1.0)
+    timings.record("navigate", 0.5)
+    assert timings.as_dict() == {"navigate": 1.5}
+
+
+def test_histogram_percentiles_are_estimated_within_buckets():
+    """ヒストグラムから p50/p95/p99 がバケット内の補間で推定されることを確認"""
+    # Arrange
+    collector = HistogramMetricsCollector(buckets=(1.0, 2.0, 4.0, math.inf))
+    for _ in range(90):
+        collector.observe("navigate", 0.5)   # (0, 1] バケット
+    for _ in range(10):
+        collector.observe("navigate", 3.0)   # (2, 4] バケット
+
+    # Act
+    p50 = collector.percentile("navigate", 0.50)
+    p95 = collector.percentile("navigate", 0.95)
+    summary = collector.summary()
+
+    # Assert
+    assert 0 < p50 <= 1.0
+    assert 2.0 < p95 <= 4.0
+    assert summary["navigate"]["count"] == 100
+    assert summary["navigate"]["mean"] == pytest.approx(0.75)
+    assert set(summary["navigate"]) == {"count", "mean", "p50", "p95", "p99"}
+
+
+def test_histogram_percentile_of_unknown_phase_is_none():
+    """観測の無いフェーズのパーセンタイルは None であることを確認"""
+    assert HistogramMetricsCollector().percentile("quit", 0.5) is None
+
+
+def test_histogram_overflow_bucket_returns_lower_bound():
+    """+Inf バケットに入った値はその下限値として推定されることを確認"""
+    collector = HistogramMetricsCollector(buckets=(1.0, math.inf))
+    collector.observe("session_create", 500.0)
+    assert collector.percentile("session_create", 0.99) == 1.0
+
+
+def test_histogram_rejects_invalid_buckets():
+    """バケットが昇順でない、または +Inf で終わらない場合に ValueError が発生することを確認"""
+    with pytest.raises(ValueError):
+        HistogramMetricsCollector(buckets=(2.0, 1.0, math.inf))
+    with pytest.raises(ValueError):
+        HistogramMetricsCollector(buckets=(1.0, 2.0))
@@ -15,6 +15,7 @@ from src.application.proxy_selector import ProxySelector
 from src.adapters.edge_option_factory import EdgeOptionFactory
 from src.application.proxied_edge_browser import ProxiedEdgeBrowser
 from src.application.proxy_provider import ProxyProvider
+from src.domain.ip_check_result import IpCheckResult
 
 # --- 基本構造とインスタンス化のテスト (Issue #8) ---
 
@@ -181,10 +182,11 @@ def test_start_browser_success(browser_manager_mocks):
     )
     assert manager._driver is mock_remote_class.return_value
     assert manager._driver.session_id == "mock_session_123"
+    # メッセージは %-style で渡され、レベルが有効な場合にのみ書式化される
     mock_logger.info.assert_any_call(
-        f"Attempting to start browser using proxy index {proxy_index}...")
+        "Attempting to start browser using proxy index %s...", proxy_index)
     mock_logger.info.assert_any_call(
-        f"Browser session started successfully. Session ID: mock_session_123")
+        "Browser session started successfully. Session ID: %s", "mock_session_123")
 
 
 def test_start_browser_closes_existing_session(browser_manager_mocks, mocker):
@@ -295,7 +297,7 @@ def test_take_screenshot_success(browser_manager_mocks, mocker):
     mock_driver.get.assert_called_once_with(test_url)
     mock_driver.save_screenshot.assert_called_once_with(test_save_path)
     mock_logger.info.assert_any_call(
-        f"Screenshot saved successfully to '{test_save_path}'.")
+        "Screenshot saved successfully to '%s'.", test_save_path)
 
 
 def test_take_screenshot_creates_directory(browser_manager_mocks, mocker):
@@ -522,3 +524,336 @@ def test_context_manager_calls_close_browser(mocker):
     # __exit__ 内のログも確認
     mock_logger.debug.assert_any_call(
         "Exiting ProxiedEdgeBrowser context, ensuring browser closure.")
+
+
+# --- verify_ip のユニットテスト ---
+
+
+def test_verify_ip_returns_egress_ip_from_body_text(browser_manager_mocks):
+    """verify_ip がページ本文から送信元 IP を読み取り、スクショを撮らないことをテスト"""
+    # Arrange
+    manager, _, _, _, mock_remote_class, _ = browser_manager_mocks
+    manager.start_browser(0)
+    mock_driver = mock_remote_class.return_value
+    mock_driver.find_element.return_value.text = '{"ip":"203.0.113.7"}'
+
+    # Act
+    result = manager.verify_ip("https://api.ipify.org?format=json")
+
+    # Assert
+    assert isinstance(result, IpCheckResult)
+    assert result.success
+    assert result.egress_ip == "203.0.113.7"
+    assert result.proxy == ProxyInfo(host="mock.proxy", port=1234)
+    mock_driver.get.assert_called_once_with("https://api.ipify.org?format=json")
+    mock_driver.save_screenshot.assert_not_called()
+
+
+def test_verify_ip_returns_failed_result_when_no_ip_found(browser_manager_mocks):
+    """本文から IP が読み取れない場合に失敗結果を返すことをテスト"""
+    # Arrange
+    manager, _, _, mock_logger, mock_remote_class, _ = browser_manager_mocks
+    manager.start_browser(0)
+    mock_remote_class.return_value.find_element.return_value.text = "This site can't be reached"
+
+    # Act
+    result = manager.verify_ip("https://api.ipify.org?format=json")
+
+    # Assert
+    assert not result.success
+    assert result.egress_ip is None
+    assert result.error == "No IP address found in page text"
+    mock_logger.warning.assert_called_once()
+
+
+def test_verify_ip_raises_runtime_error_if_not_started(browser_manager_mocks):
+    """ブラウザ未起動時に RuntimeError が発生することをテスト"""
+    # Arrange
+    manager, _, _, mock_logger, _, _ = browser_manager_mocks
+
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="Browser not started"):
+        manager.verify_ip("https://api.ipify.org?format=json")
+    mock_logger.error.assert_called_once_with(
+        "Browser not started when attempting to verify IP.")
+
+
+def test_verify_ip_reraises_webdriver_exception(browser_manager_mocks):
+    """driver.get で WebDriverException が発生した場合に再送出することをテスト"""
+    # Arrange
+    manager, _, _, mock_logger, mock_remote_class, _ = browser_manager_mocks
+    manager.start_browser(0)
+    mock_remote_class.return_value.get.side_effect = WebDriverException("Failed to navigate")
+
+    # Act & Assert
+    with pytest.raises(WebDriverException, match="Failed to navigate"):
+        manager.verify_ip("https://api.ipify.org?format=json")
+    args, kwargs = mock_logger.error.call_args
+    assert "WebDriverException during IP verification" in args[0]
+    assert kwargs.get("exc_info") is True
+
+
+# --- フェーズ計測のテスト ---
+
+
+def test_phases_are_timed_and_pushed_to_metrics_collector(browser_manager_mocks, mocker):
+    """start_browser / take_screenshot / close_browser の各フェーズが計測され、収集器に送られることを確認"""
+    # Arrange
+    from src.application.metrics import MetricsCollector
+    manager, _, _, _, _, _ = browser_manager_mocks
+    mock_collector = mocker.Mock(spec=MetricsCollector)
+    manager._metrics = mock_collector
+    mocker.patch('src.application.proxied_edge_browser.Path')
+
+    # Act
+    manager.start_browser(0)
+    manager.take_screenshot("https://example.com", "/app/screenshots/x.png")
+    manager.close_browser()
+
+    # Assert
+    phases = [c.args[0] for c in mock_collector.observe.call_args_list]
+    assert phases == ["create_options", "session_create", "navigate", "save_screenshot", "quit"]
+    timings = manager.timings.as_dict()
+    assert set(timings) == set(phases)
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_session_create_is_timed_even_when_it_fails(browser_manager_mocks):
+    """セッション作成が失敗した場合もその所要時間が記録されることを確認"""
+    # Arrange
+    manager, _, _, _, mock_remote_class, _ = browser_manager_mocks
+    mock_remote_class.side_effect = WebDriverException("session not created")
+
+    # Act
+    with pytest.raises(WebDriverException):
+        manager.start_browser(0)
+
+    # Assert
+    assert manager.timings.get("session_create") is not None
+
+
+def test_timings_are_reset_for_each_session(browser_manager_mocks, mocker):
+    """start_browser のたびに計測結果がリセットされることを確認"""
+    # Arrange
+    manager, _, _, _, _, _ = browser_manager_mocks
+    mocker.patch('src.application.proxied_edge_browser.Path')
+    manager.start_browser(0)
+    manager.take_screenshot("https://example.com", "/app/screenshots/x.png")
+
+    # Act
+    manager.start_browser(1)
+
+    # Assert
+    assert "navigate" not in manager.timings.as_dict()
+
+
+def test_start_browser_uses_tracing_connection_when_tracer_given(browser_manager_mocks, mocker):
+    """tracer を渡した場合、コマンドごとにスパンを記録する RemoteConnection を使うことを確認"""
+    # Arrange
+    from src.adapters.tracing_remote_connection import TracingRemoteConnection
+    from src.application.tracing import Tracer
+    manager, _, _, _, mock_remote_class, _ = browser_manager_mocks
+    manager._tracer = mocker.Mock(spec=Tracer)
+
+    # Act
+    manager.start_browser(0)
+
+    # Assert
+    executor = mock_remote_class.call_args.kwargs["command_executor"]
+    assert isinstance(executor, TracingRemoteConnection)
+    assert executor.client_config.remote_server_addr == manager._command_executor
+
+
+def test_start_browser_applies_command_timeout(browser_manager_mocks):
+    """command_timeout を指定した場合、その秒数で HTTP 往復を打ち切る RemoteConnection を使うことを確認"""
+    # Arrange
+    manager, _, _, _, mock_remote_class, _ = browser_manager_mocks
+    manager._command_timeout = 30.0
+
+    # Act
+    manager.start_browser(0)
+
+    # Assert
+    executor = mock_remote_class.call_args.kwargs["command_executor"]
+    assert executor.client_config.timeout == 30.0
+    assert executor.client_config.remote_server_addr == manager._command_executor
+
+
+def test_abort_quits_session_and_close_browser_only_cleans_up(browser_manager_mocks):
+    """abort が別スレッドからセッションを終了し、close_browser は quit を再送せずにオプションを返却することを確認"""
+    # Arrange
+    manager, _, mock_factory, _, mock_remote_class, _ = browser_manager_mocks
+    manager.start_browser(1)
+    driver = mock_remote_class.return_value
+
+    # Act
+    manager.abort()
+    manager.close_browser()
+
+    # Assert
+    driver.quit.assert_called_once()
+    assert manager._driver is None
+    mock_factory.release_options.assert_called_once_with(mock_factory.create_options.return_value)
+
+
+def test_take_screenshot_waits_for_readiness_condition(browser_manager_mocks, mocker, tmp_path):
+    """readiness を指定すると、ページ移動後に条件を満たすまで待ってからスクショを撮ることを確認"""
+    # Arrange
+    from src.application.readiness import ReadinessCondition
+    manager, _, _, _, _, _ = browser_manager_mocks
+    mock_driver = mocker.Mock(spec=RemoteWebDriver)
+    manager._driver = mock_driver
+    readiness = mocker.Mock(spec=ReadinessCondition)
+    readiness.side_effect = [False, True]
+    manager._readiness = readiness
+
+    # Act
+    manager.take_screenshot("https://example.com", str(tmp_path / "shot.png"))
+
+    # Assert
+    assert readiness.call_count == 2
+    readiness.assert_called_with(mock_driver)
+    assert manager.timings.get("wait_ready") is not None
+    mock_driver.save_screenshot.assert_called_once()
+
+
+def test_verify_ip_raises_timeout_when_page_never_ready(browser_manager_mocks, mocker):
+    """readiness_timeout 以内に条件を満たさない場合に TimeoutException が送出されることを確認"""
+    # Arrange
+    from selenium.common.exceptions import TimeoutException
+    from src.application.readiness import ReadinessCondition
+    manager, _, _, _, _, _ = browser_manager_mocks
+    manager.start_browser(1)
+    readiness = mocker.Mock(spec=ReadinessCondition, return_value=False)
+    readiness.description = "css '#main'"
+    manager._readiness = readiness
+    manager._readiness_timeout = 0.2
+
+    # Act & Assert
+    with pytest.raises(TimeoutException, match="was not ready \\(css '#main'\\)"):
+        manager.verify_ip("https://api.ipify.org?format=json")
+
+
+def test_take_screenshot_aborts_on_error_page_without_saving(browser_manager_mocks, mocker, tmp_path):
+    """エラーページを検出した場合、スクショを撮らずに NavigationAbortedError を送出することを確認"""
+    # Arrange
+    from src.application.error_page import ErrorPageDetector, NavigationAbortedError
+    manager, _, _, _, _, _ = browser_manager_mocks
+    mock_driver = mocker.Mock(spec=RemoteWebDriver)
+    mock_driver.execute_script.return_value = {
+        "url": "chrome-error://chromewebdata/", "errorCode": "ERR_PROXY_CONNECTION_FAILED", "title": "", "text": ""}
+    manager._driver = mock_driver
+    manager._error_page_detector = ErrorPageDetector()
+
+    # Act & Assert
+    with pytest.raises(NavigationAbortedError, match="ERR_PROXY_CONNECTION_FAILED"):
+        manager.take_screenshot("https://example.com", str(tmp_path / "shot.png"))
+    mock_driver.save_screenshot.assert_not_called()
+
+
+def test_verify_ip_converts_net_error_from_get(browser_manager_mocks):
+    """driver.get が net::ERR_* で失敗した場合、NavigationAbortedError に変換されることを確認"""
+    # Arrange
+    from src.application.error_page import ErrorPageDetector, NavigationAbortedError
+    manager, _, _, _, mock_remote_class, _ = browser_manager_mocks
+    manager._error_page_detector = ErrorPageDetector()
+    manager.start_browser(1)
+    mock_remote_class.return_value.get.side_effect = WebDriverException(
+        "unknown error: net::ERR_TUNNEL_CONNECTION_FAILED")
+
+    # Act & Assert
+    with pytest.raises(NavigationAbortedError) as exc_info:
+        manager.verify_ip("https://api.ipify.org?format=json")
+    assert exc_info.value.reason == "net::ERR_TUNNEL_CONNECTION_FAILED"
+
+
+def test_open_tabs_reuses_current_tab_then_opens_new_ones(browser_manager_mocks, mocker, tmp_path):
+    """open_tabs は先頭の URL に現在のタブを使い、残りは新しいタブで読み込みを開始することを確認"""
+    # Arrange
+    manager, _, _, _, _, _ = browser_manager_mocks
+    mock_driver = mocker.MagicMock(spec=RemoteWebDriver)
+    handles = iter(["main", "tab-2"])
+    type(mock_driver).current_window_handle = mocker.PropertyMock(side_effect=lambda: next(handles))
+    mock_driver.execute_script.return_value = None
+    manager._driver = mock_driver
+
+    # Act
+    manager.open_tabs(["https://a.example/", "https://b.example/"])
+
+    # Assert
+    mock_driver.switch_to.new_window.assert_called_once_with('tab')
+    navigations = [c.args[1] for c in mock_driver.execute_script.call_args_list]
+    assert navigations == ["https://a.example/", "https://b.example/"]
+    assert manager._tabs == {"https://a.example/": "main", "https://b.example/": "tab-2"}
+    mock_driver.get.assert_not_called()
+
+
+def test_take_screenshot_on_open_tab_waits_and_closes_it(browser_manager_mocks, mocker, tmp_path):
+    """開いたタブの URL はページ移動せず、タブに切り替えて読み込みを待ち、キャプチャ後に閉じることを確認"""
+    # Arrange
+    manager, _, _, _, _, _ = browser_manager_mocks
+    mock_driver = mocker.MagicMock(spec=RemoteWebDriver)
+    mock_driver.execute_script.side_effect = ["pending", "complete"]
+    manager._driver = mock_driver
+    manager._tabs = {"https://b.example/": "tab-2"}
+    manager._windows = ["main", "tab-2"]
+
+    # Act
+    manager.take_screenshot("https://b.example/", str(tmp_path / "b.png"))
+
+    # Assert
+    mock_driver.get.assert_not_called()
+    mock_driver.switch_to.window.assert_any_call("tab-2")
+    mock_driver.save_screenshot.assert_called_once()
+    mock_driver.close.assert_called_once()
+    assert manager._windows == ["main"]
+    mock_driver.switch_to.window.assert_called_with("main")
+
+
+def test_take_screenshot_blocks_resources_and_records_blocked_count(browser_manager_mocks, mocker, tmp_path):
+    """resource_blocker 指定時は移動前に遮断パターンを設定し、キャプチャ後にログから遮断数を記録することを確認"""
+    # Arrange
+    import json
+    from src.application.resource_blocking import BlockingRule, ResourceBlocker
+    manager, _, _, _, _, _ = browser_manager_mocks
+    manager._resource_blocker = ResourceBlocker(BlockingRule(resource_types=("image",)))
+    mock_driver = mocker.MagicMock(spec=RemoteWebDriver)
+    blocked = {"message": json.dumps({"webview": "main", "message": {
+        "method": "Network.loadingFailed", "params": {"blockedReason": "inspector"}}})}
+    calls = []
+
+    def execute(command, params):
+        calls.append(params.get("cmd", command))
+        return {"value": [blocked, blocked] if command == "getLog" else {}}
+
+    mock_driver.execute.side_effect = execute
+    mock_driver.get.side_effect = lambda url: calls.append("get")
+    manager._driver = mock_driver
+
+    # Act
+    manager.take_screenshot("https://example.com/", str(tmp_path / "shot.png"))
+
+    # Assert
+    assert calls == ["Network.enable", "Network.setBlockedURLs", "get", "getLog"]
+    assert manager.blocked_requests == {"https://example.com/": 2}
+    assert manager.timings.get("block_resources") is not None
+
+
+def test_options_are_released_after_quit_and_after_failed_start(browser_manager_mocks, mocker):
+    """セッションの終了後とセッション作成の失敗時に、オプションが EdgeOptionFactory に返却されることを確認"""
+    # Arrange
+    manager, _, mock_factory, _, mock_remote_class, _ = browser_manager_mocks
+    options = mock_factory.create_options.return_value
+
+    # Act / Assert: 終了後に返却
+    manager.start_browser(1)
+    mock_factory.release_options.assert_not_called()
+    manager.close_browser()
+    mock_factory.release_options.assert_called_once_with(options)
+
+    # Act / Assert: 作成に失敗した場合も返却
+    mock_factory.release_options.reset_mock()
+    mock_remote_class.side_effect = WebDriverException("grid is full")
+    with pytest.raises(WebDriverException):
+        manager.start_browser(1)
+    mock_factory.release_options.assert_called_once_with(options)
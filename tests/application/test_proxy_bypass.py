@@ -0,0 +1,56 @@
+# tests/application/test_proxy_bypass.py
+import json
+
+import pytest
+
+from src.application.proxy_bypass import ProxyBypassRules, bypass_entry_matches, validate_bypass_entry
+
+
+@pytest.mark.parametrize("entry, host, expected", [
+    ("cdn.example.net", "cdn.example.net", True),
+    ("cdn.example.net", "www.example.net", False),
+    ("*.cloudfront.net", "d111.cloudfront.net", True),
+    (".example.net", "example.net", True),
+    (".example.net", "img.example.net", True),
+    ("https://static.example.com:443", "static.example.com", True),
+    ("192.168.0.0/16", "192.168.10.5", True),
+    ("192.168.0.0/16", "10.0.0.1", False),
+    ("<local>", "intranet", True),
+    ("<local>", "intranet.example.com", False),
+])
+def test_bypass_entry_matches(entry, host, expected):
+    """--proxy-bypass-list のエントリとホスト名の照合を確認"""
+    assert bypass_entry_matches(entry, host) is expected
+
+
+def test_invalid_entries_are_rejected():
+    """区切り文字や空白を含むエントリは ValueError になることを確認"""
+    assert validate_bypass_entry(" *.cdn.example.net ") == "*.cdn.example.net"
+    for entry in ("", "a.example.com;b.example.com", "bad host"):
+        with pytest.raises(ValueError, match="Invalid proxy bypass entry"):
+            validate_bypass_entry(entry)
+
+
+def test_bypass_list_merges_rules_of_each_target(tmp_path):
+    """アクセス先ごとの規則 (当てはまらなければ default) をまとめた一覧を返すことを確認"""
+    # Arrange
+    path = tmp_path / "bypass.json"
+    path.write_text(json.dumps({"targets": {
+        "*.shop.example": ["*.cloudfront.net", "fonts.gstatic.com"],
+        "news.example": ["cdn.news-assets.example"],
+    }}), encoding="utf-8")
+
+    # Act
+    rules = ProxyBypassRules.from_file(path, default=["fonts.gstatic.com"])
+    bypass = rules.bypass_list(["https://www.shop.example/", "https://news.example/a", "https://api.ipify.org"])
+
+    # Assert
+    assert bypass == ("*.cloudfront.net", "fonts.gstatic.com", "cdn.news-assets.example")
+
+
+def test_bypass_list_rejects_entry_matching_target_host():
+    """アクセス先のページが直接接続になるエントリはエラーになることを確認"""
+    rules = ProxyBypassRules(default=["*.example.com"])
+    with pytest.raises(ValueError, match="www.example.com"):
+        rules.bypass_list(["https://www.example.com/"])
+    assert ProxyBypassRules().bypass_list(["https://www.example.com/"]) == ()
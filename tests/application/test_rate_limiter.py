@@ -0,0 +1,68 @@
+# tests/application/test_rate_limiter.py
+import pytest
+
+from src.domain.proxy_info import ProxyInfo
+from src.application.rate_limiter import RateLimiter, TokenBucket
+
+PROXY_A = ProxyInfo("10.0.0.1", 3128)
+PROXY_B = ProxyInfo("10.0.0.2", 3128)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills_at_rate():
+    """burst 個まで連続して使え、その後は rate に従って補充されることを確認"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+
+    # Act / Assert
+    for _ in range(2):
+        assert bucket.wait_time() == 0.0
+        bucket.take()
+    assert bucket.wait_time() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.wait_time() == 0.0
+
+
+def test_rate_limiter_limits_per_host_and_per_proxy():
+    """ホストごと・プロキシごとのバケットがそれぞれ独立して制限することを確認"""
+    clock = FakeClock()
+    limiter = RateLimiter(host_rate=10.0, proxy_rate=1.0, host_burst=5, clock=clock)
+
+    # Act / Assert
+    assert limiter.try_acquire("example.com", PROXY_A) == 0.0
+    assert limiter.try_acquire("example.com", PROXY_A) == pytest.approx(1.0)  # プロキシ A は制限中
+    assert limiter.try_acquire("example.com", PROXY_B) == 0.0                 # 別プロキシは開始できる
+    assert limiter.try_acquire("other.example", PROXY_A) == pytest.approx(1.0)
+
+
+def test_rate_limiter_consumes_nothing_when_any_bucket_is_empty():
+    """どちらかのバケットが空の場合は、もう一方のトークンも消費しないことを確認"""
+    clock = FakeClock()
+    limiter = RateLimiter(host_rate=1.0, proxy_rate=1.0, clock=clock)
+    assert limiter.try_acquire("example.com", PROXY_A) == 0.0
+
+    # Act: ホストは空、プロキシ B は満タン
+    assert limiter.try_acquire("example.com", PROXY_B) == pytest.approx(1.0)
+    clock.now = 1.0
+
+    # Assert: プロキシ B のトークンは残っているので、ホストの補充後すぐに開始できる
+    assert limiter.try_acquire("example.com", PROXY_B) == 0.0
+
+
+def test_rate_limiter_without_rates_is_disabled():
+    """rate が 0 の場合は制限しないことを確認"""
+    limiter = RateLimiter()
+    assert not limiter.enabled
+    assert all(limiter.try_acquire("example.com", PROXY_A) == 0.0 for _ in range(100))
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError, match="rate must be positive"):
+        TokenBucket(rate=0)
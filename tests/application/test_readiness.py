@@ -0,0 +1,66 @@
+# tests/application/test_readiness.py
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from src.application.readiness import (
+    BodyTextHasIp, BodyTextMatches, CssSelectorPresent, DocumentReadyState, parse_readiness)
+
+
+def make_driver(body_text: str = "", elements: list | None = None, ready_state: str = "complete") -> MagicMock:
+    driver = MagicMock()
+    driver.find_element.return_value.text = body_text
+    driver.find_elements.return_value = elements or []
+    driver.execute_script.return_value = ready_state
+    return driver
+
+
+@pytest.mark.parametrize("spec, expected_type", [
+    ("ip", BodyTextHasIp),
+    ("interactive", DocumentReadyState),
+    ("complete", DocumentReadyState),
+    ("css:#main img", CssSelectorPresent),
+    ("text:Your IP", BodyTextMatches),
+])
+def test_parse_readiness(spec, expected_type):
+    """文字列指定から対応する条件が生成されることを確認"""
+    assert isinstance(parse_readiness(spec), expected_type)
+
+
+@pytest.mark.parametrize("spec", ["", "css:", "text:", "visible:#x", "ip:extra"])
+def test_parse_readiness_rejects_invalid_spec(spec):
+    with pytest.raises(ValueError, match="Invalid readiness condition"):
+        parse_readiness(spec)
+
+
+def test_body_text_has_ip():
+    """本文から IP を読み取れた時点で準備完了になることを確認"""
+    condition = BodyTextHasIp()
+    assert not condition(make_driver("Loading..."))
+    assert condition(make_driver('{"ip": "203.0.113.7"}'))
+
+
+def test_css_selector_present_uses_find_elements():
+    """CSS セレクタの要素が現れた時点で準備完了になることを確認"""
+    condition = CssSelectorPresent("#result")
+    driver = make_driver(elements=[MagicMock()])
+
+    assert condition(driver)
+    driver.find_elements.assert_called_once_with(By.CSS_SELECTOR, "#result")
+    assert not condition(make_driver())
+
+
+def test_body_text_matches_regex():
+    condition = BodyTextMatches(r"IP:\s*\d+")
+    assert condition(make_driver("Your IP: 203"))
+    assert not condition(make_driver("Your IP: unknown"))
+
+
+def test_document_ready_state_interactive_accepts_complete():
+    """interactive 指定時は complete も準備完了とみなすことを確認"""
+    condition = DocumentReadyState("interactive")
+    assert condition(make_driver(ready_state="interactive"))
+    assert condition(make_driver(ready_state="complete"))
+    assert not condition(make_driver(ready_state="loading"))
+    assert not DocumentReadyState("complete")(make_driver(ready_state="interactive"))
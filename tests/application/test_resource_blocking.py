@@ -0,0 +1,92 @@
+# tests/application/test_resource_blocking.py
+import json
+
+import pytest
+from selenium.webdriver.edge.options import Options as EdgeOptions
+
+from src.application.resource_blocking import (
+    RESOURCE_TYPE_PATTERNS, BlockingRule, ResourceBlocker, count_blocked_requests, parse_resource_types)
+
+
+def _log_entry(method: str, params: dict, webview: str | None = "tab-1") -> dict:
+    return {"level": "INFO", "timestamp": 0,
+            "message": json.dumps({"webview": webview, "message": {"method": method, "params": params}})}
+
+
+def test_blocking_rule_expands_resource_types_and_patterns():
+    """リソースの種類が URL パターンに展開され、指定した URL パターンと重複なく並ぶことを確認"""
+    rule = BlockingRule(resource_types=("font",), url_patterns=("*.woff2", "*://ads.example.com/*"))
+    assert rule.blocked_urls == RESOURCE_TYPE_PATTERNS["font"] + ("*://ads.example.com/*",)
+
+
+def test_unknown_resource_type_is_rejected():
+    """未知のリソースの種類は ValueError になることを確認"""
+    with pytest.raises(ValueError, match="Unknown resource type"):
+        parse_resource_types("image, scripts")
+    assert parse_resource_types(" image,tracker ,") == ("image", "tracker")
+
+
+def test_rule_for_matches_target_host_patterns(tmp_path):
+    """規則ファイルのホスト名パターンに当てはまるアクセス先にはその規則、それ以外には default を使うことを確認"""
+    # Arrange
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"targets": {
+        "*.example.com": {"resource_types": ["image"]},
+        "render.example.org": {},
+    }}), encoding="utf-8")
+    default = BlockingRule(resource_types=("media",))
+
+    # Act
+    blocker = ResourceBlocker.from_file(path, default=default)
+
+    # Assert
+    assert blocker.rule_for("https://www.Example.com/page").resource_types == ("image",)
+    assert blocker.rule_for("https://render.example.org/").blocked_urls == ()
+    assert blocker.rule_for("https://api.ipify.org?format=json") is default
+
+
+def test_apply_enables_network_once_and_skips_unchanged_patterns(mocker):
+    """最初の設定で Network.enable を呼び、同じパターンの再設定は省略し、異なる場合は置き換えることを確認"""
+    # Arrange
+    driver = mocker.Mock()
+    driver.execute.return_value = {"value": {}}
+    blocker = ResourceBlocker(BlockingRule(url_patterns=("*.png",)), {"plain.test": BlockingRule()})
+
+    # Act
+    current = blocker.apply(driver, "https://example.com/")
+    current = blocker.apply(driver, "https://example.com/other", current)
+    current = blocker.apply(driver, "https://plain.test/", current)
+
+    # Assert
+    assert [c.args[1]["cmd"] for c in driver.execute.call_args_list] == [
+        "Network.enable", "Network.setBlockedURLs", "Network.setBlockedURLs"]
+    assert driver.execute.call_args_list[-1].args[1]["params"] == {"urls": []}
+    assert current == ()
+
+
+def test_apply_does_nothing_when_no_pattern_applies(mocker):
+    """遮断するものが無いアクセス先では DevTools のコマンドを実行しないことを確認"""
+    driver = mocker.Mock()
+    assert ResourceBlocker(BlockingRule()).apply(driver, "https://example.com/") is None
+    driver.execute.assert_not_called()
+
+
+def test_count_blocked_requests_counts_inspector_blocks_per_webview():
+    """setBlockedURLs による遮断 (blockedReason: inspector) のみをタブごとに数えることを確認"""
+    entries = [
+        _log_entry("Network.loadingFailed", {"blockedReason": "inspector"}),
+        _log_entry("Network.loadingFailed", {"blockedReason": "inspector"}, webview="tab-2"),
+        _log_entry("Network.loadingFailed", {"errorText": "net::ERR_CONNECTION_RESET"}),
+        _log_entry("Network.requestWillBeSent", {}),
+        {"message": "not json"},
+    ]
+    assert count_blocked_requests(entries) == {"tab-1": 1, "tab-2": 1}
+
+
+def test_configure_options_enables_performance_log():
+    """遮断数を数えるためにパフォーマンスログが有効になることを確認"""
+    options = EdgeOptions()
+    ResourceBlocker(BlockingRule()).configure_options(options)
+    capabilities = options.to_capabilities()
+    assert capabilities["ms:loggingPrefs"] == {"performance": "ALL"}
+    assert capabilities["ms:edgeOptions"]["perfLoggingPrefs"]["enableNetwork"] is True
@@ -0,0 +1,94 @@
+# tests/application/test_retry_policy.py
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException, WebDriverException
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+
+from src.application.retry_policy import (
+    ERROR_GRID, ERROR_NAVIGATION_TIMEOUT, ERROR_OTHER, ERROR_PROXY, RetryPolicy, RetryRule, classify_error)
+from src.application.run_metrics import RunMetrics
+
+
+@pytest.mark.parametrize("error, expected", [
+    (WebDriverException("unknown error: net::ERR_PROXY_CONNECTION_FAILED"), ERROR_PROXY),
+    (WebDriverException("unknown error: net::ERR_TUNNEL_CONNECTION_FAILED"), ERROR_PROXY),
+    (TimeoutException("timeout: Timed out receiving message from renderer: 300.000"), ERROR_NAVIGATION_TIMEOUT),
+    (WebDriverException("unknown error: net::ERR_TIMED_OUT"), ERROR_NAVIGATION_TIMEOUT),
+    (SessionNotCreatedException("Could not start a new session. Response code 500."), ERROR_GRID),
+    (WebDriverException("invalid session id"), ERROR_GRID),
+    (ValueError("something else"), ERROR_OTHER),
+])
+def test_classify_error_by_message_and_class(error, expected):
+    """例外クラス名とメッセージからエラー分類が決まることを確認"""
+    assert classify_error(error) == expected
+
+
+def test_classify_error_follows_cause_chain():
+    """原因の例外 (Grid への接続失敗) まで辿って分類することを確認"""
+    try:
+        try:
+            raise MaxRetryError(None, "/session", "Connection refused")
+        except MaxRetryError as cause:
+            raise RuntimeError("remote call failed") from cause
+    except RuntimeError as e:
+        error = e
+
+    assert classify_error(error) == ERROR_GRID
+
+
+def test_should_retry_follows_rule_per_category():
+    """分類ごとの最大試行回数まで再試行し、proxy エラーは再試行しないことを確認"""
+    policy = RetryPolicy(rules={ERROR_GRID: RetryRule(max_attempts=3)})
+
+    assert policy.should_retry(ERROR_GRID, 1)
+    assert policy.should_retry(ERROR_GRID, 2)
+    assert not policy.should_retry(ERROR_GRID, 3)
+    assert not policy.should_retry(ERROR_PROXY, 1)
+
+
+def test_retry_budget_caps_total_retries_per_run():
+    """実行全体の再試行予算を使い切ると再試行しないことを確認"""
+    metrics = RunMetrics()
+    policy = RetryPolicy(budget=2, metrics=metrics)
+
+    assert [policy.should_retry(ERROR_GRID, 1) for _ in range(3)] == [True, True, False]
+    assert policy.remaining_budget == 0
+    assert "proxyrot_retry_budget_remaining 0" in metrics.render_prometheus()
+
+
+def test_backoff_is_full_jitter_with_exponential_cap():
+    """待機秒数が 0〜min(max_delay, base_delay * 2^(attempt-1)) の一様乱数になることを確認"""
+    calls = []
+    policy = RetryPolicy(
+        rules={ERROR_GRID: RetryRule(max_attempts=5, base_delay=2.0, max_delay=5.0)},
+        random_func=lambda low, high: calls.append((low, high)) or high)
+
+    assert [policy.backoff(ERROR_GRID, attempt) for attempt in (1, 2, 3)] == [2.0, 4.0, 5.0]
+    assert calls[0] == (0.0, 2.0)
+
+
+def test_allows_retry_does_not_consume_budget():
+    """allows_retry は should_retry と同じ判定を予算を消費せずに返すことを確認"""
+    policy = RetryPolicy(budget=1)
+
+    assert policy.allows_retry(ERROR_NAVIGATION_TIMEOUT, 1)
+    assert policy.remaining_budget == 1
+    assert not policy.allows_retry(ERROR_NAVIGATION_TIMEOUT, 2)
+    assert policy.should_retry(ERROR_NAVIGATION_TIMEOUT, 1)
+    assert not policy.allows_retry(ERROR_GRID, 1)
+
+
+def test_client_read_timeout_during_session_create_is_grid_error():
+    """セッション作成中の urllib3 の ReadTimeoutError (過負荷の Grid) が Grid 側のエラーに分類されることを確認"""
+    error = ReadTimeoutError(None, "/wd/hub/session", "Read timed out. (read timeout=120)")
+    assert classify_error(error, session_create=True) == ERROR_GRID
+    try:
+        raise WebDriverException("request failed") from error
+    except WebDriverException as wrapped:
+        assert classify_error(wrapped, session_create=True) == ERROR_GRID
+
+
+def test_client_read_timeout_during_navigation_is_navigation_timeout():
+    """ページ移動中の ReadTimeoutError (遅いプロキシ) は、MaxRetryError に包まれていてもページ読み込みのタイムアウトに分類されることを確認"""
+    error = ReadTimeoutError(None, "/wd/hub/session/abc/url", "Read timed out. (read timeout=120)")
+    assert classify_error(error) == ERROR_NAVIGATION_TIMEOUT
+    assert classify_error(MaxRetryError(None, "/wd/hub/session/abc/url", reason=error)) == ERROR_NAVIGATION_TIMEOUT
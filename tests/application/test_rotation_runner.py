@@ -0,0 +1,595 @@
+# tests/application/test_rotation_runner.py
+import pytest
+import logging
+from unittest.mock import MagicMock
+
+from selenium.common.exceptions import WebDriverException
+
+from src.domain.proxy_info import ProxyInfo
+from src.domain.attempt_record import AttemptRecord
+from src.domain.ip_check_result import IpCheckResult, TIER_HTTP
+from src.adapters.proxy_host_resolver import ProxyHostResolver
+from src.adapters.result_sink import ResultSink
+from src.application.proxied_edge_browser import ProxiedEdgeBrowser
+from src.application.tiered_verifier import TieredVerifier
+from src.application.metrics import PhaseTimings
+from src.application.rotation_runner import RotationRunner, build_screenshot_path
+
+PROXIES = [ProxyInfo("proxy-server", 8080), ProxyInfo("10.0.0.1", 3128), ProxyInfo("10.0.0.2", 3128)]
+URL = "https://api.ipify.org?format=json"
+
+
+@pytest.fixture
+def browser_mock():
+    """with 文で自身を返す ProxiedEdgeBrowser のモック"""
+    browser = MagicMock(spec=ProxiedEdgeBrowser)
+    browser.__enter__.return_value = browser
+    browser.timings = PhaseTimings()
+    browser.timings.record("session_create", 1.5)
+    browser.timings.record("navigate", 0.7)
+    browser.blocked_requests = {}
+    return browser
+
+
+def make_runner(browser, mocker, **kwargs) -> RotationRunner:
+    return RotationRunner(
+        browser_factory=lambda: browser, url=URL, screenshot_dir="/tmp/shots",
+        logger=mocker.Mock(spec=logging.Logger), **kwargs)
+
+
+def test_run_skips_screenshot_for_first_proxy_and_writes_records(browser_mock, mocker):
+    """Proxy #0 はスクショを撮らず、全試行のレコードが結果シンクに書き出されることを確認"""
+    # Arrange
+    sink = mocker.Mock(spec=ResultSink)
+    runner = make_runner(browser_mock, mocker, result_sink=sink)
+
+    # Act
+    summary = runner.run(PROXIES)
+
+    # Assert
+    assert browser_mock.start_browser.call_count == 3
+    assert browser_mock.take_screenshot.call_count == 2
+    browser_mock.take_screenshot.assert_any_call(
+        url=URL, save_path_in_container=build_screenshot_path(1, PROXIES[1], "/tmp/shots"))
+    records = [c.args[0] for c in sink.write.call_args_list]
+    assert [r.proxy_index for r in records] == [0, 1, 2]
+    assert all(isinstance(r, AttemptRecord) and r.success for r in records)
+    assert records[0].screenshot_path is None
+    assert records[1].screenshot_path == "/tmp/shots/ip_check_proxy_1_10.0.0.1_3128.png"
+    assert records[1].timings["session_create"] == 1.5
+    assert records[1].timings["navigate"] == 0.7
+    assert "total" in records[1].timings
+    assert (summary.total, summary.succeeded, summary.failed, summary.screenshots_taken) == (3, 3, 0, 2)
+
+
+def test_process_records_failure_class_and_message(browser_mock, mocker):
+    """ブラウザ起動失敗が error_class / error_message 付きの失敗レコードになることを確認"""
+    # Arrange
+    browser_mock.start_browser.side_effect = WebDriverException("session not created")
+    runner = make_runner(browser_mock, mocker)
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert not record.success
+    assert record.error_class == "WebDriverException"
+    assert "session not created" in record.error_message
+    assert "total" in record.timings
+
+
+def test_ip_mode_records_egress_ip(browser_mock, mocker):
+    """ip モードで送信元 IP がレコードに含まれることを確認"""
+    # Arrange
+    browser_mock.verify_ip.return_value = IpCheckResult(
+        proxy=PROXIES[1], url=URL, egress_ip="203.0.113.7", elapsed_seconds=0.3)
+    runner = make_runner(browser_mock, mocker, mode="ip")
+
+    # Act
+    summary = runner.run(PROXIES[:2])
+
+    # Assert
+    browser_mock.take_screenshot.assert_not_called()
+    assert summary.ips_verified == 1
+    assert summary.screenshots_taken == 0
+
+
+def test_ip_mode_failed_verification_is_failure(browser_mock, mocker):
+    """ip モードで送信元 IP を読み取れなかった場合に失敗レコードになることを確認"""
+    # Arrange
+    browser_mock.verify_ip.return_value = IpCheckResult(
+        proxy=PROXIES[1], url=URL, egress_ip=None, elapsed_seconds=0.3,
+        error="No IP address found in page text", error_class="NoEgressIp")
+    runner = make_runner(browser_mock, mocker, mode="ip")
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert not record.success
+    assert record.error_class == "NoEgressIp"
+
+
+def test_unresolvable_proxy_is_skipped_without_browser(browser_mock, mocker):
+    """名前解決できないプロキシはブラウザを起動せずに失敗として記録されることを確認"""
+    # Arrange
+    resolver = mocker.Mock(spec=ProxyHostResolver)
+    resolver.is_unresolvable.return_value = True
+    resolver.failures = {"10.0.0.1": "Name or service not known"}
+    runner = make_runner(browser_mock, mocker, resolver=resolver)
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    browser_mock.start_browser.assert_not_called()
+    assert record.error_class == "DnsResolutionError"
+
+
+def test_tiered_mode_delegates_to_verifier(browser_mock, mocker):
+    """tiered モードでは TieredVerifier の結果がレコードになることを確認"""
+    # Arrange
+    verifier = mocker.Mock(spec=TieredVerifier)
+    verifier.verify_http.return_value = IpCheckResult(
+        proxy=PROXIES[1], url=URL, egress_ip="203.0.113.7", elapsed_seconds=0.2, tier=TIER_HTTP)
+    runner = make_runner(browser_mock, mocker, mode="tiered", verifier=verifier)
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    verifier.verify_http.assert_called_once_with(1, URL)
+    browser_mock.start_browser.assert_not_called()
+    assert record.success and record.tier == TIER_HTTP
+    assert record.timings[TIER_HTTP] == 0.2
+
+
+def test_runner_rejects_invalid_mode_and_missing_verifier(browser_mock, mocker):
+    """不正なモードや verifier 無しの tiered モードで ValueError が発生することを確認"""
+    with pytest.raises(ValueError, match="mode must be one of"):
+        make_runner(browser_mock, mocker, mode="unknown")
+    with pytest.raises(ValueError, match="verifier is required for tiered mode"):
+        make_runner(browser_mock, mocker, mode="tiered")
+
+
+def test_run_updates_run_metrics(browser_mock, mocker):
+    """RunMetrics を渡すと試行数・キュー長・プロキシの健全性が更新されることを確認"""
+    # Arrange
+    from src.application.run_metrics import RunMetrics
+    metrics = RunMetrics()
+    browser_mock.take_screenshot.side_effect = [None, WebDriverException("boom")]
+    runner = make_runner(browser_mock, mocker, metrics=metrics)
+
+    # Act
+    runner.run(PROXIES)
+
+    # Assert
+    assert metrics.totals() == {"attempts": 3, "successes": 2, "failures": 1, "active_sessions": 0}
+    assert metrics.failures_by_class() == {"WebDriverException": 1}
+    text = metrics.render_prometheus()
+    assert "proxyrot_queue_depth 0" in text
+    assert 'proxyrot_proxy_up{proxy="10.0.0.2:3128"} 0' in text
+
+
+def test_process_opens_proxy_attempt_span_per_proxy(browser_mock, mocker):
+    """tracer を渡すとプロキシごとに proxy_attempt スパンが記録されることを確認"""
+    # Arrange
+    from src.adapters.span_exporter import SpanExporter
+    from src.application.tracing import Tracer, STATUS_ERROR
+    exporter = mocker.Mock(spec=SpanExporter)
+    browser_mock.take_screenshot.side_effect = WebDriverException("boom")
+    runner = make_runner(browser_mock, mocker, tracer=Tracer(exporter, sample_ratio=1.0))
+
+    # Act
+    runner.process(1, PROXIES[1])
+
+    # Assert
+    (span,) = exporter.export.call_args.args[0]
+    assert span.name == "proxy_attempt"
+    assert span.attributes["proxy.host"] == "10.0.0.1"
+    assert span.status == STATUS_ERROR
+
+
+def test_run_with_concurrency_processes_all_proxies_and_feeds_controller(browser_mock, mocker):
+    """concurrency を指定すると Proxy #0 を先に処理し、残りを並列に処理してコントローラに結果を通知することを確認"""
+    # Arrange
+    from src.application.concurrency_controller import AimdConcurrencyController
+    controller = mocker.Mock(wraps=AimdConcurrencyController(
+        max_limit=4, logger=mocker.Mock(spec=logging.Logger)))
+    controller.max_limit = 4
+    sink = mocker.Mock(spec=ResultSink)
+    proxies = PROXIES + [ProxyInfo(f"10.0.1.{i}", 3128) for i in range(10)]
+    runner = make_runner(browser_mock, mocker, result_sink=sink, concurrency=controller)
+
+    # Act
+    summary = runner.run(proxies)
+
+    # Assert
+    records = [c.args[0] for c in sink.write.call_args_list]
+    assert records[0].proxy_index == 0
+    assert sorted(r.proxy_index for r in records) == list(range(len(proxies)))
+    assert (summary.total, summary.succeeded, summary.screenshots_taken) == (13, 13, 12)
+    assert controller.record_session.call_count == 13
+    controller.record_session.assert_any_call(1.5, False)
+
+
+def test_session_start_failure_is_reported_to_controller(browser_mock, mocker):
+    """ブラウザ起動の WebDriverException がセッション作成の失敗としてコントローラに通知されることを確認"""
+    # Arrange
+    from src.application.concurrency_controller import AimdConcurrencyController
+    controller = mocker.Mock(spec=AimdConcurrencyController)
+    browser_mock.start_browser.side_effect = WebDriverException("session not created")
+    runner = make_runner(browser_mock, mocker, concurrency=controller)
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert not record.success
+    controller.record_session.assert_called_once_with(1.5, True)
+
+
+def test_non_webdriver_session_failure_lowers_concurrency_limit(browser_mock, mocker):
+    """urllib3 の ReadTimeoutError などによるセッション作成の失敗でも、コントローラが上限を下げることを確認"""
+    # Arrange
+    from urllib3.exceptions import ReadTimeoutError
+    from src.application.concurrency_controller import AimdConcurrencyController, MIN_SAMPLES
+    controller = AimdConcurrencyController(max_limit=8, initial_limit=8, latency_target_seconds=60.0,
+                                           logger=mocker.Mock(spec=logging.Logger))
+    browser_mock.start_browser.side_effect = ReadTimeoutError(None, "/session", "Read timed out. (read timeout=120)")
+    runner = make_runner(browser_mock, mocker, concurrency=controller)
+
+    # Act
+    for _ in range(MIN_SAMPLES):
+        (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert not record.success
+    assert controller.limit < 8
+
+
+def test_rate_limited_proxy_does_not_block_other_ready_proxies(browser_mock, mocker):
+    """プロキシごとのレート制限中の試行があっても、開始できる他の試行が先に処理されることを確認"""
+    # Arrange
+    from src.application.rate_limiter import RateLimiter
+    now = [0.0]
+    limiter = RateLimiter(proxy_rate=0.1, clock=lambda: now[0])
+    sleep = mocker.patch("src.application.rotation_runner.time.sleep",
+                         side_effect=lambda s: now.__setitem__(0, now[0] + s))
+    sink = mocker.Mock(spec=ResultSink)
+    duplicate = ProxyInfo("10.0.0.1", 3128)
+    proxies = [PROXIES[0], PROXIES[1], duplicate, PROXIES[2]]
+    runner = make_runner(browser_mock, mocker, result_sink=sink, rate_limiter=limiter)
+
+    # Act
+    runner.run(proxies)
+
+    # Assert
+    assert [c.args[0].proxy_index for c in sink.write.call_args_list] == [0, 1, 3, 2]
+    sleep.assert_called_once_with(pytest.approx(10.0))
+
+
+def test_grid_error_is_retried_with_new_session(browser_mock, mocker):
+    """Grid 側のエラーは新しいセッションで再試行され、試行回数がレコードに残ることを確認"""
+    # Arrange
+    from selenium.common.exceptions import SessionNotCreatedException
+    from src.application.retry_policy import RetryPolicy
+    sleep = mocker.patch("src.application.rotation_runner.time.sleep")
+    browser_mock.start_browser.side_effect = [SessionNotCreatedException("Could not start a new session"), None]
+    runner = make_runner(browser_mock, mocker, retry_policy=RetryPolicy(random_func=lambda low, high: high))
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert record.success
+    assert record.attempts == 2
+    assert browser_mock.start_browser.call_count == 2
+    sleep.assert_called_once_with(2.0)
+
+
+def test_proxy_error_is_not_retried(browser_mock, mocker):
+    """プロキシの接続失敗は再試行せず、エラー分類付きの失敗レコードになることを確認"""
+    # Arrange
+    from src.application.retry_policy import RetryPolicy
+    browser_mock.take_screenshot.side_effect = WebDriverException("net::ERR_PROXY_CONNECTION_FAILED")
+    runner = make_runner(browser_mock, mocker, retry_policy=RetryPolicy())
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert not record.success
+    assert (record.error_category, record.attempts) == ("proxy", 1)
+    assert browser_mock.start_browser.call_count == 1
+
+
+def test_resume_skips_attempts_completed_in_journal(browser_mock, mocker):
+    """ジャーナルに記録済みの試行はスキップし、新たに完了した試行のみ記録することを確認 (Proxy #0 は常に処理)"""
+    # Arrange
+    from src.adapters.run_journal import RunJournal
+    journal = mocker.Mock(spec=RunJournal)
+    journal.is_done.side_effect = lambda proxy, url: proxy.host == "10.0.0.1"
+    runner = make_runner(browser_mock, mocker, mode="ip", journal=journal)
+    browser_mock.verify_ip.return_value = IpCheckResult(
+        proxy=PROXIES[2], url=URL, egress_ip="203.0.113.7", elapsed_seconds=0.5)
+
+    # Act
+    summary = runner.run(PROXIES)
+
+    # Assert
+    assert browser_mock.start_browser.call_count == 2
+    assert [c.args[0].proxy_index for c in journal.write.call_args_list] == [2]
+    assert (summary.total, summary.succeeded, summary.skipped) == (3, 2, 1)
+
+
+def test_multiple_urls_share_one_session_per_proxy(browser_mock, mocker):
+    """複数の URL を1プロキシ1セッションで処理し、URL ごとにレコードとスクショを残すことを確認"""
+    # Arrange
+    urls = ["https://a.example/", "https://b.example/", "https://c.example/"]
+    sink = mocker.Mock(spec=ResultSink)
+    runner = make_runner(browser_mock, mocker, urls=urls, result_sink=sink)
+
+    # Act
+    summary = runner.run(PROXIES[:2])
+
+    # Assert
+    assert browser_mock.start_browser.call_count == 2
+    assert [c.kwargs["url"] for c in browser_mock.take_screenshot.call_args_list] == urls
+    records = [c.args[0] for c in sink.write.call_args_list]
+    assert [(r.proxy_index, r.url) for r in records] == [(0, urls[0])] + [(1, url) for url in urls]
+    assert records[2].screenshot_path == "/tmp/shots/ip_check_proxy_1_10.0.0.1_3128_url2.png"
+    # セッション起動は最初の URL のレコードにのみ含める
+    assert "session_create" in records[1].timings and "session_create" not in records[2].timings
+    assert (summary.total, summary.succeeded, summary.screenshots_taken) == (2, 4, 3)
+
+
+def test_failed_url_does_not_stop_remaining_urls(browser_mock, mocker):
+    """1つの URL の失敗はその URL の失敗として記録し、同じセッションで残りの URL を処理することを確認"""
+    # Arrange
+    from src.application.error_page import NavigationAbortedError
+    urls = ["https://a.example/", "https://b.example/"]
+    browser_mock.take_screenshot.side_effect = [NavigationAbortedError(urls[0], "net::ERR_TIMED_OUT", "navigation_timeout"), None]
+    runner = make_runner(browser_mock, mocker, urls=urls)
+
+    # Act
+    records = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert browser_mock.start_browser.call_count == 1
+    assert [(r.url, r.success, r.error_category) for r in records] == [
+        (urls[0], False, "navigation_timeout"), (urls[1], True, None)]
+
+
+def test_grid_error_mid_session_retries_only_remaining_urls(browser_mock, mocker):
+    """セッションが使えなくなった場合は、新しいセッションで未処理の URL だけを再試行することを確認"""
+    # Arrange
+    from src.application.retry_policy import RetryPolicy
+    urls = ["https://a.example/", "https://b.example/"]
+    browser_mock.take_screenshot.side_effect = [None, WebDriverException("invalid session id"), None]
+    mocker.patch('src.application.rotation_runner.time.sleep')
+    runner = make_runner(browser_mock, mocker, urls=urls, retry_policy=RetryPolicy(random_func=lambda a, b: 0.0))
+
+    # Act
+    records = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert browser_mock.start_browser.call_count == 2
+    assert [c.kwargs["url"] for c in browser_mock.take_screenshot.call_args_list] == [urls[0], urls[1], urls[1]]
+    assert [(r.success, r.attempts) for r in records] == [(True, 1), (True, 2)]
+
+
+def test_tabs_per_session_opens_urls_in_batches(browser_mock, mocker):
+    """tabs_per_session ごとに URL をまとめてタブで開き始めてから、順にキャプチャすることを確認"""
+    # Arrange
+    urls = [f"https://example.com/{n}" for n in range(5)]
+    runner = make_runner(browser_mock, mocker, urls=urls, tabs_per_session=2)
+
+    # Act
+    records = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert [c.args[0] for c in browser_mock.open_tabs.call_args_list] == [urls[0:2], urls[2:4], urls[4:5]]
+    assert [c.kwargs["url"] for c in browser_mock.take_screenshot.call_args_list] == urls
+    assert all(r.success for r in records)
+
+
+def test_records_include_blocked_request_counts(browser_mock, mocker):
+    """ブラウザが記録した URL ごとの遮断数が、レコードとサマリーに含まれることを確認"""
+    # Arrange
+    browser_mock.blocked_requests = {URL: 4}
+    sink = mocker.Mock(spec=ResultSink)
+    runner = make_runner(browser_mock, mocker, result_sink=sink)
+
+    # Act
+    summary = runner.run(PROXIES[:2])
+
+    # Assert
+    records = [c.args[0] for c in sink.write.call_args_list]
+    assert [r.blocked_requests for r in records] == [4, 4]
+    assert summary.blocked_requests == 8
+
+
+def test_navigation_timeout_is_retried_with_new_session(browser_mock, mocker):
+    """ページ読み込みのタイムアウトは URL の失敗として確定せず、新しいセッションで再試行されることを確認"""
+    # Arrange
+    from selenium.common.exceptions import TimeoutException
+    from src.application.retry_policy import RetryPolicy
+    mocker.patch('src.application.rotation_runner.time.sleep')
+    browser_mock.take_screenshot.side_effect = [TimeoutException("Timed out receiving message from renderer"), None]
+    runner = make_runner(browser_mock, mocker, retry_policy=RetryPolicy(random_func=lambda a, b: 0.0))
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert (record.success, record.attempts) == (True, 2)
+    assert browser_mock.start_browser.call_count == 2
+
+
+def test_navigation_timeout_is_recorded_once_retries_are_exhausted(browser_mock, mocker):
+    """再試行の上限に達したタイムアウトは URL の失敗として記録し、同じセッションで残りの URL を処理することを確認"""
+    # Arrange
+    from selenium.common.exceptions import TimeoutException
+    from src.application.retry_policy import RetryPolicy
+    urls = ["https://a.example/", "https://b.example/"]
+    browser_mock.take_screenshot.side_effect = [TimeoutException("Timed out receiving message from renderer"), None]
+    runner = make_runner(browser_mock, mocker, urls=urls, retry_policy=RetryPolicy(budget=0))
+
+    # Act
+    records = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert browser_mock.start_browser.call_count == 1
+    assert [(r.success, r.error_category) for r in records] == [(False, "navigation_timeout"), (True, None)]
+
+
+def test_resume_reruns_attempts_that_failed_because_of_the_grid(browser_mock, mocker, tmp_path):
+    """Grid の障害で失敗した試行はジャーナルに記録されていても、再開時に処理し直すことを確認"""
+    # Arrange
+    from selenium.common.exceptions import SessionNotCreatedException
+    from src.adapters.run_journal import RunJournal
+    path = tmp_path / "run.journal"
+    browser_mock.start_browser.side_effect = [None, SessionNotCreatedException("Could not start a new session"), None]
+    with RunJournal(path) as journal:
+        first = make_runner(browser_mock, mocker, journal=journal).run(PROXIES)
+    browser_mock.start_browser.side_effect = None
+    browser_mock.start_browser.reset_mock()
+
+    # Act
+    with RunJournal(path, resume=True) as journal:
+        resumed = make_runner(browser_mock, mocker, journal=journal).run(PROXIES)
+
+    # Assert
+    assert first.failed == 1
+    assert (resumed.succeeded, resumed.skipped) == (2, 1)
+    assert [c.kwargs["proxy_index"] for c in browser_mock.start_browser.call_args_list] == [0, 1]
+
+
+def test_tiered_browser_tier_goes_through_retry_policy_and_concurrency(browser_mock, mocker):
+    """tiered モードのブラウザ段階も、Grid 側のエラーの再試行とセッション作成の通知の対象になることを確認"""
+    # Arrange
+    from selenium.common.exceptions import SessionNotCreatedException
+    from src.application.concurrency_controller import AimdConcurrencyController
+    from src.application.retry_policy import RetryPolicy
+    mocker.patch('src.application.rotation_runner.time.sleep')
+    verifier = mocker.Mock(spec=TieredVerifier)
+    verifier.verify_http.return_value = IpCheckResult(
+        proxy=PROXIES[1], url=URL, egress_ip="203.0.113.7", elapsed_seconds=0.2, tier=TIER_HTTP)
+    browser_mock.start_browser.side_effect = [SessionNotCreatedException("Could not start a new session"), None]
+    controller = mocker.Mock(spec=AimdConcurrencyController)
+    runner = make_runner(browser_mock, mocker, mode="tiered", verifier=verifier, render=True,
+                         retry_policy=RetryPolicy(random_func=lambda a, b: 0.0), concurrency=controller)
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    verifier.verify.assert_not_called()
+    assert (record.success, record.tier, record.attempts, record.egress_ip) == (True, "browser", 2, "203.0.113.7")
+    assert record.screenshot_path == build_screenshot_path(1, PROXIES[1], "/tmp/shots")
+    assert record.timings[TIER_HTTP] == 0.2 and "session_create" in record.timings
+    assert [c.args[1] for c in controller.record_session.call_args_list] == [True, False]
+
+
+def test_host_rate_limit_is_applied_per_url_host_within_a_session(browser_mock, mocker):
+    """同じセッションの2つ目以降の URL も、先頭の URL ではなくその URL 自身のホストで制限されることを確認"""
+    # Arrange
+    from src.application.rate_limiter import RateLimiter
+    now = [0.0]
+    limiter = RateLimiter(host_rate=0.5, clock=lambda: now[0])
+    sleep = mocker.patch("src.application.rotation_runner.time.sleep",
+                         side_effect=lambda s: now.__setitem__(0, now[0] + s))
+    urls = ["https://a.example/1", "https://b.example/", "https://a.example/2"]
+    runner = make_runner(browser_mock, mocker, urls=urls, rate_limiter=limiter)
+
+    # Act
+    runner.run(PROXIES[:2])
+
+    # Assert: b.example は待たず、2回目の a.example だけがトークンの補充 (2秒) を待つ
+    assert [c.kwargs["url"] for c in browser_mock.take_screenshot.call_args_list] == urls
+    sleep.assert_called_once_with(pytest.approx(2.0))
+
+
+def test_rate_limit_wait_does_not_hold_a_concurrency_slot(browser_mock, mocker):
+    """レート制限で待つ間は同時実行数の枠を返していることを確認"""
+    # Arrange
+    from src.application.concurrency_controller import AimdConcurrencyController
+    from src.application.rate_limiter import RateLimiter
+    now = [0.0]
+    limiter = RateLimiter(host_rate=1.0, clock=lambda: now[0])
+    controller = AimdConcurrencyController(max_limit=2, initial_limit=1, logger=mocker.Mock(spec=logging.Logger))
+    in_flight_while_waiting = []
+
+    def sleep(seconds):
+        in_flight_while_waiting.append(controller.in_flight)
+        now[0] += seconds
+
+    mocker.patch("src.application.rotation_runner.time.sleep", side_effect=sleep)
+    runner = make_runner(browser_mock, mocker, rate_limiter=limiter, concurrency=controller)
+
+    # Act
+    summary = runner.run(PROXIES)
+
+    # Assert
+    assert summary.succeeded == 3
+    assert in_flight_while_waiting and set(in_flight_while_waiting) == {0}
+
+
+def test_read_timeout_while_creating_session_is_retried_as_grid_error(browser_mock, mocker):
+    """セッション作成中の ReadTimeoutError は Grid 側のエラーとして新しいセッションで再試行されることを確認"""
+    # Arrange
+    from urllib3.exceptions import ReadTimeoutError
+    from src.application.retry_policy import RetryPolicy
+    mocker.patch("src.application.rotation_runner.time.sleep")
+    browser_mock.start_browser.side_effect = [ReadTimeoutError(None, "/session", "Read timed out."), None]
+    policy = RetryPolicy(random_func=lambda a, b: 0.0)
+    runner = make_runner(browser_mock, mocker, retry_policy=policy)
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert (record.success, record.attempts) == (True, 2)
+
+
+def test_read_timeout_during_navigation_is_navigation_timeout(browser_mock, mocker):
+    """ページ移動中の ReadTimeoutError (遅いプロキシ) は Grid 側のエラーではなく、ページ読み込みのタイムアウトになることを確認"""
+    # Arrange
+    from urllib3.exceptions import ReadTimeoutError
+    from src.application.retry_policy import RetryPolicy
+    mocker.patch("src.application.rotation_runner.time.sleep")
+    browser_mock.take_screenshot.side_effect = ReadTimeoutError(None, "/session/abc/url", "Read timed out.")
+    runner = make_runner(browser_mock, mocker, retry_policy=RetryPolicy(random_func=lambda a, b: 0.0))
+
+    # Act
+    (record,) = runner.process(1, PROXIES[1])
+
+    # Assert
+    assert not record.success
+    # navigation_timeout の上限 (2回) で打ち切られ、Grid 側のエラーの上限 (3回) までは再試行しない
+    assert (record.error_category, record.attempts) == ("navigation_timeout", 2)
+    assert browser_mock.start_browser.call_count == 2
+
+
+def test_retry_backoff_does_not_hold_a_concurrency_slot(browser_mock, mocker):
+    """再試行までの待機中は同時実行数の枠を返していることを確認"""
+    # Arrange
+    from selenium.common.exceptions import SessionNotCreatedException
+    from src.application.concurrency_controller import AimdConcurrencyController
+    from src.application.retry_policy import RetryPolicy
+    controller = AimdConcurrencyController(max_limit=2, initial_limit=1, logger=mocker.Mock(spec=logging.Logger))
+    in_flight_while_waiting = []
+    mocker.patch("src.application.rotation_runner.time.sleep",
+                 side_effect=lambda seconds: in_flight_while_waiting.append(controller.in_flight))
+    browser_mock.start_browser.side_effect = [None, SessionNotCreatedException("Could not start a new session"), None]
+    runner = make_runner(browser_mock, mocker, concurrency=controller,
+                         retry_policy=RetryPolicy(random_func=lambda a, b: 1.0))
+
+    # Act
+    summary = runner.run(PROXIES[:2])
+
+    # Assert
+    assert summary.succeeded == 2
+    assert in_flight_while_waiting == [0]
+    assert controller.in_flight == 0
@@ -0,0 +1,83 @@
+# tests/application/test_run_metrics.py
+import threading
+
+from src.domain.attempt_record import AttemptRecord
+from src.application.run_metrics import RunMetrics
+
+
+def make_record(success: bool, host: str = "10.0.0.1", error_class: str | None = None) -> AttemptRecord:
+    return AttemptRecord(
+        proxy_index=1, proxy_host=host, proxy_port=3128, url="https://example.com",
+        mode="screenshot", success=success, started_at=0.0, error_class=error_class)
+
+
+def test_record_attempt_updates_counters_and_proxy_health():
+    """試行結果がカウンタとプロキシごとの連続失敗数に反映されることを確認"""
+    # Arrange
+    metrics = RunMetrics()
+
+    # Act
+    metrics.record_attempt(make_record(False, error_class="TimeoutException"))
+    metrics.record_attempt(make_record(False, error_class="TimeoutException"))
+    metrics.record_attempt(make_record(True, host="10.0.0.2"))
+
+    # Assert
+    assert metrics.totals() == {"attempts": 3, "successes": 1, "failures": 2, "active_sessions": 0}
+    text = metrics.render_prometheus()
+    assert 'proxyrot_attempt_failures_total{error_class="TimeoutException"} 2' in text
+    assert 'proxyrot_proxy_consecutive_failures{proxy="10.0.0.1:3128"} 2' in text
+    assert 'proxyrot_proxy_up{proxy="10.0.0.2:3128"} 1' in text
+
+
+def test_render_prometheus_includes_cumulative_histogram_buckets():
+    """フェーズ所要時間が累積バケット・合計・件数として出力されることを確認"""
+    # Arrange
+    metrics = RunMetrics(buckets=(1.0, 5.0, float("inf")))
+
+    # Act
+    metrics.observe("navigate", 0.5)
+    metrics.observe("navigate", 3.0)
+
+    # Assert
+    text = metrics.render_prometheus()
+    assert 'proxyrot_phase_duration_seconds_bucket{phase="navigate",le="1.0"} 1' in text
+    assert 'proxyrot_phase_duration_seconds_bucket{phase="navigate",le="5.0"} 2' in text
+    assert 'proxyrot_phase_duration_seconds_bucket{phase="navigate",le="+Inf"} 2' in text
+    assert 'proxyrot_phase_duration_seconds_sum{phase="navigate"} 3.5' in text
+    assert 'proxyrot_phase_duration_seconds_count{phase="navigate"} 2' in text
+
+
+def test_track_session_and_gauges():
+    """実行中セッション数と任意のゲージが出力されることを確認"""
+    # Arrange
+    metrics = RunMetrics()
+    metrics.set_queue_depth(7)
+
+    # Act / Assert
+    with metrics.track_session():
+        assert metrics.totals()["active_sessions"] == 1
+    assert metrics.totals()["active_sessions"] == 0
+    assert "proxyrot_queue_depth 7" in metrics.render_prometheus()
+
+
+def test_counters_are_merged_across_threads():
+    """複数スレッドからの記録が合算されることを確認"""
+    # Arrange
+    metrics = RunMetrics()
+
+    def worker():
+        for _ in range(100):
+            metrics.record_attempt(make_record(True))
+            metrics.observe("navigate", 0.1)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+
+    # Act
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Assert
+    assert metrics.totals()["attempts"] == 400
+    assert metrics.phases.snapshot()["navigate"].count == 400
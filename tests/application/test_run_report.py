@@ -0,0 +1,40 @@
+# tests/application/test_run_report.py
+from src.application.run_report import build_run_report, merge_records
+from src.domain.attempt_record import AttemptRecord
+
+URL = "https://api.ipify.org?format=json"
+
+
+def make_record(index: int, host: str, started_at: float, success: bool = True,
+                error_category: str | None = None) -> AttemptRecord:
+    return AttemptRecord(
+        proxy_index=index, proxy_host=host, proxy_port=3128, url=URL, mode="ip", success=success,
+        started_at=started_at, egress_ip="203.0.113.7" if success else None,
+        error_class=None if success else "WebDriverException", error_category=error_category)
+
+
+def test_merge_keeps_latest_record_per_proxy_and_url():
+    """全シャードの Proxy #0 や再開時にやり直した試行は、最も新しいレコードだけが残ることを確認"""
+    shard_1 = [make_record(0, "proxy-server", 1.0), make_record(1, "10.0.0.1", 2.0, success=False)]
+    shard_2 = [make_record(0, "proxy-server", 1.5), make_record(1, "10.0.0.2", 2.5)]
+    resumed = [make_record(1, "10.0.0.1", 3.0)]
+
+    merged = merge_records([shard_1, shard_2, resumed])
+
+    assert [(r.proxy_host, r.started_at) for r in merged] == [
+        ("proxy-server", 1.5), ("10.0.0.2", 2.5), ("10.0.0.1", 3.0)]
+
+
+def test_report_aggregates_records_and_shard_summaries():
+    """レポートの集計値・エラー分類ごとの失敗数・シャードごとのサマリーを確認"""
+    records = [make_record(0, "proxy-server", 1.0), make_record(1, "10.0.0.1", 2.0),
+               make_record(2, "10.0.0.2", 3.0, success=False, error_category="proxy"),
+               make_record(3, "10.0.0.3", 4.0, success=False, error_category="proxy")]
+    shards = {"1/2": {"total": 3, "skipped": 5}, "2/2": {"total": 2, "skipped": 1}}
+
+    report = build_run_report(records, shards)
+
+    assert report["summary"] == {"total": 4, "succeeded": 2, "failed": 2, "screenshots_taken": 0,
+                                 "ips_verified": 2, "skipped": 6, "blocked_requests": 0}
+    assert report["error_categories"] == {"proxy": 2}
+    assert report["shards"] == shards
@@ -0,0 +1,38 @@
+# tests/application/test_sharding.py
+import pytest
+
+from src.application.sharding import ShardSpec, parse_shard, select_shard, shard_of
+from src.domain.proxy_info import ProxyInfo
+
+PROXIES = [ProxyInfo("proxy-server", 8080)] + [ProxyInfo(f"10.0.{i // 256}.{i % 256}", 3128) for i in range(1, 2001)]
+
+
+def test_parse_shard_accepts_one_based_index():
+    assert parse_shard("2/4") == ShardSpec(2, 4)
+    assert str(parse_shard("1/1")) == "1/1"
+
+
+@pytest.mark.parametrize("spec", ["0/4", "5/4", "1/0", "1", "a/b", "1/2/3"])
+def test_parse_shard_rejects_invalid_spec(spec):
+    with pytest.raises(ValueError, match="Invalid shard"):
+        parse_shard(spec)
+
+
+def test_shards_partition_proxies_and_keep_proxy_zero_first():
+    """全シャードで Proxy #0 を先頭に残し、残りのプロキシは重複・漏れなく概ね均等に分かれることを確認"""
+    shards = [select_shard(PROXIES, ShardSpec(i, 4)) for i in range(1, 5)]
+
+    assert all(shard[0] == PROXIES[0] for shard in shards)
+    assigned = [proxy for shard in shards for proxy in shard[1:]]
+    assert sorted(assigned, key=PROXIES.index) == PROXIES[1:]
+    assert all(400 <= len(shard) - 1 <= 600 for shard in shards)
+
+
+def test_assignment_is_stable_when_list_changes():
+    """プロキシの追加・削除や並び替えで、他のプロキシの担当シャードが変わらないことを確認"""
+    before = {proxy: shard_of(proxy, 4) for proxy in PROXIES[1:]}
+    changed = list(reversed(PROXIES[1:1500])) + [ProxyInfo("new.proxy", 8000)]
+
+    assert all(shard_of(proxy, 4) == before[proxy] for proxy in changed if proxy in before)
+    assert select_shard([PROXIES[0]] + changed, ShardSpec(3, 4))[1:] == [
+        p for p in changed if shard_of(p, 4) == 3]
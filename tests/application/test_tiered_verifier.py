@@ -0,0 +1,125 @@
+# tests/application/test_tiered_verifier.py
+import pytest
+import logging
+from unittest.mock import MagicMock
+
+from src.domain.proxy_info import ProxyInfo
+from src.domain.ip_check_result import IpCheckResult, TIER_HTTP, TIER_BROWSER
+from src.adapters.http_ip_checker import HttpIpChecker
+from src.application.proxy_selector import ProxySelector
+from src.application.proxied_edge_browser import ProxiedEdgeBrowser
+from src.application.tiered_verifier import TieredVerifier
+
+PROXY = ProxyInfo(host="proxy.test", port=8080)
+IP_URL = "https://api.ipify.org?format=json"
+
+
+@pytest.fixture
+def verifier_mocks(mocker):
+    """モック化された依存性を持つ TieredVerifier を提供するフィクスチャ"""
+    mock_checker = mocker.Mock(spec=HttpIpChecker)
+    mock_selector = mocker.Mock(spec=ProxySelector)
+    mock_selector.select_proxy.return_value = PROXY
+    mock_browser = MagicMock(spec=ProxiedEdgeBrowser)
+    mock_browser.__enter__.return_value = mock_browser
+    browser_factory = mocker.Mock(return_value=mock_browser)
+    verifier = TieredVerifier(
+        http_checker=mock_checker, proxy_selector=mock_selector,
+        browser_factory=browser_factory, logger=mocker.Mock(spec=logging.Logger))
+    return verifier, mock_checker, browser_factory, mock_browser
+
+
+def http_result(egress_ip="203.0.113.7", error=None):
+    return IpCheckResult(proxy=PROXY, url=IP_URL, egress_ip=egress_ip,
+                         elapsed_seconds=0.2, error=error, tier=TIER_HTTP)
+
+
+def test_verify_skips_browser_when_http_tier_fails(verifier_mocks):
+    """HTTP 段階で失敗したプロキシではブラウザを起動しないことを確認"""
+    # Arrange
+    verifier, mock_checker, browser_factory, _ = verifier_mocks
+    failed = http_result(egress_ip=None, error="ProxyError: refused")
+    mock_checker.check.return_value = failed
+
+    # Act
+    result = verifier.verify(1, IP_URL, render_url=IP_URL, screenshot_path="/tmp/x.png")
+
+    # Assert
+    assert result is failed
+    browser_factory.assert_not_called()
+
+
+def test_verify_returns_http_result_when_rendering_not_needed(verifier_mocks):
+    """レンダリング不要な対象では HTTP 段階の結果をそのまま返すことを確認"""
+    # Arrange
+    verifier, mock_checker, browser_factory, _ = verifier_mocks
+    passed = http_result()
+    mock_checker.check.return_value = passed
+
+    # Act
+    result = verifier.verify(1, IP_URL)
+
+    # Assert
+    assert result is passed
+    browser_factory.assert_not_called()
+
+
+def test_verify_takes_screenshot_in_browser_tier_for_passing_proxy(verifier_mocks):
+    """HTTP 段階を通過したプロキシでブラウザ段階のスクショを取得し、同じ形で結果を返すことを確認"""
+    # Arrange
+    verifier, mock_checker, _, mock_browser = verifier_mocks
+    mock_checker.check.return_value = http_result()
+
+    # Act
+    result = verifier.verify(1, IP_URL, render_url="https://example.com", screenshot_path="/tmp/shot.png")
+
+    # Assert
+    mock_browser.start_browser.assert_called_once_with(1)
+    mock_browser.take_screenshot.assert_called_once_with("https://example.com", "/tmp/shot.png")
+    assert isinstance(result, IpCheckResult)
+    assert result.success
+    assert result.tier == TIER_BROWSER
+    assert result.egress_ip == "203.0.113.7"
+    assert result.screenshot_path == "/tmp/shot.png"
+
+
+def test_verify_uses_browser_verify_ip_without_screenshot_path(verifier_mocks):
+    """スクショパスが無い場合はブラウザ段階で verify_ip を使うことを確認"""
+    # Arrange
+    verifier, mock_checker, _, mock_browser = verifier_mocks
+    mock_checker.check.return_value = http_result()
+    browser_result = IpCheckResult(proxy=PROXY, url=IP_URL, egress_ip="203.0.113.7", elapsed_seconds=1.0)
+    mock_browser.verify_ip.return_value = browser_result
+
+    # Act
+    result = verifier.verify(1, IP_URL, render_url=IP_URL)
+
+    # Assert
+    assert result is browser_result
+    mock_browser.take_screenshot.assert_not_called()
+
+
+def test_verify_reports_browser_tier_failure_as_result(verifier_mocks):
+    """ブラウザ段階の例外を失敗結果として返すことを確認"""
+    # Arrange
+    verifier, mock_checker, _, mock_browser = verifier_mocks
+    mock_checker.check.return_value = http_result()
+    mock_browser.start_browser.side_effect = RuntimeError("grid unavailable")
+
+    # Act
+    result = verifier.verify(1, IP_URL, render_url=IP_URL, screenshot_path="/tmp/shot.png")
+
+    # Assert
+    assert not result.success
+    assert result.tier == TIER_BROWSER
+    assert result.error == "RuntimeError: grid unavailable"
+
+
+def test_tiered_verifier_rejects_invalid_dependencies(mocker):
+    """不正な型の依存性を渡した場合に TypeError が発生することを確認"""
+    selector = mocker.Mock(spec=ProxySelector)
+    checker = mocker.Mock(spec=HttpIpChecker)
+    with pytest.raises(TypeError, match="http_checker must be an instance of HttpIpChecker"):
+        TieredVerifier("not a checker", selector, lambda: None)  # type: ignore
+    with pytest.raises(TypeError, match="proxy_selector must be an instance of ProxySelector"):
+        TieredVerifier(checker, "not a selector", lambda: None)  # type: ignore
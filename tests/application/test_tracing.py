@@ -0,0 +1,81 @@
+# tests/application/test_tracing.py
+import pytest
+
+from src.adapters.span_exporter import SpanExporter
+from src.application.tracing import Tracer, STATUS_ERROR
+
+
+@pytest.fixture
+def exporter(mocker):
+    return mocker.Mock(spec=SpanExporter)
+
+
+def test_child_spans_share_trace_and_reference_parent(exporter):
+    """入れ子のスパンが同じトレースに属し、親スパンを参照することを確認"""
+    # Arrange
+    tracer = Tracer(exporter, sample_ratio=1.0)
+
+    # Act
+    with tracer.span("proxy_attempt", {"proxy.index": 1}) as root:
+        with tracer.span("webdriver get") as child:
+            assert tracer.current_span() is child
+    assert tracer.current_span() is None
+
+    # Assert
+    spans = exporter.export.call_args.args[0]
+    assert [s.name for s in spans] == ["webdriver get", "proxy_attempt"]
+    assert child.trace_id == root.trace_id
+    assert child.parent_span_id == root.span_id
+    assert root.parent_span_id is None
+    assert root.duration_seconds >= child.duration_seconds >= 0
+
+
+def test_unsampled_fast_trace_is_dropped(exporter):
+    """サンプリングで選ばれなかった速いトレースは書き出されないことを確認"""
+    # Arrange
+    tracer = Tracer(exporter, sample_ratio=0.5, slow_threshold_seconds=60, random_func=lambda: 0.9)
+
+    # Act
+    with tracer.span("proxy_attempt"):
+        pass
+
+    # Assert
+    exporter.export.assert_not_called()
+
+
+def test_failed_trace_is_always_kept(exporter):
+    """例外で終わったトレースはサンプリング対象外でも書き出されることを確認"""
+    # Arrange
+    tracer = Tracer(exporter, sample_ratio=0.0, slow_threshold_seconds=None)
+
+    # Act
+    with pytest.raises(RuntimeError):
+        with tracer.span("proxy_attempt"):
+            with tracer.span("webdriver newSession"):
+                raise RuntimeError("grid unavailable")
+
+    # Assert
+    spans = exporter.export.call_args.args[0]
+    assert all(s.status == STATUS_ERROR for s in spans)
+    assert spans[0].status_message == "RuntimeError: grid unavailable"
+
+
+def test_slow_trace_is_always_kept(exporter):
+    """閾値以上かかったトレースはサンプリング対象外でも書き出されることを確認"""
+    # Arrange
+    tracer = Tracer(exporter, sample_ratio=0.0, slow_threshold_seconds=0.0)
+
+    # Act
+    with tracer.span("proxy_attempt"):
+        pass
+
+    # Assert
+    exporter.export.assert_called_once()
+
+
+def test_init_validates_arguments(exporter):
+    """不正な引数で例外が発生することを確認"""
+    with pytest.raises(TypeError):
+        Tracer(object())
+    with pytest.raises(ValueError):
+        Tracer(exporter, sample_ratio=1.5)
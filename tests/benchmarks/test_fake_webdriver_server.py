@@ -0,0 +1,146 @@
+# tests/benchmarks/test_fake_webdriver_server.py
+import pytest
+
+from benchmarks.fake_webdriver_server import FakeWebDriverServer, fake_egress_ip
+from benchmarks.run_benchmark import generate_proxies, run_benchmark
+from benchmarks.fake_webdriver_server import FakeLatencies
+from src.adapters.edge_option_factory import EdgeOptionFactory
+from src.application.proxied_edge_browser import ProxiedEdgeBrowser
+from src.application.proxy_provider import ListProxyProvider
+from src.application.proxy_selector import ProxySelector
+from src.domain.proxy_info import ProxyInfo
+
+
+@pytest.fixture
+def server():
+    with FakeWebDriverServer(screenshot_size=(8, 8)) as server:
+        yield server
+
+
+def test_proxied_edge_browser_runs_against_fake_server(server, tmp_path):
+    """実際の ProxiedEdgeBrowser が偽サーバーでスクショ取得と IP 確認を行えることを確認"""
+    # Arrange
+    selector = ProxySelector(ListProxyProvider([ProxyInfo("proxy-server", 8080), ProxyInfo("10.0.0.1", 3128)]))
+    browser = ProxiedEdgeBrowser(selector, EdgeOptionFactory(), command_executor=server.url)
+    screenshot = tmp_path / "shot.png"
+
+    # Act
+    with browser:
+        browser.start_browser(1)
+        browser.take_screenshot("https://example.com", str(screenshot))
+        result = browser.verify_ip("https://api.ipify.org?format=json")
+
+    # Assert
+    assert screenshot.read_bytes().startswith(b"\x89PNG")
+    assert result.egress_ip == fake_egress_ip("10.0.0.1:3128")
+    assert server.sessions_created == 1
+    assert server.active_sessions == 0
+
+
+def test_run_benchmark_reports_throughput_and_phases():
+    """ベンチマークがスループットとフェーズごとのパーセンタイルを返すことを確認"""
+    # Act
+    result = run_benchmark(5, "screenshot", FakeLatencies(), screenshot_size=(8, 8))
+
+    # Assert
+    results = result["results"]
+    assert results["succeeded"] == 5 and results["failed"] == 0
+    assert results["proxies_per_second"] > 0
+    assert {"session_create", "navigate", "save_screenshot", "quit"} <= set(results["phases"])
+
+
+def test_generate_proxies_starts_with_proxy_server():
+    """生成されるプロキシリストの先頭が proxy-server であることを確認"""
+    proxies = generate_proxies(3)
+    assert proxies[0].host == "proxy-server"
+    assert len({p.host for p in proxies}) == 3
+
+
+def test_tabs_load_urls_concurrently_against_fake_server(tmp_path):
+    """open_tabs で開始したページ移動が並行して進み、タブごとにキャプチャした後にタブが閉じられることを確認"""
+    # Arrange
+    import time
+    urls = [f"https://example.com/{n}" for n in range(4)]
+    selector = ProxySelector(ListProxyProvider([ProxyInfo("proxy-server", 8080), ProxyInfo("10.0.0.1", 3128)]))
+    with FakeWebDriverServer(FakeLatencies(navigate=0.3), screenshot_size=(8, 8)) as server:
+        browser = ProxiedEdgeBrowser(selector, EdgeOptionFactory(), command_executor=server.url)
+
+        # Act
+        with browser:
+            browser.start_browser(1)
+            started = time.perf_counter()
+            browser.open_tabs(urls)
+            for n, url in enumerate(urls):
+                browser.take_screenshot(url, str(tmp_path / f"{n}.png"))
+            elapsed = time.perf_counter() - started
+            handles = browser._driver.window_handles
+
+    # Assert
+    assert elapsed < 0.3 * len(urls) * 0.75
+    assert all((tmp_path / f"{n}.png").exists() for n in range(len(urls)))
+    assert len(handles) == 1
+
+
+def test_cdp_context_browser_shares_one_session_against_fake_server(server, tmp_path):
+    """プロキシごとのブラウザコンテキストが1つの共有セッション内に作成され、コンテキストのプロキシで通信することを確認"""
+    # Arrange
+    from src.application.cdp_context_browser import CdpContextBrowser, SharedEdgeSessionPool
+    proxies = [ProxyInfo("proxy-server", 8080), ProxyInfo("10.0.0.1", 3128), ProxyInfo("10.0.0.2", 3128)]
+    selector = ProxySelector(ListProxyProvider(proxies))
+    pool = SharedEdgeSessionPool(selector, EdgeOptionFactory(), command_executor=server.url)
+    egress_ips = []
+
+    # Act
+    for index in (1, 2):
+        with CdpContextBrowser(pool, selector, command_executor=server.url) as browser:
+            browser.start_browser(index)
+            browser.take_screenshot("https://example.com", str(tmp_path / f"{index}.png"))
+            egress_ips.append(browser.verify_ip("https://api.ipify.org?format=json").egress_ip)
+    pool.close()
+
+    # Assert
+    assert egress_ips == [fake_egress_ip("10.0.0.1:3128"), fake_egress_ip("10.0.0.2:3128")]
+    assert server.sessions_created == 1
+    assert server.contexts_created == 2
+    assert server.active_sessions == 0
+
+
+def test_blocked_requests_are_counted_per_tab_against_fake_server(tmp_path):
+    """タブで並行して読み込んだ URL ごとに、遮断したサブリソースの数が記録されることを確認"""
+    # Arrange
+    from benchmarks.fake_webdriver_server import FAKE_PAGE_RESOURCES
+    from src.application.resource_blocking import BlockingRule, ResourceBlocker
+    urls = ["https://example.com/a", "https://example.com/b", "https://plain.example.org/"]
+    blocker = ResourceBlocker(BlockingRule(resource_types=("image", "tracker")),
+                              {"plain.example.org": BlockingRule()})
+    selector = ProxySelector(ListProxyProvider([ProxyInfo("proxy-server", 8080), ProxyInfo("10.0.0.1", 3128)]))
+    with FakeWebDriverServer(screenshot_size=(8, 8)) as server:
+        browser = ProxiedEdgeBrowser(selector, EdgeOptionFactory(), command_executor=server.url,
+                                     resource_blocker=blocker)
+
+        # Act
+        with browser:
+            browser.start_browser(1)
+            browser.open_tabs(urls)
+            for n, url in enumerate(urls):
+                browser.take_screenshot(url, str(tmp_path / f"{n}.png"))
+            blocked = dict(browser.blocked_requests)
+
+    # Assert: 画像 3 件と解析/広告スクリプト 2 件
+    assert len(FAKE_PAGE_RESOURCES) == 9
+    assert blocked == {urls[0]: 5, urls[1]: 5, urls[2]: 0}
+
+
+def test_committed_baseline_can_be_compared(capsys):
+    """コミット済みのベースラインと比較でき、設定の違いと大きな退行を検出することを確認"""
+    import json
+    from benchmarks.run_benchmark import RESULTS_DIR, compare
+    baseline = json.loads((RESULTS_DIR / "baseline.json").read_text(encoding="utf-8"))
+    slower = json.loads(json.dumps(baseline))
+    slower["results"]["proxies_per_second"] *= 0.5
+    slower["config"]["proxies"] = 10
+
+    assert compare(baseline, baseline, max_regression=0.1)
+    assert "WARNING" not in capsys.readouterr().out
+    assert not compare(slower, baseline, max_regression=0.1)
+    assert "settings differ" in capsys.readouterr().out
@@ -0,0 +1,129 @@
+# tests/benchmarks/test_fault_proxy.py
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+from benchmarks.fault_proxy import FaultBehavior, FaultProxyServer, load_scenario, write_proxy_file
+
+
+@pytest.fixture
+def upstream():
+    """平文 HTTP の上流サーバー (固定の本文を返す)"""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                conn.recv(65536)
+                body = b"x" * 10000
+                conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 10000\r\nConnection: close\r\n\r\n" + body)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield port
+    listener.close()
+
+
+@pytest.fixture
+def proxies():
+    behaviors = {
+        "healthy": FaultBehavior(),
+        "local": FaultBehavior(local_response=True),
+        "slow": FaultBehavior(latency=0.3, local_response=True),
+        "error": FaultBehavior(error_status=502),
+        "refuse": FaultBehavior(refuse_connect=True),
+        "drop": FaultBehavior(drop_probability=1.0),
+        "truncate": FaultBehavior(drop_after_bytes=2048),
+    }
+    ports = {}
+    servers = []
+    for name, behavior in behaviors.items():
+        server = FaultProxyServer({0: behavior}).start_in_thread()
+        servers.append(server)
+        ports[name] = next(iter(server.ports))
+    yield ports
+    for server in servers:
+        server.stop_thread()
+
+
+def via(port: int) -> dict[str, str]:
+    return {"http": f"http://127.0.0.1:{port}", "https": f"http://127.0.0.1:{port}"}
+
+
+def test_healthy_proxy_forwards_plain_http(proxies, upstream):
+    """正常なプロキシは平文 HTTP を上流に転送することを確認"""
+    response = requests.get(f"http://127.0.0.1:{upstream}/ip", proxies=via(proxies["healthy"]), timeout=5)
+    assert response.status_code == 200
+    assert len(response.content) == 10000
+
+
+def test_local_response_and_latency(proxies):
+    """local_response は自分で IP を返し、latency 分だけ遅れることを確認"""
+    started = time.perf_counter()
+    response = requests.get("http://example.invalid/", proxies=via(proxies["slow"]), timeout=5)
+    assert time.perf_counter() - started >= 0.3
+    assert response.json() == {"ip": "127.0.0.1"}
+
+
+def test_error_status_returns_error_page(proxies):
+    """error_status を指定したプロキシはエラーページを返すことを確認"""
+    response = requests.get("http://example.invalid/", proxies=via(proxies["error"]), timeout=5)
+    assert response.status_code == 502
+    assert "502 Bad Gateway" in response.text
+
+
+def test_refuse_connect_rejects_https(proxies):
+    """refuse_connect を指定したプロキシは CONNECT を拒否することを確認"""
+    with pytest.raises(requests.exceptions.ProxyError):
+        requests.get("https://example.invalid/", proxies=via(proxies["refuse"]), timeout=5)
+
+
+def test_drop_and_truncate_break_the_connection(proxies, upstream):
+    """drop_probability と drop_after_bytes で接続が切断されることを確認"""
+    with pytest.raises(requests.exceptions.ConnectionError):
+        requests.get("http://example.invalid/", proxies=via(proxies["drop"]), timeout=5)
+    with pytest.raises(requests.exceptions.RequestException):
+        requests.get(f"http://127.0.0.1:{upstream}/", proxies=via(proxies["truncate"]), timeout=5)
+
+
+def test_load_scenario_assigns_mix_deterministically():
+    """mix の割り当てが seed で再現でき、個別指定が優先されることを確認"""
+    scenario = {
+        "base_port": 30000, "count": 100, "seed": 7,
+        "mix": [{"weight": 1, "behavior": {}}, {"weight": 1, "behavior": {"error_status": 503}}],
+        "ports": {"30000": {"latency": 1.5}},
+    }
+    first = load_scenario(scenario)
+    assert first == load_scenario(scenario)
+    assert len(first) == 100
+    assert first[30000] == FaultBehavior(latency=1.5)
+    assert 0 < sum(1 for b in first.values() if b.error_status == 503) < 100
+
+
+def test_bundled_scenario_is_valid():
+    """同梱のシナリオファイルが読み込めることを確認"""
+    scenario = Path(__file__).parents[2] / "benchmarks" / "scenarios" / "mixed_failures.json"
+    assert len(load_scenario(scenario)) == 1000
+
+
+def test_load_scenario_rejects_unknown_keys():
+    """未知の振る舞いキーは ValueError になることを確認"""
+    with pytest.raises(ValueError):
+        load_scenario({"count": 1, "mix": [{"behavior": {"lag": 1}}]})
+
+
+def test_write_proxy_file_puts_first_proxy_on_top(tmp_path):
+    """書き出したプロキシリストの1行目が初期化用プロキシになることを確認"""
+    path = tmp_path / "proxies.txt"
+    write_proxy_file(path, "127.0.0.1", [20001, 20000], "proxy-server:8080")
+    assert path.read_text().splitlines() == ["proxy-server:8080", "127.0.0.1:20000", "127.0.0.1:20001"]
@@ -180,4 +180,153 @@ def test_setup_logging_called_multiple_times(test_log_paths):
     assert len(log_lines) >= 2
     if len(log_lines) >= 2:
         assert "First log" in log_lines[-2]
-        assert "Second log" in log_lines[-1]
\ No newline at end of file
+        assert "Second log" in log_lines[-1]
+
+
+def test_async_logging_uses_queue_handler_and_flushes_on_shutdown(test_log_paths):
+    """非同期モードではロガーに QueueHandler のみが付き、停止時にファイルへ書き出されることを確認"""
+    test_log_dir, test_log_file = test_log_paths
+
+    # Act
+    setup_logging(async_logging=True)
+    logger = get_logger()
+    logger.info("Queued message for proxy #%s", 42)
+    logging_config.shutdown_logging()
+
+    # Assert
+    assert [type(h).__name__ for h in logger.handlers] == ["_QueueHandler"]
+    log_lines = test_log_file.read_text(encoding='utf-8').strip().splitlines()
+    assert "Queued message for proxy #42" in log_lines[-1]
+    assert f" - {TEST_APP_LOGGER_NAME} - INFO - " in log_lines[-1]
+
+
+def test_async_logging_keeps_traceback_text(test_log_paths):
+    """非同期モードでも exc_info の例外情報がファイルに書き出されることを確認"""
+    test_log_dir, test_log_file = test_log_paths
+    setup_logging(async_logging=True)
+    logger = get_logger()
+
+    # Act
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.error("Failed: %s", "boom", exc_info=True)
+    logging_config.shutdown_logging()
+
+    # Assert
+    content = test_log_file.read_text(encoding='utf-8')
+    assert "Traceback (most recent call last)" in content
+    assert "ValueError: boom" in content
+
+
+def test_json_format_writes_one_object_per_line(test_log_paths, monkeypatch):
+    """LOG_JSON を有効にすると1行1レコードの JSON が出力されることを確認"""
+    test_log_dir, test_log_file = test_log_paths
+    monkeypatch.setenv('LOG_JSON', 'true')
+
+    # Act
+    setup_logging()
+    logger = get_logger()
+    logger.warning("Proxy %s:%s is slow", "10.0.0.1", 3128, extra={"proxy_index": 7})
+
+    # Assert
+    import json
+    entry = json.loads(test_log_file.read_text(encoding='utf-8').strip().splitlines()[-1])
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == TEST_APP_LOGGER_NAME
+    assert entry["message"] == "Proxy 10.0.0.1:3128 is slow"
+    assert entry["proxy_index"] == 7
+
+
+def test_log_file_rotates_by_size(test_log_paths, monkeypatch):
+    """LOG_MAX_BYTES を超えるとログファイルがローテーションされ、世代数が LOG_BACKUP_COUNT に収まることを確認"""
+    test_log_dir, test_log_file = test_log_paths
+    monkeypatch.setenv('LOG_MAX_BYTES', '500')
+    monkeypatch.setenv('LOG_BACKUP_COUNT', '2')
+
+    # Act
+    setup_logging()
+    logger = get_logger()
+    for i in range(50):
+        logger.info("Filler message number %s to grow the log file", i)
+
+    # Assert
+    rotated = sorted(p.name for p in test_log_dir.iterdir())
+    assert rotated == ["test_app.log", "test_app.log.1", "test_app.log.2"]
+    assert test_log_file.stat().st_size <= 500
+
+
+def test_error_sampling_filter_suppresses_repeats_and_reports_counts():
+    """同じエラーは最初の N 件のみ通り、間隔ごとに抑制件数付きの1件 (トレースバック無し) が通ることを確認"""
+    now = [0.0]
+    sampling = logging_config.ErrorSamplingFilter(first_n=2, interval=10, clock=lambda: now[0])
+
+    def make_record(msg="Failed to start WebDriver session: %s", level=logging.ERROR):
+        try:
+            raise RuntimeError("grid down")
+        except RuntimeError:
+            import sys
+            return logging.LogRecord(TEST_APP_LOGGER_NAME, level, __file__, 1, msg, ("x",), sys.exc_info())
+
+    # Act / Assert
+    assert [sampling.filter(make_record()) for _ in range(5)] == [True, True, False, False, False]
+    assert sampling.filter(make_record("Other error: %s")) # 別のシグネチャは独立して数える
+    assert sampling.filter(make_record(level=logging.INFO)) # WARNING 未満は対象外
+
+    now[0] = 11.0
+    summary = make_record()
+    assert sampling.filter(summary)
+    assert summary.getMessage().startswith("[4 similar message(s) in the last 10s, 6 total] ")
+    assert summary.exc_info is None
+    assert not sampling.filter(make_record())
+
+
+def test_setup_logging_samples_repeated_errors(test_log_paths, monkeypatch):
+    """setup_logging() が LOG_SAMPLE_FIRST_N に従って同じエラーを間引くことを確認"""
+    test_log_dir, test_log_file = test_log_paths
+    monkeypatch.setenv('LOG_SAMPLE_FIRST_N', '3')
+
+    # Act
+    setup_logging()
+    logger = get_logger()
+    for i in range(20):
+        logger.error("Failed to start WebDriver session for proxy #%s", i)
+
+    # Assert
+    content = test_log_file.read_text(encoding='utf-8')
+    assert content.count("Failed to start WebDriver session") == 3
+
+
+def test_error_sampling_filter_summary_returns_pending_suppressions():
+    """最後のまとめ以降に抑制した件数が summary() で1件のレコードとして返され、リセットされることを確認"""
+    now = [0.0]
+    sampling = logging_config.ErrorSamplingFilter(first_n=1, interval=60, clock=lambda: now[0])
+    for i in range(4):
+        sampling.filter(logging.LogRecord(TEST_APP_LOGGER_NAME, logging.ERROR, __file__, 1, "Proxy #%s failed", (i,), None))
+
+    # Act
+    now[0] = 5.0
+    (record,) = sampling.summary()
+
+    # Assert
+    assert record.getMessage() == "[3 similar message(s) suppressed in the last 5s, 4 total] Proxy #3 failed"
+    assert sampling.filter(record)  # まとめのレコードは再び抑制されない
+    assert sampling.summary() == []
+
+
+def test_shutdown_logging_writes_suppressed_counts(test_log_paths, monkeypatch):
+    """終了時の shutdown_logging() で、最後の間隔に抑制した件数がログに出力されることを確認"""
+    test_log_dir, test_log_file = test_log_paths
+    monkeypatch.setenv('LOG_SAMPLE_FIRST_N', '3')
+    setup_logging()
+    logger = get_logger()
+    for i in range(20):
+        logger.error("Failed to start WebDriver session for proxy #%s", i)
+
+    # Act
+    logging_config.shutdown_logging()
+
+    # Assert
+    content = test_log_file.read_text(encoding='utf-8')
+    assert "[17 similar message(s) suppressed in the last " in content
+    assert "17 similar" in content.splitlines()[-1] and "proxy #19" in content.splitlines()[-1]
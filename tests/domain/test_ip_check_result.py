@@ -0,0 +1,29 @@
+# tests/domain/test_ip_check_result.py
+import pytest
+from dataclasses import FrozenInstanceError
+
+from src.domain.proxy_info import ProxyInfo
+from src.domain.ip_check_result import IpCheckResult
+
+
+def test_ip_check_result_success_when_ip_present():
+    """egress_ip があり error が無い場合に success が True になることを確認"""
+    result = IpCheckResult(proxy=ProxyInfo("proxy.test", 8080), url="https://api.ipify.org",
+                           egress_ip="203.0.113.7", elapsed_seconds=0.5)
+    assert result.success is True
+
+
+def test_ip_check_result_failure_when_ip_missing_or_error():
+    """egress_ip が無い場合や error がある場合に success が False になることを確認"""
+    proxy = ProxyInfo("proxy.test", 8080)
+    missing = IpCheckResult(proxy=proxy, url="u", egress_ip=None, elapsed_seconds=0.1, error="not found")
+    errored = IpCheckResult(proxy=proxy, url="u", egress_ip="203.0.113.7", elapsed_seconds=0.1, error="boom")
+    assert missing.success is False
+    assert errored.success is False
+
+
+def test_ip_check_result_immutability():
+    """IpCheckResult が不変であることを確認"""
+    result = IpCheckResult(proxy=ProxyInfo("proxy.test", 8080), url="u", egress_ip=None, elapsed_seconds=0.0)
+    with pytest.raises(FrozenInstanceError):
+        result.egress_ip = "203.0.113.7"  # type: ignore